@@ -1,14 +1,68 @@
 # controller.py - Enhanced with Cost Analysis Integration
 import logging
-from typing import List, Dict, Any, Tuple, Optional
-from processing.extract import load_file
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Any, Sequence, Tuple, Optional
+from processing.extract import load_file, extractor_options
 from processing.clean import clean_text
-from processing.splitter import split_text  # Keep existing basic splitter
+from processing.splitter import split_text, split_text_spans  # Keep existing basic splitter
+from processing.chunk_spans import SpanChunks, concat_chunks
+from processing.dedup import deduplicate_chunks, DedupStats
 
 # Import our premium systems
 from core.tokenizer_manager import TokenizerManager
 from core.license_manager import LicenseManager, FeatureTier
-from core.cost_calculator import EnhancedCostCalculator, calculate_training_cost
+from core.cost_calculator import EnhancedCostCalculator, GPUType, calculate_training_cost
+from core.pricing_engine import get_shared_pricing_engine
+from core.roi_calculator import ROICalculator
+from core.tokenizer_comparison import TokenizerComparisonJob, TokenizerComparisonResult
+from core.token_counts import TokenCountStore, TokenCountUpdate, TokenizerSwitchJob
+from core.batch_processing import (
+    BatchProcessingJob, FileStatus, aggregate_analyses, deduplicate_files, fingerprint_files,
+    MAX_BATCH_WORKERS, STATUS_DONE
+)
+from export.report_exporter import ExportProgress, ExportResult, ReportOptions, export_report, export_reports
+
+# Cost-analysis progress stages and the share of the work each one covers
+STAGE_TOKENIZING = "tokenizing"
+STAGE_COSTING = "costing"
+STAGE_SUMMARIZING = "summarizing"
+STAGE_DONE = "done"
+TOKENIZING_SHARE = 50.0  # Percent of the analysis spent counting tokens
+COSTING_SHARE = 45.0  # Split evenly across target models
+PROGRESS_UPDATES_PER_STAGE = 100  # Upper bound on events while tokenizing
+
+@dataclass
+class AnalysisProgress:
+    """Progress event emitted by analyze_chunks_with_costs"""
+    stage: str
+    message: str
+    percent: float
+    eta_seconds: Optional[float]
+    elapsed_seconds: float
+
+class _ProgressReporter:
+    """Turns stage updates into AnalysisProgress events with an ETA"""
+    
+    def __init__(self, callback: Optional[Callable[[AnalysisProgress], None]]):
+        self._callback = callback
+        self._started = time.perf_counter()
+    
+    def report(self, stage: str, message: str, percent: float):
+        if self._callback is None:
+            return
+        elapsed = time.perf_counter() - self._started
+        if percent >= 100:
+            eta = 0.0
+        elif percent > 0:
+            eta = round(elapsed * (100 - percent) / percent, 1)
+        else:
+            eta = None
+        try:
+            self._callback(AnalysisProgress(stage, message, round(percent, 1), eta, round(elapsed, 2)))
+        except Exception as e:
+            logging.warning(f"Progress callback failed: {e}")
 
 class ProcessingController:
     """Enhanced controller with premium tokenizer support and cost analysis"""
@@ -16,6 +70,9 @@ class ProcessingController:
     def __init__(self):
         self.tokenizer_manager = TokenizerManager()
         self.license_manager = LicenseManager()
+        self.last_dedup_stats: Optional[DedupStats] = None
+        self._pricing_engine = None  # Shared engine, attached on the first cost analysis
+        self._roi_calculator: Optional[ROICalculator] = None
         
         # Initialize cost calculator with error handling
         try:
@@ -56,7 +113,9 @@ class ProcessingController:
 
     def process_book(self, path: str, clean_opts: Dict[str, Any], split_method: str, 
                     delimiter: str = None, tokenizer_name: str = 'gpt2', 
-                    use_smart_splitting: bool = None, max_tokens: int = 512) -> List[str]:
+                    use_smart_splitting: bool = None, max_tokens: int = 512,
+                    deduplicate: bool = False, as_spans: bool = False,
+                    extract_opts: Optional[Dict[str, Dict[str, Any]]] = None) -> Sequence[str]:
         """
         Enhanced book processing (smart splitting disabled for now)
         
@@ -67,10 +126,37 @@ class ProcessingController:
             delimiter: Custom delimiter if split_method is 'custom'
             tokenizer_name: Tokenizer to use for processing
             use_smart_splitting: Whether to use smart splitting (disabled for now)
-            max_tokens: Maximum tokens per chunk for smart splitting
+            max_tokens: Maximum tokens per chunk for smart and sentence splitting
+            deduplicate: Drop exact and near-duplicate chunks before returning
+            as_spans: Return a SpanChunks over the cleaned text instead of a list
+            extract_opts: Extractor options keyed by extension, e.g.
+                {'.json': {'fields': ['messages[*].content']}}
             
         Returns:
-            List of text chunks
+            List of text chunks (duplicate statistics are kept in last_dedup_stats)
+        """
+        chunks, self.last_dedup_stats = self.process_file(
+            path, clean_opts, split_method, delimiter, tokenizer_name, deduplicate, max_tokens, as_spans,
+            extract_opts
+        )
+        return chunks
+
+    def process_file(self, path: str, clean_opts: Dict[str, Any], split_method: str,
+                     delimiter: str = None, tokenizer_name: str = 'gpt2',
+                     deduplicate: bool = False,
+                     max_tokens: int = 512,
+                     as_spans: bool = False,
+                     extract_opts: Optional[Dict[str, Dict[str, Any]]] = None
+                     ) -> Tuple[Sequence[str], Optional[DedupStats]]:
+        """
+        Process one file and return its chunks with their duplicate statistics
+        
+        Unlike process_book this keeps no state on the controller, so several
+        files can be processed concurrently. Sentence splitting packs whole
+        sentences into chunks of up to max_tokens tokens of tokenizer_name.
+        With as_spans the chunks are a SpanChunks over the cleaned text (doc_id
+        is path), which avoids a second copy of the text and records each
+        chunk's offsets.
         """
         # Validate tokenizer access
         if not self.license_manager.check_tokenizer_access(tokenizer_name):
@@ -78,15 +164,171 @@ class ProcessingController:
             tokenizer_name = 'gpt2'
         
         # Load and clean text
-        raw = load_file(path)
+        raw = load_file(path, **extractor_options(path, extract_opts))
         cleaned = clean_text(raw, **clean_opts)
         
         # Use basic splitting for now (smart splitting will be added later)
-        chunks = split_text(cleaned, split_method, delimiter)
+        chunks = self._split_document(path, cleaned, split_method, delimiter, tokenizer_name,
+                                      max_tokens, as_spans)
+        
+        # Deduplicate between splitting and export
+        dedup_stats = None
+        if deduplicate:
+            chunks, dedup_stats = deduplicate_chunks(chunks)
         
         logging.info(f"Processed {path}: {len(chunks)} chunks created using basic {split_method} splitting")
+        return chunks, dedup_stats
+
+    def process_repository(self, root: str, clean_opts: Dict[str, Any], split_method: str,
+                           delimiter: str = None, tokenizer_name: str = 'gpt2',
+                           deduplicate: bool = False,
+                           max_tokens: int = 512,
+                           as_spans: bool = False,
+                           on_file: Optional[Callable[[str, int], None]] = None
+                           ) -> Tuple[Sequence[str], Optional[DedupStats], Dict[str, Any]]:
+        """
+        Process every usable source file of a code repository into one dataset
+        
+        Files come from iter_ingested_files (honouring .gitignore and skipping
+        vendored, generated, minified and binary files) and are cleaned and
+        split one at a time as they are screened. Each file's text starts with
+        a "# File: <path>" header; with as_spans each file is its own
+        document in the SpanChunks, so chunk provenance names the file.
+        
+        Args:
+            root: Repository root directory
+            clean_opts, split_method, delimiter, tokenizer_name, deduplicate,
+                max_tokens, as_spans: As for process_file
+            on_file: Called with (relative path, files processed so far)
+            
+        Returns:
+            (chunks, dedup_stats, summary) where summary holds 'files' and
+            'skipped' (skip reason -> count)
+        """
+        if not self.license_manager.check_tokenizer_access(tokenizer_name):
+            logging.warning(f"Access denied to tokenizer {tokenizer_name}, falling back to gpt2")
+            tokenizer_name = 'gpt2'
+        
+        # Imported here so startup does not load the code extractor
+        from processing.extractors.code_extractor import iter_ingested_files
+        
+        skipped: Dict[str, int] = {}
+        parts = []
+        for ingested in iter_ingested_files(root, skipped=skipped):
+            cleaned = clean_text(f"# File: {ingested.path}\n{ingested.content}", **clean_opts)
+            parts.append(self._split_document(
+                os.path.join(root, ingested.path), cleaned, split_method, delimiter,
+                tokenizer_name, max_tokens, as_spans
+            ))
+            if on_file:
+                on_file(ingested.path, len(parts))
+        
+        chunks = concat_chunks(parts)
+        dedup_stats = None
+        if deduplicate:
+            chunks, dedup_stats = deduplicate_chunks(chunks)
+        
+        logging.info(f"Processed repository {root}: {len(parts)} files, {len(chunks)} chunks, skipped {skipped}")
+        return chunks, dedup_stats, {'files': len(parts), 'skipped': skipped}
+
+    def _split_document(self, doc_id: str, cleaned: str, split_method: str, delimiter: Optional[str],
+                        tokenizer_name: str, max_tokens: int, as_spans: bool) -> Sequence[str]:
+        """Split one cleaned document, as strings or as spans over the cleaned text"""
+        split = split_text_spans if as_spans else split_text
+        chunks = split(
+            cleaned, split_method, delimiter, max_tokens=max_tokens,
+            count_tokens=lambda sentence: self.get_token_count(sentence, tokenizer_name)[0]
+        )
+        if as_spans:
+            chunks = SpanChunks.from_spans(doc_id, cleaned, chunks)
         return chunks
 
+    def process_files(self, paths: List[str], clean_opts: Dict[str, Any], split_method: str,
+                      delimiter: str = None, tokenizer_name: str = 'gpt2', token_limit: int = 512,
+                      on_status: Optional[Callable[[FileStatus], None]] = None,
+                      max_workers: int = MAX_BATCH_WORKERS,
+                      as_spans: bool = False,
+                      extract_opts: Optional[Dict[str, Dict[str, Any]]] = None,
+                      deduplicate: bool = False) -> BatchProcessingJob:
+        """
+        Start processing and analyzing several files concurrently
+        
+        Args:
+            paths: Files to process (see expand_paths for folders)
+            clean_opts, split_method, delimiter, tokenizer_name: As for process_book
+            token_limit: Token limit used by the per-file analysis
+            as_spans: Return each file's chunks as a SpanChunks (see process_file)
+            extract_opts: Extractor options keyed by extension (see process_book)
+            deduplicate: Drop exact and near-duplicate chunks within each file.
+                Leave this off when summarize_files deduplicates across files,
+                so its statistics cover every duplicate
+            on_status: Called from worker threads whenever a file changes state
+            max_workers: Files processed at the same time
+            
+        Returns:
+            The running BatchProcessingJob; combine its results with summarize_files
+        """
+        def analyze(chunks, dedup_stats):
+            # Kept on the file's status so summarize_files never re-tokenizes
+            token_counts = self.count_chunk_tokens(chunks, tokenizer_name)
+            analysis = self.analyze_chunks(chunks, tokenizer_name, token_limit, dedup_stats,
+                                           token_counts=token_counts)
+            return analysis, token_counts
+        
+        return BatchProcessingJob(
+            paths,
+            lambda path: self.process_file(path, clean_opts, split_method, delimiter, tokenizer_name,
+                                           deduplicate=deduplicate, max_tokens=token_limit, as_spans=as_spans,
+                                           extract_opts=extract_opts),
+            analyze,
+            on_status=on_status,
+            max_workers=max_workers
+        ).start()
+
+    def summarize_files(self, statuses: List[FileStatus], tokenizer_name: str = 'gpt2',
+                        token_limit: int = 512,
+                        deduplicate: bool = False) -> Tuple[List[FileStatus], Dict[str, Any], Optional[DedupStats]]:
+        """
+        Corpus-wide analysis for a finished batch
+        
+        With deduplicate, chunks repeated across files are removed first (see
+        deduplicate_files) and the remaining chunks are analyzed with the
+        token counts recorded while each file was processed. Otherwise the
+        per-file analyses are combined. Either way no chunk is re-tokenized.
+        Each processed file's final chunks are also fingerprinted (see
+        fingerprint_files). May take a while for large batches, so call it
+        off the Tk thread.
+        
+        Returns:
+            (statuses with the retained chunks, analysis, dedup_stats or None)
+        """
+        if deduplicate:
+            statuses, dedup_stats = deduplicate_files(statuses)
+            statuses = fingerprint_files(statuses)
+            done = [status for status in statuses if status.state == STATUS_DONE]
+            analysis = self.analyze_chunks(
+                concat_chunks([status.chunks for status in done]), tokenizer_name, token_limit, dedup_stats,
+                token_counts=[count for status in done for count in status.token_counts]
+            )
+            aggregate = aggregate_analyses(statuses, token_limit)
+            for key in ('files_processed', 'files_failed', 'duplicates_removed', 'per_file'):
+                analysis[key] = aggregate[key]
+            return statuses, analysis, dedup_stats
+        
+        statuses = fingerprint_files(statuses)
+        analysis = aggregate_analyses(statuses, token_limit)
+        analysis['tokenizer_used'] = tokenizer_name
+        
+        if analysis['advanced_analytics']:
+            analysis['cost_estimates'] = self._calculate_cost_estimates(analysis['total_tokens'], tokenizer_name)
+            analysis['recommendations'] = self._generate_recommendations(
+                analysis, analysis['efficiency_score'] / 100
+            )
+        
+        has_cost_analysis = self.license_manager.check_feature_access('advanced_cost_analysis')
+        analysis['cost_preview'] = self._get_cost_preview(analysis['total_tokens'], tokenizer_name, has_cost_analysis)
+        return statuses, analysis, None
+
     def get_smart_splitting_status(self) -> Dict[str, Any]:
         """Get smart splitting status for UI info display"""
         has_smart_access = self.license_manager.check_feature_access('smart_chunking')
@@ -102,10 +344,17 @@ class ProcessingController:
     # ==================================================================================
 
     def analyze_chunks(self, chunks: List[str], tokenizer_name: str = 'gpt2', 
-                      token_limit: int = 512) -> Dict[str, Any]:
+                      token_limit: int = 512, dedup_stats: Optional[DedupStats] = None,
+                      on_chunk_counted: Optional[Callable[[int, int], None]] = None,
+                      token_counts: Optional[Sequence[int]] = None) -> Dict[str, Any]:
         """
         Enhanced analyze_chunks method with optional cost analysis integration
         Maintains full backward compatibility while adding cost insights for premium users
+        
+        dedup_stats, when given, are reported as duplicate-cluster statistics
+        in the advanced analytics. on_chunk_counted(done, total) is called
+        periodically while tokens are counted. token_counts, when given, are
+        this tokenizer's per-chunk counts and no chunk is re-tokenized.
         """
         if not chunks:
             return {
@@ -122,14 +371,9 @@ class ProcessingController:
         has_advanced_analytics = self.license_manager.check_feature_access('advanced_analytics')
         has_cost_analysis = self.license_manager.check_feature_access('advanced_cost_analysis')
         
-        token_counts = []
-        over_limit_count = 0
-        
-        for chunk in chunks:
-            count, metadata = self.get_token_count(chunk, tokenizer_name)
-            token_counts.append(count)
-            if count > token_limit:
-                over_limit_count += 1
+        if token_counts is None or len(token_counts) != len(chunks):
+            token_counts = self.count_chunk_tokens(chunks, tokenizer_name, on_chunk_counted)
+        over_limit_count = sum(1 for count in token_counts if count > token_limit)
 
         total_tokens = sum(token_counts)
         avg_tokens = total_tokens / len(token_counts) if token_counts else 0
@@ -183,6 +427,9 @@ class ProcessingController:
                 'recommendations': self._generate_recommendations(analysis, efficiency_score),
                 'advanced_analytics': True
             })
+            
+            if dedup_stats is not None:
+                analysis['duplicate_stats'] = dedup_stats.to_dict()
         else:
             analysis.update({
                 'advanced_analytics': False,
@@ -195,9 +442,45 @@ class ProcessingController:
 
         return analysis
 
+    def count_chunk_tokens(self, chunks: List[str], tokenizer_name: str = 'gpt2',
+                           on_chunk_counted: Optional[Callable[[int, int], None]] = None) -> List[int]:
+        """Token count of every chunk, in order"""
+        token_counts = []
+        report_every = max(1, len(chunks) // PROGRESS_UPDATES_PER_STAGE)
+        
+        for index, chunk in enumerate(chunks, 1):
+            count, metadata = self.get_token_count(chunk, tokenizer_name)
+            token_counts.append(count)
+            if on_chunk_counted is not None and index % report_every == 0:
+                on_chunk_counted(index, len(chunks))
+        
+        return token_counts
+
+    def switch_tokenizer(self, chunks: List[str], tokenizer_name: str, store: TokenCountStore,
+                         on_update: Callable[[TokenCountUpdate], None], token_limit: int = 512,
+                         dedup_stats: Optional[DedupStats] = None,
+                         fingerprint: Optional[str] = None) -> TokenizerSwitchJob:
+        """
+        Start providing counts and analysis for a newly selected tokenizer
+        
+        Counts already in store are reused; otherwise on_update receives an
+        estimate first and the exact analysis once every chunk is counted.
+        
+        Returns:
+            The running TokenizerSwitchJob (cancel() it if the tokenizer changes again)
+        """
+        return TokenizerSwitchJob(
+            chunks, tokenizer_name, self.get_token_count,
+            lambda counts: self.analyze_chunks(chunks, tokenizer_name, token_limit, dedup_stats,
+                                               token_counts=counts),
+            store, on_update, fingerprint=fingerprint
+        ).start()
+
     def analyze_chunks_with_costs(self, chunks: List[str], tokenizer_name: str = 'gpt2',
                                  token_limit: int = 512, target_models: Optional[List[str]] = None,
-                                 api_usage_monthly: int = 100000) -> Dict[str, Any]:
+                                 api_usage_monthly: int = 100000,
+                                 on_progress: Optional[Callable[[AnalysisProgress], None]] = None,
+                                 token_counts: Optional[Sequence[int]] = None) -> Dict[str, Any]:
         """
         Enhanced analysis method with comprehensive cost analysis
         
@@ -207,12 +490,24 @@ class ProcessingController:
             token_limit: Token limit per chunk
             target_models: Optional list of target models for cost analysis
             api_usage_monthly: Monthly API usage in tokens for ROI analysis
+            on_progress: Receives AnalysisProgress events (stage, percent
+                complete, ETA) on the calling thread as the work proceeds
+            token_counts: This tokenizer's per-chunk counts, if already known;
+                the chunks are then not re-tokenized
             
         Returns:
             Comprehensive analysis including detailed cost breakdown
         """
+        progress = _ProgressReporter(on_progress)
+        
+        def chunk_counted(done: int, total: int):
+            progress.report(STAGE_TOKENIZING, f"Counting tokens ({done:,}/{total:,} chunks)...",
+                            TOKENIZING_SHARE * done / total)
+        
         # Start with standard analysis
-        analysis = self.analyze_chunks(chunks, tokenizer_name, token_limit)
+        progress.report(STAGE_TOKENIZING, "Counting tokens...", 0.0)
+        analysis = self.analyze_chunks(chunks, tokenizer_name, token_limit, on_chunk_counted=chunk_counted,
+                                       token_counts=token_counts)
         
         # Check if user has access to advanced cost analysis
         if not self.license_manager.check_feature_access('advanced_cost_analysis'):
@@ -221,6 +516,7 @@ class ProcessingController:
                 'upgrade_message': self.license_manager.get_upgrade_message('advanced_cost_analysis'),
                 'preview': self._get_cost_preview(analysis['total_tokens'], tokenizer_name, False)
             }
+            progress.report(STAGE_DONE, "Analysis complete", 100.0)
             return analysis
         
         # Perform comprehensive cost analysis for premium users
@@ -230,16 +526,22 @@ class ProcessingController:
                 'error': 'Cost calculator not available',
                 'basic_estimate': self._get_basic_cost_estimate(analysis['total_tokens'])
             }
+            progress.report(STAGE_DONE, "Analysis complete", 100.0)
             return analysis
         
         try:
+            pricing_freshness = self._sync_live_pricing()
+            
             # Use target models or default recommended models
             if not target_models:
                 target_models = self._get_recommended_models_for_analysis(analysis['total_tokens'])
             
             # Perform cost analysis for each target model
             cost_analyses = {}
-            for model_name in target_models:
+            model_share = COSTING_SHARE / max(len(target_models), 1)
+            for index, model_name in enumerate(target_models):
+                progress.report(STAGE_COSTING, f"Calculating training costs for {model_name}...",
+                                TOKENIZING_SHARE + model_share * index)
                 try:
                     cost_result = self.cost_calculator.calculate_comprehensive_costs(
                         dataset_tokens=analysis['total_tokens'],
@@ -255,12 +557,17 @@ class ProcessingController:
                     }
             
             # Add comprehensive cost analysis to results
+            progress.report(STAGE_SUMMARIZING, "Generating optimization recommendations...",
+                            TOKENIZING_SHARE + COSTING_SHARE)
+            summary = self._generate_cost_summary(cost_analyses)
             analysis['cost_analysis'] = {
                 'available': True,
                 'models_analyzed': list(cost_analyses.keys()),
                 'detailed_results': cost_analyses,
-                'summary': self._generate_cost_summary(cost_analyses),
-                'recommendations': self._generate_cost_recommendations(cost_analyses, analysis)
+                'summary': summary,
+                'recommendations': self._generate_cost_recommendations(cost_analyses, analysis),
+                'pricing_freshness': pricing_freshness,
+                'sensitivity': self._run_roi_sensitivity(summary, cost_analyses, analysis['total_tokens'])
             }
             
         except Exception as e:
@@ -271,8 +578,89 @@ class ProcessingController:
                 'fallback_estimate': self._get_basic_cost_estimate(analysis['total_tokens'])
             }
         
+        progress.report(STAGE_DONE, "Analysis complete", 100.0)
         return analysis
 
+    def _run_roi_sensitivity(self, summary: Dict[str, Any], cost_analyses: Dict[str, Any],
+                             total_tokens: int) -> Optional[Dict[str, Any]]:
+        """
+        Monte Carlo break-even and ROI distribution for the cheapest option
+        
+        Args:
+            summary: Result of _generate_cost_summary
+            cost_analyses: Per-model results of calculate_comprehensive_costs
+            total_tokens: Dataset size in tokens
+            
+        Returns:
+            run_monte_carlo_sensitivity result, or None without a best option
+        """
+        best = summary.get('best_overall')
+        if not best:
+            return None
+        
+        try:
+            model_name = best['model']
+            monthly_savings = cost_analyses[model_name]['roi_analysis']['monthly_savings']
+            
+            # Served from the calculator's estimate cache
+            _, estimates = self.cost_calculator.estimate_approaches(total_tokens, model_name)
+            estimate = next((e for e in estimates if e.approach_name == best['best_approach']), estimates[0])
+            
+            if self._roi_calculator is None:
+                self._roi_calculator = ROICalculator(self._pricing_engine)
+            return self._roi_calculator.run_monte_carlo_for_estimate(estimate, monthly_savings)
+        except Exception as e:
+            logging.warning(f"Sensitivity analysis failed: {e}")
+            return {'error': str(e)}
+
+    def _sync_live_pricing(self) -> Dict[str, Any]:
+        """
+        Merge the shared pricing engine's cached cloud rates into the cost calculator
+        
+        The first call attaches the calculator to the engine, so rates fetched
+        later reach it too. Missing or expired rates are refreshed in the
+        background, never waited for. Only rates that changed are merged, so
+        the estimate memo survives repeated analyses.
+        
+        Returns:
+            How fresh the rates behind the estimates are: source ('live' or
+            'built-in'), live_rates, oldest_rate_timestamp and stale
+        """
+        freshness = {'source': 'built-in', 'live_rates': 0, 'oldest_rate_timestamp': None, 'stale': False}
+        try:
+            if self._pricing_engine is None:
+                self._pricing_engine = get_shared_pricing_engine()
+                self.cost_calculator.attach_pricing_engine(self._pricing_engine)
+            engine = self._pricing_engine
+            
+            current_rates = self.cost_calculator.pricing_data["cloud_hourly_rates"]
+            changed: Dict[GPUType, Dict[str, float]] = {}
+            live_rates = 0
+            timestamps = []
+            for gpu_type in GPUType:
+                cached = engine.get_cached_rates(gpu_type)
+                if len(cached) < len(engine.providers) or any(data.stale for data in cached.values()):
+                    engine.refresh_in_background(gpu_type)
+                
+                for provider, data in cached.items():
+                    if data.spot_price:
+                        continue  # Estimates use on-demand rates
+                    live_rates += 1
+                    if data.timestamp is not None:
+                        timestamps.append(data.timestamp)
+                    freshness['stale'] = freshness['stale'] or data.stale
+                    if current_rates.get(gpu_type, {}).get(provider) != data.hourly_rate:
+                        changed.setdefault(gpu_type, {})[provider] = data.hourly_rate
+            
+            if changed:
+                self.cost_calculator.update_pricing(cloud_hourly_rates=changed)
+            if live_rates:
+                freshness.update(source='live', live_rates=live_rates,
+                                 oldest_rate_timestamp=min(timestamps) if timestamps else None)
+        except Exception as e:
+            logging.warning(f"Live pricing unavailable, using built-in rates: {e}")
+        return freshness
+
     def _get_cost_preview(self, total_tokens: int, tokenizer_name: str, has_full_access: bool) -> Dict[str, Any]:
         """Generate cost preview for all users"""
         if has_full_access and self._cost_calculator_available:
@@ -458,6 +846,70 @@ class ProcessingController:
         metadata['access_denied'] = False
         return count, metadata
 
+    def compare_tokenizers(self, chunks: List[str],
+                           on_progress: Optional[Callable[[TokenizerComparisonResult], None]] = None,
+                           full_corpus: bool = False) -> TokenizerComparisonJob:
+        """
+        Start a background comparison of every accessible tokenizer
+        
+        Args:
+            chunks: Processed corpus chunks
+            on_progress: Called from worker threads with partial results
+            full_corpus: Tokenize every chunk instead of a stratified sample
+            
+        Returns:
+            The running TokenizerComparisonJob (cancel() it when no longer needed)
+        """
+        tokenizers = [
+            info['name'] for info in self.get_available_tokenizers()
+            if info['available'] and info['has_access']
+        ]
+        return TokenizerComparisonJob(
+            chunks, tokenizers, self.get_token_count,
+            on_progress=on_progress, full_corpus=full_corpus
+        ).start()
+
+    def export_cost_report(self, cost_analysis: Dict[str, Any], path: str, fmt: Optional[str] = None,
+                           tokenizer_name: str = 'gpt2', token_limit: int = 512,
+                           source_file: Optional[str] = None,
+                           on_progress: Optional[Callable[[ExportProgress], None]] = None) -> ExportResult:
+        """
+        Write a cost-analysis report without any UI (streams rows to disk)
+        
+        Args:
+            cost_analysis: Result of analyze_chunks_with_costs
+            path: Output file; the format follows its extension unless fmt is given
+            tokenizer_name: Tokenizer named in the report header
+            token_limit: Token limit named in the report header
+            source_file: Source document named in the report header
+            on_progress: Called from the writing thread with ExportProgress events
+            
+        Returns:
+            ExportResult for the written report
+        """
+        options = self._report_options(tokenizer_name, token_limit, source_file)
+        return export_report(cost_analysis, path, fmt, options, on_progress)
+
+    def export_cost_reports(self, jobs: List[Tuple[Dict[str, Any], str]], fmt: Optional[str] = None,
+                            tokenizer_name: str = 'gpt2', token_limit: int = 512,
+                            on_progress: Optional[Callable[[ExportProgress], None]] = None) -> List[ExportResult]:
+        """
+        Batch-export reports for many corpora; jobs are (cost_analysis, path) pairs
+        
+        Failed reports are returned with their error set rather than raised.
+        """
+        options = self._report_options(tokenizer_name, token_limit, None)
+        return export_reports(jobs, fmt, options, on_progress=on_progress)
+
+    def _report_options(self, tokenizer_name: str, token_limit: int, source_file: Optional[str]) -> ReportOptions:
+        license_status = self.get_licensing_info()['license_status']
+        return ReportOptions(
+            tokenizer_name=tokenizer_name,
+            token_limit=token_limit,
+            source_file=source_file,
+            license_info={'tier': license_status['tier'], 'status': license_status['status']}
+        )
+
     def _calculate_cost_estimates(self, total_tokens: int, tokenizer_name: str) -> Dict[str, Any]:
         """Calculate training cost estimates (premium feature)"""
         # Rough cost estimates for popular training services
@@ -0,0 +1,164 @@
+# core/analysis_cache.py
+"""
+Shared, disk-backed cache for cost-analysis results
+
+Results are keyed on the corpus fingerprint maintained by Session plus the
+analysis parameters, so any edit anywhere in the corpus misses the cache.
+One cache is shared by every dialog in the process and persisted to disk,
+so a re-opened dialog or a restarted app reuses earlier results.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+from .user_paths import user_cache_path
+
+# Configuration constants
+ANALYSIS_CACHE_FILE = "analysis_cache.json"  # Inside the per-user cache directory
+ANALYSIS_CACHE_TTL_SECONDS = 3600  # Matches the pricing cache; results embed live rates
+ANALYSIS_CACHE_MAX_ENTRIES = 32
+ANALYSIS_CACHE_VERSION = 1
+
+DEFAULT_CACHE_PATH = object()  # Sentinel: use ANALYSIS_CACHE_FILE in the per-user cache directory
+
+
+def analysis_cache_key(corpus_fingerprint: str,
+                       tokenizer_name: str,
+                       token_limit: int,
+                       target_models: Sequence[str],
+                       api_usage_monthly: int) -> str:
+    """Cache key for one corpus and set of analysis parameters"""
+    params = json.dumps([
+        corpus_fingerprint, tokenizer_name, token_limit, sorted(target_models), api_usage_monthly
+    ])
+    return hashlib.blake2b(params.encode('utf-8'), digest_size=16).hexdigest()
+
+
+class AnalysisResultCache:
+    """
+    LRU cache of analysis results with a TTL, persisted as JSON
+
+    Entries older than ttl_seconds are dropped on lookup. The least recently
+    used entry is evicted beyond max_entries. Writes go to a temporary
+    file that replaces cache_path atomically. cache_path defaults to
+    ANALYSIS_CACHE_FILE in the per-user cache directory, resolved when the
+    cache is created; pass None to keep results in memory only.
+    """
+
+    def __init__(self, cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+                 ttl_seconds: int = ANALYSIS_CACHE_TTL_SECONDS,
+                 max_entries: int = ANALYSIS_CACHE_MAX_ENTRIES):
+        if cache_path is DEFAULT_CACHE_PATH:
+            cache_path = user_cache_path(ANALYSIS_CACHE_FILE)
+        self.cache_path = cache_path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._load()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry['stored_at'] >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry['data']
+
+    def put(self, key: str, data: Dict[str, Any]):
+        """Store a result and persist the cache"""
+        with self._lock:
+            self._entries[key] = {'stored_at': time.time(), 'data': data}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        self.save()
+
+    def clear(self):
+        """Drop every entry, in memory and on disk"""
+        with self._lock:
+            self._entries.clear()
+        self.save()
+
+    def save(self):
+        """Write the cache to cache_path (no-op for in-memory caches)"""
+        if not self.cache_path:
+            return
+
+        # Snapshot under the save lock too, so a later snapshot is never overwritten by an earlier one
+        with self._save_lock:
+            with self._lock:
+                entries = [{'key': key, **entry} for key, entry in self._entries.items()]
+
+            temp_path = None
+            try:
+                directory = os.path.dirname(os.path.abspath(self.cache_path))
+                os.makedirs(directory, exist_ok=True)
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, delete=False,
+                                                 prefix=os.path.basename(self.cache_path),
+                                                 suffix='.tmp') as f:
+                    temp_path = f.name
+                    json.dump({'version': ANALYSIS_CACHE_VERSION, 'entries': entries}, f)
+                os.replace(temp_path, self.cache_path)
+            except (OSError, TypeError, ValueError) as e:
+                logging.warning(f"Could not persist analysis cache: {e}")
+                if temp_path and os.path.exists(temp_path):
+                    os.remove(temp_path)
+
+    def _load(self):
+        """Load persisted entries that have not expired"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            if payload.get('version') != ANALYSIS_CACHE_VERSION:
+                return
+
+            now = time.time()
+            for entry in payload.get('entries', []):
+                if now - entry['stored_at'] < self.ttl_seconds:
+                    self._entries[entry['key']] = {'stored_at': entry['stored_at'], 'data': entry['data']}
+
+            logging.info(f"Loaded {len(self._entries)} cached analysis results")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable analysis cache {self.cache_path}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'persistent': bool(self.cache_path)
+            }
+
+
+def get_analysis_cache() -> AnalysisResultCache:
+    """Process-wide analysis result cache"""
+    if not hasattr(get_analysis_cache, '_instance'):
+        get_analysis_cache._instance = AnalysisResultCache()
+    return get_analysis_cache._instance
+
+
+__all__ = [
+    'AnalysisResultCache',
+    'analysis_cache_key',
+    'get_analysis_cache',
+    'ANALYSIS_CACHE_FILE',
+    'ANALYSIS_CACHE_TTL_SECONDS'
+]
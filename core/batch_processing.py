@@ -0,0 +1,308 @@
+# core/batch_processing.py
+"""
+Concurrent processing of a queue of files into one dataset
+
+Each queued file is extracted, cleaned, split and analyzed on a worker
+from a small pool, and reports its status as it moves through the queue.
+Per-file analyses are then combined into corpus-wide figures without
+re-tokenizing any chunk; deduplicate_files removes chunks repeated across
+files before they are combined.
+
+Status callbacks are invoked from worker threads; UI code should hand
+them to the Tk thread (e.g. through a queue polled with after()).
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from processing.chunk_spans import SpanChunks, concat_chunks
+from processing.dedup import ChunkDeduplicator, DedupStats
+from processing.extract import is_supported_format
+from session import CorpusFingerprint
+
+# Configuration constants
+MAX_BATCH_WORKERS = 4  # Extraction is mostly I/O and C parsers, so a few threads overlap well
+
+STATUS_QUEUED = 'queued'
+STATUS_PROCESSING = 'processing'
+STATUS_DONE = 'done'
+STATUS_FAILED = 'failed'
+STATUS_CANCELLED = 'cancelled'
+
+
+@dataclass
+class FileStatus:
+    """Where one queued file is in the pipeline, and its results once done"""
+    path: str
+    state: str = STATUS_QUEUED
+    chunks: Sequence[str] = field(default_factory=list, repr=False)
+    token_counts: Sequence[int] = field(default_factory=list, repr=False)  # One per chunk
+    analysis: Dict[str, Any] = field(default_factory=dict, repr=False)
+    fingerprint: Optional[CorpusFingerprint] = field(default=None, repr=False)  # Set by fingerprint_files
+    duplicates_removed: int = 0
+    elapsed_seconds: float = 0.0
+    error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        return os.path.basename(self.path)
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED)
+
+
+def expand_paths(paths: Iterable[str]) -> Tuple[List[str], List[str]]:
+    """
+    Expand dropped files and folders into the files that can be processed
+
+    Folders are walked recursively in name order. Duplicates are dropped,
+    keeping the first occurrence.
+
+    Returns:
+        (supported files, skipped paths)
+    """
+    supported, skipped, seen = [], [], set()
+
+    def consider(path):
+        key = os.path.normcase(os.path.abspath(path))
+        if key in seen:
+            return
+        seen.add(key)
+        if os.path.isfile(path) and is_supported_format(path):
+            supported.append(path)
+        else:
+            skipped.append(path)
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    consider(os.path.join(root, name))
+        else:
+            consider(path)
+
+    return supported, skipped
+
+
+def deduplicate_files(statuses: Iterable[FileStatus],
+                      deduplicator: Optional[ChunkDeduplicator] = None) -> Tuple[List[FileStatus], DedupStats]:
+    """
+    Remove duplicate chunks across every processed file
+
+    One deduplicator sees the files in queue order, so a chunk repeated in
+    a later file (or later in the same file) is dropped and the first
+    occurrence kept. Each file's token counts are filtered with its chunks.
+
+    Returns:
+        (copies of the statuses with only retained chunks, duplicate statistics)
+    """
+    deduplicator = deduplicator or ChunkDeduplicator()
+    result = []
+    for status in statuses:
+        if status.state != STATUS_DONE:
+            result.append(status)
+            continue
+
+        kept = [index for index, chunk in enumerate(status.chunks) if not deduplicator.is_duplicate(chunk)]
+        if isinstance(status.chunks, SpanChunks):
+            chunks = status.chunks.select(kept)
+        else:
+            chunks = [status.chunks[index] for index in kept]
+        counts = status.token_counts
+        result.append(replace(
+            status,
+            chunks=chunks,
+            token_counts=[counts[index] for index in kept] if len(counts) == len(status.chunks) else [],
+            duplicates_removed=status.duplicates_removed + len(status.chunks) - len(kept)
+        ))
+
+    return result, deduplicator.finalize_stats()
+
+
+def fingerprint_files(statuses: Iterable[FileStatus]) -> List[FileStatus]:
+    """
+    Attach a corpus fingerprint of its final chunks to each processed file
+
+    Hashing every chunk takes a while for large batches, so call this off
+    the Tk thread; the session then takes the fingerprints over as they are.
+
+    Returns:
+        Copies of the processed statuses with fingerprint set; others unchanged
+    """
+    return [
+        replace(status, fingerprint=CorpusFingerprint(status.chunks)) if status.state == STATUS_DONE else status
+        for status in statuses
+    ]
+
+
+def aggregate_analyses(statuses: Iterable[FileStatus], token_limit: int) -> Dict[str, Any]:
+    """
+    Combine per-file chunk analyses into figures for the whole dataset
+
+    Counts and token distributions are summed, and the efficiency score is
+    weighted by chunk count, so the result matches analyzing the combined
+    chunks in one pass.
+    """
+    statuses = list(statuses)
+    done = [s for s in statuses if s.state == STATUS_DONE and s.analysis.get('total_chunks')]
+
+    total_chunks = sum(s.analysis['total_chunks'] for s in done)
+    total_tokens = sum(s.analysis['total_tokens'] for s in done)
+    over_limit = sum(s.analysis.get('over_limit', 0) for s in done)
+
+    aggregate = {
+        'total_chunks': total_chunks,
+        'total_tokens': total_tokens,
+        'avg_tokens': round(total_tokens / total_chunks, 1) if total_chunks else 0,
+        'min_tokens': min((s.analysis['min_tokens'] for s in done), default=0),
+        'max_tokens': max((s.analysis['max_tokens'] for s in done), default=0),
+        'over_limit': over_limit,
+        'over_limit_percentage': round(over_limit / total_chunks * 100, 1) if total_chunks else 0,
+        'token_limit': token_limit,
+        'files_processed': sum(1 for s in statuses if s.state == STATUS_DONE),
+        'files_failed': sum(1 for s in statuses if s.state == STATUS_FAILED),
+        'duplicates_removed': sum(s.duplicates_removed for s in statuses),
+        'per_file': [
+            {
+                'path': s.path,
+                'state': s.state,
+                'total_chunks': s.analysis.get('total_chunks', 0),
+                'total_tokens': s.analysis.get('total_tokens', 0),
+                'elapsed_seconds': s.elapsed_seconds,
+                'error': s.error
+            } for s in statuses
+        ]
+    }
+
+    if done and all(s.analysis.get('advanced_analytics') for s in done):
+        distribution: Dict[str, int] = {}
+        for s in done:
+            for bucket, count in s.analysis.get('token_distribution', {}).items():
+                distribution[bucket] = distribution.get(bucket, 0) + count
+        efficiency = sum(s.analysis['efficiency_score'] * s.analysis['total_chunks'] for s in done)
+        aggregate.update({
+            'efficiency_score': round(efficiency / total_chunks, 1),
+            'token_distribution': distribution,
+            'advanced_analytics': True
+        })
+    else:
+        aggregate['advanced_analytics'] = False
+
+    return aggregate
+
+
+class BatchProcessingJob:
+    """
+    Process queued files on a worker pool
+
+    process_file(path) -> (chunks, dedup_stats) and analyze(chunks, dedup_stats)
+    -> (analysis, token_counts) are typically built from ProcessingController
+    methods. on_status receives a copy of a file's FileStatus each time its
+    state changes.
+    """
+
+    def __init__(self,
+                 paths: Iterable[str],
+                 process_file: Callable[[str], tuple],
+                 analyze: Callable[[List[str], Any], Tuple[Dict[str, Any], Sequence[int]]],
+                 on_status: Optional[Callable[[FileStatus], None]] = None,
+                 max_workers: int = MAX_BATCH_WORKERS):
+        self.statuses: List[FileStatus] = [FileStatus(path) for path in paths]
+        self.max_workers = max(1, max_workers)
+        self._process_file = process_file
+        self._analyze = analyze
+        self._on_status = on_status
+        self._cancelled = threading.Event()
+        self._lock = threading.Lock()
+        self._futures = []
+
+    def start(self) -> "BatchProcessingJob":
+        workers = max(1, min(self.max_workers, len(self.statuses)))
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wolfscribe-batch")
+        self._futures = [executor.submit(self._run_file, status) for status in self.statuses]
+        executor.shutdown(wait=False)
+        logging.info(f"Batch processing started: {len(self.statuses)} files on {workers} workers")
+        return self
+
+    def cancel(self):
+        """Skip every file that has not started yet"""
+        self._cancelled.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every file has finished; True if they all did"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in self._futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                future.result(timeout=remaining)
+            except Exception:
+                return False
+        return True
+
+    @property
+    def done(self) -> bool:
+        return all(future.done() for future in self._futures)
+
+    def successful_chunks(self) -> Sequence[str]:
+        """Chunks of every processed file, in queue order"""
+        with self._lock:
+            return concat_chunks([status.chunks for status in self.statuses if status.state == STATUS_DONE])
+
+    def _run_file(self, status: FileStatus):
+        if self._cancelled.is_set():
+            self._update(status, state=STATUS_CANCELLED)
+            return
+
+        started = time.perf_counter()
+        self._update(status, state=STATUS_PROCESSING)
+        try:
+            chunks, dedup_stats = self._process_file(status.path)
+            analysis, token_counts = self._analyze(chunks, dedup_stats)
+        except Exception as e:
+            logging.error(f"Batch processing failed for {status.path}: {e}")
+            self._update(status, state=STATUS_FAILED, error=str(e),
+                         elapsed_seconds=round(time.perf_counter() - started, 3))
+            return
+
+        self._update(
+            status,
+            state=STATUS_DONE,
+            chunks=chunks,
+            token_counts=token_counts,
+            analysis=analysis,
+            duplicates_removed=dedup_stats.duplicates_removed if dedup_stats else 0,
+            elapsed_seconds=round(time.perf_counter() - started, 3)
+        )
+
+    def _update(self, status: FileStatus, **changes):
+        with self._lock:
+            for name, value in changes.items():
+                setattr(status, name, value)
+            snapshot = FileStatus(**vars(status))
+        if self._on_status is not None:
+            try:
+                self._on_status(snapshot)
+            except Exception as e:
+                logging.warning(f"Batch status callback failed: {e}")
+
+
+__all__ = [
+    'BatchProcessingJob',
+    'FileStatus',
+    'aggregate_analyses',
+    'deduplicate_files',
+    'fingerprint_files',
+    'expand_paths',
+    'STATUS_QUEUED',
+    'STATUS_PROCESSING',
+    'STATUS_DONE',
+    'STATUS_FAILED',
+    'STATUS_CANCELLED'
+]
@@ -0,0 +1,151 @@
+# core/catalogue_store.py
+"""
+Versioned data catalogues for models, tokenizers, GPUs and fallback pricing
+
+The catalogues live in core/data/catalogues.json so they can be updated
+without a code release. Parsing happens once per process: the first load
+writes a marshal snapshot next to the data file, keyed by a hash of the
+JSON bytes, and later starts read the snapshot instead of re-parsing. A
+changed data file no longer matches the hash and is parsed again.
+
+Set WOLFSCRIBE_CATALOGUE to point at an alternative data file.
+"""
+
+import hashlib
+import json
+import logging
+import marshal
+import os
+import threading
+from typing import Any, Dict, Optional
+
+# Configuration constants
+CATALOGUE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "catalogues.json")
+CATALOGUE_OVERRIDE_ENV = "WOLFSCRIBE_CATALOGUE"
+CATALOGUE_VERSION = 1  # Data file format this code understands
+SNAPSHOT_SUFFIX = ".snapshot"
+SNAPSHOT_FORMAT = 1  # Bump when the snapshot layout changes
+REQUIRED_SECTIONS = ("models", "tokenizers", "gpus", "pricing")
+
+_cache: Dict[str, Dict[str, Any]] = {}
+_cache_lock = threading.Lock()
+
+
+def catalogue_path() -> str:
+    """Data file in use (the override from the environment, if set)"""
+    return os.environ.get(CATALOGUE_OVERRIDE_ENV) or CATALOGUE_FILE
+
+
+def load_catalogues(path: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load all catalogues, once per process and path
+
+    The returned structure is shared; callers that need to modify a
+    section must copy it first.
+
+    Args:
+        path: Data file to load (defaults to catalogue_path())
+
+    Returns:
+        Dict[str, Any]: Parsed catalogue data keyed by section
+
+    Raises:
+        RuntimeError: If the data file is missing, unreadable or of an
+            unsupported version
+    """
+    path = os.path.abspath(path or catalogue_path())
+
+    with _cache_lock:
+        data = _cache.get(path)
+        if data is None:
+            data = _read_catalogues(path)
+            _cache[path] = data
+        return data
+
+
+def get_catalogue(section: str, path: Optional[str] = None) -> Any:
+    """Return one catalogue section ('models', 'tokenizers', 'gpus' or 'pricing')"""
+    return load_catalogues(path)[section]
+
+
+def clear_catalogue_cache():
+    """Forget loaded catalogues so the next load re-reads the data file"""
+    with _cache_lock:
+        _cache.clear()
+
+
+def _read_catalogues(path: str) -> Dict[str, Any]:
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError as e:
+        raise RuntimeError(f"Cannot read catalogue file {path}: {e}")
+
+    source_hash = hashlib.blake2b(raw, digest_size=16).hexdigest()
+    snapshot_path = path + SNAPSHOT_SUFFIX
+
+    data = _read_snapshot(snapshot_path, source_hash)
+    if data is not None:
+        return data
+
+    try:
+        data = json.loads(raw.decode('utf-8'))
+    except ValueError as e:
+        raise RuntimeError(f"Invalid catalogue file {path}: {e}")
+
+    _validate(data, path)
+    _write_snapshot(snapshot_path, source_hash, data)
+    logging.info(f"Parsed catalogues from {path} (version {data['version']})")
+    return data
+
+
+def _validate(data: Any, path: str):
+    if not isinstance(data, dict):
+        raise RuntimeError(f"Invalid catalogue file {path}: expected a JSON object")
+
+    version = data.get('version')
+    if version != CATALOGUE_VERSION:
+        raise RuntimeError(
+            f"Unsupported catalogue version {version!r} in {path} (expected {CATALOGUE_VERSION})"
+        )
+
+    missing = [section for section in REQUIRED_SECTIONS if section not in data]
+    if missing:
+        raise RuntimeError(f"Catalogue file {path} is missing sections: {', '.join(missing)}")
+
+
+def _read_snapshot(snapshot_path: str, source_hash: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(snapshot_path, 'rb') as f:
+            snapshot_format, snapshot_hash, data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+
+    if snapshot_format != SNAPSHOT_FORMAT or snapshot_hash != source_hash:
+        return None
+    return data
+
+
+def _write_snapshot(snapshot_path: str, source_hash: str, data: Dict[str, Any]):
+    temp_path = f"{snapshot_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            marshal.dump((SNAPSHOT_FORMAT, source_hash, data), f)
+        os.replace(temp_path, snapshot_path)
+    except (OSError, ValueError) as e:
+        # Read-only installs still work, they just parse the JSON each start
+        logging.debug(f"Could not write catalogue snapshot {snapshot_path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+
+
+__all__ = [
+    'load_catalogues',
+    'get_catalogue',
+    'catalogue_path',
+    'clear_catalogue_cache',
+    'CATALOGUE_FILE',
+    'CATALOGUE_VERSION'
+]
@@ -6,13 +6,25 @@ Calculates training costs across multiple approaches and provides ROI analysis
 
 import logging
 import math
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple, Sequence
+from dataclasses import dataclass, replace
 from enum import Enum
 import time
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+from .catalogue_store import get_catalogue
 from .model_database import ModelParameterDatabase, ModelInfo, TrainingFeasibility, get_model_database
 
+# Configuration constants
+COST_CACHE_MAX_ENTRIES = 512  # Memoized per-approach estimates kept per calculator
+
 class TrainingApproach(Enum):
     LOCAL_FULL = "local_full"
     LOCAL_LORA = "local_lora"
@@ -67,6 +79,70 @@ class ROIAnalysis:
     recommendation: str
     confidence: float
 
+@dataclass
+class CostGrid:
+    """
+    Cost estimates over a (dataset size x model x approach x GPU) grid
+    
+    Per-run arrays have shape (D, M, A, G); hardware arrays that do not
+    depend on dataset size have shape (M, A, G). Combinations that cannot be
+    priced (no cloud rate, no API pricing) hold NaN.
+    """
+    dataset_tokens: Any  # np.ndarray (D,)
+    models: List[str]
+    approaches: List[TrainingApproach]
+    gpu_labels: Any  # np.ndarray (M, A, G) of GPU type values, 'managed' for API
+    gpu_count: Any  # np.ndarray (M, A, G)
+    memory_required_gb: Any  # np.ndarray (M, A)
+    training_hours: Any
+    gpu_hours: Any
+    electricity_cost: Any
+    depreciation_cost: Any
+    compute_cost: Any
+    overhead_cost: Any
+    api_cost: Any
+    total_cost: Any
+    
+    @property
+    def shape(self) -> Tuple[int, int, int, int]:
+        return self.total_cost.shape
+    
+    def cheapest_per_dataset(self) -> List[Optional[Dict[str, Any]]]:
+        """Lowest-cost configuration for each dataset size (None if nothing is priced)"""
+        flat = self.total_cost.reshape(self.shape[0], -1)
+        results = []
+        for d in range(self.shape[0]):
+            row = flat[d]
+            if np.isnan(row).all():
+                results.append(None)
+                continue
+            index = np.unravel_index(int(np.nanargmin(row)), self.shape[1:])
+            results.append(self._record((d,) + index))
+        return results
+    
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Flatten the priced cells into dictionaries for tables and dashboards"""
+        return [self._record(tuple(index)) for index in np.argwhere(~np.isnan(self.total_cost))]
+    
+    def _record(self, index: Tuple[int, int, int, int]) -> Dict[str, Any]:
+        d, m, a, g = (int(i) for i in index)
+        return {
+            "dataset_tokens": int(self.dataset_tokens[d]),
+            "model": self.models[m],
+            "approach": self.approaches[a].value,
+            "gpu_type": str(self.gpu_labels[m, a, g]),
+            "gpu_count": int(self.gpu_count[m, a, g]),
+            "memory_required_gb": float(self.memory_required_gb[m, a]),
+            "training_hours": float(self.training_hours[index]),
+            "gpu_hours": float(self.gpu_hours[index]),
+            "electricity_cost": float(self.electricity_cost[index]),
+            "depreciation_cost": float(self.depreciation_cost[index]),
+            "compute_cost": float(self.compute_cost[index]),
+            "overhead_cost": float(self.overhead_cost[index]),
+            "api_cost": float(self.api_cost[index]),
+            "total_cost_usd": float(self.total_cost[index]),
+        }
+
 class EnhancedCostCalculator:
     """Comprehensive AI training cost calculator with multiple approaches"""
     
@@ -74,72 +150,39 @@ class EnhancedCostCalculator:
         self.model_db = get_model_database()
         self.gpu_configs = self._initialize_gpu_configs()
         self.pricing_data = self._initialize_pricing_data()
+        
+        # Memoized estimates, keyed on (model, approach, dataset tokens, pricing version).
+        # Bumping pricing_version makes every older entry unreachable.
+        self.pricing_version = 0
+        self._cost_cache: "OrderedDict[Tuple[str, TrainingApproach, int, int], CostEstimate]" = OrderedDict()
+        self._gpu_selection_cache: Dict[Tuple[str, TrainingApproach, bool], Tuple[GPUConfig, int]] = {}
+        self._cache_lock = threading.Lock()
+        self._cache_hits = 0
+        self._cache_misses = 0
+        
         logging.info("Enhanced Cost Calculator initialized")
     
     def _initialize_gpu_configs(self) -> Dict[GPUType, GPUConfig]:
-        """Initialize GPU configuration database"""
+        """Initialize GPU configuration database from the 'gpus' data catalogue"""
         return {
-            GPUType.RTX_3090: GPUConfig(
-                gpu_type=GPUType.RTX_3090,
-                memory_gb=24,
-                compute_tflops=35.6,  # Tensor performance
-                power_watts=350,
-                market_price_usd=1200
-            ),
-            GPUType.RTX_4090: GPUConfig(
-                gpu_type=GPUType.RTX_4090,
-                memory_gb=24,
-                compute_tflops=83.0,  # Tensor performance
-                power_watts=450,
-                market_price_usd=1600
-            ),
-            GPUType.A100: GPUConfig(
-                gpu_type=GPUType.A100,
-                memory_gb=80,  # A100 80GB variant
-                compute_tflops=312.0,  # Tensor performance
-                power_watts=400,
-                market_price_usd=15000
-            ),
-            GPUType.H100: GPUConfig(
-                gpu_type=GPUType.H100,
-                memory_gb=80,
-                compute_tflops=989.0,  # Tensor performance
-                power_watts=700,
-                market_price_usd=30000
-            ),
-            GPUType.V100: GPUConfig(
-                gpu_type=GPUType.V100,
-                memory_gb=32,
-                compute_tflops=125.0,  # Tensor performance
-                power_watts=300,
-                market_price_usd=8000
-            )
+            GPUType(gpu): GPUConfig(gpu_type=GPUType(gpu), **spec)
+            for gpu, spec in get_catalogue('gpus').items()
         }
     
     def _initialize_pricing_data(self) -> Dict[str, Any]:
-        """Initialize fallback pricing data"""
+        """Initialize fallback pricing data from the 'pricing' data catalogue"""
+        pricing = get_catalogue('pricing')
+        # Copied, since update_pricing() modifies this calculator's rates in place
         return {
             # Cloud provider hourly rates (USD/hour)
             "cloud_hourly_rates": {
-                GPUType.RTX_3090: {"vast_ai": 0.25, "runpod": 0.30},
-                GPUType.RTX_4090: {"vast_ai": 0.40, "lambda_labs": 0.50, "runpod": 0.45},
-                GPUType.A100: {"lambda_labs": 1.10, "vast_ai": 0.90, "runpod": 1.00},
-                GPUType.H100: {"lambda_labs": 2.50, "runpod": 2.20},
-                GPUType.V100: {"vast_ai": 0.35, "runpod": 0.40}
+                GPUType(gpu): dict(rates) for gpu, rates in pricing['cloud_hourly_rates'].items()
             },
             # Local electricity rates by region (USD/kWh)
-            "electricity_rates": {
-                "us_average": 0.12,
-                "us_california": 0.25,
-                "us_texas": 0.09,
-                "eu_average": 0.20,
-                "asia_average": 0.08
-            },
+            "electricity_rates": dict(pricing['electricity_rates']),
             # API fine-tuning costs (USD per 1K tokens)
             "api_finetuning_costs": {
-                "openai_gpt35": {"training": 0.008, "usage": 0.012},
-                "openai_gpt4": {"training": 0.03, "usage": 0.06},
-                "anthropic_claude": {"training": 0.025, "usage": 0.045}
+                api: dict(costs) for api, costs in pricing['api_finetuning_costs'].items()
             }
         }
     
@@ -161,6 +204,44 @@ class EnhancedCostCalculator:
             Comprehensive cost analysis with estimates and ROI
         """
         
+        model_info, cost_estimates = self.estimate_approaches(dataset_tokens, target_model, approaches)
+        
+        # Generate ROI analysis
+        roi_analysis = self._generate_roi_analysis(
+            cost_estimates, model_info, api_usage_monthly
+        )
+        
+        # Generate optimization recommendations
+        recommendations = self._generate_optimization_recommendations(
+            cost_estimates, model_info, dataset_tokens
+        )
+        
+        summary = self.describe_estimates(model_info, dataset_tokens, cost_estimates)
+        return {
+            "model_info": summary["model_info"],
+            "dataset_info": summary["dataset_info"],
+            "cost_estimates": summary["cost_estimates"],
+            "roi_analysis": self._roi_analysis_to_dict(roi_analysis),
+            "recommendations": recommendations,
+            "calculation_metadata": summary["calculation_metadata"]
+        }
+    
+    def estimate_approaches(self,
+                            dataset_tokens: int,
+                            target_model: str = "llama-2-7b",
+                            approaches: Optional[List[TrainingApproach]] = None) -> Tuple[ModelInfo, List[CostEstimate]]:
+        """
+        Calculate typed cost estimates for each approach, cheapest first
+        
+        Args:
+            dataset_tokens: Size of training dataset in tokens
+            target_model: Model to train (from model database)
+            approaches: List of training approaches to evaluate
+            
+        Returns:
+            Tuple[ModelInfo, List[CostEstimate]]: Model and its estimates
+        """
+        
         # Get model information
         model_info = self.model_db.get_model_info(target_model)
         if not model_info:
@@ -181,17 +262,14 @@ class EnhancedCostCalculator:
         
         # Sort by total cost
         cost_estimates.sort(key=lambda x: x.total_cost_usd)
-        
-        # Generate ROI analysis
-        roi_analysis = self._generate_roi_analysis(
-            cost_estimates, model_info, api_usage_monthly
-        )
-        
-        # Generate optimization recommendations
-        recommendations = self._generate_optimization_recommendations(
-            cost_estimates, model_info, dataset_tokens
-        )
-        
+        return model_info, cost_estimates
+    
+    def describe_estimates(self,
+                           model_info: ModelInfo,
+                           dataset_tokens: int,
+                           cost_estimates: List[CostEstimate]) -> Dict[str, Any]:
+        """Serialize model, dataset and cost estimates for reports and the UI"""
+        optimal_tokens = self.model_db.estimate_chinchilla_tokens(model_info.parameters)
         return {
             "model_info": {
                 "name": model_info.name,
@@ -201,12 +279,10 @@ class EnhancedCostCalculator:
             },
             "dataset_info": {
                 "tokens": dataset_tokens,
-                "optimal_tokens": self.model_db.estimate_chinchilla_tokens(model_info.parameters),
-                "tokens_ratio": dataset_tokens / self.model_db.estimate_chinchilla_tokens(model_info.parameters)
+                "optimal_tokens": optimal_tokens,
+                "tokens_ratio": dataset_tokens / optimal_tokens
             },
             "cost_estimates": [self._cost_estimate_to_dict(est) for est in cost_estimates],
-            "roi_analysis": self._roi_analysis_to_dict(roi_analysis),
-            "recommendations": recommendations,
             "calculation_metadata": {
                 "timestamp": time.time(),
                 "calculator_version": "1.0",
@@ -214,6 +290,189 @@ class EnhancedCostCalculator:
             }
         }
     
+    def calculate_cost_grid(self,
+                            dataset_tokens: Sequence[int],
+                            models: Sequence[str],
+                            approaches: Optional[Sequence[TrainingApproach]] = None,
+                            gpu_types: Optional[Sequence[GPUType]] = None,
+                            electricity_region: str = "us_average") -> CostGrid:
+        """
+        Evaluate every (dataset size, model, approach, GPU) combination at once
+        
+        Uses the same formulas as calculate_comprehensive_costs, but computes
+        training hours, memory, electricity, depreciation and cloud/API costs
+        as NumPy broadcasts instead of one CostEstimate per combination.
+        
+        Args:
+            dataset_tokens: Dataset sizes in tokens
+            models: Model names (from model database)
+            approaches: Training approaches (default: all)
+            gpu_types: GPU types to compare. If None, each (model, approach)
+                uses the calculator's own GPU selection, as in
+                calculate_comprehensive_costs, giving a GPU axis of length 1.
+            electricity_region: Key into the electricity rate table
+            
+        Returns:
+            CostGrid with arrays of shape (len(dataset_tokens), len(models),
+            len(approaches), len(gpu_types) or 1)
+            
+        Raises:
+            RuntimeError: If NumPy is not installed
+            ValueError: If a model is not in the database
+        """
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("calculate_cost_grid requires numpy (pip install numpy)")
+        
+        approaches = list(approaches) if approaches is not None else list(TrainingApproach)
+        model_infos = []
+        for name in models:
+            info = self.model_db.get_model_info(name)
+            if not info:
+                raise ValueError(f"Model '{name}' not found in database")
+            model_infos.append(info)
+        
+        tokens = np.asarray(dataset_tokens, dtype=np.float64)
+        
+        # Per-model columns (M,)
+        params = np.array([m.parameters for m in model_infos], dtype=np.float64)
+        base_memory = np.array([m.gpu_memory_required for m in model_infos], dtype=np.float64)
+        training_multiplier = np.array([m.training_memory_multiplier for m in model_infos], dtype=np.float64)
+        api_rate = np.array([self._api_training_rate(m) for m in model_infos], dtype=np.float64)
+        
+        # Per-approach columns (A,)
+        is_local = np.array([a.value.startswith("local_") for a in approaches])
+        is_cloud = np.array([a.value.startswith("cloud_") for a in approaches])
+        is_api = np.array([a == TrainingApproach.API_FINETUNING for a in approaches])
+        lora_like = np.array([a in (TrainingApproach.LOCAL_LORA, TrainingApproach.CLOUD_LORA) for a in approaches])
+        qlora = np.array([a == TrainingApproach.LOCAL_QLORA for a in approaches])
+        compute_factor = np.where(lora_like, 0.5, np.where(qlora, 0.6, 1.0))
+        
+        # Memory requirements (M, A), mirroring _calculate_memory_requirements
+        memory_multiplier = np.where(
+            lora_like[None, :], 1.5,
+            np.where(qlora[None, :], 0.7, training_multiplier[:, None])
+        )
+        memory_required = base_memory[:, None] * memory_multiplier
+        
+        # Hardware columns (M, A, G)
+        if gpu_types is None:
+            hardware = [
+                [self._grid_gpu_selection(info, approach) for approach in approaches]
+                for info in model_infos
+            ]
+            gpu_configs = np.array([[[cell[0]] for cell in row] for row in hardware], dtype=object)
+            gpu_count = np.array([[[cell[1]] for cell in row] for row in hardware], dtype=np.float64)
+        else:
+            configs = [self.gpu_configs[g] for g in gpu_types]
+            gpu_configs = np.empty((len(model_infos), len(approaches), len(configs)), dtype=object)
+            for g, config in enumerate(configs):
+                gpu_configs[:, :, g] = config
+            gpu_memory = np.array([c.memory_gb for c in configs], dtype=np.float64)
+            gpu_count = np.maximum(1.0, np.ceil(memory_required[:, :, None] / gpu_memory))
+        
+        tflops = self._gpu_attribute(gpu_configs, lambda c: c.compute_tflops)
+        power = self._gpu_attribute(gpu_configs, lambda c: c.power_watts)
+        price = self._gpu_attribute(gpu_configs, lambda c: c.market_price_usd or 0.0)
+        cloud_rate = self._gpu_attribute(gpu_configs, self._average_cloud_rate)
+        
+        api_cell = is_api[None, :, None]
+        gpu_count = np.where(api_cell, 0.0, gpu_count)
+        gpu_labels = np.where(
+            api_cell, "managed",
+            np.vectorize(lambda c: c.gpu_type.value if c is not None else "managed", otypes=[object])(gpu_configs)
+        )
+        
+        # Training time (D, M, A, G), mirroring _calculate_training_time
+        compute_budget = 6 * tokens[:, None, None, None] * params[None, :, None, None] * compute_factor[None, None, :, None]
+        effective_flops = (tflops * np.maximum(gpu_count, 1.0) * 1e12 * 0.4)[None]
+        training_hours = np.maximum(compute_budget / effective_flops / 3600, 0.5)
+        training_hours = np.where(api_cell[None], 24.0, training_hours)
+        gpu_hours = training_hours * gpu_count[None]
+        
+        # Local costs
+        local_cell = is_local[None, None, :, None]
+        electricity_rate = self.pricing_data["electricity_rates"][electricity_region]
+        electricity_cost = np.where(local_cell, power * 1.3 * gpu_hours / 1000 * electricity_rate, 0.0)
+        depreciation_cost = np.where(local_cell, price * 0.8 / 3 / (365 * 24) * gpu_hours, 0.0)
+        
+        # Cloud costs (15% overhead)
+        cloud_cell = is_cloud[None, None, :, None]
+        compute_cost = np.where(cloud_cell, cloud_rate * gpu_hours, 0.0)
+        overhead_cost = compute_cost * 0.15
+        
+        # API costs
+        api_cost = np.where(
+            api_cell[None],
+            (tokens / 1000)[:, None, None, None] * api_rate[None, :, None, None],
+            0.0
+        )
+        
+        total_cost = np.where(
+            local_cell, electricity_cost + depreciation_cost,
+            np.where(cloud_cell, compute_cost + overhead_cost, api_cost)
+        )
+        
+        # Give every per-run array the full (D, M, A, G) shape
+        (training_hours, gpu_hours, electricity_cost, depreciation_cost,
+         compute_cost, overhead_cost, api_cost, total_cost) = (
+            np.array(a) for a in np.broadcast_arrays(
+                training_hours, gpu_hours, electricity_cost, depreciation_cost,
+                compute_cost, overhead_cost, api_cost, total_cost
+            )
+        )
+        
+        return CostGrid(
+            dataset_tokens=tokens.astype(np.int64),
+            models=list(models),
+            approaches=approaches,
+            gpu_labels=gpu_labels,
+            gpu_count=gpu_count.astype(np.int64),
+            memory_required_gb=memory_required,
+            training_hours=training_hours,
+            gpu_hours=gpu_hours,
+            electricity_cost=electricity_cost,
+            depreciation_cost=depreciation_cost,
+            compute_cost=compute_cost,
+            overhead_cost=overhead_cost,
+            api_cost=api_cost,
+            total_cost=total_cost
+        )
+    
+    def _grid_gpu_selection(self, model_info: ModelInfo, approach: TrainingApproach) -> Tuple[Optional[GPUConfig], int]:
+        """GPU choice for the grid's automatic mode (None for managed API training)"""
+        if approach == TrainingApproach.API_FINETUNING:
+            return None, 0
+        return self._select_optimal_gpu_config(model_info, approach, cloud=approach.value.startswith("cloud_"))
+    
+    def _gpu_attribute(self, gpu_configs, getter) -> "np.ndarray":
+        """Map a GPUConfig attribute over an object array of configs (NaN for None)"""
+        return np.vectorize(
+            lambda c: float(getter(c)) if c is not None else np.nan, otypes=[np.float64]
+        )(gpu_configs)
+    
+    def _average_cloud_rate(self, gpu_config: GPUConfig) -> float:
+        """Average hourly rate across providers, NaN if the GPU has no cloud pricing"""
+        hourly_rates = self.pricing_data["cloud_hourly_rates"].get(gpu_config.gpu_type, {})
+        if not hourly_rates:
+            return float('nan')
+        return sum(hourly_rates.values()) / len(hourly_rates)
+    
+    def _api_training_rate(self, model_info: ModelInfo) -> float:
+        """API fine-tuning cost per 1K tokens, NaN if the model has no API pricing"""
+        if not model_info.api_cost_per_1k_tokens:
+            return float('nan')
+        
+        name = model_info.name.lower()
+        if "gpt-4" in name:
+            api_key = "openai_gpt4"
+        elif "gpt-3.5" in name:
+            api_key = "openai_gpt35"
+        elif "claude" in name:
+            api_key = "anthropic_claude"
+        else:
+            return model_info.api_cost_per_1k_tokens
+        return self.pricing_data["api_finetuning_costs"][api_key]["training"]
+    
     def _get_recommended_approaches(self, model_info: ModelInfo) -> List[TrainingApproach]:
         """Get recommended training approaches based on model characteristics"""
         approaches = []
@@ -239,7 +498,92 @@ class EnhancedCostCalculator:
         
         return approaches
     
+    # ------------------------------------------------------------------
+    # Estimate cache
+    # ------------------------------------------------------------------
+    
+    def update_pricing(self,
+                       cloud_hourly_rates: Optional[Dict[GPUType, Dict[str, float]]] = None,
+                       electricity_rates: Optional[Dict[str, float]] = None,
+                       api_finetuning_costs: Optional[Dict[str, Dict[str, float]]] = None):
+        """
+        Merge new rates into the pricing data and invalidate cached estimates
+        
+        Args:
+            cloud_hourly_rates: Per-GPU provider rates to merge (USD/hour)
+            electricity_rates: Region rates to merge (USD/kWh)
+            api_finetuning_costs: API service costs to merge (USD per 1K tokens)
+        """
+        with self._cache_lock:
+            for gpu_type, rates in (cloud_hourly_rates or {}).items():
+                self.pricing_data["cloud_hourly_rates"].setdefault(gpu_type, {}).update(rates)
+            self.pricing_data["electricity_rates"].update(electricity_rates or {})
+            self.pricing_data["api_finetuning_costs"].update(api_finetuning_costs or {})
+            self._invalidate_locked()
+    
+    def invalidate_cost_cache(self):
+        """Drop all memoized estimates (e.g. after editing pricing_data directly)"""
+        with self._cache_lock:
+            self._invalidate_locked()
+    
+    def attach_pricing_engine(self, pricing_engine) -> None:
+        """
+        Follow live rates from a DynamicPricingEngine
+        
+        Rate changes the engine observes are merged into this calculator's
+        cloud pricing, which invalidates the estimate cache.
+        """
+        pricing_engine.add_rate_listener(self._on_rates_changed)
+    
+    def detach_pricing_engine(self, pricing_engine) -> None:
+        """Stop following a DynamicPricingEngine attached earlier"""
+        pricing_engine.remove_rate_listener(self._on_rates_changed)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get estimate cache statistics"""
+        with self._cache_lock:
+            lookups = self._cache_hits + self._cache_misses
+            return {
+                'entries': len(self._cost_cache),
+                'max_entries': COST_CACHE_MAX_ENTRIES,
+                'hits': self._cache_hits,
+                'misses': self._cache_misses,
+                'hit_rate': self._cache_hits / lookups if lookups else 0.0,
+                'pricing_version': self.pricing_version
+            }
+    
+    def _on_rates_changed(self, gpu_type: GPUType, rates: Dict[str, float]):
+        logging.info(f"Cloud rates changed for {gpu_type.value}; invalidating cost estimates")
+        self.update_pricing(cloud_hourly_rates={gpu_type: rates})
+    
+    def _invalidate_locked(self):
+        self.pricing_version += 1
+        self._cost_cache.clear()
+    
     def _calculate_approach_cost(self, model_info: ModelInfo, dataset_tokens: int, approach: TrainingApproach) -> CostEstimate:
+        """Calculate cost for a specific training approach, reusing memoized estimates"""
+        
+        with self._cache_lock:
+            key = (model_info.name, approach, dataset_tokens, self.pricing_version)
+            cached = self._cost_cache.get(key)
+            if cached is not None:
+                self._cost_cache.move_to_end(key)
+                self._cache_hits += 1
+                return _copy_estimate(cached)
+            self._cache_misses += 1
+        
+        estimate = self._compute_approach_cost(model_info, dataset_tokens, approach)
+        
+        with self._cache_lock:
+            # Skip storing if pricing changed while we were computing
+            if key[3] == self.pricing_version:
+                self._cost_cache[key] = estimate
+                while len(self._cost_cache) > COST_CACHE_MAX_ENTRIES:
+                    self._cost_cache.popitem(last=False)
+        
+        return _copy_estimate(estimate)
+    
+    def _compute_approach_cost(self, model_info: ModelInfo, dataset_tokens: int, approach: TrainingApproach) -> CostEstimate:
         """Calculate cost for a specific training approach"""
         
         if approach == TrainingApproach.API_FINETUNING:
@@ -414,8 +758,19 @@ class EnhancedCostCalculator:
         )
     
     def _select_optimal_gpu_config(self, model_info: ModelInfo, approach: TrainingApproach, cloud: bool = False) -> Tuple[GPUConfig, int]:
-        """Select optimal GPU configuration for training"""
-        
+        """Select optimal GPU configuration for training (memoized; independent of pricing)"""
+        
+        key = (model_info.name, approach, cloud)
+        with self._cache_lock:
+            selection = self._gpu_selection_cache.get(key)
+        if selection is None:
+            # Computed outside the lock; a racing thread computes the same value
+            selection = self._compute_gpu_selection(model_info, approach, cloud)
+            with self._cache_lock:
+                selection = self._gpu_selection_cache.setdefault(key, selection)
+        return selection
+    
+    def _compute_gpu_selection(self, model_info: ModelInfo, approach: TrainingApproach, cloud: bool) -> Tuple[GPUConfig, int]:
         memory_required = self._calculate_memory_requirements(model_info, approach)
         
         # For cloud, prioritize performance; for local, balance cost/performance
@@ -656,6 +1011,15 @@ class EnhancedCostCalculator:
             "confidence": roi.confidence
         }
 
+def _copy_estimate(estimate: CostEstimate) -> CostEstimate:
+    """Copy an estimate's mutable containers so cached entries cannot be altered by callers"""
+    return replace(
+        estimate,
+        cost_breakdown=dict(estimate.cost_breakdown),
+        notes=list(estimate.notes),
+        hardware_requirements=dict(estimate.hardware_requirements)
+    )
+
 # Convenience functions
 def calculate_training_cost(dataset_tokens: int, model_name: str = "llama-2-7b") -> Dict[str, Any]:
     """Convenience function for quick cost calculation"""
@@ -683,6 +1047,7 @@ __all__ = [
     'GPUConfig',
     'TrainingConfig',
     'CostEstimate',
+    'CostGrid',
     'ROIAnalysis',
     'calculate_training_cost',
     'estimate_roi'
@@ -767,9 +1132,58 @@ class CostOptimizer:
         if not model_info:
             raise ValueError(f"Model '{model_name}' not found")
         
+        gpu_types = [GPUType.RTX_3090, GPUType.RTX_4090, GPUType.A100]
+        if NUMPY_AVAILABLE:
+            gpu_comparisons = self._compare_gpu_efficiency_grid(model_name, dataset_tokens, gpu_types)
+        else:
+            gpu_comparisons = self._compare_gpu_efficiency_loop(model_info, dataset_tokens, gpu_types)
+        
+        # Sort by cost efficiency (cost per TFLOP-hour)
+        gpu_comparisons.sort(key=lambda x: x["cost_per_tflop_hour"])
+        
+        return {
+            "model": model_name,
+            "dataset_tokens": dataset_tokens,
+            "gpu_efficiency_ranking": gpu_comparisons,
+            "most_efficient": gpu_comparisons[0] if gpu_comparisons else None
+        }
+    
+    def _compare_gpu_efficiency_grid(self, model_name: str, dataset_tokens: int,
+                                     gpu_types: List[GPUType]) -> List[Dict[str, Any]]:
+        """Local LoRA comparison for all GPU types in one grid evaluation"""
+        grid = self.calculator.calculate_cost_grid(
+            [dataset_tokens], [model_name], [TrainingApproach.LOCAL_LORA], gpu_types
+        )
+        
+        gpu_comparisons = []
+        for g, gpu_type in enumerate(gpu_types):
+            gpu_config = self.calculator.gpu_configs[gpu_type]
+            gpu_count = int(grid.gpu_count[0, 0, g])
+            training_hours = float(grid.training_hours[0, 0, 0, g])
+            total_cost = float(grid.total_cost[0, 0, 0, g])
+            cost_per_hour = total_cost / training_hours
+            
+            gpu_comparisons.append({
+                "gpu_type": gpu_type.value,
+                "gpu_count": gpu_count,
+                "training_hours": round(training_hours, 2),
+                "total_cost": round(total_cost, 2),
+                "cost_per_hour": round(cost_per_hour, 2),
+                "cost_per_tflop_hour": round(cost_per_hour / (gpu_config.compute_tflops * gpu_count), 4),
+                "total_tflops": gpu_config.compute_tflops * gpu_count,
+                "memory_utilization": round(
+                    float(grid.memory_required_gb[0, 0]) / (gpu_config.memory_gb * gpu_count), 2
+                )
+            })
+        
+        return gpu_comparisons
+    
+    def _compare_gpu_efficiency_loop(self, model_info: ModelInfo, dataset_tokens: int,
+                                     gpu_types: List[GPUType]) -> List[Dict[str, Any]]:
+        """Per-GPU fallback for compare_gpu_efficiency when NumPy is unavailable"""
         gpu_comparisons = []
         
-        for gpu_type in [GPUType.RTX_3090, GPUType.RTX_4090, GPUType.A100]:
+        for gpu_type in gpu_types:
             try:
                 gpu_config = self.calculator.gpu_configs[gpu_type]
                 
@@ -810,15 +1224,7 @@ class CostOptimizer:
             except Exception as e:
                 logging.warning(f"Failed to calculate efficiency for {gpu_type.value}: {e}")
         
-        # Sort by cost efficiency (cost per TFLOP-hour)
-        gpu_comparisons.sort(key=lambda x: x["cost_per_tflop_hour"])
-        
-        return {
-            "model": model_name,
-            "dataset_tokens": dataset_tokens,
-            "gpu_efficiency_ranking": gpu_comparisons,
-            "most_efficient": gpu_comparisons[0] if gpu_comparisons else None
-        }
+        return gpu_comparisons
     
     def estimate_scaling_costs(self, model_name: str, 
                               dataset_sizes: List[int] = None) -> Dict[str, Any]:
@@ -827,25 +1233,10 @@ class CostOptimizer:
         if dataset_sizes is None:
             dataset_sizes = [10000, 50000, 100000, 500000, 1000000]  # 10K to 1M tokens
         
-        scaling_data = []
-        
-        for size in dataset_sizes:
-            try:
-                results = self.calculator.calculate_comprehensive_costs(size, model_name)
-                
-                # Get the best (lowest cost) option
-                best_estimate = min(results["cost_estimates"], key=lambda x: x["total_cost_usd"])
-                
-                scaling_data.append({
-                    "dataset_tokens": size,
-                    "best_approach": best_estimate["approach_name"],
-                    "cost_usd": best_estimate["total_cost_usd"],
-                    "training_hours": best_estimate["training_hours"],
-                    "cost_per_token": best_estimate["total_cost_usd"] / size
-                })
-                
-            except Exception as e:
-                logging.warning(f"Failed to calculate scaling for {size} tokens: {e}")
+        if NUMPY_AVAILABLE:
+            scaling_data = self._scaling_data_grid(model_name, dataset_sizes)
+        else:
+            scaling_data = self._scaling_data_loop(model_name, dataset_sizes)
         
         # Calculate scaling efficiency
         if len(scaling_data) >= 2:
@@ -886,6 +1277,65 @@ class CostOptimizer:
             }
         }
 
+    def _scaling_data_grid(self, model_name: str, dataset_sizes: List[int]) -> List[Dict[str, Any]]:
+        """Best approach per dataset size from a single grid evaluation"""
+        model_info = self.calculator.model_db.get_model_info(model_name)
+        if not model_info:
+            logging.warning(f"Failed to calculate scaling: model '{model_name}' not found")
+            return []
+        
+        approaches = self.calculator._get_recommended_approaches(model_info)
+        grid = self.calculator.calculate_cost_grid(dataset_sizes, [model_name], approaches)
+        
+        scaling_data = []
+        for size, best in zip(dataset_sizes, grid.cheapest_per_dataset()):
+            if best is None:
+                logging.warning(f"Failed to calculate scaling for {size} tokens: no priced approach")
+                continue
+            
+            approach = TrainingApproach(best["approach"])
+            gpu_config = None
+            if best["gpu_type"] != "managed":
+                gpu_config = self.calculator.gpu_configs[GPUType(best["gpu_type"])]
+            approach_name = self.calculator._get_approach_display_name(approach, gpu_config)
+            if approach == TrainingApproach.API_FINETUNING:
+                approach_name = f"API Fine-tuning ({model_info.display_name})"
+            
+            cost = round(best["total_cost_usd"], 2)
+            scaling_data.append({
+                "dataset_tokens": size,
+                "best_approach": approach_name,
+                "cost_usd": cost,
+                "training_hours": round(best["training_hours"], 1),
+                "cost_per_token": cost / size
+            })
+        
+        return scaling_data
+    
+    def _scaling_data_loop(self, model_name: str, dataset_sizes: List[int]) -> List[Dict[str, Any]]:
+        """Per-size fallback for estimate_scaling_costs when NumPy is unavailable"""
+        scaling_data = []
+        
+        for size in dataset_sizes:
+            try:
+                results = self.calculator.calculate_comprehensive_costs(size, model_name)
+                
+                # Get the best (lowest cost) option
+                best_estimate = min(results["cost_estimates"], key=lambda x: x["total_cost_usd"])
+                
+                scaling_data.append({
+                    "dataset_tokens": size,
+                    "best_approach": best_estimate["approach_name"],
+                    "cost_usd": best_estimate["total_cost_usd"],
+                    "training_hours": best_estimate["training_hours"],
+                    "cost_per_token": best_estimate["total_cost_usd"] / size
+                })
+                
+            except Exception as e:
+                logging.warning(f"Failed to calculate scaling for {size} tokens: {e}")
+        
+        return scaling_data
+
 class BenchmarkValidator:
     """Validate cost calculations against known benchmarks"""
     
@@ -5,15 +5,19 @@ This file provides the unified interface that the controller will use
 """
 
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 
 # Import the main components
 from .cost_calculator import EnhancedCostCalculator, TrainingApproach, GPUType
-from .pricing_engine import DynamicPricingEngine, PricingData
+from .pricing_engine import PricingData, get_shared_pricing_engine
 from .roi_calculator import ROICalculator, CostOptimizer, UsagePattern, TimeHorizon
 from .model_database import get_model_database, ModelInfo
 
+# Configuration constants
+ANALYSIS_WORKERS = 3  # Pricing context plus two analyses alongside the calling thread
+
 @dataclass
 class ComprehensiveCostAnalysis:
     """Complete cost analysis result with all components"""
@@ -33,18 +37,38 @@ class ComprehensiveCostAnalyzer:
     
     def __init__(self):
         self.cost_calculator = EnhancedCostCalculator()
-        self.pricing_engine = DynamicPricingEngine()
+        self.pricing_engine = get_shared_pricing_engine()
+        self.cost_calculator.attach_pricing_engine(self.pricing_engine)
         self.roi_calculator = ROICalculator(self.pricing_engine)
         self.cost_optimizer = CostOptimizer(self.roi_calculator)
         self.model_db = get_model_database()
+        self._executor = ThreadPoolExecutor(max_workers=ANALYSIS_WORKERS,
+                                            thread_name_prefix="wolfscribe-analysis")
         logging.info("Comprehensive Cost Analyzer initialized")
     
+    def close(self):
+        """
+        Release the analysis worker threads and stop following live rates
+        
+        The pricing engine is shared by the whole process and stays open.
+        Safe to call more than once.
+        """
+        self._executor.shutdown(wait=True)
+        self.cost_calculator.detach_pricing_engine(self.pricing_engine)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+    
     def analyze_comprehensive_costs(self,
                                   dataset_tokens: int,
                                   target_model: str = "llama-2-7b",
                                   monthly_api_usage: int = 100000,
                                   user_constraints: Optional[Dict[str, Any]] = None,
-                                  usage_pattern: UsagePattern = UsagePattern.MODERATE) -> ComprehensiveCostAnalysis:
+                                  usage_pattern: UsagePattern = UsagePattern.MODERATE,
+                                  pipelined: bool = True) -> ComprehensiveCostAnalysis:
         """
         Perform comprehensive cost analysis with ROI and optimization
         
@@ -54,6 +78,8 @@ class ComprehensiveCostAnalyzer:
             monthly_api_usage: Monthly API usage for ROI calculation
             user_constraints: User constraints (budget, time, quality)
             usage_pattern: User's usage pattern category
+            pipelined: Overlap the pricing lookup and the independent analyses
+                instead of running each step in turn
             
         Returns:
             Complete cost analysis with all insights
@@ -61,6 +87,11 @@ class ComprehensiveCostAnalyzer:
         
         user_constraints = user_constraints or {}
         
+        if pipelined:
+            return self._analyze_pipelined(
+                dataset_tokens, target_model, monthly_api_usage, user_constraints, usage_pattern
+            )
+        
         # Step 1: Get basic cost estimates from enhanced calculator
         basic_analysis = self.cost_calculator.calculate_comprehensive_costs(
             dataset_tokens=dataset_tokens,
@@ -112,6 +143,70 @@ class ComprehensiveCostAnalyzer:
             }
         )
     
+    def _analyze_pipelined(self,
+                           dataset_tokens: int,
+                           target_model: str,
+                           monthly_api_usage: int,
+                           user_constraints: Dict[str, Any],
+                           usage_pattern: UsagePattern) -> ComprehensiveCostAnalysis:
+        """
+        Pipelined comprehensive analysis
+        
+        The pricing context may hit the network, so it starts first and runs
+        while the estimates are computed. ROI, optimization and efficiency
+        only read the estimates, so they run side by side. Estimates stay
+        CostEstimate objects throughout and are serialized once at the end.
+        """
+        
+        pricing_future = self._executor.submit(self._get_pricing_context, target_model)
+        
+        try:
+            model_info, cost_estimates = self.cost_calculator.estimate_approaches(
+                dataset_tokens=dataset_tokens,
+                target_model=target_model
+            )
+            
+            optimization_future = self._executor.submit(
+                self.cost_optimizer.generate_optimization_recommendations,
+                cost_estimates=cost_estimates,
+                user_constraints=user_constraints
+            )
+            efficiency_future = self._executor.submit(
+                self.cost_optimizer.analyze_cost_efficiency, cost_estimates
+            )
+            
+            # ROI is the heaviest step, so it runs on the calling thread
+            roi_analysis = self.roi_calculator.analyze_roi_comprehensive(
+                cost_estimates=cost_estimates,
+                monthly_token_usage=monthly_api_usage,
+                usage_pattern=usage_pattern,
+                target_model=target_model,
+                time_horizon=user_constraints.get('time_horizon', TimeHorizon.MEDIUM_TERM)
+            )
+            optimization_recommendations = optimization_future.result()
+            efficiency_analysis = efficiency_future.result()
+        except Exception:
+            pricing_future.cancel()
+            raise
+        
+        summary = self.cost_calculator.describe_estimates(model_info, dataset_tokens, cost_estimates)
+        
+        return ComprehensiveCostAnalysis(
+            model_info=summary["model_info"],
+            dataset_info=summary["dataset_info"],
+            cost_estimates=summary["cost_estimates"],
+            roi_analysis=roi_analysis,
+            optimization_recommendations=[self._optimization_rec_to_dict(rec) for rec in optimization_recommendations],
+            pricing_context=pricing_future.result(),
+            efficiency_analysis=efficiency_analysis,
+            calculation_metadata={
+                **summary["calculation_metadata"],
+                "usage_pattern": usage_pattern.value,
+                "user_constraints": user_constraints,
+                "analysis_type": "comprehensive"
+            }
+        )
+    
     def quick_cost_estimate(self,
                            dataset_tokens: int,
                            target_model: str = "llama-2-7b",
@@ -409,7 +504,9 @@ class ComprehensiveCostAnalyzer:
                     "training_hours": cost_estimate["training_hours"],
                     "confidence": cost_estimate["confidence"],
                     "spot_pricing": getattr(pricing_data, 'spot_price', False),
-                    "availability": getattr(pricing_data, 'availability', 'unknown')
+                    "availability": getattr(pricing_data, 'availability', 'unknown'),
+                    "pricing_age_seconds": pricing_data.age_seconds,
+                    "pricing_stale": pricing_data.stale
                 })
                 
             except Exception as e:
@@ -701,12 +798,12 @@ class ComprehensiveCostAnalyzer:
 def analyze_training_costs(dataset_tokens: int, model_name: str = "llama-2-7b", 
                           monthly_usage: int = 100000) -> Dict[str, Any]:
     """Convenience function for quick cost analysis"""
-    analyzer = ComprehensiveCostAnalyzer()
-    analysis = analyzer.analyze_comprehensive_costs(
-        dataset_tokens=dataset_tokens,
-        target_model=model_name,
-        monthly_api_usage=monthly_usage
-    )
+    with ComprehensiveCostAnalyzer() as analyzer:
+        analysis = analyzer.analyze_comprehensive_costs(
+            dataset_tokens=dataset_tokens,
+            target_model=model_name,
+            monthly_api_usage=monthly_usage
+        )
     
     # Convert to dictionary for easy use
     return {
@@ -721,8 +818,8 @@ def analyze_training_costs(dataset_tokens: int, model_name: str = "llama-2-7b",
 
 def get_quick_estimate(dataset_tokens: int, model_name: str = "llama-2-7b") -> Dict[str, Any]:
     """Quick estimate for simple use cases"""
-    analyzer = ComprehensiveCostAnalyzer()
-    return analyzer.quick_cost_estimate(dataset_tokens, model_name)
+    with ComprehensiveCostAnalyzer() as analyzer:
+        return analyzer.quick_cost_estimate(dataset_tokens, model_name)
 
 
 # Export main classes and functions
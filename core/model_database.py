@@ -5,10 +5,12 @@ Comprehensive database of popular AI models with training parameters
 """
 
 import logging
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Any, Tuple
 from enum import Enum
 
+from .catalogue_store import get_catalogue
+
 class ModelFamily(Enum):
     OPENAI = "openai"
     ANTHROPIC = "anthropic"
@@ -25,334 +27,248 @@ class TrainingFeasibility(Enum):
     API_ONLY = "api_only"                 # Training not available, API only
     RESEARCH_ONLY = "research_only"       # Academic/research access only
 
-@dataclass
+# Search index configuration
+SEARCH_NGRAM_SIZE = 3  # Longest character n-gram indexed for search_models
+
 class ModelInfo:
-    name: str
-    display_name: str
-    family: ModelFamily
-    parameters: int                        # Total parameter count
-    context_length: int                   # Maximum context window
-    training_tokens: Optional[int]        # Chinchilla-optimal training tokens
-    compute_optimal_ratio: float          # Chinchilla scaling ratio (usually 20)
-    training_feasibility: TrainingFeasibility
-    gpu_memory_required: int              # GB VRAM for inference
-    training_memory_multiplier: float     # Training memory = inference * multiplier
-    estimated_training_cost: Optional[int] # USD for full training (reference models)
-    api_cost_per_1k_tokens: Optional[float] # USD per 1K tokens for API
-    use_cases: List[str]
-    pricing_tier: str
-    release_date: Optional[str]
-    notes: Optional[str] = None
+    """
+    Immutable catalogue entry for one model
+    
+    A single set of entries is shared by the cost calculator and the
+    tokenizer manager. Cost fields are None for models that only carry a
+    tokenizer profile, and tokenizer fields are None/empty for models that
+    only carry a cost profile.
+    """
+    
+    __slots__ = (
+        'name', 'display_name', 'family', 'parameters', 'context_length',
+        'training_tokens', 'compute_optimal_ratio', 'training_feasibility',
+        'gpu_memory_required', 'training_memory_multiplier', 'estimated_training_cost',
+        'api_cost_per_1k_tokens', 'use_cases', 'pricing_tier', 'release_date', 'notes',
+        'optimal_tokenizer', 'acceptable_tokenizers', 'training_data_cutoff'
+    )
+    
+    def __init__(self,
+                 name: str,
+                 display_name: str,
+                 family: ModelFamily,
+                 parameters: Optional[int] = None,                 # Total parameter count
+                 context_length: Optional[int] = None,             # Maximum context window
+                 training_tokens: Optional[int] = None,            # Chinchilla-optimal training tokens
+                 compute_optimal_ratio: Optional[float] = None,    # Chinchilla scaling ratio (usually 20)
+                 training_feasibility: Optional[TrainingFeasibility] = None,
+                 gpu_memory_required: Optional[int] = None,        # GB VRAM for inference
+                 training_memory_multiplier: Optional[float] = None,  # Training memory = inference * multiplier
+                 estimated_training_cost: Optional[int] = None,    # USD for full training (reference models)
+                 api_cost_per_1k_tokens: Optional[float] = None,   # USD per 1K tokens for API
+                 use_cases: Iterable[str] = (),
+                 pricing_tier: Optional[str] = None,
+                 release_date: Optional[str] = None,
+                 notes: Optional[str] = None,
+                 optimal_tokenizer: Optional[str] = None,
+                 acceptable_tokenizers: Iterable[str] = (),
+                 training_data_cutoff: Optional[str] = None):
+        values = locals()
+        for field_name in self.__slots__:
+            value = values[field_name]
+            if field_name in ('use_cases', 'acceptable_tokenizers'):
+                value = tuple(value)
+            object.__setattr__(self, field_name, value)
+    
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ModelInfo is immutable (cannot set {name!r})")
+    
+    def __delattr__(self, name):
+        raise AttributeError(f"ModelInfo is immutable (cannot delete {name!r})")
+    
+    def __reduce__(self):
+        return (ModelInfo, tuple(getattr(self, field_name) for field_name in self.__slots__))
+    
+    def __eq__(self, other):
+        if not isinstance(other, ModelInfo):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+    
+    def __hash__(self):
+        return hash(self.name)
+    
+    def __repr__(self):
+        return f"ModelInfo(name={self.name!r}, family={self.family.value!r}, parameters={self.parameters!r})"
+    
+    @property
+    def has_cost_profile(self) -> bool:
+        return self.parameters is not None
+    
+    @property
+    def has_tokenizer_profile(self) -> bool:
+        return self.optimal_tokenizer is not None
 
-class ModelParameterDatabase:
-    """Comprehensive database of AI models for training cost analysis"""
+
+class ModelIndex:
+    """
+    Read-only view over catalogue entries with every lookup prebuilt
     
-    def __init__(self):
-        self.models = self._build_model_database()
-        logging.info(f"Initialized model database with {len(self.models)} models")
+    Family, feasibility, pricing tier and use-case lookups are dict hits.
+    search() intersects character n-gram postings and only verifies the
+    few surviving candidates, instead of scanning every entry.
+    """
     
-    def _build_model_database(self) -> Dict[str, ModelInfo]:
-        """Build comprehensive model database with accurate parameters"""
-        
-        models = {}
-        
-        # OpenAI Models
-        models["gpt-4"] = ModelInfo(
-            name="gpt-4",
-            display_name="GPT-4",
-            family=ModelFamily.OPENAI,
-            parameters=1_800_000_000_000,  # ~1.8T parameters (estimated)
-            context_length=8192,
-            training_tokens=None,  # Not publicly disclosed
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.API_ONLY,
-            gpu_memory_required=3600,  # Estimated for full model
-            training_memory_multiplier=4.0,
-            estimated_training_cost=78_000_000,  # $78M (industry estimates)
-            api_cost_per_1k_tokens=0.03,  # $0.03/1K tokens
-            use_cases=["general", "coding", "analysis", "creative"],
-            pricing_tier="premium",
-            release_date="2023-03",
-            notes="Industry estimates for parameters and training cost"
-        )
-        
-        models["gpt-4-turbo"] = ModelInfo(
-            name="gpt-4-turbo",
-            display_name="GPT-4 Turbo",
-            family=ModelFamily.OPENAI,
-            parameters=1_800_000_000_000,  # Similar to GPT-4
-            context_length=128000,
-            training_tokens=None,
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.API_ONLY,
-            gpu_memory_required=3600,
-            training_memory_multiplier=4.0,
-            estimated_training_cost=85_000_000,  # Slightly higher due to improvements
-            api_cost_per_1k_tokens=0.01,  # Lower cost per token
-            use_cases=["general", "coding", "analysis", "creative", "long_context"],
-            pricing_tier="premium",
-            release_date="2023-11"
-        )
-        
-        models["gpt-3.5-turbo"] = ModelInfo(
-            name="gpt-3.5-turbo",
-            display_name="GPT-3.5 Turbo",
-            family=ModelFamily.OPENAI,
-            parameters=175_000_000_000,  # ~175B parameters
-            context_length=16385,
-            training_tokens=300_000_000_000,  # Estimated
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.API_ONLY,
-            gpu_memory_required=350,  # Estimated
-            training_memory_multiplier=4.0,
-            estimated_training_cost=4_600_000,  # $4.6M (industry estimates)
-            api_cost_per_1k_tokens=0.002,  # $0.002/1K tokens
-            use_cases=["general", "chatbots", "summarization"],
-            pricing_tier="standard",
-            release_date="2023-03"
-        )
+    def __init__(self, entries: Iterable[ModelInfo]):
+        entries = tuple(entries)
+        self.models: Mapping[str, ModelInfo] = MappingProxyType({m.name: m for m in entries})
+        self._entries = entries
         
-        # Anthropic Claude Models
-        models["claude-3-opus"] = ModelInfo(
-            name="claude-3-opus",
-            display_name="Claude 3 Opus",
-            family=ModelFamily.ANTHROPIC,
-            parameters=175_000_000_000,  # Estimated similar to GPT-3.5
-            context_length=200000,
-            training_tokens=None,
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.API_ONLY,
-            gpu_memory_required=350,
-            training_memory_multiplier=4.0,
-            estimated_training_cost=12_000_000,  # Estimated
-            api_cost_per_1k_tokens=0.015,  # Input tokens
-            use_cases=["analysis", "creative", "coding", "research"],
-            pricing_tier="premium",
-            release_date="2024-02"
-        )
-        
-        models["claude-3-sonnet"] = ModelInfo(
-            name="claude-3-sonnet",
-            display_name="Claude 3 Sonnet",
-            family=ModelFamily.ANTHROPIC,
-            parameters=50_000_000_000,  # Estimated smaller than Opus
-            context_length=200000,
-            training_tokens=None,
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.API_ONLY,
-            gpu_memory_required=100,
-            training_memory_multiplier=4.0,
-            estimated_training_cost=3_500_000,  # Estimated
-            api_cost_per_1k_tokens=0.003,
-            use_cases=["general", "analysis", "creative"],
-            pricing_tier="standard",
-            release_date="2024-02"
-        )
+        by_family: Dict[ModelFamily, List[ModelInfo]] = {}
+        by_feasibility: Dict[TrainingFeasibility, List[ModelInfo]] = {}
+        by_tier: Dict[str, List[ModelInfo]] = {}
+        by_use_case: Dict[str, List[ModelInfo]] = {}
+        postings: Dict[str, set] = {}
+        self._search_fields: List[Tuple[str, ...]] = []
         
-        models["claude-3-haiku"] = ModelInfo(
-            name="claude-3-haiku",
-            display_name="Claude 3 Haiku",
-            family=ModelFamily.ANTHROPIC,
-            parameters=8_000_000_000,  # Estimated smaller model
-            context_length=200000,
-            training_tokens=None,
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.CLOUD_ONLY,
-            gpu_memory_required=16,
-            training_memory_multiplier=4.0,
-            estimated_training_cost=800_000,  # Estimated
-            api_cost_per_1k_tokens=0.00025,
-            use_cases=["speed", "simple_tasks", "cost_effective"],
-            pricing_tier="budget",
-            release_date="2024-02"
-        )
-        
-        # Meta LLaMA Models
-        models["llama-2-7b"] = ModelInfo(
-            name="llama-2-7b",
-            display_name="LLaMA 2 7B",
-            family=ModelFamily.META,
-            parameters=7_000_000_000,
-            context_length=4096,
-            training_tokens=2_000_000_000_000,  # 2T tokens
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.LOCAL_FEASIBLE,
-            gpu_memory_required=14,  # 13.5GB for inference
-            training_memory_multiplier=4.0,
-            estimated_training_cost=2_500_000,  # Community estimate
-            api_cost_per_1k_tokens=None,  # Open source
-            use_cases=["open_source", "local_deployment", "research"],
-            pricing_tier="free",
-            release_date="2023-07"
-        )
-        
-        models["llama-2-13b"] = ModelInfo(
-            name="llama-2-13b",
-            display_name="LLaMA 2 13B",
-            family=ModelFamily.META,
-            parameters=13_000_000_000,
-            context_length=4096,
-            training_tokens=2_000_000_000_000,
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.LOCAL_FEASIBLE,
-            gpu_memory_required=26,  # 25.6GB for inference
-            training_memory_multiplier=4.0,
-            estimated_training_cost=4_200_000,
-            api_cost_per_1k_tokens=None,
-            use_cases=["open_source", "local_deployment", "research"],
-            pricing_tier="free",
-            release_date="2023-07"
-        )
-        
-        models["llama-2-70b"] = ModelInfo(
-            name="llama-2-70b",
-            display_name="LLaMA 2 70B",
-            family=ModelFamily.META,
-            parameters=70_000_000_000,
-            context_length=4096,
-            training_tokens=2_000_000_000_000,
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.CLOUD_ONLY,
-            gpu_memory_required=140,  # ~140GB for inference
-            training_memory_multiplier=4.0,
-            estimated_training_cost=15_000_000,
-            api_cost_per_1k_tokens=None,
-            use_cases=["open_source", "high_quality", "research"],
-            pricing_tier="free",
-            release_date="2023-07"
-        )
-        
-        # Mistral Models
-        models["mistral-7b"] = ModelInfo(
-            name="mistral-7b",
-            display_name="Mistral 7B",
-            family=ModelFamily.MISTRAL,
-            parameters=7_300_000_000,
-            context_length=8192,
-            training_tokens=1_000_000_000_000,  # Estimated
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.LOCAL_FEASIBLE,
-            gpu_memory_required=15,
-            training_memory_multiplier=4.0,
-            estimated_training_cost=2_200_000,
-            api_cost_per_1k_tokens=0.0007,  # Via Together AI
-            use_cases=["open_source", "multilingual", "local_deployment"],
-            pricing_tier="free",
-            release_date="2023-09"
-        )
-        
-        models["mixtral-8x7b"] = ModelInfo(
-            name="mixtral-8x7b",
-            display_name="Mixtral 8x7B",
-            family=ModelFamily.MISTRAL,
-            parameters=56_000_000_000,  # 8 experts × 7B each
-            context_length=32768,
-            training_tokens=1_500_000_000_000,
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.CLOUD_ONLY,
-            gpu_memory_required=90,  # Mixture of experts architecture
-            training_memory_multiplier=4.0,
-            estimated_training_cost=8_500_000,
-            api_cost_per_1k_tokens=0.0006,
-            use_cases=["open_source", "high_performance", "mixture_of_experts"],
-            pricing_tier="free",
-            release_date="2023-12"
-        )
-        
-        # BERT Family
-        models["bert-base-uncased"] = ModelInfo(
-            name="bert-base-uncased",
-            display_name="BERT Base Uncased",
-            family=ModelFamily.BERT,
-            parameters=110_000_000,
-            context_length=512,
-            training_tokens=3_300_000_000,  # BookCorpus + Wikipedia
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.LOCAL_FEASIBLE,
-            gpu_memory_required=1,  # Very small
-            training_memory_multiplier=3.0,  # Encoder-only is more efficient
-            estimated_training_cost=50_000,
-            api_cost_per_1k_tokens=None,
-            use_cases=["classification", "embeddings", "understanding"],
-            pricing_tier="free",
-            release_date="2018-10"
-        )
+        for position, model in enumerate(entries):
+            by_family.setdefault(model.family, []).append(model)
+            if model.training_feasibility is not None:
+                by_feasibility.setdefault(model.training_feasibility, []).append(model)
+            if model.pricing_tier is not None:
+                by_tier.setdefault(model.pricing_tier, []).append(model)
+            for use_case in model.use_cases:
+                by_use_case.setdefault(use_case, []).append(model)
+            
+            fields = (model.name.lower(), model.display_name.lower(), model.family.value.lower(),
+                      *(use_case.lower() for use_case in model.use_cases))
+            self._search_fields.append(fields)
+            for field_text in fields:
+                for gram in _ngrams(field_text):
+                    postings.setdefault(gram, set()).add(position)
         
-        models["roberta-base"] = ModelInfo(
-            name="roberta-base",
-            display_name="RoBERTa Base",
-            family=ModelFamily.BERT,
-            parameters=125_000_000,
-            context_length=512,
-            training_tokens=160_000_000_000,  # Much more data than BERT
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.LOCAL_FEASIBLE,
-            gpu_memory_required=1,
-            training_memory_multiplier=3.0,
-            estimated_training_cost=150_000,
-            api_cost_per_1k_tokens=None,
-            use_cases=["classification", "embeddings", "nlp_tasks"],
-            pricing_tier="free",
-            release_date="2019-07"
-        )
+        self._by_family = {k: tuple(v) for k, v in by_family.items()}
+        self._by_feasibility = {k: tuple(v) for k, v in by_feasibility.items()}
+        self._by_tier = {k: tuple(v) for k, v in by_tier.items()}
+        self._by_use_case = {k: tuple(v) for k, v in by_use_case.items()}
+        self._postings = {k: frozenset(v) for k, v in postings.items()}
         
-        models["distilbert-base-uncased"] = ModelInfo(
-            name="distilbert-base-uncased",
-            display_name="DistilBERT Base",
-            family=ModelFamily.BERT,
-            parameters=66_000_000,
-            context_length=512,
-            training_tokens=3_300_000_000,
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.LOCAL_FEASIBLE,
-            gpu_memory_required=0.5,
-            training_memory_multiplier=3.0,
-            estimated_training_cost=25_000,
-            api_cost_per_1k_tokens=None,
-            use_cases=["fast_classification", "embeddings", "edge_deployment"],
-            pricing_tier="free",
-            release_date="2019-10"
+        self.api_models = tuple(m for m in entries if m.api_cost_per_1k_tokens is not None)
+        self.local_trainable = self._by_feasibility.get(TrainingFeasibility.LOCAL_FEASIBLE, ())
+        self.trainable = tuple(
+            m for m in entries
+            if m.training_feasibility in (TrainingFeasibility.LOCAL_FEASIBLE, TrainingFeasibility.CLOUD_ONLY)
         )
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def __iter__(self):
+        return iter(self._entries)
+    
+    def get(self, name: str) -> Optional[ModelInfo]:
+        return self.models.get(name)
+    
+    def by_family(self, family: ModelFamily) -> Tuple[ModelInfo, ...]:
+        return self._by_family.get(family, ())
+    
+    def by_feasibility(self, feasibility: TrainingFeasibility) -> Tuple[ModelInfo, ...]:
+        return self._by_feasibility.get(feasibility, ())
+    
+    def by_pricing_tier(self, pricing_tier: str) -> Tuple[ModelInfo, ...]:
+        return self._by_tier.get(pricing_tier, ())
+    
+    def by_use_case(self, use_case: str) -> Tuple[ModelInfo, ...]:
+        return self._by_use_case.get(use_case, ())
+    
+    def counts(self) -> Dict[str, Dict[str, int]]:
+        """Entry counts per family, feasibility and pricing tier"""
+        return {
+            "by_family": {k.value: len(v) for k, v in self._by_family.items()},
+            "by_feasibility": {k.value: len(v) for k, v in self._by_feasibility.items()},
+            "by_pricing_tier": {k: len(v) for k, v in self._by_tier.items()}
+        }
+    
+    def search(self, query: str) -> List[ModelInfo]:
+        """Entries whose name, display name, family or a use case contains query"""
+        query_lower = query.lower()
+        if not query_lower:
+            return list(self._entries)
         
-        # Google Models
-        models["gemini-pro"] = ModelInfo(
-            name="gemini-pro",
-            display_name="Gemini Pro",
-            family=ModelFamily.GOOGLE,
-            parameters=175_000_000_000,  # Estimated
-            context_length=32768,
-            training_tokens=None,
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.API_ONLY,
-            gpu_memory_required=350,
-            training_memory_multiplier=4.0,
-            estimated_training_cost=15_000_000,
-            api_cost_per_1k_tokens=0.00025,
-            use_cases=["multimodal", "general", "reasoning"],
-            pricing_tier="standard",
-            release_date="2023-12"
-        )
+        grams = _ngrams(query_lower, exact_only=True)
+        candidates = None
+        for gram in sorted(grams, key=lambda g: len(self._postings.get(g, ()))):
+            posting = self._postings.get(gram)
+            if not posting:
+                return []
+            candidates = posting if candidates is None else candidates & posting
+            if not candidates:
+                return []
         
-        # Cohere Models
-        models["command-r"] = ModelInfo(
-            name="command-r",
-            display_name="Cohere Command R",
-            family=ModelFamily.COHERE,
-            parameters=35_000_000_000,  # Estimated
-            context_length=128000,
-            training_tokens=None,
-            compute_optimal_ratio=20,
-            training_feasibility=TrainingFeasibility.API_ONLY,
-            gpu_memory_required=70,
-            training_memory_multiplier=4.0,
-            estimated_training_cost=5_000_000,
-            api_cost_per_1k_tokens=0.0015,
-            use_cases=["rag", "enterprise", "search"],
-            pricing_tier="standard",
-            release_date="2024-03"
-        )
+        return [
+            self._entries[position] for position in sorted(candidates)
+            if any(query_lower in field_text for field_text in self._search_fields[position])
+        ]
+
+
+def _ngrams(text: str, exact_only: bool = False) -> set:
+    """
+    Character n-grams of text
+    
+    Indexing takes every n-gram up to SEARCH_NGRAM_SIZE, so short queries
+    hit a posting directly. Queries (exact_only) use n-grams of exactly
+    SEARCH_NGRAM_SIZE, or the whole query when it is shorter.
+    """
+    if exact_only:
+        if len(text) <= SEARCH_NGRAM_SIZE:
+            return {text}
+        return {text[i:i + SEARCH_NGRAM_SIZE] for i in range(len(text) - SEARCH_NGRAM_SIZE + 1)}
+    
+    grams = set()
+    for size in range(1, SEARCH_NGRAM_SIZE + 1):
+        grams.update(text[i:i + size] for i in range(len(text) - size + 1))
+    return grams
+
+
+class ModelCatalogue:
+    """
+    The single set of ModelInfo entries, with views for each subsystem
+    
+    cost_models holds entries with a cost profile (ModelParameterDatabase);
+    tokenizer_models holds entries with a tokenizer profile
+    (TokenizerManager). Both views share the same ModelInfo objects.
+    """
+    
+    # Tokenizer view keeps the order its heuristics were written against
+    _TOKENIZER_FAMILY_ORDER = (ModelFamily.OPENAI, ModelFamily.ANTHROPIC, ModelFamily.BERT,
+                               ModelFamily.META, ModelFamily.MISTRAL)
+    
+    def __init__(self, entries: Iterable[ModelInfo]):
+        self.entries: Tuple[ModelInfo, ...] = tuple(entries)
+        self.cost_models = ModelIndex(m for m in self.entries if m.has_cost_profile)
         
-        return models
+        family_rank = {family: rank for rank, family in enumerate(self._TOKENIZER_FAMILY_ORDER)}
+        self.tokenizer_models = ModelIndex(sorted(
+            (m for m in self.entries if m.has_tokenizer_profile),
+            key=lambda m: family_rank.get(m.family, len(family_rank))
+        ))
+
+
+def _build_catalogue_entries() -> List[ModelInfo]:
+    """Build catalogue entries from the 'models' data catalogue"""
+    
+    entries = []
+    for record in get_catalogue('models'):
+        fields = dict(record)
+        fields['family'] = ModelFamily(fields['family'])
+        if 'training_feasibility' in fields:
+            fields['training_feasibility'] = TrainingFeasibility(fields['training_feasibility'])
+        entries.append(ModelInfo(**fields))
+    return entries
+
+
+class ModelParameterDatabase:
+    """Comprehensive database of AI models for training cost analysis"""
+    
+    def __init__(self, catalogue: Optional[ModelCatalogue] = None):
+        self.catalogue = catalogue or get_model_catalogue()
+        self._index = self.catalogue.cost_models
+        self.models = self._index.models
+        logging.info(f"Initialized model database with {len(self.models)} models")
     
     def get_model_info(self, model_name: str) -> Optional[ModelInfo]:
         """Get detailed information for a specific model"""
@@ -361,22 +277,18 @@ class ModelParameterDatabase:
     
     def get_models_by_family(self, family: ModelFamily) -> List[ModelInfo]:
         """Get all models from a specific family"""
-        return [model for model in self.models.values() if model.family == family]
+        return list(self._index.by_family(family))
     
     def get_trainable_models(self, local_only: bool = False) -> List[ModelInfo]:
         """Get models that can be trained (optionally filter to local-feasible only)"""
         if local_only:
-            return [model for model in self.models.values() 
-                   if model.training_feasibility == TrainingFeasibility.LOCAL_FEASIBLE]
+            return list(self._index.local_trainable)
         else:
-            return [model for model in self.models.values() 
-                   if model.training_feasibility in [TrainingFeasibility.LOCAL_FEASIBLE, 
-                                                   TrainingFeasibility.CLOUD_ONLY]]
+            return list(self._index.trainable)
     
     def get_api_models(self) -> List[ModelInfo]:
         """Get models available via API"""
-        return [model for model in self.models.values() 
-               if model.api_cost_per_1k_tokens is not None]
+        return list(self._index.api_models)
     
     def estimate_chinchilla_tokens(self, parameters: int) -> int:
         """Estimate optimal training tokens using Chinchilla scaling laws"""
@@ -394,56 +306,24 @@ class ModelParameterDatabase:
     
     def get_models_by_feasibility(self, feasibility: TrainingFeasibility) -> List[ModelInfo]:
         """Get models by training feasibility"""
-        return [model for model in self.models.values() 
-               if model.training_feasibility == feasibility]
+        return list(self._index.by_feasibility(feasibility))
     
     def get_models_by_price_tier(self, pricing_tier: str) -> List[ModelInfo]:
         """Get models by pricing tier"""
-        return [model for model in self.models.values() 
-               if model.pricing_tier == pricing_tier]
+        return list(self._index.by_pricing_tier(pricing_tier))
     
     def search_models(self, query: str) -> List[ModelInfo]:
         """Search models by name, family, or use case"""
-        query_lower = query.lower()
-        results = []
-        
-        for model in self.models.values():
-            if (query_lower in model.name.lower() or 
-                query_lower in model.display_name.lower() or
-                query_lower in model.family.value.lower() or
-                any(query_lower in use_case.lower() for use_case in model.use_cases)):
-                results.append(model)
-        
-        return results
+        return self._index.search(query)
     
     def get_model_summary(self) -> Dict[str, Any]:
         """Get summary statistics about the model database"""
-        total_models = len(self.models)
-        
-        by_family = {}
-        by_feasibility = {}
-        by_tier = {}
-        
-        for model in self.models.values():
-            # Count by family
-            family_name = model.family.value
-            by_family[family_name] = by_family.get(family_name, 0) + 1
-            
-            # Count by feasibility
-            feasibility_name = model.training_feasibility.value
-            by_feasibility[feasibility_name] = by_feasibility.get(feasibility_name, 0) + 1
-            
-            # Count by tier
-            by_tier[model.pricing_tier] = by_tier.get(model.pricing_tier, 0) + 1
-        
         return {
-            "total_models": total_models,
-            "by_family": by_family,
-            "by_feasibility": by_feasibility,
-            "by_pricing_tier": by_tier,
-            "trainable_models": len(self.get_trainable_models()),
-            "local_trainable": len(self.get_trainable_models(local_only=True)),
-            "api_available": len(self.get_api_models())
+            "total_models": len(self.models),
+            **self._index.counts(),
+            "trainable_models": len(self._index.trainable),
+            "local_trainable": len(self._index.local_trainable),
+            "api_available": len(self._index.api_models)
         }
     
     def validate_database(self) -> Dict[str, Any]:
@@ -483,7 +363,13 @@ class ModelParameterDatabase:
             "total_models_validated": len(self.models)
         }
 
-# Convenience function for easy access
+# Convenience functions for easy access
+def get_model_catalogue() -> ModelCatalogue:
+    """Get the shared model catalogue (built once per process)"""
+    if not hasattr(get_model_catalogue, '_instance'):
+        get_model_catalogue._instance = ModelCatalogue(_build_catalogue_entries())
+    return get_model_catalogue._instance
+
 def get_model_database() -> ModelParameterDatabase:
     """Get a singleton instance of the model database"""
     if not hasattr(get_model_database, '_instance'):
@@ -493,8 +379,11 @@ def get_model_database() -> ModelParameterDatabase:
 # Export commonly used classes
 __all__ = [
     'ModelParameterDatabase',
+    'ModelCatalogue',
+    'ModelIndex',
     'ModelInfo', 
     'ModelFamily',
     'TrainingFeasibility',
-    'get_model_database'
+    'get_model_database',
+    'get_model_catalogue'
 ]
\ No newline at end of file
@@ -4,10 +4,14 @@ Dynamic Pricing Engine for Real-time Cloud GPU Pricing
 Fetches current pricing from multiple cloud providers with robust fallbacks
 """
 
+import atexit
+import json
 import logging
+import os
+import tempfile
 import time
-from typing import Dict, List, Optional, Any, Tuple
-from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict, replace
 from enum import Enum
 import asyncio
 import aiohttp
@@ -15,6 +19,32 @@ from concurrent.futures import ThreadPoolExecutor
 import threading
 
 from .cost_calculator import GPUType
+from .user_paths import user_cache_path
+
+# Configuration constants
+HTTP_POOL_SIZE = 10  # Connections kept open by the shared aiohttp session
+FETCH_GRACE_SECONDS = 2  # Added to the slowest provider timeout for sync callers
+PRICING_CACHE_FILE = "pricing_cache.json"  # Inside the per-user cache directory
+PRICING_CACHE_TTL_SECONDS = 3600  # Entries older than this are served stale and refreshed
+PRICING_CACHE_MAX_STALE_SECONDS = 7 * 24 * 3600  # Entries older than this are discarded
+RATE_CHANGE_TOLERANCE = 0.05  # Relative rate change below which listeners are not notified
+
+DEFAULT_CACHE_PATH = object()  # Sentinel: use PRICING_CACHE_FILE in the per-user cache directory
+
+# Provider request budgets: (requests per hour, burst size)
+PROVIDER_RATE_LIMITS = {
+    'lambda_labs': (100, 10),
+    'vast_ai': (42, 5),       # 1000 per day ≈ 42 per hour
+    'runpod': (1000, 50)      # No API, high limit
+}
+DEFAULT_RATE_LIMIT = (10, 2)  # Unknown providers
+
+# GPU type mapping for Lambda Labs
+LAMBDA_LABS_GPU_NAMES = {
+    GPUType.RTX_4090: "gpu_1x_rtx4090",
+    GPUType.A100: "gpu_1x_a100",
+    GPUType.H100: "gpu_1x_h100"
+}
 
 class ProviderStatus(Enum):
     ACTIVE = "active"
@@ -32,6 +62,24 @@ class PricingData:
     confidence: float = 1.0  # 0-1 confidence in pricing accuracy
     spot_price: bool = False  # Whether this is spot pricing
     availability: str = "available"  # available, limited, unavailable
+    stale: bool = False  # Served from cache past its TTL while a refresh runs
+    
+    @property
+    def age_seconds(self) -> Optional[float]:
+        """Seconds since this rate was fetched"""
+        if self.timestamp is None:
+            return None
+        return max(time.time() - self.timestamp, 0.0)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data['gpu_type'] = self.gpu_type.value
+        del data['stale']
+        return data
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'PricingData':
+        return cls(**{**data, 'gpu_type': GPUType(data['gpu_type'])})
 
 @dataclass
 class ProviderInfo:
@@ -46,14 +94,80 @@ class ProviderInfo:
 class DynamicPricingEngine:
     """Main coordinator for dynamic cloud GPU pricing"""
     
-    def __init__(self):
-        self.cache = PricingCache()
+    def __init__(self, provider_endpoints: Optional[Dict[str, str]] = None,
+                 cache_path: Optional[str] = DEFAULT_CACHE_PATH,
+                 rate_limiter: Optional['RateLimiter'] = None):
+        """
+        Args:
+            provider_endpoints: Optional overrides of provider API endpoints
+                (e.g. a local stub server for testing)
+            cache_path: File the pricing cache persists to, or None to keep
+                it in memory only. Defaults to PRICING_CACHE_FILE in the
+                per-user cache directory, resolved when the engine is created
+            rate_limiter: Limiter to draw provider requests from. Defaults to
+                the process-wide limiter so every engine shares one budget.
+        """
+        if cache_path is DEFAULT_CACHE_PATH:
+            cache_path = user_cache_path(PRICING_CACHE_FILE)
+        self.cache = PricingCache(cache_path=cache_path)
         self.providers = self._initialize_providers()
+        for provider, endpoint in (provider_endpoints or {}).items():
+            self.providers[provider].api_endpoint = endpoint
         self.fallback_data = self._load_fallback_data()
-        self.rate_limiter = RateLimiter()
+        self.rate_limiter = rate_limiter or get_shared_rate_limiter()
         self._lock = threading.Lock()
+        self._rate_listeners: List[Callable[[GPUType, Dict[str, float]], None]] = []
+        self._last_known_rates: Dict[Tuple[str, GPUType], float] = {}
+        
+        # Shared HTTP session and the background loop that owns it for sync callers
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[threading.Thread] = None
+        self._loop_lock = threading.Lock()
+        self._refreshing: Dict[GPUType, Any] = {}  # gpu_type -> in-flight refresh future
         logging.info("Dynamic Pricing Engine initialized")
     
+    def add_rate_listener(self, listener: Callable[[GPUType, Dict[str, float]], None]):
+        """
+        Register a callback for rate changes
+        
+        The listener is called as listener(gpu_type, {provider: hourly_rate})
+        whenever a fetch returns an on-demand rate that differs from the last
+        one announced by more than RATE_CHANGE_TOLERANCE. Spot rates move on
+        every fetch and are not announced.
+        """
+        with self._lock:
+            if listener not in self._rate_listeners:
+                self._rate_listeners.append(listener)
+    
+    def remove_rate_listener(self, listener: Callable[[GPUType, Dict[str, float]], None]):
+        """Unregister a rate change callback"""
+        with self._lock:
+            if listener in self._rate_listeners:
+                self._rate_listeners.remove(listener)
+    
+    def _record_rates(self, gpu_type: GPUType, rates: Dict[str, PricingData]):
+        """Notify listeners of on-demand rates that moved beyond the tolerance"""
+        changed = {}
+        with self._lock:
+            for provider, pricing_data in rates.items():
+                if pricing_data.spot_price:
+                    continue
+                key = (provider, gpu_type)
+                previous = self._last_known_rates.get(key)
+                if previous is None or abs(pricing_data.hourly_rate - previous) > RATE_CHANGE_TOLERANCE * previous:
+                    self._last_known_rates[key] = pricing_data.hourly_rate
+                    changed[provider] = pricing_data.hourly_rate
+            listeners = list(self._rate_listeners)
+        
+        if not changed:
+            return
+        for listener in listeners:
+            try:
+                listener(gpu_type, changed)
+            except Exception as e:
+                logging.error(f"Pricing rate listener failed: {e}")
+    
     def _initialize_providers(self) -> Dict[str, ProviderInfo]:
         """Initialize cloud provider configurations"""
         return {
@@ -128,13 +242,20 @@ class DynamicPricingEngine:
         }
     
     def get_current_rates(self, gpu_type: GPUType, 
-                         providers: Optional[List[str]] = None) -> Dict[str, PricingData]:
+                         providers: Optional[List[str]] = None,
+                         wait_for_fresh: bool = False) -> Dict[str, PricingData]:
         """
         Get current GPU pricing rates from multiple providers
         
+        Uses stale-while-revalidate: fresh cached rates are returned as is,
+        expired ones are returned immediately with stale=True while a
+        background refresh runs, and providers with nothing cached fall back
+        to the built-in estimates. Only wait_for_fresh blocks on the network.
+        
         Args:
             gpu_type: GPU type to get pricing for
             providers: Optional list of specific providers to query
+            wait_for_fresh: Fetch missing or expired rates before returning
             
         Returns:
             Dictionary mapping provider names to pricing data
@@ -146,20 +267,27 @@ class DynamicPricingEngine:
         # Check cache first
         cached_rates = {}
         for provider in providers:
-            cached_data = self.cache.get_pricing(provider, gpu_type)
+            cached_data = self.cache.get_pricing(provider, gpu_type, allow_stale=True)
             if cached_data:
                 cached_rates[provider] = cached_data
         
+        outdated = [p for p in providers if p not in cached_rates or cached_rates[p].stale]
+        
         # If we have fresh cached data for all providers, return it
-        if len(cached_rates) == len(providers):
+        if not outdated:
             logging.info(f"Returning cached pricing for {gpu_type.value}")
             return cached_rates
         
-        # Fetch fresh data for providers not in cache
-        fresh_rates = self._fetch_fresh_rates(gpu_type, providers)
-        
-        # Combine cached and fresh data
-        all_rates = {**cached_rates, **fresh_rates}
+        if wait_for_fresh:
+            # Combine cached and fresh data
+            all_rates = {**cached_rates, **self._fetch_fresh_rates(gpu_type, outdated)}
+        else:
+            self.refresh_in_background(gpu_type, outdated)
+            fallback_rates = self._get_fallback_rates(gpu_type)
+            all_rates = {
+                **{p: fallback_rates[p] for p in providers if p in fallback_rates},
+                **cached_rates
+            }
         
         # If no providers returned data, use fallback
         if not all_rates:
@@ -168,46 +296,173 @@ class DynamicPricingEngine:
         
         return all_rates
     
+    def get_cached_rates(self, gpu_type: GPUType,
+                         providers: Optional[List[str]] = None) -> Dict[str, PricingData]:
+        """
+        Live rates already in the cache, expired ones marked stale
+        
+        Never touches the network and never substitutes built-in estimates,
+        so an empty result means no live rate has been fetched yet.
+        """
+        cached = {}
+        for provider in providers or list(self.providers.keys()):
+            data = self.cache.get_pricing(provider, gpu_type, allow_stale=True)
+            if data is not None:
+                cached[provider] = data
+        return cached
+    
+    def refresh_in_background(self, gpu_type: GPUType, providers: Optional[List[str]] = None):
+        """
+        Start a refresh of the given providers without waiting for it
+        
+        At most one refresh per GPU type is in flight; fresh results land in
+        the cache and are announced to rate listeners.
+        """
+        with self._lock:
+            if gpu_type in self._refreshing:
+                return
+            future = asyncio.run_coroutine_threadsafe(
+                self.fetch_rates_async(gpu_type, providers), self._ensure_loop()
+            )
+            self._refreshing[gpu_type] = future
+        
+        def _done(completed):
+            with self._lock:
+                self._refreshing.pop(gpu_type, None)
+            if not completed.cancelled() and completed.exception():
+                logging.error(f"Background pricing refresh failed for {gpu_type.value}: {completed.exception()}")
+        
+        future.add_done_callback(_done)
+    
     def _fetch_fresh_rates(self, gpu_type: GPUType, 
                           providers: List[str]) -> Dict[str, PricingData]:
-        """Fetch fresh pricing data from providers"""
+        """Fetch fresh pricing data from providers (blocking wrapper around the async path)"""
+        return self.fetch_rates(gpu_type, providers)
+    
+    # ------------------------------------------------------------------
+    # Concurrent fetching
+    # ------------------------------------------------------------------
+    
+    def fetch_rates(self, gpu_type: GPUType,
+                    providers: Optional[List[str]] = None) -> Dict[str, PricingData]:
+        """
+        Fetch fresh rates from all providers concurrently and wait for them
         
-        rates = {}
+        Runs fetch_rates_async on the engine's background event loop, so it
+        is safe to call from any thread, including one with its own running
+        loop (such as a UI thread).
         
+        Args:
+            gpu_type: GPU type to get pricing for
+            providers: Optional list of specific providers to query
+            
+        Returns:
+            Dictionary mapping provider names to pricing data
+        """
+        if providers is None:
+            providers = list(self.providers.keys())
+        
+        timeout = max(
+            (self.providers[p].timeout_seconds for p in providers if p in self.providers),
+            default=0
+        ) + FETCH_GRACE_SECONDS
+        
+        future = asyncio.run_coroutine_threadsafe(
+            self.fetch_rates_async(gpu_type, providers), self._ensure_loop()
+        )
+        try:
+            return future.result(timeout)
+        except Exception as e:
+            future.cancel()
+            logging.error(f"Concurrent pricing fetch failed for {gpu_type.value}: {e}")
+            return {}
+    
+    async def fetch_rates_async(self, gpu_type: GPUType,
+                                providers: Optional[List[str]] = None,
+                                session: Optional[aiohttp.ClientSession] = None) -> Dict[str, PricingData]:
+        """
+        Fetch fresh rates from all providers concurrently
+        
+        Each provider is bounded by its own timeout_seconds, so a refresh
+        takes as long as the slowest provider rather than the sum of all.
+        Results are cached and provider status is updated.
+        
+        Args:
+            gpu_type: GPU type to get pricing for
+            providers: Optional list of specific providers to query
+            session: Optional caller-owned session. Without one, calls made
+                on the engine's loop share its pooled session and calls from
+                any other loop use a session scoped to this fetch.
+            
+        Returns:
+            Dictionary mapping provider names to pricing data
+        """
+        if providers is None:
+            providers = list(self.providers.keys())
+        
+        if session is None and asyncio.get_running_loop() is not self._loop:
+            async with self._new_session() as scoped_session:
+                return await self.fetch_rates_async(gpu_type, providers, scoped_session)
+        
+        allowed = []
         for provider in providers:
-            # Check rate limiting
-            if not self.rate_limiter.can_request(provider):
+            # Check rate limiting (takes a token from the provider's budget)
+            if not self.rate_limiter.try_acquire(provider):
                 logging.warning(f"Rate limited for provider {provider}")
                 continue
-            
-            try:
-                pricing_data = self._fetch_provider_pricing(provider, gpu_type)
-                if pricing_data:
-                    rates[provider] = pricing_data
-                    # Cache the result
-                    self.cache.set_pricing(provider, gpu_type, pricing_data)
-                    # Update provider status
-                    self.providers[provider].status = ProviderStatus.ACTIVE
-                    self.providers[provider].last_success = time.time()
-                    self.providers[provider].error_count = 0
-                    
-            except Exception as e:
-                logging.error(f"Failed to fetch pricing from {provider}: {e}")
-                self.providers[provider].error_count += 1
-                if self.providers[provider].error_count > 3:
-                    self.providers[provider].status = ProviderStatus.ERROR
+            allowed.append(provider)
+        
+        if session is None:
+            session = self._get_session()
+        results = await asyncio.gather(
+            *(self._fetch_provider_pricing_async(session, provider, gpu_type) for provider in allowed),
+            return_exceptions=True
+        )
+        
+        rates = {}
+        try:
+            self._collect_fetch_results(gpu_type, allowed, results, rates)
+        finally:
+            self.cache.save()
         
+        self._record_rates(gpu_type, rates)
         return rates
     
-    def _fetch_provider_pricing(self, provider: str, gpu_type: GPUType) -> Optional[PricingData]:
-        """Fetch pricing from a specific provider"""
+    def _collect_fetch_results(self, gpu_type: GPUType, providers: List[str],
+                               results: List[Any], rates: Dict[str, PricingData]):
+        """Cache successful provider results and update provider status"""
+        for provider, result in zip(providers, results):
+            provider_info = self.providers.get(provider)
+            if isinstance(result, BaseException):
+                if isinstance(result, asyncio.TimeoutError):
+                    logging.error(f"Timed out fetching pricing from {provider}")
+                else:
+                    logging.error(f"Failed to fetch pricing from {provider}: {result}")
+                if provider_info:
+                    provider_info.error_count += 1
+                    if provider_info.error_count > 3:
+                        provider_info.status = ProviderStatus.ERROR
+                continue
+            
+            if result:
+                rates[provider] = result
+                # Cache the result (persisted once the whole batch is in)
+                self.cache.set_pricing(provider, gpu_type, result, persist=False)
+                # Update provider status
+                provider_info.status = ProviderStatus.ACTIVE
+                provider_info.last_success = time.time()
+                provider_info.error_count = 0
+    
+    async def _fetch_provider_pricing_async(self, session: aiohttp.ClientSession,
+                                            provider: str, gpu_type: GPUType) -> Optional[PricingData]:
+        """Fetch pricing from a specific provider within its timeout"""
         
         provider_info = self.providers.get(provider)
         if not provider_info or provider_info.status != ProviderStatus.ACTIVE:
             return None
         
         if provider == 'lambda_labs':
-            return self._fetch_lambda_labs_pricing(gpu_type)
+            request = self._fetch_lambda_labs_pricing_async(session, gpu_type)
         elif provider == 'vast_ai':
             return self._fetch_vast_ai_pricing(gpu_type)
         elif provider == 'runpod':
@@ -215,54 +470,83 @@ class DynamicPricingEngine:
         else:
             logging.warning(f"Unknown provider: {provider}")
             return None
-    
-    def _fetch_lambda_labs_pricing(self, gpu_type: GPUType) -> Optional[PricingData]:
-        """Fetch pricing from Lambda Labs API"""
         
-        # GPU type mapping for Lambda Labs
-        gpu_mapping = {
-            GPUType.RTX_4090: "gpu_1x_rtx4090",
-            GPUType.A100: "gpu_1x_a100",
-            GPUType.H100: "gpu_1x_h100"
-        }
+        if provider_info.timeout_seconds:
+            return await asyncio.wait_for(request, provider_info.timeout_seconds)
+        return await request
+    
+    async def _fetch_lambda_labs_pricing_async(self, session: aiohttp.ClientSession,
+                                               gpu_type: GPUType) -> Optional[PricingData]:
+        """Fetch pricing from Lambda Labs API using the shared session"""
         
-        lambda_gpu_type = gpu_mapping.get(gpu_type)
+        lambda_gpu_type = LAMBDA_LABS_GPU_NAMES.get(gpu_type)
         if not lambda_gpu_type:
             return None
         
-        try:
-            # Simulate API call (replace with actual implementation)
-            # In real implementation, use aiohttp or requests here
-            import requests
-            
-            provider_info = self.providers['lambda_labs']
-            response = requests.get(
-                provider_info.api_endpoint,
-                timeout=provider_info.timeout_seconds
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
+        async with session.get(self.providers['lambda_labs'].api_endpoint) as response:
+            if response.status != 200:
+                logging.error(f"Lambda Labs API returned HTTP {response.status}")
+                return None
+            data = await response.json(content_type=None)
+        
+        return self._parse_lambda_labs_pricing(data, gpu_type)
+    
+    def _new_session(self) -> aiohttp.ClientSession:
+        """Create a session with a pooled connector (must run inside a loop)"""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, ttl_dns_cache=300)
+        )
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the engine loop's shared session, creating it on first use"""
+        if self._session is None or self._session.closed:
+            self._session = self._new_session()
+        return self._session
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop used by fetch_rates"""
+        with self._loop_lock:
+            if self._loop is None or not self._loop_thread.is_alive():
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(
+                    target=self._loop.run_forever, name="pricing-fetch-loop", daemon=True
+                )
+                self._loop_thread.start()
+            return self._loop
+    
+    def close(self):
+        """Close the shared HTTP session and stop the background loop"""
+        with self._loop_lock:
+            loop, thread = self._loop, self._loop_thread
+            self._loop = self._loop_thread = None
+        
+        if loop is None:
+            return
+        
+        if self._session is not None:
+            asyncio.run_coroutine_threadsafe(self._session.close(), loop).result(FETCH_GRACE_SECONDS)
+            self._session = None
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(FETCH_GRACE_SECONDS)
+        loop.close()
+    
+    def _parse_lambda_labs_pricing(self, data: Dict[str, Any], gpu_type: GPUType) -> Optional[PricingData]:
+        """Extract pricing for the specific GPU type from a Lambda Labs response"""
+        
+        lambda_gpu_type = LAMBDA_LABS_GPU_NAMES.get(gpu_type)
+        for instance in data.get('data', []):
+            if instance.get('name') == lambda_gpu_type:
+                price_cents_per_hour = instance.get('price_cents_per_hour', 0)
+                hourly_rate = price_cents_per_hour / 100  # Convert cents to dollars
                 
-                # Extract pricing for the specific GPU type
-                for instance in data.get('data', []):
-                    if instance.get('name') == lambda_gpu_type:
-                        price_cents_per_hour = instance.get('price_cents_per_hour', 0)
-                        hourly_rate = price_cents_per_hour / 100  # Convert cents to dollars
-                        
-                        return PricingData(
-                            provider='lambda_labs',
-                            gpu_type=gpu_type,
-                            hourly_rate=hourly_rate,
-                            timestamp=time.time(),
-                            confidence=0.95,  # Lambda Labs has reliable pricing
-                            availability=instance.get('regions_with_capacity_available', {})
-                        )
-            
-        except requests.RequestException as e:
-            logging.error(f"Lambda Labs API error: {e}")
-        except Exception as e:
-            logging.error(f"Lambda Labs parsing error: {e}")
+                return PricingData(
+                    provider='lambda_labs',
+                    gpu_type=gpu_type,
+                    hourly_rate=hourly_rate,
+                    timestamp=time.time(),
+                    confidence=0.95,  # Lambda Labs has reliable pricing
+                    availability=instance.get('regions_with_capacity_available', {})
+                )
         
         return None
     
@@ -429,6 +713,7 @@ class DynamicPricingEngine:
             'confidence': pricing_data.confidence,
             'spot_pricing': pricing_data.spot_price,
             'pricing_timestamp': pricing_data.timestamp,
+            'pricing_stale': pricing_data.stale,
             'notes': [
                 f"Based on {provider} pricing",
                 f"Includes 15% overhead for storage/networking",
@@ -487,24 +772,39 @@ class DynamicPricingEngine:
         
         return {
             'providers': status_report,
+            'rate_limits': self.rate_limiter.get_metrics(),
             'cache_stats': self.cache.get_stats(),
             'last_updated': time.time()
         }
 
 
 class PricingCache:
-    """Simple in-memory cache for pricing data with TTL"""
+    """
+    Disk-backed cache for pricing data with stale-while-revalidate semantics
     
-    def __init__(self, ttl_seconds: int = 3600):  # 1 hour TTL
+    Entries younger than ttl_seconds are fresh. Older entries are still
+    served (marked stale) until max_stale_seconds, so callers can answer
+    immediately and refresh in the background. The cache is loaded from
+    cache_path on start-up and written back atomically after each update.
+    """
+    
+    def __init__(self, ttl_seconds: int = PRICING_CACHE_TTL_SECONDS,
+                 cache_path: Optional[str] = None,
+                 max_stale_seconds: int = PRICING_CACHE_MAX_STALE_SECONDS):
         self.cache = {}
         self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max(max_stale_seconds, ttl_seconds)
+        self.cache_path = cache_path
         self._lock = threading.Lock()
+        self._save_lock = threading.Lock()  # One writer at a time, so saves land in order
+        self._load()
     
     def _cache_key(self, provider: str, gpu_type: GPUType) -> str:
         return f"{provider}:{gpu_type.value}"
     
-    def get_pricing(self, provider: str, gpu_type: GPUType) -> Optional[PricingData]:
-        """Get cached pricing data if still valid"""
+    def get_pricing(self, provider: str, gpu_type: GPUType,
+                    allow_stale: bool = False) -> Optional[PricingData]:
+        """Get cached pricing data if still valid (or merely stale, when allowed)"""
         
         with self._lock:
             key = self._cache_key(provider, gpu_type)
@@ -512,25 +812,80 @@ class PricingCache:
             
             if entry:
                 data, timestamp = entry
-                if time.time() - timestamp < self.ttl_seconds:
+                age = time.time() - timestamp
+                if age < self.ttl_seconds:
                     return data
+                elif age < self.max_stale_seconds:
+                    if allow_stale:
+                        return replace(data, stale=True)
                 else:
                     # Remove expired entry
                     del self.cache[key]
         
         return None
     
-    def set_pricing(self, provider: str, gpu_type: GPUType, data: PricingData):
+    def set_pricing(self, provider: str, gpu_type: GPUType, data: PricingData,
+                    persist: bool = True):
         """Cache pricing data with timestamp"""
         
         with self._lock:
             key = self._cache_key(provider, gpu_type)
-            self.cache[key] = (data, time.time())
+            self.cache[key] = (data, data.timestamp or time.time())
+        
+        if persist:
+            self.save()
     
     def clear_cache(self):
         """Clear all cached data"""
         with self._lock:
             self.cache.clear()
+        self.save()
+    
+    def save(self):
+        """Write the cache to cache_path (no-op for in-memory caches)"""
+        if not self.cache_path:
+            return
+        
+        # Snapshot under the save lock too, so a later snapshot is never overwritten by an earlier one
+        with self._save_lock:
+            with self._lock:
+                entries = [
+                    {'key': key, 'fetched_at': timestamp, 'data': data.to_dict()}
+                    for key, (data, timestamp) in self.cache.items()
+                ]
+            
+            temp_path = None
+            try:
+                directory = os.path.dirname(os.path.abspath(self.cache_path))
+                os.makedirs(directory, exist_ok=True)
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=directory, delete=False,
+                                                 prefix=os.path.basename(self.cache_path),
+                                                 suffix='.tmp') as f:
+                    temp_path = f.name
+                    json.dump({'version': 1, 'entries': entries}, f)
+                os.replace(temp_path, self.cache_path)
+            except OSError as e:
+                logging.warning(f"Could not persist pricing cache: {e}")
+                if temp_path and os.path.exists(temp_path):
+                    os.remove(temp_path)
+    
+    def _load(self):
+        """Load persisted entries, skipping ones too old to serve"""
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return
+        
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                payload = json.load(f)
+            
+            now = time.time()
+            for entry in payload.get('entries', []):
+                if now - entry['fetched_at'] < self.max_stale_seconds:
+                    self.cache[entry['key']] = (PricingData.from_dict(entry['data']), entry['fetched_at'])
+            
+            logging.info(f"Loaded {len(self.cache)} cached pricing entries")
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logging.warning(f"Ignoring unreadable pricing cache {self.cache_path}: {e}")
     
     def get_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
@@ -539,68 +894,184 @@ class PricingCache:
             current_time = time.time()
             valid_entries = sum(1 for _, timestamp in self.cache.values() 
                               if current_time - timestamp < self.ttl_seconds)
+            oldest = max((current_time - timestamp for _, timestamp in self.cache.values()), default=None)
             
             return {
                 'total_entries': total_entries,
                 'valid_entries': valid_entries,
-                'expired_entries': total_entries - valid_entries,
-                'ttl_seconds': self.ttl_seconds
+                'stale_entries': total_entries - valid_entries,
+                'oldest_entry_age_seconds': round(oldest, 1) if oldest is not None else None,
+                'ttl_seconds': self.ttl_seconds,
+                'persistent': bool(self.cache_path)
             }
 
 
+class _TokenBucket:
+    """Token bucket state for one provider (guarded by the owning limiter's lock)"""
+    
+    __slots__ = ('capacity', 'refill_per_second', 'tokens', 'updated', 'admitted', 'throttled')
+    
+    def __init__(self, requests_per_hour: float, burst: int):
+        self.capacity = max(burst, 1)
+        self.refill_per_second = requests_per_hour / 3600
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.admitted = 0
+        self.throttled = 0
+    
+    def refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.refill_per_second)
+        self.updated = now
+    
+    def seconds_until(self, tokens: float) -> float:
+        if self.tokens >= tokens:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float('inf')
+        return (tokens - self.tokens) / self.refill_per_second
+
+
 class RateLimiter:
-    """Simple rate limiter to prevent API abuse"""
+    """
+    Thread-safe token-bucket rate limiter
     
-    def __init__(self):
-        self.requests = {}  # provider -> list of request timestamps
+    Each provider gets a bucket holding up to `burst` tokens that refills at
+    its hourly request budget. One lock guards all buckets, so engines and
+    background analyses sharing a limiter draw from the same budget.
+    """
+    
+    def __init__(self, limits: Optional[Dict[str, Tuple[float, int]]] = None):
+        """
+        Args:
+            limits: Optional provider -> (requests per hour, burst size)
+                overrides of PROVIDER_RATE_LIMITS
+        """
+        self._limits = {**PROVIDER_RATE_LIMITS, **(limits or {})}
+        self._buckets: Dict[str, _TokenBucket] = {}
         self._lock = threading.Lock()
     
+    def configure(self, provider: str, requests_per_hour: float, burst: int):
+        """Set a provider's budget, starting it with a full bucket"""
+        with self._lock:
+            self._limits[provider] = (requests_per_hour, burst)
+            self._buckets[provider] = _TokenBucket(requests_per_hour, burst)
+    
+    def _bucket(self, provider: str) -> _TokenBucket:
+        # Caller holds self._lock
+        bucket = self._buckets.get(provider)
+        if bucket is None:
+            bucket = _TokenBucket(*self._limits.get(provider, DEFAULT_RATE_LIMIT))
+            self._buckets[provider] = bucket
+        bucket.refill(time.monotonic())
+        return bucket
+    
     def can_request(self, provider: str) -> bool:
         """Check if we can make a request to provider without exceeding rate limit"""
-        
         with self._lock:
-            current_time = time.time()
-            
-            # Clean old requests (older than 1 hour)
-            if provider in self.requests:
-                self.requests[provider] = [
-                    req_time for req_time in self.requests[provider]
-                    if current_time - req_time < 3600
-                ]
-            else:
-                self.requests[provider] = []
-            
-            # Check rate limits
-            provider_info = {
-                'lambda_labs': 100,  # per hour
-                'vast_ai': 42,       # 1000 per day ≈ 42 per hour
-                'runpod': 1000       # No API, high limit
-            }
-            
-            limit = provider_info.get(provider, 10)  # Default to 10/hour
-            current_count = len(self.requests[provider])
+            return self._bucket(provider).tokens >= 1
+    
+    def try_acquire(self, provider: str, tokens: int = 1) -> bool:
+        """Take tokens for a request if available; never waits"""
+        with self._lock:
+            bucket = self._bucket(provider)
+            if bucket.tokens >= tokens:
+                bucket.tokens -= tokens
+                bucket.admitted += 1
+                return True
+            bucket.throttled += 1
+            return False
+    
+    async def acquire(self, provider: str, tokens: int = 1,
+                      timeout: Optional[float] = None) -> bool:
+        """
+        Wait until tokens are available and take them
+        
+        Returns:
+            True if admitted, False if the wait would exceed timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        while True:
+            with self._lock:
+                bucket = self._bucket(provider)
+                if tokens > bucket.capacity:
+                    raise ValueError(f"Cannot acquire {tokens} tokens; {provider} burst size is {bucket.capacity}")
+                wait = bucket.seconds_until(tokens)
+                if wait == 0:
+                    bucket.tokens -= tokens
+                    bucket.admitted += 1
+                    return True
+                
+                if deadline is not None and time.monotonic() + wait > deadline:
+                    bucket.throttled += 1
+                    return False
             
-            return current_count < limit
+            await asyncio.sleep(wait)
     
     def record_request(self, provider: str):
-        """Record a request for rate limiting"""
+        """Record a request made outside try_acquire/acquire (may overdraw the bucket)"""
+        with self._lock:
+            bucket = self._bucket(provider)
+            bucket.tokens -= 1
+            bucket.admitted += 1
+    
+    def get_metrics(self) -> Dict[str, Dict[str, Any]]:
+        """Admitted vs. throttled requests and current budget per provider"""
         with self._lock:
-            if provider not in self.requests:
-                self.requests[provider] = []
-            self.requests[provider].append(time.time())
+            metrics = {}
+            for provider in list(self._buckets):
+                bucket = self._bucket(provider)
+                total = bucket.admitted + bucket.throttled
+                metrics[provider] = {
+                    'admitted': bucket.admitted,
+                    'throttled': bucket.throttled,
+                    'throttle_rate': round(bucket.throttled / total, 3) if total else 0.0,
+                    'available_tokens': round(max(bucket.tokens, 0.0), 2),
+                    'burst_size': bucket.capacity,
+                    'requests_per_hour': round(bucket.refill_per_second * 3600, 1)
+                }
+            return metrics
+
+
+_shared_rate_limiter = RateLimiter()
+
+
+def get_shared_rate_limiter() -> RateLimiter:
+    """Process-wide limiter used by every DynamicPricingEngine by default"""
+    return _shared_rate_limiter
+
+
+_shared_pricing_engine: Optional[DynamicPricingEngine] = None
+_shared_pricing_engine_lock = threading.Lock()
+
+
+def get_shared_pricing_engine() -> DynamicPricingEngine:
+    """
+    Process-wide engine, created on first use and closed at interpreter exit
+    
+    Every engine runs its own background loop and HTTP session, so
+    analyzers and convenience functions share this one instead of
+    creating (and leaking) their own.
+    """
+    global _shared_pricing_engine
+    with _shared_pricing_engine_lock:
+        if _shared_pricing_engine is None:
+            _shared_pricing_engine = DynamicPricingEngine()
+            atexit.register(_shared_pricing_engine.close)
+        return _shared_pricing_engine
 
 
 # Convenience functions for easy integration
 def get_gpu_pricing(gpu_type: GPUType, providers: List[str] = None) -> Dict[str, PricingData]:
     """Quick function to get current GPU pricing"""
-    engine = DynamicPricingEngine()
+    engine = get_shared_pricing_engine()
     return engine.get_current_rates(gpu_type, providers)
 
 
 def estimate_training_cost(model_params: int, dataset_tokens: int, 
                           gpu_type: GPUType = GPUType.RTX_4090) -> Dict[str, Any]:
     """Quick function to estimate training cost across providers"""
-    engine = DynamicPricingEngine()
+    engine = get_shared_pricing_engine()
     
     results = {}
     providers = ['lambda_labs', 'vast_ai', 'runpod']
@@ -623,5 +1094,6 @@ __all__ = [
     'PricingData',
     'ProviderStatus',
     'get_gpu_pricing',
-    'estimate_training_cost'
+    'estimate_training_cost',
+    'get_shared_pricing_engine'
 ]
\ No newline at end of file
@@ -6,13 +6,28 @@ Provides sophisticated ROI analysis and cost optimization recommendations
 
 import logging
 import math
+import random
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 from enum import Enum
 import statistics
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
 from .cost_calculator import CostEstimate, TrainingApproach, GPUType
-from .pricing_engine import DynamicPricingEngine, PricingData
+from .pricing_engine import DynamicPricingEngine, PricingData, get_shared_pricing_engine
+
+# Monte Carlo sensitivity configuration
+MONTE_CARLO_DRAWS = 100_000
+MONTE_CARLO_FALLBACK_DRAWS = 5_000  # Pure-Python sampling when NumPy is missing
+MONTE_CARLO_PERCENTILES = (5, 25, 50, 75, 95)
+TORNADO_LOW_PERCENTILE = 10
+TORNADO_HIGH_PERCENTILE = 90
+MIN_SENSITIVITY_MULTIPLIER = 0.01  # Floor for sampled multipliers (keeps costs and savings positive)
 
 class UsagePattern(Enum):
     LIGHT = "light"           # <10K tokens/month
@@ -49,11 +64,67 @@ class OptimizationRecommendation:
     estimated_time_savings: Optional[float] = None
     confidence: float = 0.8
 
+@dataclass
+class SensitivityDistribution:
+    """
+    Distribution of a multiplier applied to a baseline ROI input
+    
+    kind is one of 'lognormal' (params: sigma; median 1.0), 'normal'
+    (mean, std), 'uniform' (low, high) or 'triangular' (low, mode, high).
+    Every kind is clipped below at MIN_SENSITIVITY_MULTIPLIER.
+    """
+    kind: str
+    params: Tuple[float, ...]
+    description: str = ""
+    
+    def sample(self, rng, draws: int):
+        """
+        Draw multipliers with a numpy Generator or a random.Random
+        
+        Draws are floored at MIN_SENSITIVITY_MULTIPLIER, so a zero cost or
+        saving never reaches the break-even and ROI divisions.
+        """
+        if NUMPY_AVAILABLE and isinstance(rng, np.random.Generator):
+            return np.maximum(self._sample_numpy(rng, draws), MIN_SENSITIVITY_MULTIPLIER)
+        return [max(value, MIN_SENSITIVITY_MULTIPLIER) for value in self._sample_python(rng, draws)]
+    
+    def _sample_numpy(self, rng, draws: int):
+        if self.kind == 'lognormal':
+            return rng.lognormal(0.0, self.params[0], draws)
+        if self.kind == 'normal':
+            return rng.normal(self.params[0], self.params[1], draws)
+        if self.kind == 'uniform':
+            return rng.uniform(self.params[0], self.params[1], draws)
+        if self.kind == 'triangular':
+            return rng.triangular(self.params[0], self.params[1], self.params[2], draws)
+        raise ValueError(f"Unknown distribution kind: {self.kind}")
+    
+    def _sample_python(self, rng, draws: int):
+        if self.kind == 'lognormal':
+            return [rng.lognormvariate(0.0, self.params[0]) for _ in range(draws)]
+        if self.kind == 'normal':
+            return [rng.gauss(self.params[0], self.params[1]) for _ in range(draws)]
+        if self.kind == 'uniform':
+            return [rng.uniform(self.params[0], self.params[1]) for _ in range(draws)]
+        if self.kind == 'triangular':
+            low, mode, high = self.params
+            return [rng.triangular(low, high, mode) for _ in range(draws)]
+        raise ValueError(f"Unknown distribution kind: {self.kind}")
+
+
+# Default uncertainty around the point estimates
+DEFAULT_SENSITIVITY_DISTRIBUTIONS = {
+    'usage_volume': SensitivityDistribution('lognormal', (0.4,), 'Monthly token usage'),
+    'api_pricing': SensitivityDistribution('triangular', (0.6, 0.9, 1.15), 'API price per token (trending down)'),
+    'training_cost': SensitivityDistribution('triangular', (0.9, 1.0, 1.8), 'Training cost overrun'),
+    'gpu_rate': SensitivityDistribution('uniform', (0.75, 1.3), 'GPU hourly rate')
+}
+
 class ROICalculator:
     """Advanced ROI analysis for AI training investments"""
     
     def __init__(self, pricing_engine: Optional[DynamicPricingEngine] = None):
-        self.pricing_engine = pricing_engine or DynamicPricingEngine()
+        self.pricing_engine = pricing_engine or get_shared_pricing_engine()
         self.api_pricing = self._initialize_api_pricing()
         logging.info("ROI Calculator initialized")
     
@@ -85,7 +156,8 @@ class ROICalculator:
                                 monthly_token_usage: int,
                                 usage_pattern: UsagePattern = UsagePattern.MODERATE,
                                 target_model: str = "llama-2-7b",
-                                time_horizon: TimeHorizon = TimeHorizon.MEDIUM_TERM) -> Dict[str, Any]:
+                                time_horizon: TimeHorizon = TimeHorizon.MEDIUM_TERM,
+                                monte_carlo: bool = False) -> Dict[str, Any]:
         """
         Comprehensive ROI analysis with multiple scenarios
         
@@ -95,6 +167,7 @@ class ROICalculator:
             usage_pattern: User's usage pattern category
             target_model: Target model for comparison
             time_horizon: Analysis time horizon
+            monte_carlo: Add a Monte Carlo distribution to the sensitivity analysis
             
         Returns:
             Comprehensive ROI analysis
@@ -134,7 +207,7 @@ class ROICalculator:
         
         # Sensitivity analysis
         sensitivity = self._perform_sensitivity_analysis(
-            best_estimate, api_costs, monthly_token_usage
+            best_estimate, api_costs, monthly_token_usage, monte_carlo=monte_carlo
         )
         
         return {
@@ -539,7 +612,8 @@ class ROICalculator:
     def _perform_sensitivity_analysis(self, 
                                     best_estimate: CostEstimate,
                                     api_costs: Dict[str, Any],
-                                    monthly_tokens: int) -> Dict[str, Any]:
+                                    monthly_tokens: int,
+                                    monte_carlo: bool = False) -> Dict[str, Any]:
         """Perform sensitivity analysis on key variables"""
         
         base_training_cost = best_estimate.total_cost_usd
@@ -592,12 +666,183 @@ class ROICalculator:
             
             sensitivity_results[category] = category_results
         
-        return {
+        analysis = {
             'base_break_even_months': round(base_break_even, 2) if base_break_even != float('inf') else None,
             'sensitivity_tests': sensitivity_results,
             'most_sensitive_factor': self._identify_most_sensitive_factor(sensitivity_results),
             'sensitivity_summary': self._summarize_sensitivity(sensitivity_results)
         }
+        
+        if monte_carlo:
+            analysis['monte_carlo'] = self.run_monte_carlo_for_estimate(best_estimate, base_monthly_savings)
+        
+        return analysis
+    
+    def run_monte_carlo_for_estimate(self,
+                                     estimate: CostEstimate,
+                                     monthly_savings: float,
+                                     **options) -> Dict[str, Any]:
+        """
+        Monte Carlo sensitivity for one training estimate
+        
+        Args:
+            estimate: Training cost estimate; its cost breakdown sets how much
+                of the cost follows the GPU rate
+            monthly_savings: Baseline monthly API savings (USD)
+            **options: distributions, draws or seed for run_monte_carlo_sensitivity
+            
+        Returns:
+            Same format as run_monte_carlo_sensitivity
+        """
+        return self.run_monte_carlo_sensitivity(
+            estimate.total_cost_usd, monthly_savings,
+            gpu_cost_share=self._gpu_cost_share(estimate), **options
+        )
+    
+    def run_monte_carlo_sensitivity(self,
+                                    training_cost: float,
+                                    monthly_savings: float,
+                                    gpu_cost_share: float = 1.0,
+                                    distributions: Optional[Dict[str, SensitivityDistribution]] = None,
+                                    draws: int = MONTE_CARLO_DRAWS,
+                                    seed: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Monte Carlo distribution of break-even time and 12-month ROI
+        
+        Samples usage volume, API price, training cost overrun and GPU rate
+        multipliers together, so interactions between them show up in the
+        result. With NumPy, 100k draws take a few milliseconds.
+        
+        Args:
+            training_cost: Baseline training cost (USD)
+            monthly_savings: Baseline monthly API savings (USD)
+            gpu_cost_share: Fraction of the training cost driven by the GPU rate
+            distributions: Per-factor overrides of DEFAULT_SENSITIVITY_DISTRIBUTIONS
+            draws: Number of samples
+            seed: Optional seed for reproducible results
+            
+        Returns:
+            Percentiles, break-even probabilities and tornado-chart data
+        """
+        
+        if training_cost <= 0 or monthly_savings <= 0:
+            return {'error': 'Monte Carlo analysis requires a positive training cost and monthly savings'}
+        
+        unknown = set(distributions or {}) - set(_FACTOR_ARGUMENTS)
+        if unknown:
+            raise ValueError(f"Unknown sensitivity factors: {sorted(unknown)}")
+        distributions = {**DEFAULT_SENSITIVITY_DISTRIBUTIONS, **(distributions or {})}
+        gpu_cost_share = min(max(gpu_cost_share, 0.0), 1.0)
+        
+        if NUMPY_AVAILABLE:
+            rng = np.random.default_rng(seed)
+        else:
+            rng = random.Random(seed)
+            draws = min(draws, MONTE_CARLO_FALLBACK_DRAWS)
+        
+        samples = {factor: dist.sample(rng, draws) for factor, dist in distributions.items()}
+        multipliers = {_FACTOR_ARGUMENTS[factor]: values for factor, values in samples.items()}
+        
+        if NUMPY_AVAILABLE:
+            break_even, roi_12 = self._roi_outcomes(training_cost, monthly_savings, gpu_cost_share, **multipliers)
+            
+            def percentiles(values):
+                points = np.percentile(values, MONTE_CARLO_PERCENTILES)
+                return {f'p{p}': round(float(v), 2) for p, v in zip(MONTE_CARLO_PERCENTILES, points)}
+            
+            break_even_stats = {**percentiles(break_even), 'mean': round(float(break_even.mean()), 2)}
+            roi_stats = {**percentiles(roi_12), 'mean': round(float(roi_12.mean()), 2)}
+            within_6 = float((break_even <= 6).mean())
+            within_12 = float((break_even <= 12).mean())
+            positive_roi = float((roi_12 > 0).mean())
+        else:
+            outcomes = [
+                self._roi_outcomes(training_cost, monthly_savings, gpu_cost_share,
+                                   **{argument: values[i] for argument, values in multipliers.items()})
+                for i in range(draws)
+            ]
+            break_even = [o[0] for o in outcomes]
+            roi_12 = [o[1] for o in outcomes]
+            
+            def percentiles(values):
+                ordered = sorted(values)
+                return {f'p{p}': round(_percentile_sorted(ordered, p), 2) for p in MONTE_CARLO_PERCENTILES}
+            
+            break_even_stats = {**percentiles(break_even), 'mean': round(statistics.fmean(break_even), 2)}
+            roi_stats = {**percentiles(roi_12), 'mean': round(statistics.fmean(roi_12), 2)}
+            within_6 = sum(1 for v in break_even if v <= 6) / draws
+            within_12 = sum(1 for v in break_even if v <= 12) / draws
+            positive_roi = sum(1 for v in roi_12 if v > 0) / draws
+        
+        return {
+            'draws': draws,
+            'break_even_months': break_even_stats,
+            'roi_12_months_percentage': roi_stats,
+            'probability_break_even_6_months': round(within_6, 3),
+            'probability_break_even_12_months': round(within_12, 3),
+            'probability_positive_roi_12_months': round(positive_roi, 3),
+            'tornado': self._tornado_data(training_cost, monthly_savings, gpu_cost_share, samples),
+            'distributions': {
+                factor: {'kind': dist.kind, 'params': list(dist.params), 'description': dist.description}
+                for factor, dist in distributions.items()
+            }
+        }
+    
+    def _roi_outcomes(self, training_cost: float, monthly_savings: float, gpu_cost_share: float,
+                      usage_volume=1.0, api_pricing=1.0, gpu_rate=1.0,
+                      training_cost_multiplier=1.0):
+        """Break-even months and 12-month ROI % for scalar or array multipliers"""
+        cost = training_cost * training_cost_multiplier * (gpu_cost_share * gpu_rate + (1 - gpu_cost_share))
+        savings = monthly_savings * usage_volume * api_pricing
+        return cost / savings, (savings * 12 - cost) / cost * 100
+    
+    def _tornado_data(self, training_cost: float, monthly_savings: float,
+                      gpu_cost_share: float, samples: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Swing in outcomes when one factor moves between its P10 and P90, others at baseline"""
+        
+        base_break_even, base_roi = self._roi_outcomes(training_cost, monthly_savings, gpu_cost_share)
+        bars = []
+        
+        for factor, values in samples.items():
+            if NUMPY_AVAILABLE and isinstance(values, np.ndarray):
+                low, high = (float(v) for v in np.percentile(values, (TORNADO_LOW_PERCENTILE, TORNADO_HIGH_PERCENTILE)))
+            else:
+                ordered = sorted(values)
+                low = _percentile_sorted(ordered, TORNADO_LOW_PERCENTILE)
+                high = _percentile_sorted(ordered, TORNADO_HIGH_PERCENTILE)
+            
+            outcomes = [
+                self._roi_outcomes(training_cost, monthly_savings, gpu_cost_share, **{_FACTOR_ARGUMENTS[factor]: m})
+                for m in (low, high)
+            ]
+            break_even_values = [o[0] for o in outcomes]
+            roi_values = [o[1] for o in outcomes]
+            
+            bars.append({
+                'factor': factor,
+                'low_multiplier': round(low, 3),
+                'high_multiplier': round(high, 3),
+                'break_even_low': round(min(break_even_values), 2),
+                'break_even_high': round(max(break_even_values), 2),
+                'roi_12_low': round(min(roi_values), 1),
+                'roi_12_high': round(max(roi_values), 1),
+                'break_even_swing': round(max(break_even_values) - min(break_even_values), 2)
+            })
+        
+        # Widest bar first, as drawn in a tornado chart
+        bars.sort(key=lambda bar: bar['break_even_swing'], reverse=True)
+        for bar in bars:
+            bar['base_break_even'] = round(base_break_even, 2)
+            bar['base_roi_12'] = round(base_roi, 1)
+        return bars
+    
+    def _gpu_cost_share(self, estimate: CostEstimate) -> float:
+        """Fraction of an estimate's cost that scales with the GPU hourly rate"""
+        if estimate.total_cost_usd <= 0:
+            return 0.0
+        breakdown = estimate.cost_breakdown
+        gpu_cost = breakdown.get('compute_hours', breakdown.get('electricity', 0.0))
+        return min(gpu_cost / estimate.total_cost_usd, 1.0)
     
     def _assess_sensitivity_impact(self, impact_percentage: float) -> str:
         """Assess the impact of sensitivity changes"""
@@ -775,6 +1020,23 @@ class ROICalculator:
         }
 
 
+# Sampled factor -> _roi_outcomes keyword
+_FACTOR_ARGUMENTS = {
+    'usage_volume': 'usage_volume',
+    'api_pricing': 'api_pricing',
+    'training_cost': 'training_cost_multiplier',
+    'gpu_rate': 'gpu_rate'
+}
+
+
+def _percentile_sorted(ordered: List[float], percentile: float) -> float:
+    """Linear-interpolated percentile of pre-sorted values (matches numpy's default)"""
+    position = (len(ordered) - 1) * percentile / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
 class CostOptimizer:
     """Advanced cost optimization engine with intelligent recommendations"""
     
@@ -0,0 +1,226 @@
+# core/token_counts.py
+"""
+Per-tokenizer token counts for the current corpus
+
+Switching tokenizers used to re-tokenize every chunk on the UI thread.
+Counts are now kept per (corpus fingerprint, tokenizer) for the session,
+so switching back to a tokenizer is free. A tokenizer that has not been
+counted yet gets an estimate from a small sample within a moment, and its
+exact counts follow from a background thread.
+
+Update callbacks are invoked from the worker thread; UI code should hand
+them to the Tk thread (e.g. through a queue polled with after()).
+"""
+
+import logging
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from session import chunks_fingerprint
+
+# Configuration constants
+MAX_STORED_COUNT_ARRAYS = 8  # (corpus, tokenizer) pairs kept for the session
+ESTIMATE_SAMPLE_CHUNKS = 32  # Chunks tokenized up front for the estimate
+CANCEL_CHECK_CHUNKS = 64  # Chunks counted between cancellation checks
+
+
+class TokenCountStore:
+    """Session cache of token-count arrays keyed by corpus fingerprint and tokenizer"""
+
+    def __init__(self, max_entries: int = MAX_STORED_COUNT_ARRAYS):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[str, str], array]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, fingerprint: str, tokenizer_name: str) -> Optional[array]:
+        with self._lock:
+            counts = self._entries.get((fingerprint, tokenizer_name))
+            if counts is not None:
+                self._entries.move_to_end((fingerprint, tokenizer_name))
+            return counts
+
+    def put(self, fingerprint: str, tokenizer_name: str, counts: Sequence[int]) -> array:
+        stored = counts if isinstance(counts, array) else array('I', counts)
+        with self._lock:
+            self._entries[(fingerprint, tokenizer_name)] = stored
+            self._entries.move_to_end((fingerprint, tokenizer_name))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return stored
+
+    def counted_tokenizers(self, fingerprint: str) -> List[str]:
+        """Tokenizers with exact counts for this corpus, most recently used last"""
+        with self._lock:
+            return [name for (fp, name) in self._entries if fp == fingerprint]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def sample_indices(chunk_count: int, size: int = ESTIMATE_SAMPLE_CHUNKS) -> List[int]:
+    """Evenly spaced chunk indices (all of them for small corpora)"""
+    if chunk_count <= size:
+        return list(range(chunk_count))
+    step = chunk_count / size
+    return [int(i * step) for i in range(size)]
+
+
+def estimate_token_counts(chunks: Sequence[str],
+                          sample_counts: Dict[int, int],
+                          reference_counts: Optional[Sequence[int]] = None) -> List[int]:
+    """
+    Estimate every chunk's count from counts measured on a sample
+
+    With reference counts from another tokenizer, each chunk's reference
+    count is scaled by the ratio between the tokenizers on the sample.
+    Otherwise the sample's tokens-per-character is applied to each chunk's
+    length. Sampled chunks keep their measured count.
+    """
+    if not sample_counts:
+        return [0] * len(chunks)
+
+    measured = sum(sample_counts.values())
+    if reference_counts is not None:
+        reference = sum(reference_counts[i] for i in sample_counts)
+        ratio = measured / reference if reference else 1.0
+        estimates = [int(round(count * ratio)) for count in reference_counts]
+    else:
+        characters = sum(len(chunks[i]) for i in sample_counts)
+        ratio = measured / characters if characters else 0.0
+        estimates = [int(round(len(chunk) * ratio)) for chunk in chunks]
+
+    for index, count in sample_counts.items():
+        estimates[index] = count
+    return estimates
+
+
+@dataclass
+class TokenCountUpdate:
+    """Estimated or exact counts (and the analysis built on them) for one tokenizer"""
+    tokenizer: str
+    fingerprint: str
+    counts: Sequence[int]
+    analysis: Dict[str, Any]
+    estimated: bool
+    elapsed_seconds: float
+    error: Optional[str] = None
+
+
+class TokenizerSwitchJob:
+    """
+    Provide counts for a newly selected tokenizer without blocking the UI
+
+    count_tokens(text, tokenizer) -> (count, metadata) is typically
+    ProcessingController.get_token_count, and analyze(counts) builds the
+    analysis shown for them. on_update receives an estimated
+    TokenCountUpdate first (unless exact counts are already stored), then
+    the exact one. A cancelled job publishes nothing further.
+    """
+
+    def __init__(self,
+                 chunks: Sequence[str],
+                 tokenizer_name: str,
+                 count_tokens: Callable[[str, str], tuple],
+                 analyze: Callable[[Sequence[int]], Dict[str, Any]],
+                 store: TokenCountStore,
+                 on_update: Callable[[TokenCountUpdate], None],
+                 fingerprint: Optional[str] = None):
+        self.chunks = chunks[:]  # Snapshot; a SpanChunks copies its offsets, not its text
+        self.tokenizer_name = tokenizer_name
+        self.fingerprint = fingerprint
+        self._count_tokens = count_tokens
+        self._analyze = analyze
+        self._store = store
+        self._on_update = on_update
+        self._cancelled = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "TokenizerSwitchJob":
+        self._thread = threading.Thread(target=self._run, name="wolfscribe-token-counts", daemon=True)
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        """Stop counting and drop any results not yet published"""
+        self._cancelled.set()
+
+    @property
+    def done(self) -> bool:
+        return self._thread is not None and not self._thread.is_alive()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        if self._thread is not None:
+            self._thread.join(timeout)
+        return self.done
+
+    def _run(self):
+        started = time.perf_counter()
+        try:
+            if self.fingerprint is None:
+                self.fingerprint = chunks_fingerprint(self.chunks)
+
+            stored = self._store.get(self.fingerprint, self.tokenizer_name)
+            if stored is not None:
+                self._publish(stored, estimated=False, started=started)
+                return
+
+            # Quick estimate from a sample, scaled from another tokenizer's counts if we have them
+            sample = {}
+            for index in sample_indices(len(self.chunks)):
+                if self._cancelled.is_set():
+                    return
+                sample[index] = self._count_tokens(self.chunks[index], self.tokenizer_name)[0]
+
+            if len(sample) < len(self.chunks):
+                reference = None
+                counted = self._store.counted_tokenizers(self.fingerprint)
+                if counted:
+                    reference = self._store.get(self.fingerprint, counted[-1])
+                self._publish(estimate_token_counts(self.chunks, sample, reference),
+                              estimated=True, started=started)
+
+            counts = array('I')
+            for index, chunk in enumerate(self.chunks):
+                if index % CANCEL_CHECK_CHUNKS == 0 and self._cancelled.is_set():
+                    return
+                counts.append(sample[index] if index in sample
+                              else self._count_tokens(chunk, self.tokenizer_name)[0])
+
+            self._store.put(self.fingerprint, self.tokenizer_name, counts)
+            self._publish(counts, estimated=False, started=started)
+
+        except Exception as e:
+            logging.error(f"Token counting failed for {self.tokenizer_name}: {e}")
+            if not self._cancelled.is_set():
+                self._on_update(TokenCountUpdate(
+                    self.tokenizer_name, self.fingerprint or '', [], {}, estimated=False,
+                    elapsed_seconds=round(time.perf_counter() - started, 3), error=str(e)
+                ))
+
+    def _publish(self, counts: Sequence[int], estimated: bool, started: float):
+        analysis = self._analyze(counts)
+        analysis['token_counts_estimated'] = estimated
+        if self._cancelled.is_set():
+            return
+        self._on_update(TokenCountUpdate(
+            tokenizer=self.tokenizer_name,
+            fingerprint=self.fingerprint,
+            counts=counts,
+            analysis=analysis,
+            estimated=estimated,
+            elapsed_seconds=round(time.perf_counter() - started, 3)
+        ))
+
+
+__all__ = [
+    'TokenCountStore',
+    'TokenCountUpdate',
+    'TokenizerSwitchJob',
+    'estimate_token_counts',
+    'sample_indices'
+]
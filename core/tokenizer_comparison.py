@@ -0,0 +1,283 @@
+# core/tokenizer_comparison.py
+"""
+Background tokenizer comparison over the processed corpus
+
+Each available tokenizer runs on its own worker thread over the whole
+corpus, or over a stratified sample when the corpus is large, and reports
+partial results as it goes. Totals for a sample are estimated per stratum
+from tokens-per-character, so long and short chunks are weighted by the
+share of the corpus they actually make up.
+
+Progress callbacks are invoked from worker threads; UI code should hand
+them to the Tk thread (e.g. through a queue polled with after()).
+"""
+
+import logging
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Configuration constants
+SAMPLE_CONFIDENCE_Z = 1.96  # 95% confidence
+SAMPLE_MARGIN_OF_ERROR = 0.02  # Relative margin on tokens-per-character
+SAMPLE_STRATA = 8  # Chunk-length strata
+SAMPLE_SEED = 7  # Fixed so repeated comparisons use the same sample
+PROGRESS_BATCH_CHUNKS = 64  # Chunks tokenized between progress reports
+MAX_COMPARISON_WORKERS = 6
+
+
+@dataclass
+class CorpusSample:
+    """Chunks to tokenize, grouped by stratum, with the corpus totals they stand for"""
+    strata: List[List[str]]
+    stratum_characters: List[int]  # Characters in each stratum of the full corpus
+    total_chunks: int
+    total_characters: int
+    sampled: bool
+
+    @property
+    def sample_chunks(self) -> int:
+        return sum(len(stratum) for stratum in self.strata)
+
+
+@dataclass
+class TokenizerComparisonResult:
+    """Partial or final comparison figures for one tokenizer"""
+    tokenizer: str
+    chunks_done: int
+    chunks_total: int
+    characters_done: int
+    tokens_counted: int
+    estimated_total_tokens: int
+    tokens_per_character: float
+    characters_per_second: float
+    tokens_per_second: float
+    elapsed_seconds: float
+    accuracy: str = 'unknown'
+    sampled: bool = False
+    done: bool = False
+    error: Optional[str] = None
+
+    @property
+    def percent_complete(self) -> float:
+        if not self.chunks_total:
+            return 100.0
+        return round(self.chunks_done / self.chunks_total * 100, 1)
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['percent_complete'] = self.percent_complete
+        return data
+
+
+def required_sample_size(population: int,
+                         z: float = SAMPLE_CONFIDENCE_Z,
+                         margin: float = SAMPLE_MARGIN_OF_ERROR) -> int:
+    """
+    Chunks needed to estimate a proportion within the margin (Cochran, with
+    finite population correction)
+    """
+    if population <= 0:
+        return 0
+    n0 = (z ** 2) * 0.25 / (margin ** 2)
+    return min(population, math.ceil(n0 / (1 + (n0 - 1) / population)))
+
+
+def build_corpus_sample(chunks: Sequence[str],
+                        full_corpus: bool = False,
+                        strata: int = SAMPLE_STRATA,
+                        seed: int = SAMPLE_SEED) -> CorpusSample:
+    """
+    Stratify chunks by length and sample each stratum proportionally
+
+    Args:
+        chunks: The processed corpus
+        full_corpus: Tokenize every chunk instead of sampling
+        strata: Number of chunk-length strata
+        seed: Sampling seed
+
+    Returns:
+        CorpusSample: Chunks to tokenize and the corpus figures they represent
+    """
+    total_chunks = len(chunks)
+    sample_size = required_sample_size(total_chunks)
+    sampled = not full_corpus and sample_size < total_chunks
+
+    # Strata are contiguous runs of chunks ordered by length
+    order = sorted(range(total_chunks), key=lambda i: len(chunks[i]))
+    strata = max(1, min(strata, total_chunks))
+    bounds = [round(total_chunks * s / strata) for s in range(strata + 1)]
+
+    rng = random.Random(seed)
+    sample_strata = []
+    stratum_characters = []
+    for start, end in zip(bounds, bounds[1:]):
+        members = order[start:end]
+        stratum_characters.append(sum(len(chunks[i]) for i in members))
+        if sampled and members:
+            take = max(1, round(sample_size * len(members) / total_chunks))
+            members = sorted(rng.sample(members, min(take, len(members))))
+        sample_strata.append([chunks[i] for i in members])
+
+    return CorpusSample(
+        strata=sample_strata,
+        stratum_characters=stratum_characters,
+        total_chunks=total_chunks,
+        total_characters=sum(stratum_characters),
+        sampled=sampled
+    )
+
+
+class TokenizerComparisonJob:
+    """
+    Tokenize a corpus sample with several tokenizers in parallel
+
+    count_tokens(text, tokenizer) -> (count, metadata) is typically
+    ProcessingController.get_token_count. on_progress receives a
+    TokenizerComparisonResult after every PROGRESS_BATCH_CHUNKS chunks
+    and once more when each tokenizer finishes.
+    """
+
+    def __init__(self,
+                 chunks: Sequence[str],
+                 tokenizers: Sequence[str],
+                 count_tokens: Callable[[str, str], tuple],
+                 on_progress: Optional[Callable[[TokenizerComparisonResult], None]] = None,
+                 full_corpus: bool = False):
+        self.sample = build_corpus_sample(chunks, full_corpus=full_corpus)
+        self.tokenizers = list(tokenizers)
+        self._count_tokens = count_tokens
+        self._on_progress = on_progress
+        self._cancelled = threading.Event()
+        self._results: Dict[str, TokenizerComparisonResult] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._futures = []
+
+    def start(self) -> "TokenizerComparisonJob":
+        workers = max(1, min(MAX_COMPARISON_WORKERS, len(self.tokenizers)))
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="wolfscribe-compare")
+        self._futures = [self._executor.submit(self._run_tokenizer, name) for name in self.tokenizers]
+        self._executor.shutdown(wait=False)
+        logging.info(
+            f"Tokenizer comparison started: {len(self.tokenizers)} tokenizers over "
+            f"{self.sample.sample_chunks} of {self.sample.total_chunks} chunks"
+        )
+        return self
+
+    def cancel(self):
+        """Stop all tokenizers before their next chunk"""
+        self._cancelled.set()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every tokenizer has finished; True if they all did"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for future in self._futures:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                future.result(timeout=remaining)
+            except Exception:
+                return False
+        return True
+
+    @property
+    def done(self) -> bool:
+        return all(future.done() for future in self._futures)
+
+    @property
+    def results(self) -> Dict[str, TokenizerComparisonResult]:
+        """Latest result for each tokenizer"""
+        with self._lock:
+            return dict(self._results)
+
+    def _run_tokenizer(self, tokenizer: str):
+        sample = self.sample
+        chunks_total = sample.sample_chunks
+        stratum_tokens = [0] * len(sample.strata)
+        stratum_chars = [0] * len(sample.strata)
+        chunks_done = 0
+        accuracy = 'unknown'
+        started = time.perf_counter()
+
+        try:
+            for index, stratum in enumerate(sample.strata):
+                for chunk in stratum:
+                    if self._cancelled.is_set():
+                        return
+                    count, metadata = self._count_tokens(chunk, tokenizer)
+                    accuracy = metadata.get('accuracy', accuracy)
+                    stratum_tokens[index] += count
+                    stratum_chars[index] += len(chunk)
+                    chunks_done += 1
+                    if chunks_done % PROGRESS_BATCH_CHUNKS == 0:
+                        self._publish(tokenizer, stratum_tokens, stratum_chars, chunks_done,
+                                      chunks_total, started, accuracy, done=False)
+        except Exception as e:
+            logging.error(f"Tokenizer comparison failed for {tokenizer}: {e}")
+            self._publish(tokenizer, stratum_tokens, stratum_chars, chunks_done,
+                          chunks_total, started, accuracy, done=True, error=str(e))
+            return
+
+        self._publish(tokenizer, stratum_tokens, stratum_chars, chunks_done,
+                      chunks_total, started, accuracy, done=True)
+
+    def _publish(self, tokenizer: str, stratum_tokens: List[int], stratum_chars: List[int],
+                 chunks_done: int, chunks_total: int, started: float, accuracy: str,
+                 done: bool, error: Optional[str] = None):
+        elapsed = time.perf_counter() - started
+        tokens = sum(stratum_tokens)
+        characters = sum(stratum_chars)
+
+        result = TokenizerComparisonResult(
+            tokenizer=tokenizer,
+            chunks_done=chunks_done,
+            chunks_total=chunks_total,
+            characters_done=characters,
+            tokens_counted=tokens,
+            estimated_total_tokens=self._estimate_total(stratum_tokens, stratum_chars),
+            tokens_per_character=round(tokens / characters, 4) if characters else 0.0,
+            characters_per_second=round(characters / elapsed, 1) if elapsed > 0 else 0.0,
+            tokens_per_second=round(tokens / elapsed, 1) if elapsed > 0 else 0.0,
+            elapsed_seconds=round(elapsed, 3),
+            accuracy=accuracy,
+            sampled=self.sample.sampled,
+            done=done,
+            error=error
+        )
+
+        with self._lock:
+            self._results[tokenizer] = result
+        if self._on_progress is not None:
+            try:
+                self._on_progress(result)
+            except Exception as e:
+                logging.warning(f"Tokenizer comparison progress callback failed: {e}")
+
+    def _estimate_total(self, stratum_tokens: List[int], stratum_chars: List[int]) -> int:
+        """Scale each stratum's tokens-per-character up to its share of the corpus"""
+        sample = self.sample
+        measured_tokens = sum(stratum_tokens)
+        measured_chars = sum(stratum_chars)
+        if not measured_chars:
+            return 0
+
+        overall_ratio = measured_tokens / measured_chars
+        estimate = 0.0
+        for tokens, chars, corpus_chars in zip(stratum_tokens, stratum_chars, sample.stratum_characters):
+            # Strata not reached yet borrow the ratio measured so far
+            ratio = tokens / chars if chars else overall_ratio
+            estimate += ratio * corpus_chars
+        return int(round(estimate))
+
+
+__all__ = [
+    'TokenizerComparisonJob',
+    'TokenizerComparisonResult',
+    'CorpusSample',
+    'build_corpus_sample',
+    'required_sample_size'
+]
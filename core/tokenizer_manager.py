@@ -1,10 +1,15 @@
 # core/tokenizer_manager.py - Enhanced with Model Compatibility System
 import logging
 from typing import Dict, List, Tuple, Optional, Any
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, replace
 from enum import Enum
 from datetime import datetime
 import re
+import threading
+
+from .catalogue_store import get_catalogue
+from .model_database import ModelInfo, get_model_catalogue
 
 # Try importing premium tokenizer libraries
 try:
@@ -29,6 +34,17 @@ except ImportError:
     TRANSFORMERS_AVAILABLE = False
     logging.error("transformers library not available - core functionality compromised")
 
+# Optional libraries a catalogue tokenizer can require
+LIBRARY_AVAILABILITY = {
+    'tiktoken': TIKTOKEN_AVAILABLE,
+    'sentence_transformers': SENTENCE_TRANSFORMERS_AVAILABLE,
+    'transformers': TRANSFORMERS_AVAILABLE
+}
+LIBRARY_PACKAGE_NAMES = {'sentence_transformers': 'sentence-transformers'}
+
+# Memo size for model names outside the catalogue (free-text entries)
+COMPATIBILITY_MEMO_SIZE = 256
+
 class PerformanceLevel(Enum):
     FAST = "fast"
     MEDIUM = "medium"
@@ -65,272 +81,63 @@ class ModelCompatibility:
     warnings: List[str]
     icon: str  # Unicode icon for UI display
 
+# Ordering used when filtering and sorting by compatibility
+_COMPATIBILITY_RANK = {
+    CompatibilityLevel.POOR: 0,
+    CompatibilityLevel.ACCEPTABLE: 1,
+    CompatibilityLevel.GOOD: 2,
+    CompatibilityLevel.PERFECT: 3
+}
+
 class TokenizerManager:
     def __init__(self):
         self._tokenizers = {}
         self._compatibility_matrix = self._build_compatibility_matrix()
-        self._model_database = self._build_model_database()
+        # Shared, immutable catalogue entries (also used by the cost calculator)
+        self._model_index = get_model_catalogue().tokenizer_models
+        self._model_database = self._model_index.models
+        
+        # Dense tokenizer x model table, resolved once for every catalogue pair
+        self._recommended_tokenizers: Dict[str, str] = {}
+        self._compatibility_table: Dict[Tuple[str, str], ModelCompatibility] = {}
+        self._compatibility_memo: "OrderedDict[Tuple[str, str], ModelCompatibility]" = OrderedDict()
+        self._memo_lock = threading.Lock()
+        self._build_compatibility_table()
         self._initialize_tokenizers()
 
-    def _build_model_database(self) -> Dict[str, Dict[str, Any]]:
-        """Comprehensive database of popular AI models and their tokenizer requirements"""
-        return {
-            # OpenAI Models
-            'gpt-4': {
-                'family': 'openai',
-                'optimal_tokenizer': 'tiktoken_gpt4',
-                'acceptable_tokenizers': ['tiktoken_gpt35', 'gpt2'],
-                'context_window': 8192,
-                'training_data_cutoff': '2021-09',
-                'use_cases': ['general', 'coding', 'analysis', 'creative'],
-                'pricing_tier': 'premium'
-            },
-            'gpt-4-turbo': {
-                'family': 'openai',
-                'optimal_tokenizer': 'tiktoken_gpt4',
-                'acceptable_tokenizers': ['tiktoken_gpt35', 'gpt2'],
-                'context_window': 128000,
-                'training_data_cutoff': '2023-12',
-                'use_cases': ['general', 'coding', 'analysis', 'creative', 'long_context'],
-                'pricing_tier': 'premium'
-            },
-            'gpt-4o': {
-                'family': 'openai',
-                'optimal_tokenizer': 'tiktoken_gpt4',
-                'acceptable_tokenizers': ['tiktoken_gpt35', 'gpt2'],
-                'context_window': 128000,
-                'training_data_cutoff': '2023-10',
-                'use_cases': ['multimodal', 'general', 'coding', 'analysis'],
-                'pricing_tier': 'premium'
-            },
-            'gpt-3.5-turbo': {
-                'family': 'openai',
-                'optimal_tokenizer': 'tiktoken_gpt35',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'gpt2'],
-                'context_window': 16385,
-                'training_data_cutoff': '2021-09',
-                'use_cases': ['general', 'chatbots', 'summarization'],
-                'pricing_tier': 'standard'
-            },
-            'gpt-3.5-turbo-16k': {
-                'family': 'openai',
-                'optimal_tokenizer': 'tiktoken_gpt35',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'gpt2'],
-                'context_window': 16385,
-                'training_data_cutoff': '2021-09',
-                'use_cases': ['general', 'long_context', 'summarization'],
-                'pricing_tier': 'standard'
-            },
-            
-            # Anthropic Models  
-            'claude-3-opus': {
-                'family': 'anthropic',
-                'optimal_tokenizer': 'claude_estimator',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'gpt2'],
-                'context_window': 200000,
-                'training_data_cutoff': '2023-08',
-                'use_cases': ['analysis', 'creative', 'coding', 'research'],
-                'pricing_tier': 'premium'
-            },
-            'claude-3-sonnet': {
-                'family': 'anthropic',
-                'optimal_tokenizer': 'claude_estimator',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'gpt2'],
-                'context_window': 200000,
-                'training_data_cutoff': '2023-08',
-                'use_cases': ['general', 'analysis', 'creative'],
-                'pricing_tier': 'standard'
-            },
-            'claude-3-haiku': {
-                'family': 'anthropic',
-                'optimal_tokenizer': 'claude_estimator',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'gpt2'],
-                'context_window': 200000,
-                'training_data_cutoff': '2023-08',
-                'use_cases': ['speed', 'simple_tasks', 'cost_effective'],
-                'pricing_tier': 'budget'
-            },
-            'claude-3.5-sonnet': {
-                'family': 'anthropic',
-                'optimal_tokenizer': 'claude_estimator',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'gpt2'],
-                'context_window': 200000,
-                'training_data_cutoff': '2024-04',
-                'use_cases': ['general', 'coding', 'analysis', 'creative'],
-                'pricing_tier': 'standard'
-            },
-            
-            # BERT Family
-            'bert-base-uncased': {
-                'family': 'bert',
-                'optimal_tokenizer': 'sentence_transformer',
-                'acceptable_tokenizers': ['gpt2'],
-                'context_window': 512,
-                'training_data_cutoff': 'pre-2019',
-                'use_cases': ['classification', 'embeddings', 'understanding'],
-                'pricing_tier': 'free'
-            },
-            'bert-large-uncased': {
-                'family': 'bert',
-                'optimal_tokenizer': 'sentence_transformer',
-                'acceptable_tokenizers': ['gpt2'],
-                'context_window': 512,
-                'training_data_cutoff': 'pre-2019',
-                'use_cases': ['classification', 'embeddings', 'understanding'],
-                'pricing_tier': 'free'
-            },
-            'roberta-base': {
-                'family': 'bert',
-                'optimal_tokenizer': 'sentence_transformer',
-                'acceptable_tokenizers': ['gpt2'],
-                'context_window': 512,
-                'training_data_cutoff': 'pre-2019',
-                'use_cases': ['classification', 'embeddings', 'nlp_tasks'],
-                'pricing_tier': 'free'
-            },
-            'distilbert-base-uncased': {
-                'family': 'bert',
-                'optimal_tokenizer': 'sentence_transformer',
-                'acceptable_tokenizers': ['gpt2'],
-                'context_window': 512,
-                'training_data_cutoff': 'pre-2019',
-                'use_cases': ['fast_classification', 'embeddings', 'edge_deployment'],
-                'pricing_tier': 'free'
-            },
-            
-            # LLaMA Family
-            'llama-2-7b': {
-                'family': 'meta',
-                'optimal_tokenizer': 'gpt2',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'tiktoken_gpt35'],
-                'context_window': 4096,
-                'training_data_cutoff': '2023-07',
-                'use_cases': ['open_source', 'local_deployment', 'research'],
-                'pricing_tier': 'free'
-            },
-            'llama-2-13b': {
-                'family': 'meta',
-                'optimal_tokenizer': 'gpt2',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'tiktoken_gpt35'],
-                'context_window': 4096,
-                'training_data_cutoff': '2023-07',
-                'use_cases': ['open_source', 'local_deployment', 'research'],
-                'pricing_tier': 'free'
-            },
-            'llama-2-70b': {
-                'family': 'meta',
-                'optimal_tokenizer': 'gpt2',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'tiktoken_gpt35'],
-                'context_window': 4096,
-                'training_data_cutoff': '2023-07',
-                'use_cases': ['open_source', 'high_quality', 'research'],
-                'pricing_tier': 'free'
-            },
-            
-            # Mistral Models
-            'mistral-7b': {
-                'family': 'mistral',
-                'optimal_tokenizer': 'gpt2',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'tiktoken_gpt35'],
-                'context_window': 8192,
-                'training_data_cutoff': '2023-09',
-                'use_cases': ['open_source', 'multilingual', 'local_deployment'],
-                'pricing_tier': 'free'
-            },
-            'mixtral-8x7b': {
-                'family': 'mistral',
-                'optimal_tokenizer': 'gpt2',
-                'acceptable_tokenizers': ['tiktoken_gpt4', 'tiktoken_gpt35'],
-                'context_window': 32768,
-                'training_data_cutoff': '2023-09',
-                'use_cases': ['open_source', 'high_performance', 'mixture_of_experts'],
-                'pricing_tier': 'free'
-            }
-        }
+    def _build_compatibility_table(self):
+        """Resolve compatibility and recommended tokenizer for every catalogue model"""
+        for model_name in self._model_database:
+            self._recommended_tokenizers[model_name] = self._resolve_recommended_tokenizer(model_name)
+            for tokenizer_name in self._compatibility_matrix:
+                self._compatibility_table[(tokenizer_name, model_name)] = \
+                    self._resolve_compatibility(tokenizer_name, model_name)
 
     def _build_compatibility_matrix(self) -> Dict[str, Dict[str, Any]]:
-        """Build comprehensive model compatibility matrix"""
-        return {
-            'gpt2': {
-                'info': TokenizerInfo(
-                    name='gpt2',
-                    display_name='GPT-2 (Free)',
-                    description='Basic tokenizer - good for general estimation',
-                    is_premium=False,
-                    performance=PerformanceLevel.FAST,
-                    accuracy=AccuracyLevel.ESTIMATED,
-                    compatible_models=['GPT-2', 'General estimation'],
-                    available=TRANSFORMERS_AVAILABLE,
-                    error_message=None if TRANSFORMERS_AVAILABLE else "transformers library not installed"
-                ),
-                'models': ['gpt-2', 'gpt2-medium', 'gpt2-large', 'gpt2-xl'],
-                'use_cases': ['General estimation', 'Development testing', 'Free tier usage']
-            },
-            
-            'tiktoken_gpt4': {
-                'info': TokenizerInfo(
-                    name='tiktoken_gpt4',
-                    display_name='🔒 GPT-4 (Premium)',
-                    description='Exact tokenization for GPT-4 models',
-                    is_premium=True,
-                    performance=PerformanceLevel.FAST,
-                    accuracy=AccuracyLevel.EXACT,
-                    compatible_models=['GPT-4', 'GPT-4-turbo', 'GPT-4o'],
-                    available=TIKTOKEN_AVAILABLE,
-                    error_message=None if TIKTOKEN_AVAILABLE else "tiktoken library not installed"
-                ),
-                'models': ['gpt-4', 'gpt-4-turbo', 'gpt-4o', 'gpt-4-32k'],
-                'use_cases': ['GPT-4 fine-tuning', 'Exact cost estimation', 'Production training']
-            },
-            
-            'tiktoken_gpt35': {
-                'info': TokenizerInfo(
-                    name='tiktoken_gpt35',
-                    display_name='🔒 GPT-3.5-turbo (Premium)',
-                    description='Exact tokenization for GPT-3.5 models',
-                    is_premium=True,
-                    performance=PerformanceLevel.FAST,
-                    accuracy=AccuracyLevel.EXACT,
-                    compatible_models=['GPT-3.5-turbo', 'GPT-3.5-turbo-16k'],
-                    available=TIKTOKEN_AVAILABLE,
-                    error_message=None if TIKTOKEN_AVAILABLE else "tiktoken library not installed"
-                ),
-                'models': ['gpt-3.5-turbo', 'gpt-3.5-turbo-16k', 'gpt-3.5-turbo-instruct'],
-                'use_cases': ['GPT-3.5 fine-tuning', 'Cost optimization', 'API usage planning']
-            },
-            
-            'sentence_transformer': {
-                'info': TokenizerInfo(
-                    name='sentence_transformer',
-                    display_name='🔒 BERT/RoBERTa (Premium)',
-                    description='Tokenization for embedding and encoder models',
-                    is_premium=True,
-                    performance=PerformanceLevel.MEDIUM,
-                    accuracy=AccuracyLevel.EXACT,
-                    compatible_models=['BERT', 'RoBERTa', 'DistilBERT', 'SentenceTransformers'],
-                    available=SENTENCE_TRANSFORMERS_AVAILABLE,
-                    error_message=None if SENTENCE_TRANSFORMERS_AVAILABLE else "sentence-transformers library not installed"
-                ),
-                'models': ['bert-base-uncased', 'roberta-base', 'distilbert-base', 'all-MiniLM-L6-v2'],
-                'use_cases': ['Embedding model training', 'Semantic search', 'Classification tasks']
-            },
+        """Build comprehensive model compatibility matrix from the 'tokenizers' data catalogue"""
+        matrix = {}
+        
+        for name, record in get_catalogue('tokenizers').items():
+            required_library = record.get('requires')
+            available = LIBRARY_AVAILABILITY.get(required_library, False) if required_library else True
             
-            'claude_estimator': {
+            matrix[name] = {
                 'info': TokenizerInfo(
-                    name='claude_estimator',
-                    display_name='🔒 Claude Estimator (Premium)',
-                    description='Estimated tokenization for Claude models',
-                    is_premium=True,
-                    performance=PerformanceLevel.FAST,
-                    accuracy=AccuracyLevel.ESTIMATED,
-                    compatible_models=['Claude-3', 'Claude-3.5', 'Claude-2'],
-                    available=True,  # Always available (uses word-based estimation)
-                    error_message=None
+                    name=name,
+                    display_name=record['display_name'],
+                    description=record['description'],
+                    is_premium=record['is_premium'],
+                    performance=PerformanceLevel(record['performance']),
+                    accuracy=AccuracyLevel(record['accuracy']),
+                    compatible_models=list(record['compatible_models']),
+                    available=available,
+                    error_message=None if available else f"{LIBRARY_PACKAGE_NAMES.get(required_library, required_library)} library not installed"
                 ),
-                'models': ['claude-3-opus', 'claude-3-sonnet', 'claude-3-haiku', 'claude-3.5-sonnet'],
-                'use_cases': ['Claude API usage estimation', 'Anthropic model preparation', 'Cost planning']
+                'models': list(record['models']),
+                'use_cases': list(record['use_cases'])
             }
-        }
+        
+        return matrix
 
     def _initialize_tokenizers(self):
         """Initialize available tokenizers"""
@@ -463,17 +270,19 @@ class TokenizerManager:
 
     def get_recommended_tokenizer(self, model_name: str) -> Optional[str]:
         """Get recommended tokenizer for a specific model"""
+        recommended = self._recommended_tokenizers.get(model_name.lower())
+        if recommended is not None:
+            return recommended
+        return self._resolve_recommended_tokenizer(model_name)
+
+    def _resolve_recommended_tokenizer(self, model_name: str) -> str:
         model_name_lower = model_name.lower()
         
         # Check model database first
-        model_info = None
-        for db_model, info in self._model_database.items():
-            if model_name_lower == db_model.lower():
-                model_info = info
-                break
+        model_info = self._model_database.get(model_name_lower)
         
         if model_info:
-            optimal_tokenizer = model_info['optimal_tokenizer']
+            optimal_tokenizer = model_info.optimal_tokenizer
             if self._compatibility_matrix[optimal_tokenizer]['info'].available:
                 return optimal_tokenizer
         
@@ -501,14 +310,30 @@ class TokenizerManager:
         Returns:
             ModelCompatibility object with detailed compatibility info
         """
+        key = (tokenizer_name, model_name)
+        compatibility = self._compatibility_table.get(key)
+        
+        if compatibility is None:
+            # Free-text model names are resolved once and remembered
+            with self._memo_lock:
+                compatibility = self._compatibility_memo.get(key)
+                if compatibility is None:
+                    compatibility = self._resolve_compatibility(tokenizer_name, model_name)
+                    self._compatibility_memo[key] = compatibility
+                    if len(self._compatibility_memo) > COMPATIBILITY_MEMO_SIZE:
+                        self._compatibility_memo.popitem(last=False)
+                else:
+                    self._compatibility_memo.move_to_end(key)
+        
+        # Callers get their own warnings list; table entries stay untouched
+        return replace(compatibility, warnings=list(compatibility.warnings))
+
+    def _resolve_compatibility(self, tokenizer_name: str, model_name: str) -> ModelCompatibility:
         model_name_lower = model_name.lower()
         model_info = None
         
         # Find model in database (exact match first, then partial)
-        for db_model, info in self._model_database.items():
-            if model_name_lower == db_model.lower():
-                model_info = info
-                break
+        model_info = self._model_database.get(model_name_lower)
         
         # If no exact match, try partial matching
         if not model_info:
@@ -522,8 +347,8 @@ class TokenizerManager:
             return self._assess_unknown_model(tokenizer_name, model_name)
         
         # Assess compatibility based on model info
-        optimal_tokenizer = model_info['optimal_tokenizer']
-        acceptable_tokenizers = model_info.get('acceptable_tokenizers', [])
+        optimal_tokenizer = model_info.optimal_tokenizer
+        acceptable_tokenizers = model_info.acceptable_tokenizers
         
         if tokenizer_name == optimal_tokenizer:
             return ModelCompatibility(
@@ -585,10 +410,10 @@ class TokenizerManager:
             icon=icon
         )
 
-    def _assess_cross_family_compatibility(self, tokenizer_name: str, model_name: str, model_info: Dict) -> ModelCompatibility:
+    def _assess_cross_family_compatibility(self, tokenizer_name: str, model_name: str, model_info: ModelInfo) -> ModelCompatibility:
         """Assess compatibility across different model families"""
-        optimal_tokenizer = model_info['optimal_tokenizer']
-        model_family = model_info['family']
+        optimal_tokenizer = model_info.optimal_tokenizer
+        model_family = model_info.family.value
         
         # Define compatibility between families
         cross_family_matrix = {
@@ -637,21 +462,21 @@ class TokenizerManager:
         """Get model recommendations based on use case"""
         recommendations = []
         
-        for model_name, model_info in self._model_database.items():
-            if target_use_case and target_use_case not in model_info.get('use_cases', []):
-                continue
-                
-            optimal_tokenizer = model_info['optimal_tokenizer']
+        models = self._model_index.by_use_case(target_use_case) if target_use_case else self._model_index
+        
+        for model_info in models:
+            model_name = model_info.name
+            optimal_tokenizer = model_info.optimal_tokenizer
             tokenizer_info = self._compatibility_matrix.get(optimal_tokenizer, {}).get('info')
             
             recommendation = {
                 'model_name': model_name,
-                'model_family': model_info['family'],
+                'model_family': model_info.family.value,
                 'optimal_tokenizer': optimal_tokenizer,
                 'tokenizer_display_name': tokenizer_info.display_name if tokenizer_info else optimal_tokenizer,
-                'context_window': model_info.get('context_window', 'Unknown'),
-                'use_cases': model_info.get('use_cases', []),
-                'pricing_tier': model_info.get('pricing_tier', 'unknown'),
+                'context_window': model_info.context_length,
+                'use_cases': list(model_info.use_cases),
+                'pricing_tier': model_info.pricing_tier,
                 'is_premium_tokenizer': tokenizer_info.is_premium if tokenizer_info else False
             }
             
@@ -748,7 +573,7 @@ class TokenizerManager:
                 'transformers': TRANSFORMERS_AVAILABLE
             },
             'model_database_size': len(self._model_database),
-            'supported_model_families': list(set(info['family'] for info in self._model_database.values()))
+            'supported_model_families': list(set(info.family.value for info in self._model_database.values()))
         }
 
     def validate_tokenizer_model_pair(self, tokenizer_name: str, model_name: str) -> Dict[str, Any]:
@@ -815,7 +640,7 @@ class TokenizerManager:
         """Get all supported model families and their models"""
         families = {}
         for model_name, model_info in self._model_database.items():
-            family = model_info['family']
+            family = model_info.family.value
             if family not in families:
                 families[family] = []
             families[family].append(model_name)
@@ -831,28 +656,26 @@ class TokenizerManager:
         """Search for models compatible with a given tokenizer"""
         compatible_models = []
         
+        level_order = _COMPATIBILITY_RANK
+        minimum_rank = level_order[compatibility_level]
+        
         for model_name in self._model_database.keys():
-            compatibility = self.check_model_compatibility(tokenizer_name, model_name)
+            compatibility = self._compatibility_table.get((tokenizer_name, model_name))
+            if compatibility is None:
+                compatibility = self.check_model_compatibility(tokenizer_name, model_name)
             
             # Check if compatibility meets minimum requirement
-            level_order = {
-                CompatibilityLevel.POOR: 0,
-                CompatibilityLevel.ACCEPTABLE: 1,
-                CompatibilityLevel.GOOD: 2,
-                CompatibilityLevel.PERFECT: 3
-            }
-            
-            if level_order[compatibility.compatibility] >= level_order[compatibility_level]:
+            if level_order[compatibility.compatibility] >= minimum_rank:
                 model_info = self._model_database[model_name]
                 compatible_models.append({
                     'model_name': model_name,
-                    'family': model_info['family'],
+                    'family': model_info.family.value,
                     'compatibility': compatibility.compatibility.value,
                     'confidence': compatibility.confidence,
                     'icon': compatibility.icon,
-                    'context_window': model_info.get('context_window', 'Unknown'),
-                    'use_cases': model_info.get('use_cases', []),
-                    'pricing_tier': model_info.get('pricing_tier', 'unknown')
+                    'context_window': model_info.context_length,
+                    'use_cases': list(model_info.use_cases),
+                    'pricing_tier': model_info.pricing_tier
                 })
         
         # Sort by compatibility level (best first) then by context window
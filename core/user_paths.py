@@ -0,0 +1,48 @@
+# core/user_paths.py
+"""
+Per-user locations for Wolfscribe's persistent caches
+
+Caches used to be written to the working directory, so launching the app
+from a project folder (or the repository) left cache files behind there.
+They now live in the platform's per-user cache directory:
+
+- Windows: %LOCALAPPDATA%\\Wolfscribe\\Cache
+- macOS: ~/Library/Caches/Wolfscribe
+- Other: $XDG_CACHE_HOME/wolfscribe (default ~/.cache/wolfscribe)
+
+Set WOLFSCRIBE_CACHE_DIR to override. Paths are resolved when called, not
+at import time, and directories are created by the writer.
+"""
+
+import os
+import sys
+
+CACHE_DIR_ENV = "WOLFSCRIBE_CACHE_DIR"
+
+
+def user_cache_dir() -> str:
+    """Directory for Wolfscribe's caches (may not exist yet)"""
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return os.path.expanduser(override)
+
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.expanduser(r"~\AppData\Local")
+        return os.path.join(base, "Wolfscribe", "Cache")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/Wolfscribe")
+
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+    return os.path.join(base, "wolfscribe")
+
+
+def user_cache_path(filename: str) -> str:
+    """Path of a cache file inside user_cache_dir()"""
+    return os.path.join(user_cache_dir(), filename)
+
+
+__all__ = [
+    'CACHE_DIR_ENV',
+    'user_cache_dir',
+    'user_cache_path'
+]
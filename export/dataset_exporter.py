@@ -1,21 +1,29 @@
 # export/dataset_exporter.py
 import csv
 
+from processing.chunk_spans import SpanChunks
+
 def save_as_txt(chunks, output_path):
     with open(output_path, "w", encoding="utf-8") as f:
         for chunk in chunks:
             f.write(chunk + "\n")
 
-def save_as_csv(chunks, output_path):
+def save_as_csv(chunks, output_path, include_provenance=False):
+    # Provenance columns need span chunks (see processing.chunk_spans)
+    include_provenance = include_provenance and isinstance(chunks, SpanChunks)
     with open(output_path, "w", newline='', encoding="utf-8") as f:
         writer = csv.DictWriter(
             f,
-            fieldnames=["text"],
+            fieldnames=["text", "source", "start", "end"] if include_provenance else ["text"],
             delimiter=",",             # Standard CSV
             quotechar='"',             # Explicit quoting char
             quoting=csv.QUOTE_ALL,     # Quote everything
             escapechar="\\"            # Escape any embedded quote chars
         )
         writer.writeheader()
+        if include_provenance:
+            for c, span in zip(chunks, chunks.iter_spans()):
+                writer.writerow({"text": c, "source": span.doc_id, "start": span.start, "end": span.end})
+            return
         for c in chunks:
             writer.writerow({"text": c})
\ No newline at end of file
@@ -0,0 +1,463 @@
+# export/report_exporter.py
+"""
+Streaming export engine for cost-analysis reports
+
+Reports are written row by row instead of being assembled in memory:
+CSV and text go straight to the file, JSON is encoded incrementally and
+Excel uses an openpyxl write-only workbook. Approaches are merged from the
+per-model estimate lists (each already sorted by cost), so the full
+comparison matrix is never materialised or re-sorted.
+
+Nothing here touches Tk. Dialogs run export_report() on a worker thread
+and forward its progress events to the UI; headless callers can use
+export_report() directly or export_reports() for many corpora at once.
+"""
+
+import csv
+import heapq
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Configuration constants
+REPORT_FORMATS = {'json': '.json', 'csv': '.csv', 'txt': '.txt', 'excel': '.xlsx'}
+PROGRESS_EVERY_ROWS = 500  # Rows written between progress events
+TEXT_REPORT_TOP_APPROACHES = 10
+TEXT_REPORT_TOP_RECOMMENDATIONS = 5
+CHART_TOP_APPROACHES = 10
+MAX_BATCH_WORKERS = 4
+NOTES_MAX_LENGTH = 100
+EXPORTED_BY = 'Wolfscribe Premium v2.2'
+
+
+@dataclass
+class ReportOptions:
+    """What to include in a report and the dataset details shown in its header"""
+    include_metadata: bool = True
+    include_recommendations: bool = True
+    include_charts: bool = True
+    dataset_chunks: Optional[int] = None
+    tokenizer_name: str = 'gpt2'
+    token_limit: int = 512
+    source_file: Optional[str] = None
+    license_info: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ExportProgress:
+    """Progress event emitted while a report is written"""
+    path: str
+    rows_written: int
+    total_rows: int
+    done: bool = False
+
+    @property
+    def percent(self) -> float:
+        if self.done or not self.total_rows:
+            return 100.0 if self.done else 0.0
+        return round(min(self.rows_written / self.total_rows, 1.0) * 99, 1)
+
+
+@dataclass
+class ExportResult:
+    """Outcome of one export"""
+    path: str
+    format: str
+    rows_written: int
+    fallback_reason: Optional[str] = None  # Set when a different format had to be written
+    error: Optional[str] = None
+
+
+ProgressCallback = Callable[[ExportProgress], None]
+
+
+def export_report(cost_analysis: Dict[str, Any],
+                  path: str,
+                  fmt: Optional[str] = None,
+                  options: Optional[ReportOptions] = None,
+                  on_progress: Optional[ProgressCallback] = None) -> ExportResult:
+    """
+    Write a cost-analysis report
+
+    Args:
+        cost_analysis: Result of ProcessingController.analyze_chunks_with_costs
+        path: Output file
+        fmt: 'json', 'csv', 'txt' or 'excel' (defaults to the path's extension)
+        options: Report contents and header details
+        on_progress: Called with ExportProgress events from the writing thread
+
+    Returns:
+        ExportResult: Where the report went and how many approach rows it has
+
+    Raises:
+        ValueError: If the format is not supported
+        RuntimeError: If writing the report fails
+    """
+    fmt = fmt or _format_for_path(path)
+    if fmt not in REPORT_FORMATS:
+        raise ValueError(f"Unsupported report format: {fmt}. "
+                         f"Supported formats: {', '.join(sorted(REPORT_FORMATS))}")
+    options = options or ReportOptions()
+    progress = _ProgressTracker(path, count_approach_rows(cost_analysis), on_progress)
+
+    try:
+        if fmt == 'json':
+            _write_json(cost_analysis, path, options)
+        elif fmt == 'csv':
+            _write_csv(cost_analysis, path, options, progress)
+        elif fmt == 'txt':
+            _write_text(cost_analysis, path, options, progress)
+        else:
+            try:
+                _write_excel(cost_analysis, path, options, progress)
+            except ImportError:
+                csv_path = os.path.splitext(path)[0] + REPORT_FORMATS['csv']
+                logging.warning(f"openpyxl not available - exporting {csv_path} instead of {path}")
+                progress = _ProgressTracker(csv_path, progress.total_rows, on_progress)
+                _write_csv(cost_analysis, csv_path, options, progress)
+                progress.finish()
+                return ExportResult(csv_path, 'csv', progress.rows_written,
+                                    fallback_reason="Excel export requires the openpyxl package")
+    except (OSError, ValueError, TypeError, KeyError) as e:
+        raise RuntimeError(f"Failed to export {fmt} report to {path}: {e}")
+
+    progress.finish()
+    return ExportResult(path, fmt, progress.rows_written)
+
+
+def export_reports(jobs: Sequence[Tuple[Dict[str, Any], str]],
+                   fmt: Optional[str] = None,
+                   options: Optional[ReportOptions] = None,
+                   max_workers: int = MAX_BATCH_WORKERS,
+                   on_progress: Optional[ProgressCallback] = None) -> List[ExportResult]:
+    """
+    Export reports for many corpora in parallel
+
+    Args:
+        jobs: (cost_analysis, path) pairs
+        fmt: Format for every report (defaults to each path's extension)
+        options: Shared report options
+        max_workers: Reports written at the same time
+        on_progress: Called with every report's progress events
+
+    Returns:
+        List[ExportResult]: One result per job, in job order; failures carry
+        their error instead of raising
+    """
+    def run(job):
+        cost_analysis, path = job
+        try:
+            return export_report(cost_analysis, path, fmt, options, on_progress)
+        except (ValueError, RuntimeError) as e:
+            logging.error(f"Report export failed for {path}: {e}")
+            return ExportResult(path, fmt or _format_for_path(path), 0, error=str(e))
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="wolfscribe-export") as executor:
+        return list(executor.map(run, jobs))
+
+
+def iter_approach_rows(cost_analysis: Dict[str, Any]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield (model, estimate) pairs across all models, cheapest first
+
+    Each model's estimates are already sorted by cost, so the lists are
+    merged lazily rather than collected and re-sorted.
+    """
+    def model_rows(model_name, estimates):
+        for estimate in estimates:
+            yield model_name, estimate
+
+    per_model = [
+        model_rows(model_name, model_data.get('cost_estimates', []))
+        for model_name, model_data in _detailed_results(cost_analysis).items()
+        if 'error' not in model_data
+    ]
+    return heapq.merge(*per_model, key=lambda pair: pair[1]['total_cost_usd'])
+
+
+def count_approach_rows(cost_analysis: Dict[str, Any]) -> int:
+    return sum(
+        len(model_data.get('cost_estimates', []))
+        for model_data in _detailed_results(cost_analysis).values()
+        if 'error' not in model_data
+    )
+
+
+class _ProgressTracker:
+    def __init__(self, path: str, total_rows: int, callback: Optional[ProgressCallback]):
+        self.path = path
+        self.total_rows = total_rows
+        self.rows_written = 0
+        self._callback = callback
+
+    def row_written(self):
+        self.rows_written += 1
+        if self.rows_written % PROGRESS_EVERY_ROWS == 0:
+            self._emit(done=False)
+
+    def finish(self):
+        self._emit(done=True)
+
+    def _emit(self, done: bool):
+        if self._callback is None:
+            return
+        try:
+            self._callback(ExportProgress(self.path, self.rows_written, self.total_rows, done))
+        except Exception as e:
+            logging.warning(f"Export progress callback failed: {e}")
+
+
+def _format_for_path(path: str) -> str:
+    extension = os.path.splitext(path)[1].lower()
+    for fmt, fmt_extension in REPORT_FORMATS.items():
+        if extension == fmt_extension:
+            return fmt
+    return extension.lstrip('.') or 'unknown'
+
+
+def _detailed_results(cost_analysis: Dict[str, Any]) -> Dict[str, Any]:
+    return cost_analysis.get('cost_analysis', {}).get('detailed_results', {})
+
+
+def _hardware_label(estimate: Dict[str, Any]) -> str:
+    hardware = estimate.get('hardware_requirements', {})
+    gpu_count = hardware.get('gpu_count', 1)
+    return f"{hardware.get('gpu_type', 'Unknown')}" + (f" x{gpu_count}" if gpu_count > 1 else "")
+
+
+def _dataset_chunks(cost_analysis: Dict[str, Any], options: ReportOptions) -> int:
+    if options.dataset_chunks is not None:
+        return options.dataset_chunks
+    return cost_analysis.get('total_chunks', 0)
+
+
+def _generated_at() -> str:
+    return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _write_json(cost_analysis: Dict[str, Any], path: str, options: ReportOptions):
+    report = dict(cost_analysis)
+
+    if options.include_metadata:
+        report['export_metadata'] = {
+            'exported_at': datetime.now().isoformat(),
+            'exported_by': EXPORTED_BY,
+            'export_format': 'json',
+            'dataset_info': {
+                'total_chunks': _dataset_chunks(cost_analysis, options),
+                'tokenizer_used': options.tokenizer_name,
+                'token_limit': options.token_limit,
+                'file_processed': os.path.basename(options.source_file) if options.source_file else 'Unknown'
+            },
+            'license_info': options.license_info
+        }
+
+    if not options.include_recommendations and 'recommendations' in report.get('cost_analysis', {}):
+        # Copy rather than mutate: the analysis may be shared with the result cache
+        report['cost_analysis'] = {
+            key: value for key, value in report['cost_analysis'].items() if key != 'recommendations'
+        }
+
+    with open(path, 'w', encoding='utf-8') as f:
+        # json.dump encodes incrementally, writing each fragment as it goes
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+
+def _write_csv(cost_analysis: Dict[str, Any], path: str, options: ReportOptions, progress: _ProgressTracker):
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+
+        # Header with metadata
+        if options.include_metadata:
+            writer.writerow(['# Wolfscribe Cost Analysis Report'])
+            writer.writerow([f'# Generated: {_generated_at()}'])
+            writer.writerow([f'# Dataset: {_dataset_chunks(cost_analysis, options)} chunks'])
+            writer.writerow([f'# Tokenizer: {options.tokenizer_name}'])
+            writer.writerow([''])
+
+        writer.writerow(['Rank', 'Model', 'Training_Approach', 'Cost_USD', 'Time_Hours',
+                         'Hardware_Type', 'GPU_Count', 'Confidence_Percent', 'Notes'])
+
+        for rank, (model_name, estimate) in enumerate(iter_approach_rows(cost_analysis), 1):
+            hardware = estimate.get('hardware_requirements', {})
+            writer.writerow([
+                rank,
+                model_name,
+                estimate['approach_name'],
+                estimate['total_cost_usd'],
+                estimate['training_hours'],
+                hardware.get('gpu_type', 'Unknown'),
+                hardware.get('gpu_count', 1),
+                f"{estimate.get('confidence', 0.8) * 100:.0f}",
+                '; '.join(estimate.get('notes', []))[:NOTES_MAX_LENGTH]
+            ])
+            progress.row_written()
+
+
+def _write_text(cost_analysis: Dict[str, Any], path: str, options: ReportOptions, progress: _ProgressTracker):
+    cost_data = cost_analysis.get('cost_analysis', {})
+
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("💰 WOLFSCRIBE COST ANALYSIS REPORT\n")
+        f.write("=" * 50 + "\n\n")
+
+        if options.include_metadata:
+            f.write(f"Generated: {_generated_at()}\n")
+            f.write(f"Dataset: {_dataset_chunks(cost_analysis, options)} chunks, "
+                    f"{cost_analysis.get('total_tokens', 0):,} tokens\n")
+            f.write(f"Tokenizer: {options.tokenizer_name}\n\n")
+
+        # Executive Summary
+        summary = cost_data.get('summary', {})
+        if summary:
+            f.write("📊 EXECUTIVE SUMMARY\n")
+            f.write("-" * 20 + "\n")
+
+            best_option = summary.get('best_overall', {})
+            if best_option:
+                f.write(f"Best Approach: {best_option.get('best_approach', 'N/A')}\n")
+                f.write(f"Optimal Cost: ${best_option.get('cost', 0):.2f}\n")
+                f.write(f"Training Time: {best_option.get('hours', 0):.1f} hours\n")
+
+            cost_range = summary.get('cost_range', {})
+            if cost_range:
+                f.write(f"Cost Range: ${cost_range.get('min', 0):.2f} - ${cost_range.get('max', 0):.2f}\n")
+                f.write(f"Maximum Savings: ${cost_range.get('max', 0) - cost_range.get('min', 0):.2f}\n")
+
+            f.write(f"Models Analyzed: {summary.get('models_compared', 0)}\n\n")
+
+        # Detailed Results (cheapest approaches only)
+        if count_approach_rows(cost_analysis):
+            f.write("🔧 DETAILED TRAINING APPROACHES\n")
+            f.write("-" * 35 + "\n\n")
+
+            for rank, (model_name, estimate) in enumerate(iter_approach_rows(cost_analysis), 1):
+                if rank > TEXT_REPORT_TOP_APPROACHES:
+                    break
+                f.write(f"{rank:2d}. {estimate['approach_name']} ({model_name})\n")
+                f.write(f"    Cost: ${estimate['total_cost_usd']:.2f} | Time: {estimate['training_hours']:.1f}h\n")
+                f.write(f"    Hardware: {_hardware_label(estimate)}\n\n")
+                progress.row_written()
+
+        # Recommendations
+        if options.include_recommendations:
+            recommendations = cost_data.get('recommendations', [])
+            if recommendations:
+                f.write("💡 OPTIMIZATION RECOMMENDATIONS\n")
+                f.write("-" * 35 + "\n")
+                for i, rec in enumerate(recommendations[:TEXT_REPORT_TOP_RECOMMENDATIONS], 1):
+                    f.write(f"{i}. {rec}\n")
+                f.write("\n")
+
+        # Footer
+        if options.include_metadata:
+            f.write("=" * 50 + "\n")
+            f.write("Generated by Wolfscribe Premium\n")
+            f.write("https://wolflow.ai\n")
+
+
+def _write_excel(cost_analysis: Dict[str, Any], path: str, options: ReportOptions, progress: _ProgressTracker):
+    """Write-only workbook: rows are streamed to disk and never held as cell objects"""
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.chart import BarChart, Reference
+    from openpyxl.styles import Font, PatternFill
+
+    wb = Workbook(write_only=True)
+    cost_data = cost_analysis.get('cost_analysis', {})
+    bold = Font(bold=True)
+
+    def styled(sheet, value, **style):
+        cell = WriteOnlyCell(sheet, value=value)
+        for name, setting in style.items():
+            setattr(cell, name, setting)
+        return cell
+
+    # Summary sheet
+    ws_summary = wb.create_sheet("Executive Summary")
+    ws_summary.column_dimensions['A'].width = 24
+    ws_summary.column_dimensions['B'].width = 40
+    ws_summary.append([styled(ws_summary, "Wolfscribe Training Cost Analysis", font=Font(size=16, bold=True))])
+    ws_summary.append([])
+
+    if options.include_metadata:
+        ws_summary.append([f"Generated: {_generated_at()}"])
+        ws_summary.append([f"Dataset: {_dataset_chunks(cost_analysis, options)} chunks"])
+        ws_summary.append([f"Tokenizer: {options.tokenizer_name}"])
+        ws_summary.append([])
+
+    summary = cost_data.get('summary', {})
+    if summary:
+        best_option = summary.get('best_overall', {})
+        cost_range = summary.get('cost_range', {})
+        ws_summary.append([styled(ws_summary, "Best Training Option:", font=bold),
+                           best_option.get('best_approach', 'N/A')])
+        ws_summary.append(["Optimal Cost:", f"${best_option.get('cost', 0):.2f}"])
+        ws_summary.append(["Training Time:", f"{best_option.get('hours', 0):.1f} hours"])
+        ws_summary.append([])
+        ws_summary.append(["Cost Range:", f"${cost_range.get('min', 0):.2f} - ${cost_range.get('max', 0):.2f}"])
+
+    # Detailed comparison sheet (write-only sheets need widths before rows)
+    ws_details = wb.create_sheet("Cost Comparison")
+    for column, width in zip("ABCDEFG", (8, 20, 40, 14, 14, 24, 12)):
+        ws_details.column_dimensions[column].width = width
+
+    header_fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
+    ws_details.append([
+        styled(ws_details, header, font=bold, fill=header_fill)
+        for header in ['Rank', 'Model', 'Approach', 'Cost (USD)', 'Time (Hours)', 'Hardware', 'Confidence']
+    ])
+
+    for rank, (model_name, estimate) in enumerate(iter_approach_rows(cost_analysis), 1):
+        ws_details.append([
+            rank,
+            model_name,
+            estimate['approach_name'],
+            styled(ws_details, estimate['total_cost_usd'], number_format='"$"#,##0.00'),
+            styled(ws_details, estimate['training_hours'], number_format='0.0"h"'),
+            _hardware_label(estimate),
+            styled(ws_details, estimate.get('confidence', 0.8), number_format='0%')
+        ])
+        progress.row_written()
+
+    # Costs are stored as numbers, so the chart can plot them directly
+    if options.include_charts and progress.rows_written > 1:
+        last_row = min(CHART_TOP_APPROACHES, progress.rows_written) + 1
+        chart = BarChart()
+        chart.type = "col"
+        chart.style = 10
+        chart.title = "Training Cost Comparison"
+        chart.y_axis.title = "Cost (USD)"
+        chart.x_axis.title = "Training Approach"
+        chart.add_data(Reference(ws_details, min_col=4, min_row=1, max_row=last_row), titles_from_data=True)
+        chart.set_categories(Reference(ws_details, min_col=3, min_row=2, max_row=last_row))
+        ws_details.add_chart(chart, "I2")
+
+    # Recommendations sheet
+    if options.include_recommendations:
+        recommendations = cost_data.get('recommendations', [])
+        if recommendations:
+            ws_rec = wb.create_sheet("Recommendations")
+            ws_rec.column_dimensions['A'].width = 100
+            ws_rec.append([styled(ws_rec, "Cost Optimization Recommendations", font=Font(size=14, bold=True))])
+            ws_rec.append([])
+            for i, rec in enumerate(recommendations, 1):
+                ws_rec.append([f"{i}. {rec}"])
+
+    wb.save(path)
+
+
+__all__ = [
+    'export_report',
+    'export_reports',
+    'iter_approach_rows',
+    'count_approach_rows',
+    'ReportOptions',
+    'ExportProgress',
+    'ExportResult',
+    'REPORT_FORMATS'
+]
@@ -1,22 +1,30 @@
 # main.py - Enhanced with Modern Slate Theme
+#
+# Startup is splash-first: only Tk, the theme and ui.startup are imported
+# before the window paints. The controller, extractors and tokenizer
+# libraries load on a background thread (see ui/startup.py), and the main
+# frame is built once they are ready.
+#
+#   python main.py --startup-report   import-time breakdown of both paths
+import sys
 from tkinterdnd2 import TkinterDnD
 import ttkbootstrap as ttkb
 from ttkbootstrap.constants import *
 import tkinter as tk
-from ui.app_frame import AppFrame
+from ui.startup import StartupLoader, run_startup_report
 
 def main():
     # Use TkinterDnD-capable root window
     root = TkinterDnD.Tk()
-    
+
     # Apply modern dark theme as base (darkly is a good dark theme in ttkbootstrap)
     style = ttkb.Style(theme="darkly")  # Using darkly as base for dark theme
-    
+
     # Apply our custom modern slate styling
     from ui.styles import apply_modern_slate_theme, apply_hover_style, MODERN_SLATE
     apply_modern_slate_theme(style)
     apply_hover_style(style)
-    
+
     # Link style to root window
     style.master = root
 
@@ -24,7 +32,7 @@ def main():
     root.title("Wolfscribe - Dataset Generator")
     root.geometry("750x600")
     root.minsize(750, 600)
-    
+
     # Set modern dark background
     root.configure(bg=MODERN_SLATE['bg_primary'])
 
@@ -34,16 +42,38 @@ def main():
     except:
         pass  # Fallback silently if no icon found
 
-    # Create main application frame
-    frame = AppFrame(root)
-    frame.pack(fill=BOTH, expand=YES)
-
     # Set window-level dark theme properties
     root.option_add('*TCombobox*Listbox.selectBackground', MODERN_SLATE['accent_blue'])
     root.option_add('*TCombobox*Listbox.background', MODERN_SLATE['bg_cards'])
     root.option_add('*TCombobox*Listbox.foreground', MODERN_SLATE['text_primary'])
 
+    # Splash shown while the controller loads
+    splash = ttkb.Frame(root, style="Modern.TFrame")
+    splash.pack(fill=BOTH, expand=YES)
+    ttkb.Label(splash, text="Wolfscribe", style="Heading.TLabel").pack(expand=YES, anchor=S)
+    ttkb.Label(splash, text="Loading tokenizers and extractors...",
+               style="Secondary.TLabel").pack(expand=YES, anchor=N, pady=(8, 0))
+
+    def show_app(loader):
+        if loader.error is not None:
+            from tkinter import messagebox
+            messagebox.showerror("Startup Error", f"Wolfscribe failed to start:\n{loader.error}")
+            root.destroy()
+            return
+
+        # Create main application frame
+        from ui.app_frame import AppFrame
+        frame = AppFrame(root, controller=loader.controller)
+        splash.destroy()
+        frame.pack(fill=BOTH, expand=YES)
+
+    # Load the controller in the background once the splash is laid out
+    root.update_idletasks()
+    loader = StartupLoader().start()
+    loader.when_ready(root, show_app)
     root.mainloop()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    if "--startup-report" in sys.argv[1:]:
+        sys.exit(run_startup_report())
+    main()
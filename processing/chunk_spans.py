@@ -0,0 +1,151 @@
+# processing/chunk_spans.py
+"""
+Offset-based chunk storage for Wolfscribe
+
+A SpanChunks holds each chunk as (doc_id, start, end) over the cleaned text
+of its document instead of as its own string. The cleaned text is kept
+once and shared, and chunk text is sliced out only when a chunk is read,
+so a large book no longer costs its text twice (once cleaned, once as
+chunks).
+
+SpanChunks is a Sequence[str], so exporters, tokenizers, the
+deduplicator and previews use it exactly like a list of strings. The spans
+themselves record where every chunk came from, for citation and for
+tracing duplicates back to their source.
+"""
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Sequence, Tuple, Union
+
+
+class ChunkSpan(NamedTuple):
+    """Where a chunk lives: its document and character offsets in the cleaned text"""
+    doc_id: str
+    start: int
+    end: int
+
+
+class SpanChunks(Sequence):
+    """
+    Chunks stored as spans over shared document text
+
+    Indexing returns the chunk's text; slicing returns a SpanChunks over the
+    same documents. Use span(i) or iter_spans() for provenance.
+    """
+
+    __slots__ = ('_texts', '_doc_ids', '_doc_index', '_docs', '_starts', '_ends')
+
+    def __init__(self):
+        self._texts: List[str] = []  # Cleaned text per document
+        self._doc_ids: List[str] = []  # doc_id per document
+        self._doc_index: Dict[str, int] = {}  # doc_id -> document index
+        self._docs = array('I')  # Document index per chunk
+        self._starts = array('Q')
+        self._ends = array('Q')
+
+    @classmethod
+    def from_spans(cls, doc_id: str, text: str, spans: Iterable[Tuple[int, int]]) -> "SpanChunks":
+        """Chunks of one document from (start, end) offsets into its text"""
+        chunks = cls()
+        index = chunks.add_document(doc_id, text)
+        for start, end in spans:
+            chunks._docs.append(index)
+            chunks._starts.append(start)
+            chunks._ends.append(end)
+        return chunks
+
+    def add_document(self, doc_id: str, text: str) -> int:
+        """Register a document's text (once) and return its index"""
+        index = self._doc_index.get(doc_id)
+        if index is not None:
+            existing = self._texts[index]
+            if existing is not text and existing != text:
+                raise ValueError(f"Document {doc_id} is already registered with different text")
+            return index
+        self._doc_index[doc_id] = len(self._texts)
+        self._texts.append(text)
+        self._doc_ids.append(doc_id)
+        return len(self._texts) - 1
+
+    def append(self, doc_id: str, start: int, end: int):
+        """Add a chunk of an already registered document"""
+        if doc_id not in self._doc_index:
+            raise KeyError(f"Unknown document: {doc_id}")
+        self._docs.append(self._doc_index[doc_id])
+        self._starts.append(start)
+        self._ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index: Union[int, slice]):
+        if isinstance(index, slice):
+            return self._subset(self._docs[index], self._starts[index], self._ends[index])
+        return self._texts[self._docs[index]][self._starts[index]:self._ends[index]]
+
+    def __iter__(self) -> Iterator[str]:
+        texts = self._texts
+        for doc, start, end in zip(self._docs, self._starts, self._ends):
+            yield texts[doc][start:end]
+
+    def __repr__(self) -> str:
+        return f"SpanChunks({len(self)} chunks over {len(self._doc_ids)} documents)"
+
+    def span(self, index: int) -> ChunkSpan:
+        """Provenance of one chunk"""
+        return ChunkSpan(self._doc_ids[self._docs[index]], self._starts[index], self._ends[index])
+
+    def iter_spans(self) -> Iterator[ChunkSpan]:
+        doc_ids = self._doc_ids
+        for doc, start, end in zip(self._docs, self._starts, self._ends):
+            yield ChunkSpan(doc_ids[doc], start, end)
+
+    def document(self, doc_id: str) -> str:
+        """Cleaned text of a document"""
+        return self._texts[self._doc_index[doc_id]]
+
+    @property
+    def doc_ids(self) -> List[str]:
+        return list(self._doc_ids)
+
+    def select(self, indices: Iterable[int]) -> "SpanChunks":
+        """The chunks at indices, in the given order, sharing this object's documents"""
+        docs, starts, ends = array('I'), array('Q'), array('Q')
+        for i in indices:
+            docs.append(self._docs[i])
+            starts.append(self._starts[i])
+            ends.append(self._ends[i])
+        return self._subset(docs, starts, ends)
+
+    def _subset(self, docs: array, starts: array, ends: array) -> "SpanChunks":
+        subset = SpanChunks()
+        subset._texts = self._texts
+        subset._doc_ids = self._doc_ids
+        subset._doc_index = self._doc_index
+        subset._docs, subset._starts, subset._ends = docs, starts, ends
+        return subset
+
+    @classmethod
+    def concat(cls, parts: Iterable["SpanChunks"]) -> "SpanChunks":
+        """One SpanChunks holding every part's chunks in order"""
+        combined = cls()
+        for part in parts:
+            remap = [combined.add_document(doc_id, text) for doc_id, text in zip(part._doc_ids, part._texts)]
+            combined._docs.extend(remap[doc] for doc in part._docs)
+            combined._starts.extend(part._starts)
+            combined._ends.extend(part._ends)
+        return combined
+
+
+def concat_chunks(parts: Sequence[Sequence[str]]) -> Sequence[str]:
+    """Concatenate chunk sequences, keeping spans when every part has them"""
+    if parts and all(isinstance(part, SpanChunks) for part in parts):
+        return SpanChunks.concat(parts)
+    return [chunk for part in parts for chunk in part]
+
+
+__all__ = [
+    'ChunkSpan',
+    'SpanChunks',
+    'concat_chunks'
+]
@@ -0,0 +1,291 @@
+# processing/dedup.py
+"""
+Chunk deduplication stage for Wolfscribe
+
+Runs between splitting and export to drop repeated chunks (boilerplate,
+license headers, passages shared between editions) before they inflate
+the training set:
+
+1. Exact duplicates are caught by a 64-bit hash of the whitespace-normalised text
+2. Near duplicates are caught by MinHash signatures over word shingles,
+   bucketed with LSH banding so each chunk is only compared against the
+   few earlier chunks that share a band
+
+Chunks are processed as a stream and their text is never kept. Each
+unique chunk costs roughly 100 bytes in the exact-hash table plus about
+1 KB (its signature and one entry per band) in the near-duplicate index.
+The index holds at most max_indexed_chunks signatures; once it is full,
+later chunks are still checked against it and against the exact table,
+but are not added to it. Chunks without any word characters (scene
+breaks such as "***") are only deduplicated exactly.
+"""
+
+import hashlib
+import logging
+import random
+import re
+from array import array
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from processing.chunk_spans import SpanChunks
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+DEFAULT_NUM_PERM = 64  # MinHash permutations per signature
+DEFAULT_BANDS = 8  # LSH bands (rows per band = num_perm / bands)
+DEFAULT_THRESHOLD = 0.8  # Estimated Jaccard similarity that counts as a duplicate
+DEFAULT_SHINGLE_SIZE = 3  # Words per shingle
+DEFAULT_MAX_INDEXED_CHUNKS = 250_000  # Signatures kept in the near-duplicate index (~250 MB)
+CLUSTER_PREVIEW_LENGTH = 80  # Characters kept from the first duplicate removed from each cluster
+TOP_CLUSTERS_REPORTED = 5
+
+_UINT64_MASK = (1 << 64) - 1
+_PERMUTATION_SEED = 1  # Fixed so signatures are stable across runs
+_WORD_RE = re.compile(r'\w+')
+
+
+@dataclass
+class DuplicateCluster:
+    preview: str  # Start of the first removed duplicate (retained chunks' text is not kept)
+    size: int  # Including the retained chunk
+
+
+@dataclass
+class DedupStats:
+    total_chunks: int = 0
+    unique_chunks: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+    unindexed_chunks: int = 0  # Unique chunks left out of a full near-duplicate index
+    duplicate_clusters: int = 0
+    largest_cluster: int = 0
+    characters_removed: int = 0
+    threshold: float = DEFAULT_THRESHOLD
+    top_clusters: List[DuplicateCluster] = field(default_factory=list)
+
+    @property
+    def duplicates_removed(self) -> int:
+        return self.exact_duplicates + self.near_duplicates
+
+    @property
+    def duplicate_percentage(self) -> float:
+        if not self.total_chunks:
+            return 0.0
+        return round(self.duplicates_removed / self.total_chunks * 100, 1)
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['duplicates_removed'] = self.duplicates_removed
+        data['duplicate_percentage'] = self.duplicate_percentage
+        return data
+
+
+class ChunkDeduplicator:
+    """
+    Streaming exact + MinHash/LSH deduplicator
+
+    Feed chunks one at a time with is_duplicate(), or filter an iterable
+    with iter_unique(). The first occurrence of each cluster is kept.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD,
+                 num_perm: int = DEFAULT_NUM_PERM,
+                 bands: int = DEFAULT_BANDS,
+                 shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                 exact_only: bool = False,
+                 max_indexed_chunks: int = DEFAULT_MAX_INDEXED_CHUNKS):
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be divisible by bands ({bands})")
+        if not 0.0 < threshold <= 1.0:
+            raise ValueError(f"threshold must be in (0, 1], got {threshold}")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        self.exact_only = exact_only
+        self.max_indexed_chunks = max_indexed_chunks
+
+        # Multiply-add-shift hashing of 32-bit shingle hashes:
+        # h(x) = ((a*x + b) mod 2^64) >> 32 with a odd. uint64 arithmetic wraps
+        # exactly like the masked Python version, so both paths agree.
+        rng = random.Random(_PERMUTATION_SEED)
+        self._perm_a = [rng.getrandbits(64) | 1 for _ in range(num_perm)]
+        self._perm_b = [rng.getrandbits(64) for _ in range(num_perm)]
+        if NUMPY_AVAILABLE:
+            self._np_a = np.array(self._perm_a, dtype=np.uint64)[:, None]
+            self._np_b = np.array(self._perm_b, dtype=np.uint64)[:, None]
+
+        self._exact: Dict[int, int] = {}  # exact hash -> representative id
+        self._band_buckets: List[Dict[int, int]] = [{} for _ in range(bands)]  # band key -> index slot
+        self._signatures = array('I')  # Flat store, num_perm values per index slot
+        self._slot_representatives = array('I')  # Index slot -> representative id
+        self._cluster_sizes: Dict[int, int] = {}  # representative id -> duplicates seen
+        self._cluster_previews: Dict[int, str] = {}  # Only for representatives with duplicates
+        self.stats = DedupStats(threshold=threshold)
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def is_duplicate(self, chunk: str) -> bool:
+        """Record a chunk and report whether an earlier chunk already covers it"""
+        self.stats.total_chunks += 1
+        normalized = ' '.join(chunk.split())
+
+        exact_key = _exact_hash(normalized)
+        representative = self._exact.get(exact_key)
+        if representative is not None:
+            self.stats.exact_duplicates += 1
+            self._record_duplicate(representative, chunk)
+            return True
+
+        # Chunks without words share an empty shingle set, so only exact matches count for them
+        shingle_hashes = None if self.exact_only else self._shingle_hashes(normalized)
+        if shingle_hashes:
+            signature = self._signature(shingle_hashes)
+            band_keys = self._band_keys(signature)
+
+            representative = self._find_near_duplicate(signature, band_keys)
+            if representative is not None:
+                self.stats.near_duplicates += 1
+                self._record_duplicate(representative, chunk)
+                return True
+
+        # New representative
+        representative = self.stats.unique_chunks
+        self.stats.unique_chunks += 1
+        self._exact[exact_key] = representative
+        if shingle_hashes:
+            if len(self._slot_representatives) < self.max_indexed_chunks:
+                slot = len(self._slot_representatives)
+                self._slot_representatives.append(representative)
+                self._signatures.extend(signature)
+                for bucket, key in zip(self._band_buckets, band_keys):
+                    bucket.setdefault(key, slot)
+            else:
+                self.stats.unindexed_chunks += 1
+        return False
+
+    def iter_unique(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Yield only the chunks that are not duplicates of an earlier one"""
+        for chunk in chunks:
+            if not self.is_duplicate(chunk):
+                yield chunk
+
+    def finalize_stats(self) -> DedupStats:
+        """Fill in cluster statistics and return the stats"""
+        sizes = self._cluster_sizes
+        self.stats.duplicate_clusters = len(sizes)
+        self.stats.largest_cluster = max(sizes.values(), default=0) + (1 if sizes else 0)
+
+        top = sorted(sizes.items(), key=lambda item: item[1], reverse=True)[:TOP_CLUSTERS_REPORTED]
+        self.stats.top_clusters = [
+            DuplicateCluster(preview=self._cluster_previews.get(rep, ''), size=count + 1)
+            for rep, count in top
+        ]
+        return self.stats
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _record_duplicate(self, representative: int, chunk: str) -> None:
+        self._cluster_sizes[representative] = self._cluster_sizes.get(representative, 0) + 1
+        if representative not in self._cluster_previews:
+            # The retained chunk's text is not kept, so the cluster is shown by its first removed duplicate
+            self._cluster_previews[representative] = chunk[:CLUSTER_PREVIEW_LENGTH]
+        self.stats.characters_removed += len(chunk)
+
+    def _shingle_hashes(self, normalized: str) -> List[int]:
+        words = _WORD_RE.findall(normalized.lower())
+        if not words:
+            return []
+        k = self.shingle_size
+        if len(words) <= k:
+            shingles = {' '.join(words)}
+        else:
+            shingles = {' '.join(words[i:i + k]) for i in range(len(words) - k + 1)}
+        return [_shingle_hash(s) for s in shingles]
+
+    def _signature(self, hashes: List[int]) -> List[int]:
+        if NUMPY_AVAILABLE:
+            values = np.array(hashes, dtype=np.uint64)[None, :]
+            permuted = (self._np_a * values + self._np_b) >> np.uint64(32)
+            return permuted.min(axis=1).tolist()
+
+        return [
+            min(((a * x + b) & _UINT64_MASK) >> 32 for x in hashes)
+            for a, b in zip(self._perm_a, self._perm_b)
+        ]
+
+    def _band_keys(self, signature: List[int]) -> List[int]:
+        rows = self.rows
+        return [hash(tuple(signature[i:i + rows])) for i in range(0, self.num_perm, rows)]
+
+    def _find_near_duplicate(self, signature: List[int], band_keys: List[int]) -> Optional[int]:
+        checked = set()
+        for bucket, key in zip(self._band_buckets, band_keys):
+            slot = bucket.get(key)
+            if slot is None or slot in checked:
+                continue
+            checked.add(slot)
+            if self._estimated_similarity(signature, slot) >= self.threshold:
+                return self._slot_representatives[slot]
+        return None
+
+    def _estimated_similarity(self, signature: List[int], slot: int) -> float:
+        start = slot * self.num_perm
+        stored = self._signatures[start:start + self.num_perm]
+        matches = sum(1 for a, b in zip(signature, stored) if a == b)
+        return matches / self.num_perm
+
+
+def deduplicate_chunks(chunks: Iterable[str],
+                       threshold: float = DEFAULT_THRESHOLD,
+                       exact_only: bool = False) -> Tuple[Sequence[str], DedupStats]:
+    """
+    Remove exact and near-duplicate chunks, keeping first occurrences
+
+    Args:
+        chunks: Chunks in export order
+        threshold (float): Estimated Jaccard similarity treated as a duplicate
+        exact_only (bool): Skip the MinHash stage and drop exact repeats only
+
+    Returns:
+        Tuple[Sequence[str], DedupStats]: Retained chunks (a SpanChunks when
+        given one) and duplicate statistics
+    """
+    deduplicator = ChunkDeduplicator(threshold=threshold, exact_only=exact_only)
+    if isinstance(chunks, SpanChunks):
+        # Keep the retained chunks' spans (and so their provenance) rather than copying text
+        unique = chunks.select(
+            index for index, chunk in enumerate(chunks) if not deduplicator.is_duplicate(chunk)
+        )
+    else:
+        unique = list(deduplicator.iter_unique(chunks))
+
+    stats = deduplicator.finalize_stats()
+    logger.info(
+        f"Deduplication: {stats.total_chunks} chunks -> {stats.unique_chunks} "
+        f"({stats.exact_duplicates} exact, {stats.near_duplicates} near duplicates)"
+    )
+    return unique, stats
+
+
+def _exact_hash(normalized: str) -> int:
+    return int.from_bytes(hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _shingle_hash(shingle: str) -> int:
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'little')
@@ -19,100 +19,233 @@ Supported formats:
 - XML: Extensible markup language documents
 - PPTX/PPT: Microsoft PowerPoint presentations (NEW)
 - Code Files: Python, JavaScript, Java, C/C++, and 25+ other languages (NEW)
+
+Extractor modules are imported on first use through ExtractorRegistry, and
+other packages can add formats via the "wolfscribe.extractors" entry points.
 """
 
+import importlib
+import logging
 import os
-from typing import Dict, Callable
-
-# Import all extractor modules
-from processing.extractors import (
-    txt_extractor,
-    pdf_extractor, 
-    epub_extractor,
-    docx_extractor,
-    csv_extractor,
-    md_extractor,
-    json_extractor,
-    xlsx_extractor,
-    html_extractor,
-    xml_extractor,
-    pptx_extractor,  
-    code_extractor   # Source code support
-)
-
-# Extension to extractor function mapping
-EXTENSION_LOADERS: Dict[str, Callable[[str], str]] = {
+import threading
+from collections.abc import Mapping
+from typing import Any, Dict, Callable, Iterator, Optional, Union
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+EXTRACTORS_PACKAGE = "processing.extractors"
+EXTRACTOR_ENTRY_POINT_GROUP = "wolfscribe.extractors"  # name = extension, value = "module:function"
+EXTRACTOR_FUNCTION = "extract_text"  # Used when a target names a module only
+
+# Built-in extension to extractor module mapping (modules load on first use)
+BUILTIN_EXTRACTORS: Dict[str, str] = {
     # Text formats
-    ".txt": txt_extractor.extract_text,
+    ".txt": "txt_extractor",
     
     # Document formats
-    ".pdf": pdf_extractor.extract_text,
-    ".epub": epub_extractor.extract_text,
-    ".docx": docx_extractor.extract_text,
+    ".pdf": "pdf_extractor",
+    ".epub": "epub_extractor",
+    ".docx": "docx_extractor",
     
     # Presentation formats (NEW)
-    ".pptx": pptx_extractor.extract_text,
-    ".ppt": pptx_extractor.extract_text,  # Legacy support
+    ".pptx": "pptx_extractor",
+    ".ppt": "pptx_extractor",  # Legacy support
     
     # Source code formats (NEW)
-    ".py": code_extractor.extract_text,     # Python
-    ".js": code_extractor.extract_text,     # JavaScript
-    ".jsx": code_extractor.extract_text,    # React JSX
-    ".ts": code_extractor.extract_text,     # TypeScript
-    ".tsx": code_extractor.extract_text,    # React TSX
-    ".java": code_extractor.extract_text,   # Java
-    ".c": code_extractor.extract_text,      # C
-    ".cpp": code_extractor.extract_text,    # C++
-    ".cc": code_extractor.extract_text,     # C++
-    ".cxx": code_extractor.extract_text,    # C++
-    ".h": code_extractor.extract_text,      # C/C++ headers
-    ".hpp": code_extractor.extract_text,    # C++ headers
-    ".cs": code_extractor.extract_text,     # C#
-    ".php": code_extractor.extract_text,    # PHP
-    ".rb": code_extractor.extract_text,     # Ruby
-    ".go": code_extractor.extract_text,     # Go
-    ".rs": code_extractor.extract_text,     # Rust
-    ".swift": code_extractor.extract_text,  # Swift
-    ".kt": code_extractor.extract_text,     # Kotlin
-    ".scala": code_extractor.extract_text,  # Scala
-    ".r": code_extractor.extract_text,      # R
-    ".m": code_extractor.extract_text,      # Objective-C/MATLAB
-    ".pl": code_extractor.extract_text,     # Perl
-    ".sh": code_extractor.extract_text,     # Shell scripts
-    ".bash": code_extractor.extract_text,   # Bash scripts
-    ".ps1": code_extractor.extract_text,    # PowerShell
-    ".lua": code_extractor.extract_text,    # Lua
-    ".dart": code_extractor.extract_text,   # Dart
-    ".toml": code_extractor.extract_text,   # TOML config
-    ".yaml": code_extractor.extract_text,   # YAML config
-    ".yml": code_extractor.extract_text,    # YAML config
+    ".py": "code_extractor",     # Python
+    ".js": "code_extractor",     # JavaScript
+    ".jsx": "code_extractor",    # React JSX
+    ".ts": "code_extractor",     # TypeScript
+    ".tsx": "code_extractor",    # React TSX
+    ".java": "code_extractor",   # Java
+    ".c": "code_extractor",      # C
+    ".cpp": "code_extractor",    # C++
+    ".cc": "code_extractor",     # C++
+    ".cxx": "code_extractor",    # C++
+    ".h": "code_extractor",      # C/C++ headers
+    ".hpp": "code_extractor",    # C++ headers
+    ".cs": "code_extractor",     # C#
+    ".php": "code_extractor",    # PHP
+    ".rb": "code_extractor",     # Ruby
+    ".go": "code_extractor",     # Go
+    ".rs": "code_extractor",     # Rust
+    ".swift": "code_extractor",  # Swift
+    ".kt": "code_extractor",     # Kotlin
+    ".scala": "code_extractor",  # Scala
+    ".r": "code_extractor",      # R
+    ".m": "code_extractor",      # Objective-C/MATLAB
+    ".pl": "code_extractor",     # Perl
+    ".sh": "code_extractor",     # Shell scripts
+    ".bash": "code_extractor",   # Bash scripts
+    ".ps1": "code_extractor",    # PowerShell
+    ".lua": "code_extractor",    # Lua
+    ".dart": "code_extractor",   # Dart
+    ".toml": "code_extractor",   # TOML config
+    ".yaml": "code_extractor",   # YAML config
+    ".yml": "code_extractor",    # YAML config
     
     # Data formats
-    ".csv": csv_extractor.extract_text,
+    ".csv": "csv_extractor",
     
     # Markup formats
-    ".md": md_extractor.extract_text,
-    ".markdown": md_extractor.extract_text,
+    ".md": "md_extractor",
+    ".markdown": "md_extractor",
     
     # Structured data formats
-    ".json": json_extractor.extract_text,
-    ".jsonl": json_extractor.extract_text,
+    ".json": "json_extractor",
+    ".jsonl": "json_extractor",
     
     # Spreadsheet formats
-    ".xlsx": xlsx_extractor.extract_text,
-    ".xls": xlsx_extractor.extract_text,
-    ".xlsm": xlsx_extractor.extract_text,
+    ".xlsx": "xlsx_extractor",
+    ".xls": "xlsx_extractor",
+    ".xlsm": "xlsx_extractor",
     
     # Web formats
-    ".html": html_extractor.extract_text,
-    ".htm": html_extractor.extract_text,
+    ".html": "html_extractor",
+    ".htm": "html_extractor",
     
     # XML formats
-    ".xml": xml_extractor.extract_text
+    ".xml": "xml_extractor"
 }
 
 
-def load_file(path: str) -> str:
+class ExtractorRegistry(Mapping):
+    """
+    Extension -> extractor registry that imports extractors on first use
+
+    Targets are "package.module:function" strings (or a bare module path,
+    meaning its extract_text). Nothing is imported until a file with that
+    extension is loaded, so a process only pays for the formats it sees.
+
+    Third-party packages can add or replace extractors through the
+    "wolfscribe.extractors" entry point group, e.g. in pyproject.toml:
+
+        [project.entry-points."wolfscribe.extractors"]
+        ".rtf" = "wolfscribe_rtf:extract_text"
+
+    Entry points are discovered the first time the registry is queried.
+    Indexing the registry returns the resolved callable, so it is a
+    drop-in for the old EXTENSION_LOADERS dict.
+    """
+
+    def __init__(self, builtins: Dict[str, str]):
+        self._targets: Dict[str, Union[str, Callable[[str], str]]] = {
+            ext: f"{EXTRACTORS_PACKAGE}.{module}" for ext, module in builtins.items()
+        }
+        self._resolved: Dict[str, Callable[[str], str]] = {}
+        self._entry_points_loaded = False
+        self._lock = threading.RLock()
+
+    def register(self, extension: str, target: Union[str, Callable[[str], str]]):
+        """
+        Register an extractor for an extension, replacing any existing one
+
+        Args:
+            extension (str): File extension including the dot (e.g. ".rtf")
+            target: "module:function" path or an extractor callable
+        """
+        extension = _normalize_extension(extension)
+        with self._lock:
+            self._targets[extension] = target
+            self._resolved.pop(extension, None)
+
+    def target(self, extension: str) -> Union[str, Callable[[str], str]]:
+        """Registered target for an extension, without importing it"""
+        self._ensure_entry_points()
+        return self._targets[_normalize_extension(extension)]
+
+    def loaded_extensions(self) -> list[str]:
+        """Extensions whose extractor has already been imported"""
+        with self._lock:
+            return sorted(self._resolved)
+
+    def __getitem__(self, extension: str) -> Callable[[str], str]:
+        self._ensure_entry_points()
+        extension = _normalize_extension(extension)
+        with self._lock:
+            extractor = self._resolved.get(extension)
+            if extractor is None:
+                extractor = _resolve_target(self._targets[extension])
+                self._resolved[extension] = extractor
+            return extractor
+
+    def __contains__(self, extension) -> bool:
+        self._ensure_entry_points()
+        return isinstance(extension, str) and _normalize_extension(extension) in self._targets
+
+    def __iter__(self) -> Iterator[str]:
+        self._ensure_entry_points()
+        with self._lock:
+            return iter(list(self._targets))
+
+    def __len__(self) -> int:
+        self._ensure_entry_points()
+        return len(self._targets)
+
+    def _ensure_entry_points(self):
+        if self._entry_points_loaded:
+            return
+        with self._lock:
+            if self._entry_points_loaded:
+                return
+            self._entry_points_loaded = True
+            for entry_point in _discover_entry_points():
+                extension = _normalize_extension(entry_point.name)
+                if extension in self._targets:
+                    logger.info(f"Extractor plugin {entry_point.value} replaces the handler for {extension}")
+                self._targets[extension] = entry_point.value
+                self._resolved.pop(extension, None)
+
+
+def _normalize_extension(extension: str) -> str:
+    extension = extension.lower()
+    return extension if extension.startswith('.') else f".{extension}"
+
+
+def _resolve_target(target: Union[str, Callable[[str], str]]) -> Callable[[str], str]:
+    if callable(target):
+        return target
+
+    module_path, _, attribute = target.partition(':')
+    module = importlib.import_module(module_path.strip())
+    extractor = module
+    for name in (attribute.strip() or EXTRACTOR_FUNCTION).split('.'):
+        extractor = getattr(extractor, name)
+    return extractor
+
+
+def _discover_entry_points() -> list:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        return []
+
+    try:
+        discovered = entry_points()
+        if hasattr(discovered, 'select'):
+            return list(discovered.select(group=EXTRACTOR_ENTRY_POINT_GROUP))
+        return list(discovered.get(EXTRACTOR_ENTRY_POINT_GROUP, []))  # Python 3.8/3.9
+    except Exception as e:
+        logger.warning(f"Could not load extractor plugins: {e}")
+        return []
+
+
+EXTENSION_LOADERS = ExtractorRegistry(BUILTIN_EXTRACTORS)
+
+
+def register_extractor(extension: str, target: Union[str, Callable[[str], str]]):
+    """
+    Register an extractor for a file extension
+
+    Args:
+        extension (str): File extension including the dot (e.g. ".rtf")
+        target: "module:function" path, imported on first use, or a callable
+    """
+    EXTENSION_LOADERS.register(extension, target)
+
+
+def load_file(path: str, **options) -> str:
     """
     Load and extract text content from various file formats
     
@@ -122,6 +255,8 @@ def load_file(path: str) -> str:
     
     Args:
         path (str): Path to the file to extract text from
+        **options: Extractor-specific keyword arguments, e.g. fields and
+            streaming for JSON (see extractor_options)
         
     Returns:
         str: Extracted text content from the file
@@ -136,6 +271,7 @@ def load_file(path: str) -> str:
         >>> text = load_file("readme.md")
         >>> text = load_file("presentation.pptx")  # NEW
         >>> text = load_file("script.py")  # NEW
+        >>> text = load_file("chat.jsonl", fields=["messages[*].content"])
     """
     if not os.path.exists(path):
         raise RuntimeError(f"File not found: {path}")
@@ -152,7 +288,7 @@ def load_file(path: str) -> str:
     # Dispatch to appropriate extractor
     try:
         extractor_func = EXTENSION_LOADERS[ext]
-        return extractor_func(path)
+        return extractor_func(path, **options)
     except Exception as e:
         # Re-raise extraction errors with context
         if isinstance(e, (ValueError, RuntimeError)):
@@ -161,6 +297,23 @@ def load_file(path: str) -> str:
             raise RuntimeError(f"Failed to extract text from {path}: {str(e)}")
 
 
+def extractor_options(path: str, extract_opts: Optional[Dict[str, Dict[str, Any]]]) -> Dict[str, Any]:
+    """
+    Pick the keyword arguments for one file's extractor
+    
+    Args:
+        path (str): File being loaded
+        extract_opts: Options keyed by extension, e.g.
+            {".json": {"fields": ["text"], "streaming": True}}
+        
+    Returns:
+        Dict[str, Any]: Options for load_file (empty when none apply)
+    """
+    if not extract_opts:
+        return {}
+    return dict(extract_opts.get(os.path.splitext(path)[1].lower(), {}))
+
+
 def get_supported_extensions() -> list[str]:
     """
     Get list of all supported file extensions
@@ -231,7 +384,7 @@ def get_format_info() -> Dict[str, Dict[str, any]]:
         "structured": {
             "extensions": [".json", ".jsonl"],
             "description": "Structured data formats", 
-            "features": ["recursive text extraction", "chat format detection", "metadata filtering"]
+            "features": ["recursive text extraction", "chat format detection", "metadata filtering", "field path selection", "streaming for large arrays"]
         }
     }
 
@@ -279,59 +432,59 @@ def validate_file_batch(file_paths: list[str]) -> Dict[str, any]:
 # Legacy compatibility functions (maintain backward compatibility)
 def load_txt(path: str) -> str:
     """Legacy compatibility function for TXT files"""
-    return txt_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.txt_extractor")(path)
 
 
 def load_pdf(path: str) -> str:
     """Legacy compatibility function for PDF files"""
-    return pdf_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.pdf_extractor")(path)
 
 
 def load_epub(path: str) -> str:
     """Legacy compatibility function for EPUB files"""
-    return epub_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.epub_extractor")(path)
 
 
 def load_docx(path: str) -> str:
     """Legacy compatibility function for DOCX files"""
-    return docx_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.docx_extractor")(path)
 
 
 def load_pptx(path: str) -> str:  # NEW
     """Legacy compatibility function for PowerPoint files"""
-    return pptx_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.pptx_extractor")(path)
 
 
 def load_code(path: str) -> str:  # NEW
     """Legacy compatibility function for source code files"""
-    return code_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.code_extractor")(path)
 
 
 def load_csv(path: str) -> str:
     """Legacy compatibility function for CSV files"""
-    return csv_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.csv_extractor")(path)
 
 
 def load_md(path: str) -> str:
     """Legacy compatibility function for Markdown files"""
-    return md_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.md_extractor")(path)
 
 
 def load_json(path: str) -> str:
     """Legacy compatibility function for JSON files"""
-    return json_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.json_extractor")(path)
 
 
 def load_xlsx(path: str) -> str:
     """Legacy compatibility function for Excel files"""
-    return xlsx_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.xlsx_extractor")(path)
 
 
 def load_html(path: str) -> str:
     """Legacy compatibility function for HTML files"""
-    return html_extractor.extract_text(path)
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.html_extractor")(path)
 
 
 def load_xml(path: str) -> str:
     """Legacy compatibility function for XML files"""
-    return xml_extractor.extract_text(path)
\ No newline at end of file
+    return _resolve_target(f"{EXTRACTORS_PACKAGE}.xml_extractor")(path)
\ No newline at end of file
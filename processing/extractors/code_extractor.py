@@ -15,12 +15,21 @@ Features:
 - Encoding detection and handling
 - File size limits for performance
 - Whitespace and structure preservation
+- Repository ingestion: walk a whole tree honouring .gitignore, filtering
+  by path first and screening files in parallel
 """
 
+import itertools
 import os
-import chardet
-from typing import Optional, Dict, Any
+import re
+import time
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Iterator, List, Set, Tuple
+
+from processing.extractors.decoding import decode_bytes, decode_file, detect_encoding, mapped_file
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -29,7 +38,9 @@ logger = logging.getLogger(__name__)
 MAX_FILE_SIZE = 1_000_000  # 1MB limit for individual files
 MIN_WHITESPACE_RATIO = 0.05  # Minimum 5% whitespace for non-minified code
 MIN_LINE_LENGTH_FOR_MINIFIED_CHECK = 1000  # Check minification for files > 1KB
-ENCODING_CONFIDENCE_THRESHOLD = 0.7  # Minimum confidence for encoding detection
+
+# Lines containing nothing but whitespace (newlines excluded so matches stay on one line)
+_BLANK_LINE_RE = re.compile(r'^[^\S\n]*$', re.MULTILINE)
 
 # Common auto-generated file patterns
 AUTO_GENERATED_PATTERNS = [
@@ -72,27 +83,20 @@ def extract_text(file_path: str, encoding: Optional[str] = None) -> str:
             f"File: {file_path}"
         )
     
-    # Detect encoding if not specified
-    if encoding is None:
-        encoding = detect_file_encoding(file_path)
-    
     try:
-        # Read file content
-        with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
-            content = f.read()
+        if encoding is None:
+            # Detect and decode in a single pass; undecodable bytes are dropped
+            content = decode_file(file_path, fallback='utf-8', errors='ignore').text
+        else:
+            with open(file_path, 'r', encoding=encoding, errors='ignore') as f:
+                content = f.read()
     except Exception as e:
         raise RuntimeError(f"Failed to read file {file_path}: {str(e)}")
     
     # Quality control checks
-    if is_minified_code(content):
-        raise ValueError(
-            f"Skipping minified file (low whitespace ratio): {file_path}"
-        )
-    
-    if is_auto_generated(content):
-        raise ValueError(
-            f"Skipping auto-generated file: {file_path}"
-        )
+    skip_reason = get_skip_reason(content)
+    if skip_reason:
+        raise ValueError(f"Skipping {skip_reason} file: {file_path}")
     
     # Additional quality checks based on file extension
     file_ext = os.path.splitext(file_path)[1].lower()
@@ -110,7 +114,8 @@ def detect_file_encoding(file_path: str) -> str:
     """
     Detect the encoding of a text file
     
-    Uses chardet library to detect encoding with fallback to utf-8.
+    Checks for a BOM and UTF-8 validity on the mapped file, and only runs
+    charset detection on a sample when neither applies. Falls back to utf-8.
     
     Args:
         file_path (str): Path to the file
@@ -119,27 +124,32 @@ def detect_file_encoding(file_path: str) -> str:
         str: Detected encoding name
     """
     try:
-        # Read raw bytes for detection
-        with open(file_path, 'rb') as f:
-            raw_data = f.read(10000)  # Read first 10KB for detection
-        
-        # Detect encoding
-        result = chardet.detect(raw_data)
-        
-        if result['confidence'] >= ENCODING_CONFIDENCE_THRESHOLD:
-            return result['encoding']
-        else:
-            logger.warning(
-                f"Low confidence encoding detection ({result['confidence']:.2f}) "
-                f"for {file_path}. Using UTF-8."
-            )
-            return 'utf-8'
+        with mapped_file(file_path) as view:
+            return detect_encoding(view, fallback='utf-8')
             
     except Exception as e:
         logger.error(f"Encoding detection failed for {file_path}: {str(e)}")
         return 'utf-8'  # Default fallback
 
 
+def get_skip_reason(content: str) -> Optional[str]:
+    """
+    Run the quality control checks without raising
+    
+    Args:
+        content (str): Source code content
+        
+    Returns:
+        Optional[str]: 'minified' or 'auto-generated' if the file should be
+        skipped, None if it is suitable for training data
+    """
+    if is_minified_code(content):
+        return 'minified'
+    if is_auto_generated(content):
+        return 'auto-generated'
+    return None
+
+
 def is_minified_code(content: str) -> bool:
     """
     Detect if code is minified based on whitespace ratio and line length
@@ -158,38 +168,42 @@ def is_minified_code(content: str) -> bool:
     if len(content) < MIN_LINE_LENGTH_FOR_MINIFIED_CHECK:
         return False  # Too small to reliably check
     
-    # Check whitespace ratio
-    whitespace_count = sum(1 for c in content if c.isspace())
-    whitespace_ratio = whitespace_count / len(content)
+    stats = _content_stats(content)
     
-    if whitespace_ratio < MIN_WHITESPACE_RATIO:
+    # Check whitespace ratio
+    if stats['whitespace_ratio'] < MIN_WHITESPACE_RATIO:
         return True
     
-    # Check average line length
-    lines = content.split('\n')
-    non_empty_lines = [line for line in lines if line.strip()]
-    
-    if non_empty_lines:
-        avg_line_length = sum(len(line) for line in non_empty_lines) / len(non_empty_lines)
-        
-        # If average line length is very high, likely minified
-        if avg_line_length > 500:
-            return True
-    
-    # Check for specific minification patterns
-    minified_indicators = [
-        '){', '};', ']{', '];',  # No spacing around brackets
-        'var a=', 'let a=', 'const a=',  # Single letter variables
-        'function(a,b,c,d,e)',  # Many single letter parameters
-    ]
-    
-    indicator_count = sum(1 for indicator in minified_indicators if indicator in content)
-    if indicator_count > 10:  # Many minification patterns found
+    # If average line length is very high, likely minified
+    if stats['non_empty_lines'] and stats['average_non_empty_line_length'] > 500:
         return True
     
     return False
 
 
+def _content_stats(content: str) -> Dict[str, Any]:
+    """
+    Count whitespace and non-empty line statistics without a Python-level loop
+    
+    str.split() with no separator splits on exactly the characters for which
+    str.isspace() is true, so the whitespace count falls out of the lengths
+    of the remaining tokens. Blank lines are counted with a single regex scan.
+    """
+    total = len(content)
+    whitespace_count = total - sum(map(len, content.split()))
+    
+    line_count = content.count('\n') + 1
+    blank_lines = _BLANK_LINE_RE.findall(content)
+    non_empty_lines = line_count - len(blank_lines)
+    non_empty_chars = (total - (line_count - 1)) - sum(map(len, blank_lines))
+    
+    return {
+        'whitespace_ratio': whitespace_count / max(total, 1),
+        'non_empty_lines': non_empty_lines,
+        'average_non_empty_line_length': non_empty_chars / max(non_empty_lines, 1),
+    }
+
+
 def is_auto_generated(content: str) -> bool:
     """
     Detect if code is auto-generated based on common markers
@@ -239,16 +253,16 @@ def get_code_metrics(content: str) -> Dict[str, Any]:
         Dict[str, Any]: Metrics including line count, whitespace ratio, etc.
     """
     lines = content.split('\n')
-    non_empty_lines = [line for line in lines if line.strip()]
+    stats = _content_stats(content)
     
     # Calculate metrics
     metrics = {
         'total_lines': len(lines),
-        'non_empty_lines': len(non_empty_lines),
+        'non_empty_lines': stats['non_empty_lines'],
         'total_characters': len(content),
-        'whitespace_ratio': sum(1 for c in content if c.isspace()) / max(len(content), 1),
-        'average_line_length': sum(len(line) for line in lines) / max(len(lines), 1),
-        'max_line_length': max((len(line) for line in lines), default=0),
+        'whitespace_ratio': stats['whitespace_ratio'],
+        'average_line_length': (len(content) - len(lines) + 1) / max(len(lines), 1),
+        'max_line_length': max(map(len, lines), default=0),
         'has_comments': any(marker in content for marker in ['#', '//', '/*', '"""', "'''"]),
         'appears_minified': is_minified_code(content),
         'appears_generated': is_auto_generated(content),
@@ -305,4 +319,362 @@ def validate_code_file(file_path: str) -> Dict[str, Any]:
         result['valid'] = False
         result['issues'].append(f"Cannot read file: {str(e)}")
     
-    return result
\ No newline at end of file
+    return result
+
+# ---------------------------------------------------------------------------
+# Repository ingestion
+# ---------------------------------------------------------------------------
+
+# Source extensions picked up when ingesting a repository
+CODE_EXTENSIONS = frozenset({
+    '.py', '.js', '.jsx', '.ts', '.tsx', '.java', '.c', '.cpp', '.cc', '.cxx',
+    '.h', '.hpp', '.cs', '.php', '.rb', '.go', '.rs', '.swift', '.kt', '.scala',
+    '.r', '.m', '.pl', '.sh', '.bash', '.ps1', '.lua', '.dart',
+    '.toml', '.yaml', '.yml',
+})
+
+# Directories that hold vendored, generated or tooling content
+VENDORED_DIRECTORIES = frozenset({
+    '.git', '.hg', '.svn', 'node_modules', 'bower_components', 'vendor',
+    'third_party', 'third-party', 'site-packages', '__pycache__', '.venv',
+    'venv', '.tox', '.mypy_cache', '.pytest_cache', 'dist', 'build', 'target',
+    '.idea', '.vscode', '.gradle', 'Pods',
+})
+
+# Filename suffixes that mark generated or bundled output
+GENERATED_SUFFIXES = ('.min.js', '.min.css', '.bundle.js', '.pb.go', '_pb2.py', '.g.dart')
+
+BINARY_SNIFF_SIZE = 1024  # Bytes checked for a null byte before decoding
+INGEST_CHUNKSIZE = 64  # Files handed to a worker process at a time
+INGEST_BATCHES_PER_WORKER = 2  # Batches in flight per worker while streaming
+
+
+@dataclass
+class IngestedFile:
+    path: str  # Relative to the repository root, '/' separated
+    content: str
+    size_bytes: int
+
+
+@dataclass
+class RepositoryIngestResult:
+    root: str
+    files: List[IngestedFile] = field(default_factory=list)
+    skipped: Dict[str, int] = field(default_factory=dict)  # reason -> count
+    elapsed_seconds: float = 0.0
+    
+    @property
+    def total_bytes(self) -> int:
+        return sum(f.size_bytes for f in self.files)
+    
+    def to_text(self) -> str:
+        """Join all ingested files, each preceded by a path header"""
+        return '\n\n'.join(f"# File: {f.path}\n{f.content}" for f in self.files)
+
+
+class _GitignoreRule:
+    """A single .gitignore pattern compiled to a regex"""
+    
+    __slots__ = ('base', 'regex', 'negate', 'dir_only', 'match_name')
+    
+    def __init__(self, base: str, pattern: str):
+        self.base = base
+        self.negate = pattern.startswith('!')
+        if self.negate:
+            pattern = pattern[1:]
+        elif pattern.startswith('\\'):
+            pattern = pattern[1:]
+        
+        self.dir_only = pattern.endswith('/')
+        pattern = pattern.rstrip('/')
+        
+        # Patterns without an inner slash match a name at any depth
+        self.match_name = '/' not in pattern
+        self.regex = re.compile(_translate_gitignore_glob(pattern.lstrip('/')))
+    
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+        if self.match_name:
+            return self.regex.match(name) is not None
+        
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+        return self.regex.match(rel_path) is not None
+
+
+def _translate_gitignore_glob(pattern: str) -> str:
+    """Translate a gitignore glob into an anchored regex"""
+    parts = []
+    i, n = 0, len(pattern)
+    while i < n:
+        if pattern.startswith('**/', i):
+            parts.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == n:
+            parts.append('/.*')
+            i += 3
+        elif pattern.startswith('**', i):
+            parts.append('.*')
+            i += 2
+        elif pattern[i] == '*':
+            parts.append('[^/]*')
+            i += 1
+        elif pattern[i] == '?':
+            parts.append('[^/]')
+            i += 1
+        elif pattern[i] == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                parts.append(re.escape('['))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f'[{body}]')
+                i = end + 1
+        else:
+            parts.append(re.escape(pattern[i]))
+            i += 1
+    return ''.join(parts) + r'\Z'
+
+
+def _read_gitignore(directory: str, rel_dir: str) -> List[_GitignoreRule]:
+    """Load the rules of a directory's .gitignore, if it has one"""
+    try:
+        with open(os.path.join(directory, '.gitignore'), 'r', encoding='utf-8', errors='ignore') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return []
+    
+    rules = []
+    for line in lines:
+        line = line.rstrip()
+        if not line or line.startswith('#'):
+            continue
+        try:
+            rules.append(_GitignoreRule(rel_dir, line))
+        except re.error:
+            logger.debug(f"Ignoring unparseable .gitignore pattern {line!r} in {directory}")
+    return rules
+
+
+def _is_ignored(rules: List[_GitignoreRule], rel_path: str, name: str, is_dir: bool) -> bool:
+    """Apply rules in order; the last matching rule wins"""
+    ignored = False
+    for rule in rules:
+        if rule.negate == ignored and rule.matches(rel_path, name, is_dir):
+            ignored = not ignored
+    return ignored
+
+
+def iter_repository_files(root: str,
+                          extensions: Optional[Set[str]] = None,
+                          respect_gitignore: bool = True,
+                          max_file_size: int = MAX_FILE_SIZE,
+                          skipped: Optional[Dict[str, int]] = None) -> Iterator[Tuple[str, str, int]]:
+    """
+    Walk a source tree, applying only checks that need no file contents
+    
+    Vendored directories and .gitignore'd paths are pruned before they are
+    descended into, and files are filtered by extension, generated-file
+    suffix and size (from the directory entry) before anything is read.
+    
+    Args:
+        root (str): Repository root directory
+        extensions (Optional[Set[str]]): Extensions to include (default CODE_EXTENSIONS)
+        respect_gitignore (bool): Honour .gitignore files throughout the tree
+        max_file_size (int): Skip files larger than this many bytes
+        skipped (Optional[Dict[str, int]]): Incremented per skip reason if given
+        
+    Yields:
+        Tuple[str, str, int]: (absolute path, relative path, size in bytes)
+    """
+    extensions = CODE_EXTENSIONS if extensions is None else frozenset(e.lower() for e in extensions)
+    skipped = skipped if skipped is not None else {}
+    
+    def skip(reason: str) -> None:
+        skipped[reason] = skipped.get(reason, 0) + 1
+    
+    # Depth-first stack of (directory, relative dir, inherited gitignore rules)
+    stack = [(root, '', [])]
+    while stack:
+        directory, rel_dir, rules = stack.pop()
+        if respect_gitignore:
+            rules = rules + _read_gitignore(directory, rel_dir)
+        
+        try:
+            entries = list(os.scandir(directory))
+        except OSError as e:
+            logger.warning(f"Cannot read directory {directory}: {str(e)}")
+            continue
+        
+        subdirectories = []
+        for entry in entries:
+            name = entry.name
+            rel_path = f"{rel_dir}/{name}" if rel_dir else name
+            
+            try:
+                if entry.is_symlink():
+                    continue
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+            
+            if is_dir:
+                if name in VENDORED_DIRECTORIES:
+                    skip('vendored')
+                elif rules and _is_ignored(rules, rel_path, name, True):
+                    skip('gitignored')
+                else:
+                    subdirectories.append((entry.path, rel_path, rules))
+                continue
+            
+            lower_name = name.lower()
+            if os.path.splitext(lower_name)[1] not in extensions:
+                continue  # Not a source file; not counted as a skip
+            if lower_name.endswith(GENERATED_SUFFIXES):
+                skip('generated')
+                continue
+            if rules and _is_ignored(rules, rel_path, name, False):
+                skip('gitignored')
+                continue
+            
+            try:
+                size = entry.stat().st_size
+            except OSError:
+                skip('unreadable')
+                continue
+            if size > max_file_size:
+                skip('too large')
+                continue
+            
+            yield entry.path, rel_path, size
+        
+        # Reverse so directories are visited in listing order
+        stack.extend(reversed(subdirectories))
+
+
+def _ingest_one(item: Tuple[str, str, int]) -> Tuple[str, Any]:
+    """
+    Read and screen one file in a worker
+    
+    Returns ('ok', IngestedFile) or (skip reason, relative path); skips are
+    reported as values rather than exceptions.
+    """
+    path, rel_path, size = item
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except OSError:
+        return 'unreadable', rel_path
+    
+    if b'\x00' in data[:BINARY_SNIFF_SIZE]:
+        return 'binary', rel_path
+    
+    content, _ = decode_bytes(data, fallback='utf-8', errors='ignore')
+    
+    skip_reason = get_skip_reason(content)
+    if skip_reason:
+        return skip_reason, rel_path
+    
+    return 'ok', IngestedFile(path=rel_path, content=content, size_bytes=size)
+
+
+def iter_ingested_files(root: str,
+                        extensions: Optional[Set[str]] = None,
+                        respect_gitignore: bool = True,
+                        max_file_size: int = MAX_FILE_SIZE,
+                        max_workers: Optional[int] = None,
+                        skipped: Optional[Dict[str, int]] = None) -> Iterator[IngestedFile]:
+    """
+    Yield every usable source file of a repository tree, in walk order
+    
+    Files are screened in a process pool in batches of INGEST_CHUNKSIZE,
+    with at most INGEST_BATCHES_PER_WORKER batches per worker in flight, so
+    the walk advances only as results are consumed and memory holds a
+    bounded number of files rather than the whole repository.
+    
+    Args:
+        root, extensions, respect_gitignore, max_file_size, max_workers:
+            As for ingest_repository
+        skipped (Optional[Dict[str, int]]): Receives skip counts by reason
+        
+    Raises:
+        ValueError: If root is not a directory
+    """
+    if not os.path.isdir(root):
+        raise ValueError(f"Repository root is not a directory: {root}")
+    
+    skipped = skipped if skipped is not None else {}
+    candidates = iter_repository_files(root, extensions, respect_gitignore, max_file_size, skipped)
+    
+    def screened(outcomes: Iterator[Tuple[str, Any]]) -> Iterator[IngestedFile]:
+        for status, value in outcomes:
+            if status == 'ok':
+                yield value
+            else:
+                skipped[status] = skipped.get(status, 0) + 1
+    
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1:
+        yield from screened(map(_ingest_one, candidates))
+        return
+    
+    batches = iter(lambda: list(itertools.islice(candidates, INGEST_CHUNKSIZE)), [])
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for batch in batches:
+            pending.append(executor.submit(_ingest_batch, batch))
+            if len(pending) >= workers * INGEST_BATCHES_PER_WORKER:
+                yield from screened(pending.popleft().result())
+        while pending:
+            yield from screened(pending.popleft().result())
+
+
+def _ingest_batch(items: List[Tuple[str, str, int]]) -> List[Tuple[str, Any]]:
+    """Screen a batch of files in one worker round trip"""
+    return [_ingest_one(item) for item in items]
+
+
+def ingest_repository(root: str,
+                      extensions: Optional[Set[str]] = None,
+                      respect_gitignore: bool = True,
+                      max_file_size: int = MAX_FILE_SIZE,
+                      max_workers: Optional[int] = None) -> RepositoryIngestResult:
+    """
+    Extract every usable source file from a repository tree
+    
+    The tree walk applies the cheap path-based filters, and the remaining
+    files are read, binary-sniffed, decoded and quality-checked in a
+    process pool. Use iter_ingested_files to consume files as they are
+    screened instead of collecting them all.
+    
+    Args:
+        root (str): Repository root directory
+        extensions (Optional[Set[str]]): Extensions to include (default CODE_EXTENSIONS)
+        respect_gitignore (bool): Honour .gitignore files throughout the tree
+        max_file_size (int): Skip files larger than this many bytes
+        max_workers (Optional[int]): Worker processes (default CPU count; 1 runs inline)
+        
+    Returns:
+        RepositoryIngestResult: Ingested files in walk order plus skip counts
+        
+    Raises:
+        ValueError: If root is not a directory
+    """
+    start_time = time.perf_counter()
+    result = RepositoryIngestResult(root=os.path.abspath(root))
+    result.files.extend(iter_ingested_files(
+        root, extensions, respect_gitignore, max_file_size, max_workers, result.skipped
+    ))
+    
+    result.elapsed_seconds = time.perf_counter() - start_time
+    logger.info(
+        f"Ingested {len(result.files):,} files ({result.total_bytes:,} bytes) from "
+        f"{root} in {result.elapsed_seconds:.1f}s; skipped {result.skipped}"
+    )
+    return result
@@ -13,6 +13,8 @@ from typing import List, Dict, Any, Tuple
 from io import StringIO
 import re
 
+from processing.extractors.decoding import mapped_file, detect_encoding
+
 
 def extract_text(path: str) -> str:
     """
@@ -75,35 +77,29 @@ def _analyze_csv_file(path: str) -> Tuple[str, str, bool]:
     Returns:
         tuple: (delimiter, encoding, has_header)
     """
-    # Try different encodings
-    encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
+    try:
+        with mapped_file(path) as view:
+            # Settle the encoding once from the raw bytes
+            encoding = detect_encoding(view)
+            
+            # Decode only the first 8KB to analyze structure (a character cut
+            # at the boundary is dropped)
+            sample = str(view[:8192], encoding, 'ignore')
+    except Exception:
+        # Fallback defaults
+        return ',', 'utf-8', True
     
-    for encoding in encodings:
-        try:
-            with open(path, 'r', encoding=encoding) as f:
-                # Read first few lines to analyze structure
-                sample = f.read(8192)  # 8KB sample
-                
-                # Detect delimiter
-                delimiter = _detect_csv_delimiter(sample)
-                
-                # Check if first row looks like headers
-                f.seek(0)
-                reader = csv.reader(f, delimiter=delimiter)
-                first_row = next(reader, None)
-                second_row = next(reader, None)
-                
-                has_header = _detect_headers(first_row, second_row)
-                
-                return delimiter, encoding, has_header
-                
-        except UnicodeDecodeError:
-            continue
-        except Exception:
-            continue
+    # Detect delimiter
+    delimiter = _detect_csv_delimiter(sample)
+    
+    # Check if first row looks like headers
+    reader = csv.reader(StringIO(sample), delimiter=delimiter)
+    first_row = next(reader, None)
+    second_row = next(reader, None)
+    
+    has_header = _detect_headers(first_row, second_row)
     
-    # Fallback defaults
-    return ',', 'utf-8', True
+    return delimiter, encoding, has_header
 
 
 def _detect_csv_delimiter(sample: str) -> str:
@@ -0,0 +1,193 @@
+# wolfscribe/processing/extractors/decoding.py
+"""
+Shared byte-level decoding layer for Wolfscribe extractors
+
+Text-based extractors used to re-open a file once per candidate encoding,
+reading the whole file every time. This module maps the file into memory
+once, settles the encoding from the raw bytes and decodes in a single pass:
+
+1. Byte order marks (UTF-8/16/32) are recognised directly
+2. Files that are valid UTF-8 are decoded straight from the mapping
+3. Anything else is identified by charset-normalizer or chardet on a
+   sample only, falling back to a fixed encoding
+
+Extractors that work on raw bytes can use mapped_file() to get a
+memoryview over the file without copying it.
+"""
+
+import codecs
+import mmap
+import os
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Iterator, Optional, Tuple, Union
+
+try:
+    from charset_normalizer import from_bytes as _normalizer_from_bytes
+    CHARSET_NORMALIZER_AVAILABLE = True
+except ImportError:
+    CHARSET_NORMALIZER_AVAILABLE = False
+
+try:
+    import chardet
+    CHARDET_AVAILABLE = True
+except ImportError:
+    CHARDET_AVAILABLE = False
+
+# Set up logging
+logger = logging.getLogger(__name__)
+
+# Configuration constants
+DETECTION_SAMPLE_SIZE = 64 * 1024  # Bytes handed to the statistical detector
+ENCODING_CONFIDENCE_THRESHOLD = 0.7  # Minimum confidence to trust the detector
+DEFAULT_FALLBACK_ENCODING = 'latin-1'  # Decodes any byte sequence
+
+# Longest marks first so UTF-32 LE is not mistaken for UTF-16 LE
+_BOMS: Tuple[Tuple[bytes, str], ...] = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+BytesLike = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+
+@dataclass
+class DecodedText:
+    text: str
+    encoding: str
+    size_bytes: int
+
+
+@contextmanager
+def mapped_file(path: str) -> Iterator[memoryview]:
+    """
+    Map a file read-only and yield a memoryview over its bytes
+
+    The view is only valid inside the with block. Empty files yield an
+    empty view since zero-length files cannot be mapped.
+
+    Args:
+        path (str): Path to the file
+
+    Yields:
+        memoryview: Zero-copy view of the file contents
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield memoryview(b'')
+            return
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            view = memoryview(mapping)
+            try:
+                yield view
+            finally:
+                view.release()
+
+
+def detect_bom(data: BytesLike) -> Optional[str]:
+    """Return the codec implied by a leading byte order mark, if any"""
+    head = bytes(data[:4])
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    return None
+
+
+def detect_encoding(data: BytesLike, fallback: str = DEFAULT_FALLBACK_ENCODING) -> str:
+    """
+    Determine the encoding of raw file bytes
+
+    Args:
+        data: Raw bytes (bytes, memoryview or mmap)
+        fallback (str): Encoding used when detection is inconclusive
+
+    Returns:
+        str: Codec name suitable for str(data, encoding)
+    """
+    bom_encoding = detect_bom(data)
+    if bom_encoding:
+        return bom_encoding
+
+    try:
+        codecs.decode(data, 'utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+
+    return _detect_from_sample(data, fallback)
+
+
+def decode_bytes(data: BytesLike, fallback: str = DEFAULT_FALLBACK_ENCODING,
+                 errors: str = 'strict') -> Tuple[str, str]:
+    """
+    Decode raw bytes, detecting the encoding on the way
+
+    Valid UTF-8 input is decoded exactly once - the validity check and the
+    decode are the same operation.
+
+    Args:
+        data: Raw bytes (bytes, memoryview or mmap)
+        fallback (str): Encoding used when detection is inconclusive
+        errors (str): Error handler for the final decode
+
+    Returns:
+        Tuple[str, str]: (decoded text, encoding used)
+    """
+    encoding = detect_bom(data)
+
+    if encoding is None:
+        try:
+            return str(data, 'utf-8'), 'utf-8'
+        except UnicodeDecodeError:
+            encoding = _detect_from_sample(data, fallback)
+
+    try:
+        return str(data, encoding, errors), encoding
+    except (UnicodeDecodeError, LookupError):
+        # Detector guessed from a sample and the rest of the file disagrees
+        logger.warning(f"Decoding as {encoding} failed, falling back to {fallback}")
+        return str(data, fallback, errors), fallback
+
+
+def decode_file(path: str, fallback: str = DEFAULT_FALLBACK_ENCODING,
+                errors: str = 'strict') -> DecodedText:
+    """
+    Read and decode a text file in one pass over a memory map
+
+    Args:
+        path (str): Path to the file
+        fallback (str): Encoding used when detection is inconclusive
+        errors (str): Error handler for the final decode
+
+    Returns:
+        DecodedText: Decoded text with the encoding that was used
+
+    Raises:
+        OSError: If the file cannot be opened or mapped
+    """
+    with mapped_file(path) as view:
+        text, encoding = decode_bytes(view, fallback=fallback, errors=errors)
+        size_bytes = view.nbytes
+
+    return DecodedText(text=text, encoding=encoding, size_bytes=size_bytes)
+
+
+def _detect_from_sample(data: BytesLike, fallback: str) -> str:
+    """Run the statistical detector on a prefix of the data"""
+    sample = bytes(data[:DETECTION_SAMPLE_SIZE])
+
+    if CHARSET_NORMALIZER_AVAILABLE:
+        best = _normalizer_from_bytes(sample).best()
+        if best is not None and (1.0 - best.chaos) >= ENCODING_CONFIDENCE_THRESHOLD:
+            return best.encoding
+    elif CHARDET_AVAILABLE:
+        result = chardet.detect(sample)
+        if result.get('encoding') and result.get('confidence', 0) >= ENCODING_CONFIDENCE_THRESHOLD:
+            return result['encoding']
+
+    return fallback
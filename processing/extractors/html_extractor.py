@@ -10,6 +10,8 @@ import os
 import re
 from typing import List, Optional
 
+from processing.extractors.decoding import decode_file
+
 
 def extract_text(path: str) -> str:
     """
@@ -46,18 +48,7 @@ def extract_text(path: str) -> str:
 def _extract_with_beautifulsoup(path: str) -> str:
     """Extract text using BeautifulSoup for proper HTML parsing"""
     
-    # Try different encodings
-    encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
-    
-    for encoding in encodings:
-        try:
-            with open(path, 'r', encoding=encoding) as f:
-                html_content = f.read()
-            break
-        except UnicodeDecodeError:
-            continue
-    else:
-        raise RuntimeError(f"Cannot read HTML file with any supported encoding")
+    html_content = decode_file(path).text
     
     # Parse HTML
     soup = BeautifulSoup(html_content, 'html.parser')
@@ -78,17 +69,7 @@ def _extract_with_beautifulsoup(path: str) -> str:
 def _extract_with_regex(path: str) -> str:
     """Fallback extraction using regex (when BeautifulSoup not available)"""
     
-    encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
-    
-    for encoding in encodings:
-        try:
-            with open(path, 'r', encoding=encoding) as f:
-                html_content = f.read()
-            break
-        except UnicodeDecodeError:
-            continue
-    else:
-        raise RuntimeError(f"Cannot read HTML file with any supported encoding")
+    html_content = decode_file(path).text
     
     # Remove script and style elements
     html_content = re.sub(r'<script.*?</script>', '', html_content, flags=re.DOTALL | re.IGNORECASE)
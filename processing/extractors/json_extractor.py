@@ -6,34 +6,74 @@ Handles .json and .jsonl files by recursively extracting text content
 from structured data, with special handling for chat logs and API responses.
 """
 
+import io
 import os
+import re
 import json
-from typing import List, Dict, Any, Union, Set
+from typing import List, Dict, Any, Union, Set, Optional, Iterator, Tuple, BinaryIO
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
-def extract_text(path: str) -> str:
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+    # ijson's parse errors (including truncated input) do not subclass ValueError
+    _STREAM_PARSE_ERRORS = (ValueError, ijson.JSONError)
+except ImportError:
+    IJSON_AVAILABLE = False
+    _STREAM_PARSE_ERRORS = (ValueError,)
+
+from processing.extractors.decoding import decode_file
+
+# Configuration constants
+STREAMING_THRESHOLD_BYTES = 64 * 1024 * 1024  # Stream top-level arrays above 64MB
+STREAM_READ_SIZE = 1024 * 1024  # Characters read per refill in the stdlib streamer
+MAX_STREAM_ITEM_CHARS = 64 * 1024 * 1024  # Largest single array item the stdlib streamer buffers
+
+# Field path tokens: a key name, "[*]" for every list item, or "[n]" for one item
+_FIELD_PATH_TOKEN = re.compile(r'([^.\[\]]+)|\[(\*|-?\d+)\]')
+_WILDCARD = object()
+
+
+def extract_text(path: str, fields: Optional[List[str]] = None,
+                 streaming: Optional[bool] = None) -> str:
     """
     Extract text from JSON or JSONL files
     
     Args:
         path (str): Path to the JSON/JSONL file
+        fields (Optional[List[str]]): Field paths to extract instead of walking
+            every value heuristically, e.g. ["messages[*].content", "title"]
+        streaming (Optional[bool]): Parse a top-level JSON array one item at a
+            time instead of loading the whole document. None streams files
+            larger than STREAMING_THRESHOLD_BYTES
         
     Returns:
         str: Extracted text content from the JSON structure
         
     Raises:
         RuntimeError: If JSON extraction fails
+        ValueError: If a field path is malformed
     """
     if not os.path.exists(path):
         raise RuntimeError(f"JSON file not found: {path}")
     
     file_ext = os.path.splitext(path)[1].lower()
+    field_paths = [compile_field_path(field) for field in fields] if fields else None
     
     try:
         if file_ext == '.jsonl':
-            return _extract_jsonl(path)
+            return _extract_jsonl(path, field_paths)
         else:
-            return _extract_json(path)
+            if streaming is None:
+                streaming = os.path.getsize(path) > STREAMING_THRESHOLD_BYTES
+            if streaming and _can_stream(path, field_paths):
+                return _extract_json_streaming(path, field_paths)
+            return _extract_json(path, field_paths)
             
     except Exception as e:
         if "JSON" in str(e):
@@ -42,24 +82,140 @@ def extract_text(path: str) -> str:
             raise RuntimeError(f"JSON extraction failed: {str(e)}")
 
 
-def _extract_json(path: str) -> str:
+def compile_field_path(field: str) -> Tuple[Any, ...]:
+    """
+    Compile a field path such as "messages[*].content" into lookup steps
+    
+    Args:
+        field (str): Dotted field path. "[*]" selects every list item and
+            "[n]" selects a single item (negative indexes allowed)
+        
+    Returns:
+        Tuple[Any, ...]: Lookup steps (str keys, int indexes, or wildcards)
+        
+    Raises:
+        ValueError: If the path is empty or malformed
+    """
+    steps = []
+    position = 0
+    
+    for match in _FIELD_PATH_TOKEN.finditer(field):
+        gap = field[position:match.start()]
+        if gap not in ('', '.') or (gap == '.' and not steps):
+            raise ValueError(f"Invalid field path: {field!r}")
+        position = match.end()
+        
+        key, index = match.groups()
+        if key is not None:
+            steps.append(key)
+        elif index == '*':
+            steps.append(_WILDCARD)
+        else:
+            steps.append(int(index))
+    
+    if not steps or position != len(field):
+        raise ValueError(f"Invalid field path: {field!r}")
+    
+    return tuple(steps)
+
+
+def _select_field_values(obj: Any, steps: Tuple[Any, ...]) -> Iterator[Any]:
+    """Yield every value reached by following the compiled field path"""
+    if not steps:
+        yield obj
+        return
+    
+    step, remaining = steps[0], steps[1:]
+    
+    if step is _WILDCARD:
+        if isinstance(obj, list):
+            for item in obj:
+                yield from _select_field_values(item, remaining)
+    elif isinstance(step, int):
+        if isinstance(obj, list) and -len(obj) <= step < len(obj):
+            yield from _select_field_values(obj[step], remaining)
+    elif isinstance(obj, dict) and step in obj:
+        yield from _select_field_values(obj[step], remaining)
+
+
+def _extract_fields(data: Any, field_paths: List[Tuple[Any, ...]], texts: List[str]) -> None:
+    """Extract text only from the requested field paths"""
+    for steps in field_paths:
+        for value in _select_field_values(data, steps):
+            if isinstance(value, str):
+                value = value.strip()
+                if value:
+                    texts.append(value)
+            elif isinstance(value, (dict, list)):
+                # Selected a container - fall back to the heuristic walk below it
+                _extract_text_recursive(value, texts)
+
+
+def _extract_json(path: str, field_paths: Optional[List[Tuple[Any, ...]]] = None) -> str:
     """Extract text from a standard JSON file"""
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-    except UnicodeDecodeError:
-        # Try different encoding
-        try:
-            with open(path, 'r', encoding='latin-1') as f:
-                data = json.load(f)
-        except Exception as e:
-            raise RuntimeError(f"Cannot read JSON file with any encoding: {str(e)}")
+        data = json.loads(decode_file(path).text)
     except json.JSONDecodeError as e:
         raise RuntimeError(f"Invalid JSON format: {str(e)}")
+    except OSError as e:
+        raise RuntimeError(f"Cannot read JSON file: {str(e)}")
     
     # Extract text content recursively
     extracted_texts = []
-    _extract_text_recursive(data, extracted_texts, set())
+    if field_paths:
+        _extract_fields(data, field_paths, extracted_texts)
+    else:
+        _extract_text_recursive(data, extracted_texts)
+    
+    if not extracted_texts:
+        return ""
+    
+    return "\n".join(extracted_texts)
+
+
+def _can_stream(path: str, field_paths: Optional[List[Tuple[Any, ...]]]) -> bool:
+    """Check whether the document is a top-level array that can be streamed"""
+    # Negative indexes need the array length, which is unknown while streaming
+    if field_paths and any(isinstance(steps[0], int) and steps[0] < 0 for steps in field_paths):
+        return False
+    
+    with open(path, 'rb') as f:
+        head = f.read(4096)
+    
+    return head.lstrip(b'\xef\xbb\xbf').lstrip()[:1] == b'['
+
+
+def _extract_json_streaming(path: str, field_paths: Optional[List[Tuple[Any, ...]]] = None,
+                            encoding: Optional[str] = None) -> str:
+    """
+    Extract text from a JSON document whose root is an array, one item at a time
+    
+    Only the current array item is held in memory, so multi-GB exports
+    (Slack dumps, API snapshots) can be processed. Field paths are matched
+    against the root array, so "[*].text" selects "text" from every item.
+    """
+    if encoding is None:
+        encoding = _sniff_stream_encoding(path)
+    
+    extracted_texts = []
+    
+    try:
+        with open(path, 'rb') as f:
+            for index, item in enumerate(_iter_top_level_items(f, encoding)):
+                if field_paths:
+                    for steps in field_paths:
+                        head = steps[0]
+                        if head is _WILDCARD or head == index:
+                            _extract_fields(item, [steps[1:]], extracted_texts)
+                else:
+                    _extract_text_recursive(item, extracted_texts)
+    except UnicodeDecodeError:
+        if encoding == 'latin-1':
+            raise
+        # Non-UTF-8 bytes past the sniffed prefix - restart with latin-1
+        return _extract_json_streaming(path, field_paths, encoding='latin-1')
+    except _STREAM_PARSE_ERRORS as e:
+        raise RuntimeError(f"Invalid JSON format: {str(e)}")
     
     if not extracted_texts:
         return ""
@@ -67,57 +223,151 @@ def _extract_json(path: str) -> str:
     return "\n".join(extracted_texts)
 
 
-def _extract_jsonl(path: str) -> str:
-    """Extract text from a JSONL (JSON Lines) file"""
+def _sniff_stream_encoding(path: str) -> str:
+    """Guess UTF-8 vs latin-1 from the first block of the file"""
+    with open(path, 'rb') as f:
+        sample = f.read(65536)
+    
+    try:
+        sample.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut off at the end of the sample is still UTF-8
+        if e.start < len(sample) - 3:
+            return 'latin-1'
+    
+    return 'utf-8'
+
+
+def _iter_top_level_items(f: BinaryIO, encoding: str) -> Iterator[Any]:
+    """Yield the items of a top-level JSON array, using ijson when available"""
+    if IJSON_AVAILABLE and encoding == 'utf-8':
+        if f.read(3) != b'\xef\xbb\xbf':
+            f.seek(0)
+        # 'item' is ijson's prefix for the elements of the root array
+        yield from ijson.items(f, 'item', use_float=True)
+    else:
+        yield from _iter_array_items_stdlib(f, encoding)
+
+
+def _iter_array_items_stdlib(f: BinaryIO, encoding: str) -> Iterator[Any]:
+    """
+    Incrementally decode the items of a top-level JSON array with the json module
+    
+    Reads STREAM_READ_SIZE characters at a time and parses complete items
+    with JSONDecoder.raw_decode. An item that is still incomplete at the end
+    of the buffer is retried after reading more input, up to
+    MAX_STREAM_ITEM_CHARS; past that the item is treated as malformed rather
+    than pulling the rest of the file into memory.
+    
+    Raises:
+        ValueError: If the document is not a well-formed JSON array, or an
+            item is larger than MAX_STREAM_ITEM_CHARS
+    """
+    decoder = json.JSONDecoder()
+    stream = io.TextIOWrapper(f, encoding='utf-8-sig' if encoding == 'utf-8' else encoding)
+    buffer = stream.read(STREAM_READ_SIZE)
+    position = 0
+    eof = not buffer
+    expect_item = True  # No comma needed before the first item
+    
+    def skip_whitespace(text: str, pos: int) -> int:
+        while pos < len(text) and text[pos] in ' \t\r\n':
+            pos += 1
+        return pos
+    
+    position = skip_whitespace(buffer, position)
+    if buffer[position:position + 1] != '[':
+        raise ValueError("Streaming JSON extraction requires a top-level array")
+    position += 1
+    first = True
+    
+    while True:
+        position = skip_whitespace(buffer, position)
+        
+        # Refill when the buffer runs dry between tokens
+        if position >= len(buffer):
+            if eof:
+                raise ValueError("Unexpected end of JSON array")
+            buffer = stream.read(STREAM_READ_SIZE)
+            position = 0
+            eof = not buffer
+            continue
+        
+        char = buffer[position]
+        if char == ']' and (first or not expect_item):
+            return
+        
+        if not first and not expect_item:
+            if char != ',':
+                raise ValueError(f"Expecting ',' delimiter in JSON array, found {char!r}")
+            position += 1
+            expect_item = True
+            continue
+        
+        try:
+            item, end = decoder.raw_decode(buffer, position)
+            # A number (or literal) touching the buffer end may continue in the next read
+            complete = end < len(buffer) or eof
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        
+        if not complete:
+            if len(buffer) - position > MAX_STREAM_ITEM_CHARS:
+                raise ValueError(f"JSON array item exceeds {MAX_STREAM_ITEM_CHARS:,} characters "
+                                 f"or is malformed")
+            # Keep the partial item and grow the buffer geometrically
+            more = stream.read(max(STREAM_READ_SIZE, len(buffer) - position))
+            buffer = buffer[position:] + more
+            position = 0
+            eof = not more
+            continue
+        
+        yield item
+        position = end
+        first = False
+        expect_item = False
+        
+        # Drop consumed text so memory stays bounded by the largest item
+        if position > STREAM_READ_SIZE:
+            buffer = buffer[position:]
+            position = 0
+
+
+def _extract_jsonl(path: str, field_paths: Optional[List[Tuple[Any, ...]]] = None) -> str:
+    """
+    Extract text from a JSONL (JSON Lines) file in a single pass
+    
+    The file is read as bytes and each line is decoded on its own, so a
+    stray non-UTF-8 line falls back to latin-1 without restarting the file.
+    """
     extracted_texts = []
-    line_number = 0
     
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line_number += 1
-                line = line.strip()
+        with open(path, 'rb') as f:
+            for line_number, raw_line in enumerate(f, start=1):
+                if line_number == 1 and raw_line.startswith(b'\xef\xbb\xbf'):
+                    raw_line = raw_line[3:]  # Strip UTF-8 BOM
                 
-                if not line:  # Skip empty lines
+                raw_line = raw_line.strip()
+                if not raw_line:  # Skip empty lines
                     continue
                 
                 try:
-                    data = json.loads(line)
-                    line_texts = []
-                    _extract_text_recursive(data, line_texts, set())
-                    
-                    if line_texts:
-                        extracted_texts.extend(line_texts)
-                        
-                except json.JSONDecodeError as e:
+                    data = _loads_jsonl_line(raw_line)
+                except ValueError as e:
                     # Log error but continue processing other lines
                     print(f"Warning: Invalid JSON on line {line_number}: {str(e)}")
                     continue
+                
+                if field_paths:
+                    _extract_fields(data, field_paths, extracted_texts)
+                else:
+                    _extract_text_recursive(data, extracted_texts)
                     
-    except UnicodeDecodeError:
-        # Try different encoding
-        try:
-            with open(path, 'r', encoding='latin-1') as f:
-                for line in f:
-                    line_number += 1
-                    line = line.strip()
-                    
-                    if not line:
-                        continue
-                    
-                    try:
-                        data = json.loads(line)
-                        line_texts = []
-                        _extract_text_recursive(data, line_texts, set())
-                        
-                        if line_texts:
-                            extracted_texts.extend(line_texts)
-                            
-                    except json.JSONDecodeError:
-                        continue
-                        
-        except Exception as e:
-            raise RuntimeError(f"Cannot read JSONL file: {str(e)}")
+    except OSError as e:
+        raise RuntimeError(f"Cannot read JSONL file: {str(e)}")
     
     if not extracted_texts:
         return ""
@@ -125,15 +375,52 @@ def _extract_jsonl(path: str) -> str:
     return "\n".join(extracted_texts)
 
 
-def _extract_text_recursive(obj: Any, texts: List[str], seen_objects: Set[id]) -> None:
+def _loads_jsonl_line(raw_line: bytes) -> Any:
+    """
+    Parse one JSONL line, decoding it as UTF-8 with a latin-1 fallback
+    
+    Raises:
+        ValueError: If the line is not valid JSON (json.JSONDecodeError and
+            orjson.JSONDecodeError are both ValueError subclasses)
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            # orjson parses UTF-8 bytes directly without an intermediate str
+            return orjson.loads(raw_line)
+        except orjson.JSONDecodeError:
+            try:
+                raw_line.decode('utf-8')
+            except UnicodeDecodeError:
+                return orjson.loads(raw_line.decode('latin-1'))
+            raise
+    
+    try:
+        text = raw_line.decode('utf-8')
+    except UnicodeDecodeError:
+        text = raw_line.decode('latin-1')
+    return json.loads(text)
+
+
+def _extract_text_recursive(obj: Any, texts: List[str], seen_objects: Optional[Set[int]] = None) -> None:
     """
     Recursively extract text content from JSON objects
     
     Args:
         obj: The JSON object/value to process
         texts: List to append extracted text to
-        seen_objects: Set of object IDs to prevent infinite recursion
+        seen_objects: Set of object IDs to prevent infinite recursion. Values
+            produced by a JSON parser cannot be circular, so parsers pass None
+            and skip the bookkeeping
     """
+    if seen_objects is None:
+        if isinstance(obj, dict):
+            _extract_from_dict(obj, texts, seen_objects)
+        elif isinstance(obj, list):
+            _extract_from_list(obj, texts, seen_objects)
+        elif isinstance(obj, str):
+            _extract_from_string(obj, texts)
+        return
+    
     # Prevent infinite recursion on circular references
     if isinstance(obj, (dict, list)) and id(obj) in seen_objects:
         return
@@ -152,7 +439,7 @@ def _extract_text_recursive(obj: Any, texts: List[str], seen_objects: Set[id]) -
         _extract_from_string(obj, texts)
 
 
-def _extract_from_dict(obj: Dict[str, Any], texts: List[str], seen_objects: Set[id]) -> None:
+def _extract_from_dict(obj: Dict[str, Any], texts: List[str], seen_objects: Optional[Set[int]]) -> None:
     """Extract text from dictionary objects with intelligent key prioritization"""
     
     # Define priority keys that typically contain meaningful text content
@@ -197,7 +484,7 @@ def _extract_from_dict(obj: Dict[str, Any], texts: List[str], seen_objects: Set[
                 _extract_text_recursive(value, texts, seen_objects)
 
 
-def _extract_from_list(obj: List[Any], texts: List[str], seen_objects: Set[id]) -> None:
+def _extract_from_list(obj: List[Any], texts: List[str], seen_objects: Optional[Set[int]]) -> None:
     """Extract text from list objects"""
     for item in obj:
         _extract_text_recursive(item, texts, seen_objects)
@@ -227,7 +514,7 @@ def _extract_from_string(text: str, texts: List[str]) -> None:
     texts.append(text)
 
 
-def _extract_chat_message(obj: Dict[str, Any], texts: List[str], seen_objects: Set[id]) -> None:
+def _extract_chat_message(obj: Dict[str, Any], texts: List[str], seen_objects: Optional[Set[int]]) -> None:
     """Special handling for chat message objects"""
     # Common chat message formats:
     # {"role": "user", "content": "message"}
@@ -10,6 +10,8 @@ import os
 import re
 from typing import List, Optional
 
+from processing.extractors.decoding import decode_file
+
 
 def extract_text(path: str, include_code_blocks: bool = True) -> str:
     """
@@ -35,8 +37,7 @@ def extract_text(path: str, include_code_blocks: bool = True) -> str:
             from markdown.extensions import codehilite, tables, toc
 
             # Read the markdown file
-            with open(path, 'r', encoding='utf-8') as f:
-                md_content = f.read()
+            md_content = decode_file(path).text
 
             # Configure markdown with useful extensions
             md = markdown.Markdown(
@@ -83,15 +84,9 @@ def _extract_text_manual(path: str, include_code_blocks: bool = True) -> str:
     This is a fallback method when markdown library is not available.
     """
     try:
-        with open(path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except UnicodeDecodeError:
-        # Try with different encoding
-        try:
-            with open(path, 'r', encoding='latin-1') as f:
-                content = f.read()
-        except Exception as inner_e:
-            raise RuntimeError(f"Cannot read markdown file with any encoding: {str(inner_e)}")
+        content = decode_file(path).text
+    except Exception as e:
+        raise RuntimeError(f"Cannot read markdown file: {str(e)}")
 
     # Clean the markdown content
     clean_content = _clean_markdown_manual(content, include_code_blocks)
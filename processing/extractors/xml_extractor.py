@@ -11,6 +11,8 @@ import re
 import xml.etree.ElementTree as ET
 from typing import List, Dict, Set, Optional
 
+from processing.extractors.decoding import decode_file
+
 
 def extract_text(path: str) -> str:
     """
@@ -47,17 +49,7 @@ def extract_text(path: str) -> str:
 def _extract_with_beautifulsoup(path: str) -> str:
     """Extract text using BeautifulSoup for robust XML parsing"""
     
-    encodings = ['utf-8', 'utf-8-sig', 'latin-1', 'cp1252', 'iso-8859-1']
-    
-    for encoding in encodings:
-        try:
-            with open(path, 'r', encoding=encoding) as f:
-                xml_content = f.read()
-            break
-        except UnicodeDecodeError:
-            continue
-    else:
-        raise RuntimeError(f"Cannot read XML file with any supported encoding")
+    xml_content = decode_file(path).text
     
     # Parse with BeautifulSoup using XML parser
     soup = BeautifulSoup(xml_content, 'xml')
@@ -0,0 +1,185 @@
+# processing/sentences.py
+"""
+Rule-based sentence segmentation for Wolfscribe
+
+Sentences are returned as (start, end) offsets into the cleaned text rather
+than as new strings, so segmenting a book allocates one small tuple per
+sentence instead of a copy of the whole text. A boundary is a run of
+terminal punctuation (plus closing quotes or brackets) followed by
+whitespace, or a blank line. A period does not end a sentence after a known
+abbreviation or a single initial, and no punctuation ends one when the
+next word starts in lower case ('"Really?" she asked.'). Single newlines
+inside a sentence (hard-wrapped text) are not boundaries.
+
+merge_sentence_spans() then packs consecutive sentences into chunks that
+stay within a token budget, so sentence splitting yields fewer,
+training-sized chunks instead of one tiny chunk per sentence.
+"""
+
+import re
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Span = Tuple[int, int]
+
+# Configuration constants
+CHARS_PER_TOKEN_ESTIMATE = 4  # Used when no tokenizer is supplied
+SENTENCE_JOIN_TOKENS = 1  # Budget per joined sentence for whitespace and per-sentence rounding
+ABBREVIATION_LOOKBACK = 16  # Characters searched for the word before a period
+
+# Lower-case, without the trailing period
+ABBREVIATIONS = frozenset({
+    # Titles and honorifics
+    'mr', 'mrs', 'ms', 'dr', 'prof', 'rev', 'hon', 'st', 'sr', 'jr', 'sgt', 'capt', 'col',
+    'gen', 'lt', 'cmdr', 'gov', 'pres', 'sen', 'fr', 'mt',
+    # Latin and common prose abbreviations
+    'e.g', 'i.e', 'etc', 'vs', 'viz', 'cf', 'al', 'approx', 'ibid',
+    # Organisations and places
+    'inc', 'ltd', 'corp', 'dept', 'univ', 'assn', 'bros', 'ave', 'blvd',
+    # Months
+    'jan', 'feb', 'apr', 'jun', 'jul', 'aug', 'sep', 'sept', 'oct', 'nov', 'dec',
+})
+
+# Abbreviations that are also ordinary words ("the answer was no."), so
+# they only count when a number follows
+NUMERIC_ABBREVIATIONS = frozenset({
+    'no', 'nos', 'vol', 'vols', 'p', 'pp', 'fig', 'figs', 'ch', 'chap', 'sec', 'art', 'ed',
+    'c', 'ca', 'in', 'ft', 'lb', 'lbs', 'oz', 'min', 'hr', 'hrs', 'mar', 'co', 'rd',
+})
+
+# Candidate boundaries. Terminal punctuation (with closing quotes/brackets) and
+# the whitespace after it, unless an ASCII lower-case word follows; or a blank line.
+# The leading lookahead lets the engine skip ahead to candidate characters.
+_BOUNDARY_RE = re.compile(
+    r"(?=[.!?\n])(?:"
+    r"(?P<term>[.!?]+)[\"'”’)\]]*(?P<gap>\s+)(?=[^\sa-z]|\Z)"
+    r"|\n[ \t\r\f\v]*\n\s*)"
+)
+# Word (possibly with inner periods, e.g. "e.g") ending right before a period
+_WORD_BEFORE_RE = re.compile(r"[A-Za-z][A-Za-z.]*\Z")
+
+
+def iter_sentence_spans(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Span]:
+    """
+    Yield (start, end) offsets of the sentences in text[start:end]
+
+    Offsets exclude surrounding whitespace; empty sentences are skipped.
+    """
+    end = len(text) if end is None else end
+    sentence_start, _ = _trim(text, start, end)
+
+    for match in _BOUNDARY_RE.finditer(text, sentence_start, end):
+        term = match.group('term')
+        if term is None:
+            sentence_end = _trim(text, sentence_start, match.start())[1]
+        else:
+            if not _is_sentence_end(text, match.start(), term, match.end(), end):
+                if match.group('gap').count('\n') < 2:
+                    continue
+            sentence_end = match.start('gap')
+
+        if sentence_start < sentence_end:
+            yield sentence_start, sentence_end
+        sentence_start = match.end()
+
+    sentence_start, sentence_end = _trim(text, sentence_start, end)
+    if sentence_start < sentence_end:
+        yield sentence_start, sentence_end
+
+
+def sentence_spans(text: str, start: int = 0, end: Optional[int] = None) -> List[Span]:
+    """Offsets of every sentence in text[start:end]"""
+    return list(iter_sentence_spans(text, start, end))
+
+
+def merge_sentence_spans(text: str,
+                         spans: Iterable[Span],
+                         max_tokens: int,
+                         count_tokens: Optional[Callable[[str], int]] = None) -> List[Span]:
+    """
+    Pack consecutive sentences into chunks of at most max_tokens
+
+    A chunk's token count is the sum of its sentences' counts plus
+    SENTENCE_JOIN_TOKENS per join, which covers the whitespace between
+    sentences and estimators that round each sentence down. A single
+    sentence longer than max_tokens becomes a chunk of its own.
+
+    Args:
+        text: Text the spans point into
+        spans: Sentence spans in order
+        max_tokens: Token budget per chunk
+        count_tokens: Token counter for a sentence (defaults to a
+            characters-per-token estimate)
+
+    Returns:
+        List[Span]: One (start, end) span per chunk, covering whole sentences
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be positive")
+
+    chunks: List[Span] = []
+    chunk_start = chunk_end = None
+    chunk_tokens = 0
+
+    for start, end in spans:
+        if count_tokens is None:
+            tokens = max(1, (end - start) // CHARS_PER_TOKEN_ESTIMATE)
+        else:
+            tokens = count_tokens(text[start:end])
+
+        if chunk_start is not None and chunk_tokens + SENTENCE_JOIN_TOKENS + tokens > max_tokens:
+            chunks.append((chunk_start, chunk_end))
+            chunk_start = None
+
+        if chunk_start is None:
+            chunk_start, chunk_tokens = start, tokens
+        else:
+            chunk_tokens += SENTENCE_JOIN_TOKENS + tokens
+        chunk_end = end
+
+    if chunk_start is not None:
+        chunks.append((chunk_start, chunk_end))
+    return chunks
+
+
+def slice_spans(text: str, spans: Sequence[Span]) -> List[str]:
+    """Materialise spans as strings"""
+    return [text[start:end] for start, end in spans]
+
+
+def _is_sentence_end(text: str, position: int, term: str, after: int, end: int) -> bool:
+    """Whether the terminal punctuation term at text[position] ends a sentence"""
+    next_char = text[after] if after < end else ''
+    if next_char.islower():
+        return False  # Sentences do not start in lower case (ASCII is already excluded by the pattern)
+
+    if term == '.':
+        word = _WORD_BEFORE_RE.search(text, max(0, position - ABBREVIATION_LOOKBACK), position)
+        if word is not None:
+            token = word.group().lower()
+            if token in ABBREVIATIONS or '.' in token:
+                return False  # Known abbreviation, or dotted like "U.S." and "a.m."
+            if len(token) == 1 and word.group().isupper():
+                return False  # An initial, as in "J. R. R. Tolkien"
+            if token in NUMERIC_ABBREVIATIONS and next_char.isdigit():
+                return False  # "No. 5", "pp. 12-14"
+    return True
+
+
+def _trim(text: str, start: int, end: int) -> Span:
+    """Shrink a span to exclude leading and trailing whitespace"""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    return start, end
+
+
+__all__ = [
+    'iter_sentence_spans',
+    'sentence_spans',
+    'merge_sentence_spans',
+    'slice_spans',
+    'ABBREVIATIONS',
+    'NUMERIC_ABBREVIATIONS',
+    'Span'
+]
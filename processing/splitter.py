@@ -1,11 +1,46 @@
 #processing/splitter.py
-def split_text(text, method="paragraph", delimiter=None):
+from processing.sentences import iter_sentence_spans, merge_sentence_spans, slice_spans, Span
+from typing import List
+
+
+def split_text(text, method="paragraph", delimiter=None, max_tokens=None, count_tokens=None):
+    """
+    Split cleaned text into chunks
+
+    For method="sentence", consecutive sentences are merged into chunks of
+    up to max_tokens (counted with count_tokens(text) when given, estimated
+    from length otherwise); without max_tokens each sentence is a chunk.
+    """
+    return slice_spans(text, split_text_spans(text, method, delimiter, max_tokens, count_tokens))
+
+
+def split_text_spans(text, method="paragraph", delimiter=None, max_tokens=None, count_tokens=None) -> List[Span]:
+    """Same as split_text, but returns (start, end) offsets into text instead of strings"""
     if method == "paragraph":
-        return [p.strip() for p in text.split("\n\n") if p.strip()]
+        return [span for span in _delimited_spans(text, "\n\n") if span[0] < span[1]]
     elif method == "sentence":
-        import re
-        return re.split(r'(?<=[.!?]) +', text)
+        spans = iter_sentence_spans(text)
+        if max_tokens:
+            return merge_sentence_spans(text, spans, max_tokens, count_tokens)
+        return list(spans)
     elif method == "custom" and delimiter:
-        return [s.strip() for s in text.split(delimiter)]
+        return list(_delimited_spans(text, delimiter))
     else:
         raise ValueError("Invalid split method.")
+
+
+def _delimited_spans(text, delimiter):
+    """Whitespace-trimmed spans between occurrences of delimiter (like str.split then strip)"""
+    start = 0
+    while True:
+        end = text.find(delimiter, start)
+        piece_end = len(text) if end == -1 else end
+        piece_start = start
+        while piece_start < piece_end and text[piece_start].isspace():
+            piece_start += 1
+        while piece_end > piece_start and text[piece_end - 1].isspace():
+            piece_end -= 1
+        yield piece_start, piece_end
+        if end == -1:
+            return
+        start = end + len(delimiter)
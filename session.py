@@ -1,12 +1,139 @@
+import hashlib
+from array import array
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from typing import Iterable, List, Optional, Dict, Sequence
+
+from processing.chunk_spans import SpanChunks
+
+# Rolling fingerprint over chunk digests: value = sum(d_i * BASE^(n-1-i)) mod 2^64.
+# BASE is odd, so appends and in-place edits update the value without rehashing
+# the rest of the corpus.
+_FINGERPRINT_BASE = 0x100000001b3
+_UINT64_MASK = (1 << 64) - 1
+
+
+def chunk_digest(chunk: str) -> int:
+    """64-bit content digest of one chunk"""
+    return int.from_bytes(hashlib.blake2b(chunk.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+class CorpusFingerprint:
+    """Order-sensitive rolling hash of a chunk list, updated as chunks change"""
+
+    __slots__ = ('_digests', '_value')
+
+    def __init__(self, chunks: Iterable[str] = ()):
+        self._digests = array('Q')
+        self._value = 0
+        self.extend(chunks)
+
+    def __len__(self) -> int:
+        return len(self._digests)
+
+    def append(self, chunk: str):
+        digest = chunk_digest(chunk)
+        self._digests.append(digest)
+        self._value = (self._value * _FINGERPRINT_BASE + digest) & _UINT64_MASK
+
+    def extend(self, chunks: Iterable[str]):
+        for chunk in chunks:
+            self.append(chunk)
+
+    def replace(self, index: int, chunk: str):
+        """Account for chunks[index] having been replaced by chunk"""
+        count = len(self._digests)
+        index = index + count if index < 0 else index
+        old_digest = self._digests[index]
+        new_digest = chunk_digest(chunk)
+        self._digests[index] = new_digest
+        weight = pow(_FINGERPRINT_BASE, count - 1 - index, 1 << 64)
+        self._value = (self._value + (new_digest - old_digest) * weight) & _UINT64_MASK
+
+    @classmethod
+    def concat(cls, parts: Iterable['CorpusFingerprint']) -> 'CorpusFingerprint':
+        """Fingerprint of the parts' chunks joined in order, without rehashing them"""
+        combined = cls()
+        for part in parts:
+            combined._digests.extend(part._digests)
+            shift = pow(_FINGERPRINT_BASE, len(part._digests), 1 << 64)
+            combined._value = (combined._value * shift + part._value) & _UINT64_MASK
+        return combined
+
+    def hexdigest(self) -> str:
+        """Fingerprint string (rolling hash plus chunk count)"""
+        return f"{self._value:016x}-{len(self._digests):x}"
+
+
+def chunks_fingerprint(chunks: Iterable[str]) -> str:
+    """Fingerprint of a chunk list that is not tracked by a session"""
+    return CorpusFingerprint(chunks).hexdigest()
+
 
 @dataclass
 class SessionFile:
     path: str
     tag: Optional[str] = None
     config: Dict = field(default_factory=dict)
-    chunks: List[str] = field(default_factory=list)
+    chunks: Sequence[str] = ()  # Read-only: a tuple, or SpanChunks straight from processing
+    _fingerprint: Optional[CorpusFingerprint] = field(default=None, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        if name == 'chunks':
+            # Edits must go through append_chunks/replace_chunk to keep the fingerprint current
+            if not isinstance(value, (tuple, SpanChunks)):
+                value = tuple(value)
+            # Rebuilt lazily so repeated assignments cost nothing extra
+            super().__setattr__('_fingerprint', None)
+        super().__setattr__(name, value)
+
+    @property
+    def fingerprint(self) -> str:
+        """Content fingerprint of this file's chunks"""
+        if self._fingerprint is None:
+            super().__setattr__('_fingerprint', CorpusFingerprint(self.chunks))
+        return self._fingerprint.hexdigest()
+
+    def update_chunks(self, chunks: Sequence[str], fingerprint: Optional[CorpusFingerprint] = None):
+        """
+        Replace the chunks, e.g. after reprocessing, without a full rehash where possible
+
+        fingerprint, if given, must have been built from these chunks (typically
+        on a worker thread) and is taken over as is. Otherwise, when the new
+        chunks mostly match the old ones, only edited and appended chunks are
+        rehashed.
+        """
+        if not isinstance(chunks, (tuple, SpanChunks)):
+            chunks = tuple(chunks)
+        if fingerprint is not None:
+            if len(fingerprint) != len(chunks):
+                raise ValueError(f"Fingerprint covers {len(fingerprint)} chunks, not {len(chunks)}")
+            self.chunks = chunks
+            super().__setattr__('_fingerprint', fingerprint)
+            return
+
+        old = self.chunks
+        if self._fingerprint is not None and len(chunks) >= len(old):
+            changed = [index for index, (before, after) in enumerate(zip(old, chunks)) if before != after]
+            if len(changed) * 2 <= len(old):
+                super().__setattr__('chunks', chunks)
+                for index in changed:
+                    self._fingerprint.replace(index, chunks[index])
+                self._fingerprint.extend(chunks[len(old):])
+                return
+        self.chunks = chunks
+
+    def append_chunks(self, chunks: Iterable[str]):
+        chunks = tuple(chunks)
+        super().__setattr__('chunks', tuple(self.chunks) + chunks)
+        if self._fingerprint is not None:
+            self._fingerprint.extend(chunks)
+
+    def replace_chunk(self, index: int, chunk: str):
+        edited = list(self.chunks)
+        edited[index] = chunk
+        super().__setattr__('chunks', tuple(edited))
+        if self._fingerprint is not None:
+            self._fingerprint.replace(index, chunk)
 
 @dataclass
 class Session:
@@ -18,17 +145,43 @@ class Session:
     def get_all_chunks(self) -> List[str]:
         return [chunk for f in self.files for chunk in f.chunks]
 
+    def get_file(self, path: str) -> Optional[SessionFile]:
+        for f in self.files:
+            if f.path == path:
+                return f
+        return None
+
+    def file_fingerprint(self, path: str) -> Optional[str]:
+        """Fingerprint of one file's chunks, or None if the file is not in the session"""
+        session_file = self.get_file(path)
+        return session_file.fingerprint if session_file else None
+
+    @property
+    def fingerprint(self) -> str:
+        """Fingerprint of all chunks in file order (changes whenever any chunk does)"""
+        combined = hashlib.blake2b(digest_size=16)
+        for f in self.files:
+            combined.update(f.fingerprint.encode('ascii'))
+            combined.update(b'|')
+        return combined.hexdigest()
+
     def to_dict(self) -> Dict:
         return {
-            "files": [
-                {
-                    "path": f.path,
-                    "tag": f.tag,
-                    "config": f.config,
-                    "chunks": f.chunks
-                } for f in self.files
-            ]
+            "files": [self._file_dict(f) for f in self.files]
+        }
+
+    @staticmethod
+    def _file_dict(f: SessionFile) -> Dict:
+        data = {
+            "path": f.path,
+            "tag": f.tag,
+            "config": f.config,
+            "chunks": list(f.chunks)
         }
+        if isinstance(f.chunks, SpanChunks):
+            # Source offsets of each chunk in the cleaned text, for provenance
+            data["spans"] = [[span.doc_id, span.start, span.end] for span in f.chunks.iter_spans()]
+        return data
 
     @staticmethod
     def from_dict(data: Dict) -> 'Session':
@@ -40,4 +193,4 @@ class Session:
                 config=file_data.get("config", {}),
                 chunks=file_data.get("chunks", [])
             ))
-        return session
\ No newline at end of file
+        return session
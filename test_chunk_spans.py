@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# test_chunk_spans.py
+"""
+Test suite for offset-based chunk storage (processing/chunk_spans.py)
+
+Usage:
+    python -m pytest test_chunk_spans.py
+    python test_chunk_spans.py
+"""
+
+import sys
+import os
+import traceback
+
+# Add the project root to path to import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from processing.chunk_spans import ChunkSpan, SpanChunks, concat_chunks
+
+
+BOOK = "Alpha paragraph.\n\nBeta paragraph.\n\nGamma paragraph."
+BOOK_SPANS = [(0, 16), (18, 33), (35, 51)]
+BOOK_CHUNKS = ["Alpha paragraph.", "Beta paragraph.", "Gamma paragraph."]
+NOTES = "First note. Second note."
+
+
+def book_chunks():
+    return SpanChunks.from_spans("book.txt", BOOK, BOOK_SPANS)
+
+
+def notes_chunks():
+    return SpanChunks.from_spans("notes.txt", NOTES, [(0, 11), (12, 24)])
+
+
+def test_sequence_behaviour():
+    """SpanChunks reads like a list of strings"""
+    chunks = book_chunks()
+
+    assert len(chunks) == 3, f"expected 3 chunks, got {len(chunks)}"
+    assert chunks[0] == "Alpha paragraph." and chunks[-1] == "Gamma paragraph.", "indexing does not return chunk text"
+    assert list(chunks) == BOOK_CHUNKS, "iteration does not match a list"
+    assert "Beta paragraph." in chunks and chunks.index("Gamma paragraph.") == 2, "membership or index() wrong"
+    assert chunks.document("book.txt") is BOOK, "text not stored once"
+
+    try:
+        chunks[len(chunks)]
+        raise AssertionError("out-of-range index did not raise IndexError")
+    except IndexError:
+        pass
+
+
+def test_slicing_and_select():
+    """Slices and selections stay SpanChunks over the same documents"""
+    chunks = book_chunks()
+    tail = chunks[1:]
+    picked = chunks.select([2, 0])
+
+    assert isinstance(tail, SpanChunks), f"slice returned {type(tail).__name__}"
+    assert list(tail) == BOOK_CHUNKS[1:], "slice text wrong"
+    assert list(chunks[::-1]) == BOOK_CHUNKS[::-1], "stepped slice wrong"
+    assert tail.document("book.txt") is BOOK, "slice does not share the document text"
+    assert list(picked) == ["Gamma paragraph.", "Alpha paragraph."], "select did not keep the given order"
+    assert picked.span(0) == ChunkSpan("book.txt", 35, 51), "select lost provenance"
+    assert len(chunks.select([])) == 0, "empty selection not empty"
+
+
+def test_provenance():
+    """span() and iter_spans() report where each chunk came from"""
+    chunks = book_chunks()
+    spans = list(chunks.iter_spans())
+
+    assert chunks.span(1) == ChunkSpan("book.txt", 18, 33), f"wrong span for one chunk: {chunks.span(1)}"
+    assert [(s.start, s.end) for s in spans] == BOOK_SPANS, "iter_spans does not cover every chunk"
+    assert all(s.doc_id == "book.txt" for s in spans), "spans do not name their document"
+    assert [chunks.document(s.doc_id)[s.start:s.end] for s in spans] == BOOK_CHUNKS, \
+        "spans do not slice back to the chunks"
+
+
+def test_documents():
+    """Documents are registered once and conflicting text is rejected"""
+    chunks = book_chunks()
+
+    assert chunks.add_document("book.txt", "".join(BOOK)) == 0, "equal text did not reuse the document"
+
+    try:
+        chunks.add_document("book.txt", "Different text")
+        raise AssertionError("conflicting text for a doc_id accepted")
+    except ValueError:
+        pass
+
+    try:
+        chunks.append("missing.txt", 0, 1)
+        raise AssertionError("appending to an unknown document did not raise KeyError")
+    except KeyError:
+        pass
+
+    assert chunks.add_document("notes.txt", NOTES) == 1, "new document did not get the next index"
+    chunks.append("notes.txt", 0, 11)
+    assert chunks[-1] == "First note.", "appended chunk not readable"
+    assert chunks.doc_ids == ["book.txt", "notes.txt"], f"doc_ids out of registration order: {chunks.doc_ids}"
+
+
+def test_concat():
+    """Concatenation keeps spans when it can and falls back to a list"""
+    book, notes = book_chunks(), notes_chunks()
+    combined = SpanChunks.concat([book, notes, book[:1]])
+    mixed = concat_chunks([book, ["plain chunk"]])
+
+    assert list(combined) == BOOK_CHUNKS + ["First note.", "Second note.", "Alpha paragraph."], \
+        "concat lost or reordered chunks"
+    assert combined.doc_ids == ["book.txt", "notes.txt"], "shared documents registered more than once"
+    assert combined.span(4) == ChunkSpan("notes.txt", 12, 24), "concat did not remap provenance"
+    assert isinstance(concat_chunks([book, notes]), SpanChunks), "concat_chunks dropped spans for span parts"
+    assert isinstance(mixed, list) and mixed == BOOK_CHUNKS + ["plain chunk"], \
+        "concat_chunks did not fall back to a list for mixed parts"
+    assert list(concat_chunks([])) == [], "concat_chunks of nothing not empty"
+
+
+TESTS = [
+    test_sequence_behaviour,
+    test_slicing_and_select,
+    test_provenance,
+    test_documents,
+    test_concat,
+]
+
+
+def main():
+    """Run all tests without pytest and provide summary"""
+    print("🧪 Wolfscribe Chunk Span Test Suite")
+    print("=" * 60)
+
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ PASSED   {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAILED   {test.__name__}: {e}")
+        except Exception as e:
+            failed += 1
+            print(f"💥 ERROR    {test.__name__}: {e}")
+            traceback.print_exc()
+
+    print("=" * 60)
+    print(f"SUMMARY: {len(TESTS) - failed}/{len(TESTS)} tests passed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
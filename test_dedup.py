@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+# test_dedup.py
+"""
+Test suite for the chunk deduplication stage (processing/dedup.py)
+
+Usage:
+    python -m pytest test_dedup.py
+    python test_dedup.py
+"""
+
+import sys
+import os
+import traceback
+
+# Add the project root to path to import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from processing.dedup import ChunkDeduplicator, deduplicate_chunks
+from processing.chunk_spans import SpanChunks
+
+
+PARAGRAPH = ("The old lighthouse keeper climbed the spiral stairs every evening at dusk, "
+             "trimming the wick and polishing the great lens until it shone across the bay.")
+NEAR_COPY = PARAGRAPH + " Always."  # One extra word: estimated similarity well above 0.8
+
+
+def test_exact_duplicates():
+    """Exact repeats (ignoring whitespace) are removed, first occurrence kept"""
+    chunks = ["alpha beta gamma", "delta epsilon", "alpha   beta\ngamma", "delta epsilon"]
+    unique, stats = deduplicate_chunks(chunks, exact_only=True)
+
+    assert unique == ["alpha beta gamma", "delta epsilon"], f"first occurrences not kept in order: {unique}"
+    assert stats.exact_duplicates == 2, f"expected 2 exact duplicates, got {stats.exact_duplicates}"
+    assert stats.near_duplicates == 0, "near duplicates reported in exact-only mode"
+    assert stats.characters_removed == len(chunks[2]) + len(chunks[3]), "characters removed miscounted"
+
+
+def test_near_duplicates():
+    """Lightly edited copies are caught; unrelated text is kept"""
+    unrelated = ("Quarterly revenue rose on strong demand for cloud services, while operating "
+                 "margins narrowed as the company expanded its data centre footprint.")
+    unique, stats = deduplicate_chunks([PARAGRAPH, unrelated, NEAR_COPY])
+
+    assert unique == [PARAGRAPH, unrelated], "edited copy not removed, or unrelated text dropped"
+    assert stats.near_duplicates == 1, f"expected 1 near duplicate, got {stats.near_duplicates}"
+    assert stats.duplicate_clusters == 1 and stats.largest_cluster == 2, "expected one cluster of two"
+
+
+def test_wordless_chunks():
+    """Chunks without word characters only collapse when identical"""
+    unique, stats = deduplicate_chunks(["***", "---", "* * *", "***"])
+
+    assert unique == ["***", "---", "* * *"], f"distinct scene breaks not kept: {unique}"
+    assert stats.exact_duplicates == 1, "identical break not removed exactly"
+    assert stats.near_duplicates == 0, "wordless chunks matched as near duplicates"
+
+
+def test_cluster_preview():
+    """The cluster preview shows the first removed duplicate"""
+    deduplicator = ChunkDeduplicator()
+    for chunk in [PARAGRAPH, NEAR_COPY, PARAGRAPH]:
+        deduplicator.is_duplicate(chunk)
+    stats = deduplicator.finalize_stats()
+
+    assert len(stats.top_clusters) == 1, f"expected one cluster, got {len(stats.top_clusters)}"
+    assert stats.top_clusters[0].size == 3, "cluster size should include the retained chunk"
+    assert NEAR_COPY.startswith(stats.top_clusters[0].preview), "preview is not the first removed duplicate"
+
+
+def test_index_cap():
+    """A full near-duplicate index still matches earlier chunks but stops growing"""
+    deduplicator = ChunkDeduplicator(max_indexed_chunks=1)
+    other = "Completely different words about sailing ships and distant harbours at night."
+
+    assert not deduplicator.is_duplicate(PARAGRAPH), "first chunk reported as a duplicate"
+    assert not deduplicator.is_duplicate(other), "second unique chunk reported as a duplicate"
+    assert deduplicator.is_duplicate(NEAR_COPY), "near copy of the indexed chunk not caught"
+    assert not deduplicator.is_duplicate(other + " Always."), "unindexed chunk matched as a near duplicate"
+    assert deduplicator.is_duplicate(other), "exact copy of the unindexed chunk not caught"
+    assert deduplicator.stats.unindexed_chunks == 2, f"expected 2 unindexed, got {deduplicator.stats.unindexed_chunks}"
+
+
+def test_span_chunks():
+    """SpanChunks input gives SpanChunks output that keeps provenance"""
+    text = f"{PARAGRAPH}\n\nShort note.\n\n{PARAGRAPH}"
+    second = text.index("Short")
+    third = text.rindex(PARAGRAPH)
+    chunks = SpanChunks.from_spans("book.txt", text, [(0, len(PARAGRAPH)), (second, second + 11),
+                                                      (third, third + len(PARAGRAPH))])
+    unique, stats = deduplicate_chunks(chunks)
+
+    assert isinstance(unique, SpanChunks), f"expected SpanChunks, got {type(unique).__name__}"
+    assert list(unique) == deduplicate_chunks(list(chunks))[0], "text differs from list input"
+    assert unique.span(1) == ("book.txt", second, second + 11), "retained span lost its offsets"
+    assert stats.duplicates_removed == 1, f"expected 1 duplicate removed, got {stats.duplicates_removed}"
+
+
+TESTS = [
+    test_exact_duplicates,
+    test_near_duplicates,
+    test_wordless_chunks,
+    test_cluster_preview,
+    test_index_cap,
+    test_span_chunks,
+]
+
+
+def main():
+    """Run all tests without pytest and provide summary"""
+    print("🧪 Wolfscribe Deduplication Test Suite")
+    print("=" * 60)
+
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ PASSED   {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAILED   {test.__name__}: {e}")
+        except Exception as e:
+            failed += 1
+            print(f"💥 ERROR    {test.__name__}: {e}")
+            traceback.print_exc()
+
+    print("=" * 60)
+    print(f"SUMMARY: {len(TESTS) - failed}/{len(TESTS)} tests passed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# test_sentences.py
+"""
+Test suite for sentence segmentation and text splitting
+(processing/sentences.py, processing/splitter.py)
+
+Usage:
+    python -m pytest test_sentences.py
+    python test_sentences.py
+"""
+
+import sys
+import os
+import traceback
+
+# Add the project root to path to import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from processing.sentences import merge_sentence_spans, sentence_spans, slice_spans, SENTENCE_JOIN_TOKENS
+from processing.splitter import split_text, split_text_spans
+
+
+def sentences(text):
+    return split_text(text, "sentence")
+
+
+def test_abbreviations():
+    """Periods after abbreviations and initials do not end sentences"""
+    assert sentences("Mr. Smith met Dr. Jones. They talked.") == ["Mr. Smith met Dr. Jones.", "They talked."], \
+        "titles (Mr., Dr.) split a sentence"
+    assert sentences("We saw birds, e.g. robins. Then we left.") == ["We saw birds, e.g. robins.", "Then we left."], \
+        "Latin abbreviation (e.g.) split a sentence"
+    assert sentences("The U.S. Army arrived. It rained.") == ["The U.S. Army arrived.", "It rained."], \
+        "dotted abbreviation (U.S.) split a sentence"
+    assert sentences("See No. 5 for details. The answer was no. Then silence.") == \
+        ["See No. 5 for details.", "The answer was no.", "Then silence."], \
+        "numeric abbreviation not limited to a following number"
+    assert sentences("J. R. R. Tolkien wrote it. He was a professor.") == \
+        ["J. R. R. Tolkien wrote it.", "He was a professor."], "initials split a sentence"
+    assert sentences("It costs 3.5 dollars. Fine.") == ["It costs 3.5 dollars.", "Fine."], \
+        "decimal number split a sentence"
+
+
+def test_punctuation_and_quotes():
+    """Closing quotes stay with their sentence; lower case never starts one"""
+    assert sentences('"Really?" she asked. "Yes!" He nodded.') == ['"Really?" she asked.', '"Yes!"', 'He nodded.'], \
+        "quoted question followed by lower case split wrongly"
+    assert sentences("Wait... What happened? Nothing!") == ["Wait...", "What happened?", "Nothing!"], \
+        "runs of terminal punctuation split wrongly"
+    assert sentences("It was late (very late.) We slept.") == ["It was late (very late.)", "We slept."], \
+        "closing bracket not kept with its sentence"
+
+
+def test_line_boundaries():
+    """Blank lines end sentences; single hard-wrap newlines do not"""
+    text = "A heading\n\nThe first paragraph\nwraps here. Next sentence."
+
+    assert sentences(text) == ["A heading", "The first paragraph\nwraps here.", "Next sentence."], \
+        "blank line did not end an unpunctuated heading, or a hard wrap did"
+    assert sentences("Ask Dr.\n\nNew paragraph.") == ["Ask Dr.", "New paragraph."], \
+        "blank line did not end a sentence after an abbreviation"
+    assert sentence_spans("  One.  Two.  ") == [(2, 6), (8, 12)], "spans include surrounding whitespace"
+    assert slice_spans(text, sentence_spans(text)) == sentences(text), "spans do not slice back to the sentences"
+    assert sentences("") == [] and sentences(" \n\n ") == [], "empty or blank text gave sentences"
+
+
+def test_token_budget():
+    """Sentences are packed into chunks within max_tokens"""
+    text = "One two three. Four five. Six seven eight nine. Ten."
+    count_words = lambda sentence: len(sentence.split())
+    spans = sentence_spans(text)
+
+    # 3 + (1 + 2) = 6 fits; adding the 4-word sentence would not
+    chunks = slice_spans(text, merge_sentence_spans(text, spans, 6, count_words))
+    assert chunks == ["One two three. Four five.", "Six seven eight nine. Ten."], \
+        f"consecutive sentences not merged: {chunks}"
+
+    for chunk in chunks:
+        parts = sentences(chunk)
+        used = sum(count_words(part) for part in parts) + SENTENCE_JOIN_TOKENS * (len(parts) - 1)
+        assert used <= 6, f"chunk over the budget: {chunk!r}"
+
+    assert slice_spans(text, merge_sentence_spans(text, spans, 2, count_words)) == \
+        ["One two three.", "Four five.", "Six seven eight nine.", "Ten."], "oversized sentence not kept whole"
+    assert split_text(text, "sentence", max_tokens=6, count_tokens=count_words) == chunks, \
+        "split_text did not apply max_tokens"
+    assert len(merge_sentence_spans(text, spans, 1000)) == 1, "character estimate not used without a counter"
+
+    try:
+        merge_sentence_spans(text, spans, 0)
+        raise AssertionError("max_tokens <= 0 accepted")
+    except ValueError:
+        pass
+
+
+def test_delimited_splits():
+    """Paragraph and custom splits match the original split-and-strip behaviour"""
+    texts = [
+        "First paragraph.\n\nSecond paragraph.\n\n\n\nThird after extra blank lines.",
+        "\n\n  Leading blanks and trailing spaces.  \n\n",
+        "No delimiter at all",
+        "",
+        "a|b||  c  |",
+    ]
+
+    for text in texts:
+        assert split_text(text, "paragraph") == [p.strip() for p in text.split("\n\n") if p.strip()], \
+            f"paragraph split differs from split/strip without empties for {text!r}"
+        for delimiter in ("|", "\n\n", "---"):
+            assert split_text(text, "custom", delimiter=delimiter) == [s.strip() for s in text.split(delimiter)], \
+                f"custom split on {delimiter!r} differs from split/strip for {text!r}"
+
+    spans = split_text_spans("  alpha  |beta|  ", "custom", delimiter="|")
+    assert spans == [(2, 7), (10, 14), (17, 17)], f"spans do not point at the trimmed pieces: {spans}"
+
+    try:
+        split_text("text", "custom")
+        raise AssertionError("custom split without a delimiter accepted")
+    except ValueError:
+        pass
+
+
+TESTS = [
+    test_abbreviations,
+    test_punctuation_and_quotes,
+    test_line_boundaries,
+    test_token_budget,
+    test_delimited_splits,
+]
+
+
+def main():
+    """Run all tests without pytest and provide summary"""
+    print("🧪 Wolfscribe Sentence Splitting Test Suite")
+    print("=" * 60)
+
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ PASSED   {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAILED   {test.__name__}: {e}")
+        except Exception as e:
+            failed += 1
+            print(f"💥 ERROR    {test.__name__}: {e}")
+            traceback.print_exc()
+
+    print("=" * 60)
+    print(f"SUMMARY: {len(TESTS) - failed}/{len(TESTS)} tests passed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
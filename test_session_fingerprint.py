@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# test_session_fingerprint.py
+"""
+Test suite for the incremental corpus fingerprint (session.py)
+
+Usage:
+    python -m pytest test_session_fingerprint.py
+    python test_session_fingerprint.py
+"""
+
+import sys
+import os
+import traceback
+
+# Add the project root to path to import our modules
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from session import CorpusFingerprint, Session, SessionFile, chunks_fingerprint
+from core.batch_processing import FileStatus, fingerprint_files, STATUS_DONE, STATUS_FAILED
+from processing.chunk_spans import SpanChunks
+
+
+CHUNKS = ["First chunk of the book.", "Second chunk.", "Third chunk, a little longer than the rest.",
+          "Fourth.", "Fifth and final chunk."]
+
+
+def test_incremental_updates():
+    """extend and replace give the same value as hashing the result from scratch"""
+    fingerprint = CorpusFingerprint(CHUNKS[:2])
+    fingerprint.extend(CHUNKS[2:])
+    assert fingerprint.hexdigest() == chunks_fingerprint(CHUNKS), "extend differs from a full rehash"
+
+    edited = list(CHUNKS)
+    fingerprint.replace(0, "A new opening.")
+    edited[0] = "A new opening."
+    assert fingerprint.hexdigest() == chunks_fingerprint(edited), "replacing the first chunk differs from a rehash"
+
+    fingerprint.replace(2, "Middle rewritten.")
+    edited[2] = "Middle rewritten."
+    assert fingerprint.hexdigest() == chunks_fingerprint(edited), "replacing a middle chunk differs from a rehash"
+
+    fingerprint.replace(-1, "A new ending.")
+    edited[-1] = "A new ending."
+    assert fingerprint.hexdigest() == chunks_fingerprint(edited), "negative index did not replace from the end"
+
+    fingerprint.replace(2, CHUNKS[2])
+    fingerprint.replace(0, CHUNKS[0])
+    fingerprint.replace(-1, CHUNKS[-1])
+    assert fingerprint.hexdigest() == chunks_fingerprint(CHUNKS), "undoing every edit did not restore the original"
+
+
+def test_order_and_content():
+    """The fingerprint changes with order, content and count"""
+    original = chunks_fingerprint(CHUNKS)
+
+    assert chunks_fingerprint([CHUNKS[1], CHUNKS[0]] + CHUNKS[2:]) != original, "swapping two chunks kept it"
+    assert chunks_fingerprint(CHUNKS[:-1] + [CHUNKS[-1] + " "]) != original, "a one-character edit kept it"
+    assert chunks_fingerprint(CHUNKS + [""]) != original, "an empty trailing chunk kept it"
+    assert chunks_fingerprint(tuple(CHUNKS)) == original, "equal content gave a different fingerprint"
+
+
+def test_session_file_edits():
+    """SessionFile keeps its fingerprint current through its edit methods"""
+    session_file = SessionFile(path="book.txt", chunks=list(CHUNKS))
+    assert isinstance(session_file.chunks, tuple), "list input not stored read-only"
+    assert session_file.fingerprint == chunks_fingerprint(CHUNKS), "initial fingerprint differs from a rehash"
+
+    edited = list(CHUNKS)
+    edited[1] = "Second chunk, revised."
+    session_file.replace_chunk(1, "Second chunk, revised.")
+    assert session_file.fingerprint == chunks_fingerprint(edited), "replace_chunk did not keep it current"
+
+    edited.append("An epilogue.")
+    session_file.append_chunks(["An epilogue."])
+    assert session_file.fingerprint == chunks_fingerprint(edited), "append_chunks did not keep it current"
+
+    try:
+        session_file.chunks[0] = "Edited in place."
+        raise AssertionError("in-place item assignment was allowed")
+    except TypeError:
+        pass
+
+    session_file.chunks = ["Reassigned."]
+    assert session_file.fingerprint == chunks_fingerprint(["Reassigned."]), "reassignment did not reset it"
+
+
+def test_concat():
+    """Concatenated fingerprints equal hashing the joined chunks"""
+    parts = [CorpusFingerprint(CHUNKS[:2]), CorpusFingerprint(), CorpusFingerprint(CHUNKS[2:])]
+    combined = CorpusFingerprint.concat(parts)
+
+    assert combined.hexdigest() == chunks_fingerprint(CHUNKS), "concat differs from hashing the joined chunks"
+    combined.replace(3, "Edited.")
+    assert combined.hexdigest() == chunks_fingerprint(CHUNKS[:3] + ["Edited."] + CHUNKS[4:]), \
+        "concatenated fingerprint cannot be edited incrementally"
+    assert parts[2].hexdigest() == chunks_fingerprint(CHUNKS[2:]), "editing the result changed a part"
+
+
+def test_update_chunks():
+    """update_chunks rehashes only what changed, or takes a precomputed fingerprint"""
+    session_file = SessionFile(path="book.txt", chunks=CHUNKS)
+    assert session_file.fingerprint == chunks_fingerprint(CHUNKS)
+
+    tracked = session_file._fingerprint
+    reprocessed = [CHUNKS[0], "Second chunk, revised."] + CHUNKS[2:] + ["An epilogue."]
+    session_file.update_chunks(reprocessed)
+    assert session_file._fingerprint is tracked, "small edit rebuilt the fingerprint from scratch"
+    assert session_file.chunks == tuple(reprocessed), "chunks not replaced"
+    assert session_file.fingerprint == chunks_fingerprint(reprocessed), "edit plus append not tracked"
+
+    shorter = CHUNKS[:2]
+    session_file.update_chunks(shorter)
+    assert session_file.fingerprint == chunks_fingerprint(shorter), "shrinking did not reset it"
+
+    rewritten = ["Entirely", "new", "chunks"]
+    session_file.update_chunks(rewritten)
+    assert session_file.fingerprint == chunks_fingerprint(rewritten), "mostly changed chunks not rehashed"
+
+    precomputed = CorpusFingerprint(CHUNKS)
+    session_file.update_chunks(CHUNKS, precomputed)
+    assert session_file.fingerprint == chunks_fingerprint(CHUNKS), "precomputed fingerprint not used"
+    try:
+        session_file.update_chunks(CHUNKS[:1], CorpusFingerprint(CHUNKS))
+        raise AssertionError("fingerprint of other chunks was accepted")
+    except ValueError:
+        pass
+
+
+def test_fingerprint_files():
+    """Processed batch files get a fingerprint of their chunks; failed ones do not"""
+    statuses = [FileStatus("a.txt", state=STATUS_DONE, chunks=CHUNKS[:2]), FileStatus("b.txt", state=STATUS_FAILED)]
+    done, failed = fingerprint_files(statuses)
+
+    assert done.fingerprint.hexdigest() == chunks_fingerprint(CHUNKS[:2]), "processed file fingerprint wrong"
+    assert failed.fingerprint is None, "failed file fingerprinted"
+    assert statuses[0].fingerprint is None, "input status modified in place"
+
+
+def test_span_chunks():
+    """SpanChunks are kept as they are and can still be edited"""
+    text = "Alpha paragraph.\n\nBeta paragraph."
+    chunks = SpanChunks.from_spans("book.txt", text, [(0, 16), (18, 33)])
+    session = Session()
+    session.add_file("book.txt")
+    session_file = session.files[0]
+    session_file.chunks = chunks
+
+    assert session_file.chunks is chunks, "SpanChunks not stored as the same object"
+    assert session_file.fingerprint == chunks_fingerprint(list(chunks)), "fingerprint does not match the text"
+    assert Session._file_dict(session_file)["spans"] == [["book.txt", 0, 16], ["book.txt", 18, 33]], \
+        "spans not saved for provenance"
+
+    session_file.replace_chunk(0, "Gamma paragraph.")
+    assert session_file.fingerprint == chunks_fingerprint(["Gamma paragraph.", "Beta paragraph."]), \
+        "replace_chunk on spans did not keep it current"
+    assert Session.from_dict(session.to_dict()).fingerprint == session.fingerprint, \
+        "reloaded session has a different fingerprint"
+
+
+TESTS = [
+    test_incremental_updates,
+    test_order_and_content,
+    test_session_file_edits,
+    test_concat,
+    test_update_chunks,
+    test_fingerprint_files,
+    test_span_chunks,
+]
+
+
+def main():
+    """Run all tests without pytest and provide summary"""
+    print("🧪 Wolfscribe Session Fingerprint Test Suite")
+    print("=" * 60)
+
+    failed = 0
+    for test in TESTS:
+        try:
+            test()
+            print(f"✅ PASSED   {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ FAILED   {test.__name__}: {e}")
+        except Exception as e:
+            failed += 1
+            print(f"💥 ERROR    {test.__name__}: {e}")
+            traceback.print_exc()
+
+    print("=" * 60)
+    print(f"SUMMARY: {len(TESTS) - failed}/{len(TESTS)} tests passed")
+    return failed == 0
+
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -11,29 +11,38 @@ from controller import ProcessingController
 from export.dataset_exporter import save_as_txt, save_as_csv
 from tkinterdnd2 import DND_FILES
 import json
-from session import Session
+from session import CorpusFingerprint, Session, chunks_fingerprint
+from core.batch_processing import STATUS_DONE
+from processing.chunk_spans import concat_chunks
+from core.token_counts import TokenCountStore
 from ui.styles import MODERN_SLATE
 from ui.cost_dialogs import CostAnalysisDialogs
 from ui.preview_dialogs import PreviewDialogs
 from ui.section_builders import SectionBuilder
+from ui.dialogs.file_queue_dialog import FileQueueDialog
 
 # Removed unused imports from cleanup
+import queue
 import threading
 import time
 from datetime import datetime
 
 TOKEN_LIMIT = 512
+TOKEN_COUNT_POLL_MS = 100  # How often background token counts are applied
+CHUNKS_AS_SPANS = True  # Keep chunks as offsets into the cleaned text instead of copies
+REPOSITORY_POLL_MS = 100  # How often repository ingestion progress is shown
 
 class AppFrame(Frame):
-    def __init__(self, parent):
+    def __init__(self, parent, controller: ProcessingController = None):
         super().__init__(parent, style="Modern.TFrame")
 
-        # Initialize the enhanced controller
-        self.controller = ProcessingController()
+        # Initialize the enhanced controller (main.py builds it during the splash)
+        self.controller = controller or ProcessingController()
         
         # Initialize dialog systems (from previous stages)
         self.cost_dialogs = CostAnalysisDialogs(self, self.controller)
         self.preview_dialogs = PreviewDialogs(self, self.controller)
+        self.file_queue = FileQueueDialog(self, self.controller, TOKEN_LIMIT)
         
         # Setup scrollable canvas
         self._setup_canvas()
@@ -43,16 +52,25 @@ class AppFrame(Frame):
         self.chunks = []
         self.session = Session()
         self.current_analysis = None
+        self.dedup_stats = None
+        self.token_counts = TokenCountStore()  # Per-tokenizer counts for this session's corpora
+        self._batch_fingerprint = None  # (chunks, fingerprint) of a multi-file dataset
+        self._token_count_job = None
+        self._token_count_updates = queue.Queue()
         
         # UI component references (will be set by SectionBuilder)
         self.file_label = None
         self.split_method = None
         self.split_dropdown = None
         self.delimiter_entry = None
+        self.json_fields_entry = None
+        self.json_streaming = None
+        self.deduplicate = None
         self.selected_tokenizer = None
         self.tokenizer_dropdown = None
         self.license_status_label = None
         self.premium_section = None
+        self.analysis_summary_label = None
         
         # Tokenizer state
         self.tokenizer_options = []
@@ -434,32 +452,99 @@ class AppFrame(Frame):
             self.update_chunk_analysis()
 
     def update_chunk_analysis(self):
-        """Update chunk analysis with current tokenizer"""
+        """Update chunk analysis for the current tokenizer without blocking the UI"""
         if not self.chunks:
             return
         
+        self._cancel_token_counts()
+        
         try:
             tokenizer_name = getattr(self, '_current_tokenizer_name', 'gpt2')
-            self.current_analysis = self.controller.analyze_chunks(self.chunks, tokenizer_name, TOKEN_LIMIT)
-            
-            if self.controller.license_manager.check_feature_access('advanced_analytics'):
-                tokenizer_info = next((t for t in self.controller.get_available_tokenizers() 
-                                     if t['name'] == tokenizer_name), None)
-                
-                if tokenizer_info and self.current_analysis:
-                    enhanced_recommendations = list(self.current_analysis.get('recommendations', []))
-                    
-                    if tokenizer_info['accuracy'] == 'estimated' and self.current_analysis['total_tokens'] > 5000:
-                        enhanced_recommendations.append("Consider upgrading to exact tokenizer for large datasets")
-                    
-                    if tokenizer_info['performance'] == 'slow' and len(self.chunks) > 100:
-                        enhanced_recommendations.append("Large dataset detected - faster tokenizer recommended")
-                    
-                    self.current_analysis['recommendations'] = enhanced_recommendations
-                    
+            # Worker thread only touches the queue; the Tk thread drains it
+            self._token_count_job = self.controller.switch_tokenizer(
+                self.chunks, tokenizer_name, self.token_counts, self._token_count_updates.put,
+                TOKEN_LIMIT, self.dedup_stats, fingerprint=self.session_fingerprint()
+            )
+            self._show_analysis_summary(None, f"Counting tokens with {tokenizer_name}...")
+            self.after(TOKEN_COUNT_POLL_MS, self._poll_token_counts, self._token_count_job)
         except Exception as e:
             messagebox.showerror("Analysis Error", f"Failed to analyze chunks: {str(e)}")
 
+    def session_fingerprint(self):
+        """Session-maintained fingerprint of self.chunks, or None if the session does not track them"""
+        for session_file in self.session.files:
+            if session_file.chunks is self.chunks:
+                return session_file.fingerprint
+        if self._batch_fingerprint is not None and self._batch_fingerprint[0] is self.chunks:
+            return self._batch_fingerprint[1]
+        return None
+
+    def _cancel_token_counts(self):
+        """Drop any background counting for the previous dataset"""
+        if self._token_count_job is not None:
+            self._token_count_job.cancel()
+            self._token_count_job = None
+        self._show_analysis_summary(None)
+
+    def _poll_token_counts(self, job):
+        """Apply estimated, then exact, counts for the selected tokenizer"""
+        while True:
+            try:
+                update = self._token_count_updates.get_nowait()
+            except queue.Empty:
+                break
+            
+            # Results for a tokenizer that is no longer selected are dropped
+            if job is not self._token_count_job or update.tokenizer != self._current_tokenizer_name:
+                continue
+            
+            if update.error:
+                self._show_analysis_summary(None, f"⚠️ Token counting failed: {update.error}")
+                messagebox.showerror("Analysis Error", f"Failed to analyze chunks: {update.error}")
+                return
+            
+            self.current_analysis = self._enhance_recommendations(update.analysis, update.tokenizer)
+            self._show_analysis_summary(self.current_analysis)
+        
+        if job is self._token_count_job and not (job.done and self._token_count_updates.empty()):
+            self.after(TOKEN_COUNT_POLL_MS, self._poll_token_counts, job)
+
+    def _enhance_recommendations(self, analysis, tokenizer_name):
+        """Add tokenizer-specific recommendations for premium users"""
+        if not self.controller.license_manager.check_feature_access('advanced_analytics'):
+            return analysis
+        
+        # The dropdown's tokenizer list is reused rather than rebuilt on every switch
+        tokenizer_info = next((t for t in self.tokenizer_options if t['name'] == tokenizer_name), None)
+        if tokenizer_info and analysis:
+            enhanced_recommendations = list(analysis.get('recommendations', []))
+            
+            if tokenizer_info['accuracy'] == 'estimated' and analysis['total_tokens'] > 5000:
+                enhanced_recommendations.append("Consider upgrading to exact tokenizer for large datasets")
+            
+            if tokenizer_info['performance'] == 'slow' and len(self.chunks) > 100:
+                enhanced_recommendations.append("Large dataset detected - faster tokenizer recommended")
+            
+            analysis['recommendations'] = enhanced_recommendations
+        return analysis
+
+    def _show_analysis_summary(self, analysis, message=None):
+        """Show the dataset summary (or a status message) under the preview button"""
+        if self.analysis_summary_label is None:
+            return
+        
+        if analysis is None:
+            self.analysis_summary_label.config(text=message or "")
+            return
+        
+        estimated = analysis.get('token_counts_estimated', False)
+        text = (f"{analysis['total_chunks']:,} chunks · {'~' if estimated else ''}{analysis['total_tokens']:,} tokens "
+                f"({analysis.get('tokenizer_used', self._current_tokenizer_name)}) · "
+                f"{analysis['over_limit']} over {TOKEN_LIMIT}")
+        if estimated:
+            text += " · estimating..."
+        self.analysis_summary_label.config(text=text)
+
     # File operations - UPDATED FOR DOCX and CSV SUPPORT
 
     def select_file(self):
@@ -467,12 +552,13 @@ class AppFrame(Frame):
         path = filedialog.askopenfilename(
             title="Select Book or Document",
             filetypes=[
-                ("All Supported Files", "*.txt *.pdf *.epub *.docx *.csv"),
+                ("All Supported Files", "*.txt *.pdf *.epub *.docx *.csv *.json *.jsonl"),
                 ("Text Files", "*.txt"),
                 ("PDF Files", "*.pdf"), 
                 ("EPUB Files", "*.epub"),
                 ("Word Documents", "*.docx"),
                 ("CSV Files", "*.csv"),
+                ("JSON Files", "*.json *.jsonl"),
                 ("All Files", "*.*")
             ]
         )
@@ -492,15 +578,22 @@ class AppFrame(Frame):
             self.file_label.config(text=f"{emoji} {filename}")
             self.chunks = []
             self.current_analysis = None
+            self.dedup_stats = None
+            self._cancel_token_counts()
             self.session.add_file(path)
 
     # Updated handle_file_drop() function
     # Replace the existing handle_file_drop() function with this version:
 
     def handle_file_drop(self, event):
-        """Handle drag and drop file - now supports CSV"""
-        path = event.data.strip("{}")
-        supported_extensions = (".txt", ".pdf", ".epub", ".docx", ".csv")
+        """Handle drag and drop - one file is selected, several files or a folder are queued"""
+        paths = list(self.tk.splitlist(event.data))
+        if len(paths) > 1 or (paths and os.path.isdir(paths[0])):
+            self.show_file_queue(paths)
+            return
+        
+        path = paths[0] if paths else ""
+        supported_extensions = (".txt", ".pdf", ".epub", ".docx", ".csv", ".json", ".jsonl")
         
         if os.path.isfile(path) and path.lower().endswith(supported_extensions):
             self.file_path = path
@@ -518,13 +611,149 @@ class AppFrame(Frame):
             self.file_label.config(text=f"{emoji} {filename}")
             self.chunks = []
             self.current_analysis = None
+            self.dedup_stats = None
+            self._cancel_token_counts()
             self.session.add_file(path)
         else:
             messagebox.showerror(
                 "Invalid File", 
-                "Please drop a valid file (.txt, .pdf, .epub, .docx, or .csv)."
+                "Please drop a valid file (.txt, .pdf, .epub, .docx, .csv, .json or .jsonl)."
             )
 
+    def show_file_queue(self, paths=None):
+        """Open the multi-file queue, optionally adding paths to it"""
+        self.file_queue.show(paths)
+
+    def apply_batch_results(self, statuses, analysis, tokenizer_name, dedup_stats=None):
+        """Use every file processed by the queue as the current dataset"""
+        processed = [status for status in statuses if status.state == STATUS_DONE]
+        
+        for status in processed:
+            session_file = self.session.get_file(status.path)
+            if session_file is None:
+                self.session.add_file(status.path)
+                session_file = self.session.files[-1]
+            session_file.update_chunks(status.chunks, status.fingerprint)
+            session_file.config['tokenizer'] = tokenizer_name
+        
+        # The dataset now spans several files, so there is no single selected file
+        self.file_path = None
+        self.chunks = concat_chunks([status.chunks for status in processed])
+        self.dedup_stats = dedup_stats
+        self.current_analysis = analysis
+        
+        # Combined from the per-file fingerprints the summary thread made, so nothing is rehashed here
+        if all(status.fingerprint is not None for status in processed):
+            fingerprint = CorpusFingerprint.concat(status.fingerprint for status in processed).hexdigest()
+        else:
+            fingerprint = chunks_fingerprint(self.chunks)
+        self._batch_fingerprint = (self.chunks, fingerprint)
+        
+        # Keep the counts the queue already made so switching back to this tokenizer is free
+        token_counts = [count for status in processed for count in status.token_counts]
+        if len(token_counts) == len(self.chunks):
+            self.token_counts.put(fingerprint, tokenizer_name, token_counts)
+        self._show_analysis_summary(analysis)
+        self.file_label.config(
+            text=f"📚 {len(processed)} files - {len(self.chunks):,} chunks, {analysis['total_tokens']:,} tokens"
+        )
+
+    def ingest_repository(self):
+        """Process every source file of a code repository into one dataset, in the background"""
+        root = filedialog.askdirectory(title="Select Code Repository")
+        if not root:
+            return
+        
+        # Processing options are read here, on the Tk thread
+        method = self.split_method.get()
+        delimiter = self.delimiter_entry.get() if method == "custom" else None
+        tokenizer_name = getattr(self, '_current_tokenizer_name', 'gpt2')
+        deduplicate = self.deduplicate.get()
+        clean_opts = {
+            "remove_headers": True,
+            "normalize_whitespace": True,
+            "strip_bullets": True
+        }
+        
+        updates = queue.Queue()
+        
+        def worker():
+            try:
+                chunks, dedup_stats, summary = self.controller.process_repository(
+                    root, clean_opts, method, delimiter, tokenizer_name,
+                    deduplicate=deduplicate, max_tokens=TOKEN_LIMIT, as_spans=CHUNKS_AS_SPANS,
+                    on_file=lambda path, count: updates.put(('progress', (path, count)))
+                )
+                counts = self.controller.count_chunk_tokens(chunks, tokenizer_name)
+                analysis = self.controller.analyze_chunks(
+                    chunks, tokenizer_name, TOKEN_LIMIT, dedup_stats, token_counts=counts
+                )
+                fingerprint = CorpusFingerprint(chunks)  # Hashed here rather than on the Tk thread
+                updates.put(('done', (chunks, dedup_stats, summary, counts, analysis, fingerprint)))
+            except Exception as e:
+                updates.put(('error', str(e)))
+        
+        self._cancel_token_counts()
+        self.file_label.config(text=f"🔄 Ingesting {os.path.basename(root) or root}...")
+        threading.Thread(target=worker, name="wolfscribe-repository", daemon=True).start()
+        self._poll_repository_ingest(root, tokenizer_name, updates)
+
+    def _poll_repository_ingest(self, root, tokenizer_name, updates):
+        """Apply repository ingestion progress and results on the Tk thread"""
+        name = os.path.basename(root) or root
+        while True:
+            try:
+                kind, payload = updates.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'progress':
+                path, count = payload
+                self.file_label.config(text=f"🔄 Ingesting {name}: {count:,} files - {path}")
+            elif kind == 'error':
+                self.file_label.config(text="No file selected" if not self.file_path
+                                       else f"📄 {os.path.basename(self.file_path)}")
+                messagebox.showerror("Repository Error", f"❌ Could not ingest repository:\n\n{payload}")
+                return
+            else:
+                chunks, dedup_stats, summary, counts, analysis, fingerprint = payload
+                self.file_path = None
+                self.dedup_stats = dedup_stats
+                self.current_analysis = analysis
+                
+                session_file = self.session.get_file(root)
+                if session_file is None:
+                    self.session.add_file(root, tag="repository")
+                    session_file = self.session.files[-1]
+                session_file.update_chunks(chunks, fingerprint)
+                self.chunks = session_file.chunks  # Same object, so dialogs can reuse its fingerprint
+                session_file.config['tokenizer'] = tokenizer_name
+                self.token_counts.put(session_file.fingerprint, tokenizer_name, counts)
+                
+                self._show_analysis_summary(analysis)
+                self.file_label.config(
+                    text=f"🗂 {name} - {summary['files']:,} files, {len(chunks):,} chunks"
+                )
+                skipped = ", ".join(f"{reason}: {count}" for reason, count in sorted(summary['skipped'].items()))
+                msg = (f"✅ Ingested {summary['files']:,} source files into {analysis['total_chunks']:,} chunks\n"
+                       f"📊 Total tokens: {analysis['total_tokens']:,}")
+                if skipped:
+                    msg += f"\n⏭ Skipped - {skipped}"
+                messagebox.showinfo("Repository Ingested", msg)
+                return
+        
+        self.after(REPOSITORY_POLL_MS, lambda: self._poll_repository_ingest(root, tokenizer_name, updates))
+
+    def extract_options(self):
+        """Extractor options from the preprocessing section, keyed by extension"""
+        fields = [field.strip() for field in self.json_fields_entry.get().split(",") if field.strip()]
+        json_opts = {}
+        if fields:
+            json_opts["fields"] = fields
+        if self.json_streaming.get():
+            json_opts["streaming"] = True
+        return {".json": json_opts, ".jsonl": dict(json_opts)} if json_opts else None
+
     def on_split_method_change(self, event=None):
         """Handle split method change"""
         selected = self.split_method.get()
@@ -573,24 +802,34 @@ class AppFrame(Frame):
                 processing_window.update()
             
             self.chunks = self.controller.process_book(
-                self.file_path, clean_opts, method, delimiter, tokenizer_name
+                self.file_path, clean_opts, method, delimiter, tokenizer_name,
+                deduplicate=self.deduplicate.get(), as_spans=CHUNKS_AS_SPANS,
+                extract_opts=self.extract_options()
+            )
+            self.dedup_stats = self.controller.last_dedup_stats
+            
+            # Update session first: reprocessing that only edits or appends chunks rehashes just those
+            session_file = self.session.get_file(self.file_path)
+            if session_file is not None:
+                session_file.update_chunks(self.chunks)
+                self.chunks = session_file.chunks  # Same object, so dialogs can reuse its fingerprint
+                session_file.config['tokenizer'] = tokenizer_name
+            
+            # Keep this tokenizer's counts so switching back to it needs no re-tokenizing
+            token_counts = self.token_counts.put(
+                self.session_fingerprint() or chunks_fingerprint(self.chunks), tokenizer_name,
+                self.controller.count_chunk_tokens(self.chunks, tokenizer_name)
             )
             self.current_analysis = self.controller.analyze_chunks(
-                self.chunks, tokenizer_name, TOKEN_LIMIT
+                self.chunks, tokenizer_name, TOKEN_LIMIT, self.dedup_stats, token_counts=token_counts
             )
+            self._show_analysis_summary(self.current_analysis)
             
             # Close processing dialog if it exists
             if processing_window:
                 processing_window.destroy()
                 processing_window = None
             
-            # Update session
-            for f in self.session.files:
-                if f.path == self.file_path:
-                    f.chunks = self.chunks
-                    f.config['tokenizer'] = tokenizer_name
-                    break
-
             # Create enhanced success message with format-specific info
             analysis = self.current_analysis
             format_name = {
@@ -603,6 +842,10 @@ class AppFrame(Frame):
             msg = f"✅ Processed {format_name} into {analysis['total_chunks']} chunks using {tokenizer_name}\n"
             msg += f"📊 Total tokens: {analysis['total_tokens']:,} | Average: {analysis['avg_tokens']}\n"
             
+            if self.dedup_stats and self.dedup_stats.duplicates_removed:
+                msg += (f"🧹 Removed {self.dedup_stats.duplicates_removed} duplicate chunks "
+                        f"({self.dedup_stats.duplicate_percentage:.1f}%)\n")
+            
             if analysis['over_limit'] > 0:
                 msg += f"⚠️ {analysis['over_limit']} chunks exceed {TOKEN_LIMIT} tokens ({analysis['over_limit_percentage']:.1f}%)"
             else:
@@ -743,6 +986,7 @@ class AppFrame(Frame):
                 emoji = format_emoji.get(file_ext, '📄')
                 self.file_label.config(text=f"{emoji} {filename}")
                 self.chunks = first_file.chunks
+                self.dedup_stats = None
                 
                 if self.chunks:
                     self.update_chunk_analysis()
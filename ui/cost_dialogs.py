@@ -1,13 +1,19 @@
 # ui/cost_dialogs.py
-import os
 import tkinter as tk
 from tkinter import filedialog, messagebox
 from ttkbootstrap import Frame, Label, Button, Entry, Combobox, Radiobutton, Checkbutton
 from ttkbootstrap.constants import *
+import queue
 import threading
 import time
-from datetime import datetime
 from ui.styles import MODERN_SLATE
+from core.analysis_cache import analysis_cache_key, get_analysis_cache
+from core.pricing_engine import PRICING_CACHE_TTL_SECONDS
+from session import chunks_fingerprint
+from export.report_exporter import REPORT_FORMATS, ReportOptions, export_report
+
+PROGRESS_POLL_MS = 100  # How often the loading dialog drains analysis progress events
+TORNADO_BAR_WIDTH = 30  # Characters in the widest sensitivity bar
 
 class CostAnalysisDialogs:
     """Handles all cost analysis related dialogs and exports"""
@@ -15,7 +21,7 @@ class CostAnalysisDialogs:
     def __init__(self, parent, controller):
         self.parent = parent
         self.controller = controller
-        self.cost_analysis_cache = {}
+        self.cost_analysis_cache = get_analysis_cache()  # Shared across dialogs and restarts
         
     def show_cost_analysis(self):
         """STAGE 3 ENHANCED: Main cost analysis method with loading states and caching"""
@@ -34,13 +40,15 @@ class CostAnalysisDialogs:
             api_usage_monthly = 100000
             
             # Generate cache key
+            chunks = self.parent.chunks
+            corpus_fingerprint = self._get_corpus_fingerprint(chunks)
             cache_key = self._get_analysis_cache_key(
-                self.parent.chunks, tokenizer_name, 512, target_models, api_usage_monthly
+                corpus_fingerprint, tokenizer_name, 512, target_models, api_usage_monthly
             )
             
             # Check cache first
-            if self._is_analysis_cache_valid(cache_key):
-                cost_analysis = self.cost_analysis_cache[cache_key]['data']
+            cost_analysis = self.cost_analysis_cache.get(cache_key)
+            if cost_analysis is not None:
                 self._display_cost_analysis_dialog(cost_analysis)
                 return
             
@@ -50,62 +58,35 @@ class CostAnalysisDialogs:
                 "Calculating comprehensive costs across 15+ approaches...\nThis may take a few seconds."
             )
             
+            # Counts the app already has for this tokenizer spare the worker re-tokenizing
+            token_counts = self.parent.token_counts.get(corpus_fingerprint, tokenizer_name)
+            updates = queue.Queue()
+            
             def run_analysis():
+                # Worker thread: never touches Tk, only posts events to the queue
                 try:
-                    # Update status
-                    def update_status(text):
-                        try:
-                            status_label.config(text=text)
-                            loading_window.update()
-                        except tk.TclError:
-                            pass
-                    
-                    update_status("Loading model database...")
-                    time.sleep(0.5)  # Brief pause for UI feedback
-                    
-                    update_status("Fetching real-time cloud pricing...")
-                    time.sleep(0.5)
-                    
-                    update_status("Calculating training costs...")
-                    
-                    # Perform the actual analysis
                     cost_analysis = self.controller.analyze_chunks_with_costs(
-                        self.parent.chunks, 
+                        chunks, 
                         tokenizer_name, 
                         512,
                         target_models=target_models,
-                        api_usage_monthly=api_usage_monthly
+                        api_usage_monthly=api_usage_monthly,
+                        on_progress=lambda event: updates.put(('progress', event)),
+                        token_counts=token_counts
                     )
                     
-                    update_status("Generating optimization recommendations...")
-                    time.sleep(0.3)
-                    
                     # Cache the results
-                    self.cost_analysis_cache[cache_key] = {
-                        'data': cost_analysis,
-                        'timestamp': time.time()
-                    }
-                    
-                    # Close loading dialog and show results
-                    self._close_loading_dialog(loading_window, progress)
-                    self._display_cost_analysis_dialog(cost_analysis)
+                    self.cost_analysis_cache.put(cache_key, cost_analysis)
+                    updates.put(('done', cost_analysis))
                     
                 except Exception as e:
-                    self._close_loading_dialog(loading_window, progress)
-                    self._show_enhanced_error_dialog(
-                        "Cost Analysis Error",
-                        f"Failed to analyze training costs: {str(e)}",
-                        recovery_suggestions=[
-                            "Check your internet connection for live pricing",
-                            "Try with a smaller dataset",
-                            "Contact support if the problem persists"
-                        ]
-                    )
+                    updates.put(('error', e))
             
             # Run analysis in thread to keep UI responsive
             analysis_thread = threading.Thread(target=run_analysis)
             analysis_thread.daemon = True
             analysis_thread.start()
+            self._poll_analysis_updates(updates, loading_window, progress, status_label)
             
         except Exception as e:
             self._show_enhanced_error_dialog(
@@ -113,6 +94,54 @@ class CostAnalysisDialogs:
                 f"Failed to start cost analysis: {str(e)}"
             )
 
+    def _poll_analysis_updates(self, updates, loading_window, progress, status_label):
+        """Apply analysis progress events on the Tk thread until the worker finishes"""
+        while True:
+            try:
+                kind, payload = updates.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'progress':
+                self._show_analysis_progress(payload, progress, status_label)
+            elif kind == 'done':
+                self._close_loading_dialog(loading_window, progress)
+                self._display_cost_analysis_dialog(payload)
+                return
+            else:
+                self._close_loading_dialog(loading_window, progress)
+                self._show_enhanced_error_dialog(
+                    "Cost Analysis Error",
+                    f"Failed to analyze training costs: {str(payload)}",
+                    recovery_suggestions=[
+                        "Check your internet connection for live pricing",
+                        "Try with a smaller dataset",
+                        "Contact support if the problem persists"
+                    ]
+                )
+                return
+        
+        try:
+            loading_window.after(PROGRESS_POLL_MS, self._poll_analysis_updates,
+                                 updates, loading_window, progress, status_label)
+        except tk.TclError:
+            pass  # Loading dialog closed; the worker's result is still cached
+
+    def _show_analysis_progress(self, event, progress, status_label):
+        """Show one AnalysisProgress event in the loading dialog"""
+        try:
+            if str(progress.cget('mode')) != 'determinate':
+                progress.stop()
+                progress.config(mode='determinate', maximum=100)
+            progress.config(value=event.percent)
+            
+            status = f"{event.message} {event.percent:.0f}%"
+            if event.eta_seconds:
+                status += f" (about {event.eta_seconds:.0f}s left)"
+            status_label.config(text=status)
+        except tk.TclError:
+            pass
+
     def show_cost_upgrade_dialog(self):
         """Show upgrade dialog for cost analysis feature"""
         try:
@@ -255,24 +284,19 @@ Would you like to start your free trial?"""
         except tk.TclError:
             pass  # Dialog might already be closed
 
-    def _get_analysis_cache_key(self, chunks, tokenizer_name, token_limit, target_models, api_usage):
-        """Generate cache key for cost analysis results"""
-        import hashlib
-        
-        # Create a hash of the analysis parameters
-        chunks_hash = hashlib.md5(str(len(chunks)).encode() + 
-                                 (chunks[0][:100] if chunks else "").encode()).hexdigest()[:8]
-        
-        params_str = f"{chunks_hash}_{tokenizer_name}_{token_limit}_{len(target_models)}_{api_usage}"
-        return hashlib.md5(params_str.encode()).hexdigest()[:16]
+    def _get_analysis_cache_key(self, corpus_fingerprint, tokenizer_name, token_limit, target_models, api_usage):
+        """Generate cache key for cost analysis results from the full corpus content"""
+        return analysis_cache_key(
+            corpus_fingerprint, tokenizer_name, token_limit, target_models, api_usage
+        )
 
-    def _is_analysis_cache_valid(self, cache_key):
-        """Check if cached analysis is still valid (within 5 minutes)"""
-        if cache_key not in self.cost_analysis_cache:
-            return False
-        
-        cache_time = self.cost_analysis_cache[cache_key].get('timestamp', 0)
-        return (time.time() - cache_time) < 300  # 5 minutes
+    def _get_corpus_fingerprint(self, chunks):
+        """Use the session's incrementally maintained fingerprint when it covers these chunks"""
+        if chunks is self.parent.chunks:
+            fingerprint = self.parent.session_fingerprint()
+            if fingerprint is not None:
+                return fingerprint
+        return chunks_fingerprint(chunks)
 
     def _show_enhanced_error_dialog(self, title, message, recovery_suggestions=None):
         """Show enhanced error dialog with recovery suggestions"""
@@ -324,6 +348,8 @@ Would you like to start your free trial?"""
                    f"Chunks: {len(self.parent.chunks)} | "
                    f"Tokenizer: {getattr(self.parent, '_current_tokenizer_name', 'gpt2')}", 
               style="Secondary.TLabel", font=("Segoe UI", 11)).pack(anchor="w")
+        Label(header_frame, text=self._pricing_freshness_text(cost_data.get('pricing_freshness')),
+              style="Secondary.TLabel", font=("Segoe UI", 10)).pack(anchor="w", pady=(2, 0))
 
         # Enhanced Summary Section with modern cards
         if summary:
@@ -392,6 +418,10 @@ Would you like to start your free trial?"""
                 Label(col3, text=f"Payback: {break_even*30:.0f} days", 
                       style="Secondary.TLabel", font=("Segoe UI", 11)).pack(anchor="w")
 
+        sensitivity = cost_data.get('sensitivity')
+        if sensitivity and 'error' not in sensitivity:
+            self._build_sensitivity_section(content_frame, sensitivity)
+
         # Comprehensive Approaches Table with modern styling
         if detailed_results:
             approaches_frame = Frame(content_frame, style="Modern.TFrame")
@@ -516,6 +546,67 @@ Would you like to start your free trial?"""
         Button(button_frame, text="Close", command=cleanup_dialog, 
                style="Secondary.TButton").pack(side=RIGHT)
 
+    def _build_sensitivity_section(self, parent, sensitivity):
+        """Break-even and ROI distribution plus a text tornado chart for the best option"""
+        frame = Frame(parent, style="Card.TFrame", padding=(20, 15))
+        frame.pack(fill=X, pady=(0, 20))
+        
+        Label(frame, text="🎲 ROI Sensitivity (Monte Carlo)", 
+              style="Heading.TLabel", font=("Segoe UI", 16, "bold")).pack(anchor="w", pady=(0, 5))
+        Label(frame, text=f"{sensitivity.get('draws', 0):,} scenarios varying usage, API price, "
+                          f"training cost and GPU rate together", 
+              style="Secondary.TLabel", font=("Segoe UI", 10)).pack(anchor="w", pady=(0, 10))
+        
+        break_even = sensitivity.get('break_even_months', {})
+        roi = sensitivity.get('roi_12_months_percentage', {})
+        Label(frame, text=f"Break-even: {break_even.get('p50', 0):.1f} months median "
+                          f"(90% range {break_even.get('p5', 0):.1f} - {break_even.get('p95', 0):.1f})", 
+              style="Secondary.TLabel", font=("Segoe UI", 11, "bold")).pack(anchor="w")
+        Label(frame, text=f"12-month ROI: {roi.get('p50', 0):.0f}% median "
+                          f"(90% range {roi.get('p5', 0):.0f}% - {roi.get('p95', 0):.0f}%)", 
+              style="Secondary.TLabel", font=("Segoe UI", 11)).pack(anchor="w")
+        Label(frame, text=f"Chance of breaking even: "
+                          f"{sensitivity.get('probability_break_even_6_months', 0):.0%} within 6 months, "
+                          f"{sensitivity.get('probability_break_even_12_months', 0):.0%} within 12 months", 
+              style="CostSavings.TLabel", font=("Segoe UI", 11)).pack(anchor="w", pady=(0, 10))
+        
+        tornado = sensitivity.get('tornado', [])
+        if not tornado:
+            return
+        Label(frame, text="What moves break-even most (P10 - P90 of each factor, others at baseline):", 
+              style="Secondary.TLabel", font=("Segoe UI", 10, "bold")).pack(anchor="w")
+        
+        widest = max(bar['break_even_swing'] for bar in tornado) or 1.0
+        descriptions = sensitivity.get('distributions', {})
+        for bar in tornado:
+            name = descriptions.get(bar['factor'], {}).get('description', bar['factor'])
+            length = max(int(round(TORNADO_BAR_WIDTH * bar['break_even_swing'] / widest)), 1)
+            Label(frame, text=f"{'█' * length:<{TORNADO_BAR_WIDTH}}  {name}: "
+                              f"{bar['break_even_low']:.1f} - {bar['break_even_high']:.1f} months", 
+                  style="Secondary.TLabel", font=("Consolas", 10)).pack(anchor="w", padx=(20, 0))
+
+    def _pricing_freshness_text(self, freshness):
+        """Which cloud rates the estimates used and how old they are"""
+        if not freshness or freshness.get('source') != 'live':
+            return "💲 Pricing: built-in estimates (no live cloud rates fetched yet)"
+        
+        text = f"Pricing: {freshness.get('live_rates', 0)} live cloud rates"
+        timestamp = freshness.get('oldest_rate_timestamp')
+        stale = freshness.get('stale', False)
+        if timestamp is not None:
+            # Measured now, since the analysis itself may come from the result cache
+            age = max(time.time() - timestamp, 0)
+            stale = stale or age >= PRICING_CACHE_TTL_SECONDS
+            if age < 3600:
+                text += f", oldest fetched {age / 60:.0f} min ago"
+            elif age < 48 * 3600:
+                text += f", oldest fetched {age / 3600:.1f} h ago"
+            else:
+                text += f", oldest fetched {age / 86400:.1f} days ago"
+        if stale:
+            return f"⚠️ {text} - stale, use Refresh Pricing for current rates"
+        return f"💲 {text}"
+
 # CONTINUING cost_dialogs.py - Part 2: Export Methods and Refresh Functionality
 
     def _export_cost_analysis(self, cost_analysis):
@@ -601,14 +692,6 @@ Would you like to start your free trial?"""
                 try:
                     selected_format = export_format.get()
                     
-                    # File extension mapping
-                    ext_map = {
-                        "json": ".json",
-                        "csv": ".csv", 
-                        "txt": ".txt",
-                        "excel": ".xlsx"
-                    }
-                    
                     # File type mapping for dialog
                     filetype_map = {
                         "json": [("JSON Report", "*.json")],
@@ -619,58 +702,42 @@ Would you like to start your free trial?"""
                     
                     path = filedialog.asksaveasfilename(
                         title=f"Export {selected_format.upper()} Report",
-                        defaultextension=ext_map[selected_format],
+                        defaultextension=REPORT_FORMATS[selected_format],
                         filetypes=filetype_map[selected_format]
                     )
                     
                     if not path:
                         return
                     
+                    # Options are read here, on the Tk thread; the worker only writes
+                    options = self._report_options(include_metadata.get(),
+                                                   include_recommendations.get(),
+                                                   include_charts.get())
                     export_window.destroy()
                     
                     # Show progress for export
-                    progress_window, progress_bar, _ = self._show_loading_dialog(
+                    progress_window, progress_bar, status_label = self._show_loading_dialog(
                         "Exporting Report", f"Generating {selected_format.upper()} report..."
                     )
+                    status_label.config(text="Writing report...")
+                    
+                    updates = queue.Queue()
                     
                     def export_worker():
+                        # Worker thread: never touches Tk, only posts events to the queue
                         try:
-                            if selected_format == "json":
-                                self._export_json_report(cost_analysis, path, 
-                                                       include_metadata.get(), 
-                                                       include_recommendations.get())
-                            elif selected_format == "csv":
-                                self._export_csv_report(cost_analysis, path,
-                                                       include_metadata.get())
-                            elif selected_format == "txt":
-                                self._export_text_report(cost_analysis, path,
-                                                        include_metadata.get(),
-                                                        include_recommendations.get())
-                            elif selected_format == "excel":
-                                self._export_excel_report(cost_analysis, path,
-                                                         include_metadata.get(),
-                                                         include_recommendations.get(),
-                                                         include_charts.get())
-                            
-                            self._close_loading_dialog(progress_window, progress_bar)
-                            messagebox.showinfo("✅ Export Complete", 
-                                              f"Report exported successfully to:\n{path}")
-                            
-                        except Exception as e:
-                            self._close_loading_dialog(progress_window, progress_bar)
-                            self._show_enhanced_error_dialog(
-                                "Export Error",
-                                f"Failed to export report: {str(e)}",
-                                recovery_suggestions=[
-                                    "Try a different file location",
-                                    "Check disk space and permissions",
-                                    "Try a different export format"
-                                ]
+                            result = export_report(
+                                cost_analysis, path, selected_format, options,
+                                on_progress=lambda event: updates.put(('progress', event))
                             )
+                            updates.put(('done', result))
+                        except Exception as e:
+                            updates.put(('error', e))
                     
                     export_thread = threading.Thread(target=export_worker)
                     export_thread.daemon = True
                     export_thread.start()
+                    self._poll_export_updates(updates, progress_window, progress_bar, status_label)
                     
                 except Exception as e:
                     messagebox.showerror("Export Error", f"Failed to start export: {str(e)}")
@@ -686,317 +753,90 @@ Would you like to start your free trial?"""
         except Exception as e:
             messagebox.showerror("Export Error", f"Failed to show export dialog: {str(e)}")
 
+    def _poll_export_updates(self, updates, progress_window, progress_bar, status_label):
+        """Apply export progress events on the Tk thread until the worker finishes"""
+        while True:
+            try:
+                kind, payload = updates.get_nowait()
+            except queue.Empty:
+                break
+            
+            if kind == 'progress':
+                try:
+                    if str(progress_bar.cget('mode')) != 'determinate':
+                        progress_bar.stop()
+                        progress_bar.config(mode='determinate', maximum=100)
+                    progress_bar.config(value=payload.percent)
+                    status_label.config(
+                        text=f"Writing report... {payload.rows_written:,} of {payload.total_rows:,} approaches"
+                    )
+                except tk.TclError:
+                    pass
+            elif kind == 'done':
+                self._close_loading_dialog(progress_window, progress_bar)
+                if payload.fallback_reason:
+                    messagebox.showwarning("Excel Export",
+                                           f"{payload.fallback_reason}.\nExported as CSV instead:\n{payload.path}")
+                else:
+                    messagebox.showinfo("✅ Export Complete",
+                                        f"Report exported successfully to:\n{payload.path}")
+                return
+            else:
+                self._close_loading_dialog(progress_window, progress_bar)
+                self._show_enhanced_error_dialog(
+                    "Export Error",
+                    f"Failed to export report: {str(payload)}",
+                    recovery_suggestions=[
+                        "Try a different file location",
+                        "Check disk space and permissions",
+                        "Try a different export format"
+                    ]
+                )
+                return
+        
+        try:
+            progress_window.after(PROGRESS_POLL_MS, self._poll_export_updates,
+                                  updates, progress_window, progress_bar, status_label)
+        except tk.TclError:
+            pass  # Progress dialog closed; the export still completes
+
+    def _report_options(self, include_metadata=True, include_recommendations=True, include_charts=False):
+        """Dataset and license details for the report header, read on the Tk thread"""
+        try:
+            license_status = self.controller.get_licensing_info()['license_status']
+            license_info = {'tier': license_status['tier'], 'status': license_status['status']}
+        except Exception:
+            license_info = {}
+        
+        return ReportOptions(
+            include_metadata=include_metadata,
+            include_recommendations=include_recommendations,
+            include_charts=include_charts,
+            dataset_chunks=len(self.parent.chunks),
+            tokenizer_name=getattr(self.parent, '_current_tokenizer_name', 'gpt2'),
+            token_limit=512,
+            source_file=self.parent.file_path,
+            license_info=license_info
+        )
+
     def _export_json_report(self, cost_analysis, path, include_metadata, include_recommendations):
         """Export comprehensive JSON report with metadata"""
-        import json
-        
-        report = cost_analysis.copy()
-        
-        if include_metadata:
-            # Add comprehensive metadata
-            report['export_metadata'] = {
-                'exported_at': datetime.now().isoformat(),
-                'exported_by': 'Wolfscribe Premium v2.2',
-                'export_format': 'json',
-                'dataset_info': {
-                    'total_chunks': len(self.parent.chunks),
-                    'tokenizer_used': getattr(self.parent, '_current_tokenizer_name', 'gpt2'),
-                    'token_limit': 512,
-                    'file_processed': os.path.basename(self.parent.file_path) if self.parent.file_path else 'Unknown'
-                },
-                'license_info': {
-                    'tier': self.controller.get_licensing_info()['license_status']['tier'],
-                    'status': self.controller.get_licensing_info()['license_status']['status']
-                }
-            }
-        
-        if not include_recommendations:
-            # Remove recommendations if not wanted
-            if 'cost_analysis' in report and 'recommendations' in report['cost_analysis']:
-                del report['cost_analysis']['recommendations']
-        
-        with open(path, 'w', encoding='utf-8') as f:
-            json.dump(report, f, indent=2, ensure_ascii=False)
+        return export_report(cost_analysis, path, 'json',
+                             self._report_options(include_metadata, include_recommendations))
 
     def _export_csv_report(self, cost_analysis, path, include_metadata):
         """Export CSV summary with cost comparison table"""
-        import csv
-        
-        cost_data = cost_analysis.get('cost_analysis', {})
-        detailed_results = cost_data.get('detailed_results', {})
-        
-        with open(path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            
-            # Header with metadata
-            if include_metadata:
-                writer.writerow(['# Wolfscribe Cost Analysis Report'])
-                writer.writerow([f'# Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}'])
-                writer.writerow([f'# Dataset: {len(self.parent.chunks)} chunks'])
-                writer.writerow([f'# Tokenizer: {getattr(self.parent, "_current_tokenizer_name", "gpt2")}'])
-                writer.writerow([''])
-            
-            # Column headers
-            writer.writerow(['Rank', 'Model', 'Training_Approach', 'Cost_USD', 'Time_Hours', 
-                            'Hardware_Type', 'GPU_Count', 'Confidence_Percent', 'Notes'])
-            
-            # Collect all approaches
-            all_approaches = []
-            for model_name, model_data in detailed_results.items():
-                if 'error' in model_data:
-                    continue
-                cost_estimates = model_data.get('cost_estimates', [])
-                for estimate in cost_estimates:
-                    hw_req = estimate.get('hardware_requirements', {})
-                    all_approaches.append([
-                        model_name,
-                        estimate['approach_name'],
-                        estimate['total_cost_usd'],
-                        estimate['training_hours'],
-                        hw_req.get('gpu_type', 'Unknown'),
-                        hw_req.get('gpu_count', 1),
-                        f"{estimate.get('confidence', 0.8) * 100:.0f}",
-                        '; '.join(estimate.get('notes', []))[:100]  # Truncate notes
-                    ])
-            
-            # Sort by cost and add rank
-            all_approaches.sort(key=lambda x: x[2])
-            for i, approach in enumerate(all_approaches, 1):
-                writer.writerow([i] + approach)
+        return export_report(cost_analysis, path, 'csv', self._report_options(include_metadata))
 
     def _export_text_report(self, cost_analysis, path, include_metadata, include_recommendations):
         """Export formatted text report for cost analysis"""
-        report = "💰 WOLFSCRIBE COST ANALYSIS REPORT\n"
-        report += "=" * 50 + "\n\n"
-        
-        # Add timestamp
-        if include_metadata:
-            report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            report += f"Dataset: {len(self.parent.chunks)} chunks, {cost_analysis.get('dataset_info', {}).get('tokens', 0):,} tokens\n"
-            report += f"Tokenizer: {getattr(self.parent, '_current_tokenizer_name', 'gpt2')}\n\n"
-        
-        # Executive Summary
-        cost_data = cost_analysis.get('cost_analysis', {})
-        summary = cost_data.get('summary', {})
-        
-        if summary:
-            report += "📊 EXECUTIVE SUMMARY\n"
-            report += "-" * 20 + "\n"
-            
-            best_option = summary.get('best_overall', {})
-            if best_option:
-                report += f"Best Approach: {best_option.get('best_approach', 'N/A')}\n"
-                report += f"Optimal Cost: ${best_option.get('cost', 0):.2f}\n"
-                report += f"Training Time: {best_option.get('hours', 0):.1f} hours\n"
-            
-            cost_range = summary.get('cost_range', {})
-            if cost_range:
-                report += f"Cost Range: ${cost_range.get('min', 0):.2f} - ${cost_range.get('max', 0):.2f}\n"
-                savings = cost_range.get('max', 0) - cost_range.get('min', 0)
-                report += f"Maximum Savings: ${savings:.2f}\n"
-            
-            report += f"Models Analyzed: {summary.get('models_compared', 0)}\n\n"
-        
-        # Detailed Results
-        detailed_results = cost_data.get('detailed_results', {})
-        if detailed_results:
-            report += "🔧 DETAILED TRAINING APPROACHES\n"
-            report += "-" * 35 + "\n\n"
-            
-            all_approaches = []
-            for model_name, model_data in detailed_results.items():
-                if 'error' in model_data:
-                    continue
-                cost_estimates = model_data.get('cost_estimates', [])
-                for estimate in cost_estimates:
-                    all_approaches.append({
-                        'model': model_name,
-                        'approach': estimate['approach_name'],
-                        'cost': estimate['total_cost_usd'],
-                        'hours': estimate['training_hours'],
-                        'hardware': estimate.get('hardware_requirements', {})
-                    })
-            
-            # Sort by cost
-            all_approaches.sort(key=lambda x: x['cost'])
-            
-            for i, approach in enumerate(all_approaches[:10], 1):  # Top 10
-                report += f"{i:2d}. {approach['approach']} ({approach['model']})\n"
-                report += f"    Cost: ${approach['cost']:.2f} | Time: {approach['hours']:.1f}h\n"
-                
-                hw = approach['hardware']
-                gpu_type = hw.get('gpu_type', 'Unknown')
-                gpu_count = hw.get('gpu_count', 1)
-                hardware_str = f"{gpu_type}" + (f" x{gpu_count}" if gpu_count > 1 else "")
-                report += f"    Hardware: {hardware_str}\n\n"
-        
-        # Recommendations
-        if include_recommendations:
-            recommendations = cost_data.get('recommendations', [])
-            if recommendations:
-                report += "💡 OPTIMIZATION RECOMMENDATIONS\n"
-                report += "-" * 35 + "\n"
-                for i, rec in enumerate(recommendations[:5], 1):
-                    report += f"{i}. {rec}\n"
-                report += "\n"
-        
-        # Footer
-        if include_metadata:
-            report += "=" * 50 + "\n"
-            report += "Generated by Wolfscribe Premium\n"
-            report += "https://wolflow.ai\n"
-        
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(report)
+        return export_report(cost_analysis, path, 'txt',
+                             self._report_options(include_metadata, include_recommendations))
 
     def _export_excel_report(self, cost_analysis, path, include_metadata, include_recommendations, include_charts):
-        """Export Excel workbook with multiple sheets and optional charts"""
-        try:
-            # Try to import openpyxl for Excel export
-            from openpyxl import Workbook
-            from openpyxl.styles import Font, Alignment, PatternFill
-            from openpyxl.chart import BarChart, Reference
-            
-            wb = Workbook()
-            
-            # Summary sheet
-            ws_summary = wb.active
-            ws_summary.title = "Executive Summary"
-            
-            # Add title and metadata
-            ws_summary['A1'] = "Wolfscribe Training Cost Analysis"
-            ws_summary['A1'].font = Font(size=16, bold=True)
-            
-            if include_metadata:
-                ws_summary['A3'] = f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}"
-                ws_summary['A4'] = f"Dataset: {len(self.parent.chunks)} chunks"
-                ws_summary['A5'] = f"Tokenizer: {getattr(self.parent, '_current_tokenizer_name', 'gpt2')}"
-            
-            # Summary data
-            cost_data = cost_analysis.get('cost_analysis', {})
-            summary = cost_data.get('summary', {})
-            
-            if summary:
-                best_option = summary.get('best_overall', {})
-                cost_range = summary.get('cost_range', {})
-                
-                row = 7
-                ws_summary[f'A{row}'] = "Best Training Option:"
-                ws_summary[f'B{row}'] = best_option.get('best_approach', 'N/A')
-                ws_summary[f'A{row}'].font = Font(bold=True)
-                
-                row += 1
-                ws_summary[f'A{row}'] = "Optimal Cost:"
-                ws_summary[f'B{row}'] = f"${best_option.get('cost', 0):.2f}"
-                
-                row += 1
-                ws_summary[f'A{row}'] = "Training Time:"
-                ws_summary[f'B{row}'] = f"{best_option.get('hours', 0):.1f} hours"
-                
-                row += 2
-                ws_summary[f'A{row}'] = "Cost Range:"
-                ws_summary[f'B{row}'] = f"${cost_range.get('min', 0):.2f} - ${cost_range.get('max', 0):.2f}"
-            
-            # Detailed comparison sheet
-            ws_details = wb.create_sheet("Cost Comparison")
-            
-            # Headers
-            headers = ['Rank', 'Model', 'Approach', 'Cost (USD)', 'Time (Hours)', 'Hardware', 'Confidence']
-            for col, header in enumerate(headers, 1):
-                cell = ws_details.cell(row=1, column=col, value=header)
-                cell.font = Font(bold=True)
-                cell.fill = PatternFill(start_color="366092", end_color="366092", fill_type="solid")
-            
-            # Data rows
-            detailed_results = cost_data.get('detailed_results', {})
-            all_approaches = []
-            
-            for model_name, model_data in detailed_results.items():
-                if 'error' in model_data:
-                    continue
-                cost_estimates = model_data.get('cost_estimates', [])
-                for estimate in cost_estimates:
-                    hw_req = estimate.get('hardware_requirements', {})
-                    hardware = f"{hw_req.get('gpu_type', 'Unknown')}"
-                    if hw_req.get('gpu_count', 1) > 1:
-                        hardware += f" x{hw_req['gpu_count']}"
-                    
-                    all_approaches.append([
-                        model_name,
-                        estimate['approach_name'],
-                        estimate['total_cost_usd'],
-                        estimate['training_hours'],
-                        hardware,
-                        estimate.get('confidence', 0.8)
-                    ])
-            
-            # Sort and populate
-            all_approaches.sort(key=lambda x: x[2])
-            for i, approach in enumerate(all_approaches, 2):
-                ws_details.cell(row=i, column=1, value=i-1)  # Rank
-                for col, value in enumerate(approach, 2):
-                    if col == 4:  # Cost column
-                        ws_details.cell(row=i, column=col, value=f"${value:.2f}")
-                    elif col == 5:  # Time column
-                        ws_details.cell(row=i, column=col, value=f"{value:.1f}h")
-                    elif col == 7:  # Confidence column
-                        ws_details.cell(row=i, column=col, value=f"{value*100:.0f}%")
-                    else:
-                        ws_details.cell(row=i, column=col, value=value)
-            
-            # Auto-adjust column widths
-            for sheet in [ws_summary, ws_details]:
-                for column in sheet.columns:
-                    max_length = 0
-                    column_letter = column[0].column_letter
-                    for cell in column:
-                        try:
-                            if len(str(cell.value)) > max_length:
-                                max_length = len(str(cell.value))
-                        except:
-                            pass
-                    adjusted_width = min(max_length + 2, 50)
-                    sheet.column_dimensions[column_letter].width = adjusted_width
-            
-            # Add chart if requested
-            if include_charts and len(all_approaches) > 1:
-                chart = BarChart()
-                chart.type = "col"
-                chart.style = 10
-                chart.title = "Training Cost Comparison"
-                chart.y_axis.title = "Cost (USD)"
-                chart.x_axis.title = "Training Approach"
-                
-                # Data for chart (top 10 approaches)
-                data = Reference(ws_details, min_col=4, min_row=1, max_row=min(11, len(all_approaches)+1), max_col=4)
-                cats = Reference(ws_details, min_col=3, min_row=2, max_row=min(11, len(all_approaches)+1))
-                
-                chart.add_data(data, titles_from_data=True)
-                chart.set_categories(cats)
-                
-                ws_details.add_chart(chart, "I2")
-            
-            # Recommendations sheet
-            if include_recommendations:
-                recommendations = cost_data.get('recommendations', [])
-                if recommendations:
-                    ws_rec = wb.create_sheet("Recommendations")
-                    ws_rec['A1'] = "Cost Optimization Recommendations"
-                    ws_rec['A1'].font = Font(size=14, bold=True)
-                    
-                    for i, rec in enumerate(recommendations, 3):
-                        ws_rec[f'A{i}'] = f"{i-2}. {rec}"
-            
-            wb.save(path)
-            
-        except ImportError:
-            # Fallback to CSV if openpyxl not available
-            messagebox.showwarning("Excel Export", 
-                                  "Excel export requires openpyxl package.\nExporting as CSV instead.")
-            csv_path = path.replace('.xlsx', '.csv')
-            self._export_csv_report(cost_analysis, csv_path, include_metadata)
-        except Exception as e:
-            raise Exception(f"Excel export failed: {str(e)}")
+        """Export Excel workbook (falls back to CSV without openpyxl)"""
+        return export_report(cost_analysis, path, 'excel',
+                             self._report_options(include_metadata, include_recommendations, include_charts))
 
     def _refresh_cost_analysis(self):
         """STAGE 3 ENHANCED: Enhanced refresh with cache clearing and user feedback"""
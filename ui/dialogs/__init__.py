@@ -12,6 +12,7 @@ Components:
 - PremiumUpgradeDialog: Premium upgrade and trial flows
 - PremiumInfoDialog: Premium feature information
 - TokenizerDisplayHelper: Helper utilities for tokenizer display
+- FileQueueDialog: Multi-file queue processed concurrently into one dataset
 """
 
 from .preview_dialog import ChunkPreviewDialog
@@ -22,6 +23,7 @@ from .premium_dialogs import (
     PremiumInfoDialog,
     TokenizerDisplayHelper
 )
+from .file_queue_dialog import FileQueueDialog
 
 __all__ = [
     'ChunkPreviewDialog', 
@@ -29,5 +31,6 @@ __all__ = [
     'TokenizerComparisonDialog',
     'PremiumUpgradeDialog',
     'PremiumInfoDialog', 
-    'TokenizerDisplayHelper'
+    'TokenizerDisplayHelper',
+    'FileQueueDialog'
 ]
\ No newline at end of file
@@ -41,6 +41,7 @@ class AnalyticsDashboard:
         self._create_overview_section(main_frame)
         self._create_token_distribution_section(main_frame)
         self._create_cost_estimation_section(main_frame)
+        self._create_duplicates_section(main_frame)
         self._create_recommendations_section(main_frame)
         self._create_action_buttons(main_frame)
 
@@ -115,6 +116,32 @@ class AnalyticsDashboard:
         for stat in cost_stats:
             Label(cost_frame, text=f"• {stat}", font=("Arial", 10)).pack(anchor="w", pady=1)
 
+    def _create_duplicates_section(self, parent):
+        """Create duplicate cluster statistics section"""
+        if not self.current_analysis.get('duplicate_stats'):
+            return
+            
+        dup_frame = Frame(parent, relief="solid", padding=15)
+        dup_frame.pack(fill="x", pady=(0, 15))
+        
+        Label(dup_frame, text="🧹 Deduplication", font=("Arial", 14, "bold")).pack(anchor="w")
+        
+        dup = self.current_analysis['duplicate_stats']
+        dup_stats = [
+            f"Chunks Before Dedup: {dup['total_chunks']:,}",
+            f"Duplicates Removed: {dup['duplicates_removed']:,} ({dup['duplicate_percentage']:.1f}%)",
+            f"Exact / Near Duplicates: {dup['exact_duplicates']:,} / {dup['near_duplicates']:,}",
+            f"Duplicate Clusters: {dup['duplicate_clusters']:,} (largest: {dup['largest_cluster']} chunks)",
+            f"Characters Removed: {dup['characters_removed']:,}"
+        ]
+        
+        for stat in dup_stats:
+            Label(dup_frame, text=f"• {stat}", font=("Arial", 10)).pack(anchor="w", pady=1)
+        
+        for cluster in dup['top_clusters']:
+            Label(dup_frame, text=f"    {cluster['size']}× \"{cluster['preview']}\"",
+                  wraplength=650, font=("Arial", 9)).pack(anchor="w", pady=1)
+
     def _create_recommendations_section(self, parent):
         """Create optimization recommendations section"""
         if not self.current_analysis.get('recommendations'):
@@ -161,7 +188,7 @@ class AnalyticsDashboard:
                         'tokenizer_used': self.tokenizer_name
                     },
                     'analysis': self.current_analysis,
-                    'chunks_sample': self.chunks[:5] if len(self.chunks) > 5 else self.chunks
+                    'chunks_sample': list(self.chunks[:5])
                 }
                 
                 with open(path, 'w', encoding='utf-8') as f:
@@ -188,6 +215,14 @@ class AnalyticsDashboard:
                     if self.current_analysis.get('efficiency_score'):
                         f.write(f"Efficiency Score: {self.current_analysis['efficiency_score']}%\n")
                     
+                    dup = self.current_analysis.get('duplicate_stats')
+                    if dup:
+                        f.write("\nDEDUPLICATION\n")
+                        f.write("-" * 20 + "\n")
+                        f.write(f"Duplicates Removed: {dup['duplicates_removed']:,} ({dup['duplicate_percentage']:.1f}%)\n")
+                        f.write(f"Exact / Near: {dup['exact_duplicates']:,} / {dup['near_duplicates']:,}\n")
+                        f.write(f"Duplicate Clusters: {dup['duplicate_clusters']:,} (largest: {dup['largest_cluster']})\n")
+                    
                     if self.current_analysis.get('recommendations'):
                         f.write("\nRECOMMENDATIONS\n")
                         f.write("-" * 20 + "\n")
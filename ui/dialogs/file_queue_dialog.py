@@ -0,0 +1,267 @@
+# ui/dialogs/file_queue_dialog.py
+import queue
+import threading
+from tkinter import Toplevel, filedialog, messagebox
+from tkinterdnd2 import DND_FILES
+from ttkbootstrap import Frame, Label, Button, Treeview, Scrollbar
+from ttkbootstrap.constants import *
+from typing import Dict, List, Optional
+
+from core.batch_processing import (
+    FileStatus, expand_paths,
+    STATUS_QUEUED, STATUS_PROCESSING, STATUS_DONE, STATUS_FAILED, STATUS_CANCELLED
+)
+
+STATUS_LABELS = {
+    STATUS_QUEUED: "⏳ Queued",
+    STATUS_PROCESSING: "🔄 Processing",
+    STATUS_DONE: "✅ Done",
+    STATUS_FAILED: "❌ Failed",
+    STATUS_CANCELLED: "⏹ Cancelled"
+}
+
+
+class FileQueueDialog:
+    """Queue of files processed concurrently into one dataset"""
+
+    POLL_INTERVAL_MS = 100  # How often status changes are moved onto the table
+
+    def __init__(self, app, controller, token_limit: int = 512):
+        self.app = app
+        self.controller = controller
+        self.token_limit = token_limit
+        self.window = None
+        self.job = None
+        self._updates = queue.Queue()
+        self._summaries = queue.Queue()  # Combined batch results from the summary thread
+        self._statuses: Dict[str, FileStatus] = {}  # Latest status per path, in queue order
+        self._tree = None
+        self._status_label = None
+        self._process_button = None
+        self._tokenizer_name = 'gpt2'
+        self._deduplicate = False
+
+    def show(self, paths: Optional[List[str]] = None):
+        """Display the queue (creating it if needed) and enqueue paths"""
+        if self.window is None or not self.window.winfo_exists():
+            self._build()
+        else:
+            self.window.lift()
+
+        if paths:
+            self.enqueue(paths)
+
+    def enqueue(self, paths: List[str]):
+        """Add files, or every supported file in dropped folders, to the queue"""
+        files, skipped = expand_paths(paths)
+        added = 0
+        for path in files:
+            if path in self._statuses:
+                continue
+            self._statuses[path] = FileStatus(path)
+            self._tree.insert("", END, iid=path, values=self._row_values(self._statuses[path]))
+            added += 1
+
+        message = f"{added} file(s) added, {len(self._statuses)} in queue"
+        if skipped:
+            message += f" - {len(skipped)} unsupported item(s) skipped"
+        self._status_label.config(text=message)
+
+    def _build(self):
+        """Create the queue window"""
+        self.window = Toplevel(self.app)
+        self.window.title("File Queue")
+        self.window.geometry("760x480")
+        self.window.protocol("WM_DELETE_WINDOW", self._close)
+        self.window.drop_target_register(DND_FILES)
+        self.window.dnd_bind('<<Drop>>', self._handle_drop)
+
+        main_frame = Frame(self.window, padding=20)
+        main_frame.pack(fill="both", expand=True)
+
+        Label(main_frame, text="📚 File Queue", font=("Arial", 16, "bold")).pack(pady=(0, 5))
+        self._status_label = Label(main_frame, text="Drop files or folders, or add them below")
+        self._status_label.pack(pady=(0, 10))
+
+        self._create_queue_table(main_frame)
+        self._create_buttons(main_frame)
+
+    def _create_queue_table(self, parent):
+        """Create one row per queued file"""
+        table_frame = Frame(parent)
+        table_frame.pack(fill="both", expand=True)
+
+        columns = ("file", "status", "chunks", "tokens", "time")
+        self._tree = Treeview(table_frame, columns=columns, show="headings", height=12)
+        for column, heading, width, anchor in [
+            ("file", "File", 300, "w"),
+            ("status", "Status", 130, "w"),
+            ("chunks", "Chunks", 90, "e"),
+            ("tokens", "Tokens", 110, "e"),
+            ("time", "Time", 80, "e")
+        ]:
+            self._tree.heading(column, text=heading)
+            self._tree.column(column, width=width, anchor=anchor)
+
+        scrollbar = Scrollbar(table_frame, orient="vertical", command=self._tree.yview)
+        self._tree.configure(yscrollcommand=scrollbar.set)
+        self._tree.pack(side=LEFT, fill="both", expand=True)
+        scrollbar.pack(side=RIGHT, fill="y")
+
+    def _create_buttons(self, parent):
+        """Create queue action buttons"""
+        button_frame = Frame(parent)
+        button_frame.pack(fill="x", pady=(10, 0))
+
+        Button(button_frame, text="Add Files", command=self._add_files,
+               style="Secondary.TButton").pack(side=LEFT, padx=(0, 5))
+        Button(button_frame, text="Add Folder", command=self._add_folder,
+               style="Secondary.TButton").pack(side=LEFT, padx=(0, 5))
+        self._process_button = Button(button_frame, text="Process All", command=self._process_all,
+                                      style="Success.TButton")
+        self._process_button.pack(side=LEFT, padx=(0, 5))
+        Button(button_frame, text="Cancel", command=self._cancel,
+               style="Secondary.TButton").pack(side=LEFT)
+        Button(button_frame, text="Close", command=self._close).pack(side=RIGHT)
+
+    def _handle_drop(self, event):
+        self.enqueue(list(self.window.tk.splitlist(event.data)))
+
+    def _add_files(self):
+        paths = filedialog.askopenfilenames(title="Add Files to Queue", parent=self.window)
+        if paths:
+            self.enqueue(list(paths))
+
+    def _add_folder(self):
+        path = filedialog.askdirectory(title="Add Folder to Queue", parent=self.window)
+        if path:
+            self.enqueue([path])
+
+    def _process_all(self):
+        """Process every file that has not been processed yet"""
+        if self.job is not None and not self.job.done:
+            return
+
+        pending = [path for path, status in self._statuses.items() if status.state != STATUS_DONE]
+        if not pending:
+            messagebox.showinfo("File Queue", "Every queued file has already been processed.",
+                                parent=self.window)
+            return
+
+        # Processing options are read here, on the Tk thread
+        method = self.app.split_method.get()
+        delimiter = self.app.delimiter_entry.get() if method == "custom" else None
+        self._tokenizer_name = getattr(self.app, '_current_tokenizer_name', 'gpt2')
+        clean_opts = {
+            "remove_headers": True,
+            "normalize_whitespace": True,
+            "strip_bullets": True
+        }
+        extract_opts = self.app.extract_options()
+        self._deduplicate = self.app.deduplicate.get()
+
+        for path in pending:
+            self._apply_status(FileStatus(path))
+
+        # Worker threads only touch the queue; the Tk thread drains it.
+        # Duplicates are removed across all files once the batch finishes.
+        self.job = self.controller.process_files(
+            pending, clean_opts, method, delimiter, self._tokenizer_name,
+            self.token_limit, on_status=self._updates.put, as_spans=True,
+            extract_opts=extract_opts, deduplicate=False
+        )
+        self._process_button.config(state="disabled")
+        self._status_label.config(text=f"Processing {len(pending)} file(s) on {self.job.max_workers} workers...")
+        self._poll_updates()
+
+    def _poll_updates(self):
+        """Apply queued status changes on the Tk thread"""
+        if self.window is None or not self.window.winfo_exists():
+            return
+
+        while True:
+            try:
+                status = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            self._apply_status(status)
+
+        if self.job.done and self._updates.empty():
+            self._finish()
+        else:
+            self.window.after(self.POLL_INTERVAL_MS, self._poll_updates)
+
+    def _apply_status(self, status: FileStatus):
+        """Update one file's row"""
+        self._statuses[status.path] = status
+        if self._tree.exists(status.path):
+            self._tree.item(status.path, values=self._row_values(status))
+
+    def _row_values(self, status: FileStatus):
+        tokens = status.analysis.get('total_tokens')
+        return (
+            status.name,
+            STATUS_LABELS.get(status.state, status.state) if not status.error
+            else f"{STATUS_LABELS[STATUS_FAILED]}: {status.error[:60]}",
+            f"{len(status.chunks):,}" if status.state == STATUS_DONE else "",
+            f"{tokens:,}" if tokens is not None else "",
+            f"{status.elapsed_seconds:.1f}s" if status.finished else ""
+        )
+
+    def _finish(self):
+        """Combine every processed file into the app's dataset on a worker thread"""
+        statuses = list(self._statuses.values())
+        self._status_label.config(
+            text="Removing duplicates across files..." if self._deduplicate else "Combining files..."
+        )
+
+        def summarize():
+            try:
+                self._summaries.put(self.controller.summarize_files(
+                    statuses, self._tokenizer_name, self.token_limit, deduplicate=self._deduplicate
+                ))
+            except Exception as e:
+                self._summaries.put(e)
+
+        threading.Thread(target=summarize, name="wolfscribe-batch-summary", daemon=True).start()
+        self._poll_summary()
+
+    def _poll_summary(self):
+        """Hand the combined results to the app once the summary thread is done"""
+        if self.window is None or not self.window.winfo_exists():
+            return
+
+        try:
+            result = self._summaries.get_nowait()
+        except queue.Empty:
+            self.window.after(self.POLL_INTERVAL_MS, self._poll_summary)
+            return
+
+        self._process_button.config(state="normal")
+        if isinstance(result, Exception):
+            self._status_label.config(text="Could not combine the processed files")
+            messagebox.showerror("File Queue", f"❌ Could not combine the processed files:\n\n{result}",
+                                 parent=self.window)
+            return
+
+        statuses, analysis, dedup_stats = result
+        summary = (f"{analysis['files_processed']} file(s) → {analysis['total_chunks']:,} chunks, "
+                   f"{analysis['total_tokens']:,} tokens")
+        if dedup_stats is not None and dedup_stats.duplicates_removed:
+            summary += f", {dedup_stats.duplicates_removed:,} duplicates removed"
+        if analysis['files_failed']:
+            summary += f" ({analysis['files_failed']} failed)"
+        self._status_label.config(text=summary)
+
+        if analysis['files_processed']:
+            self.app.apply_batch_results(statuses, analysis, self._tokenizer_name, dedup_stats)
+
+    def _cancel(self):
+        """Skip files that have not started yet"""
+        if self.job is not None:
+            self.job.cancel()
+
+    def _close(self):
+        """Stop pending files and close the queue"""
+        self._cancel()
+        self.window.destroy()
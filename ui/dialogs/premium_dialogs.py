@@ -1,4 +1,5 @@
 # ui/dialogs/premium_dialogs.py
+import queue
 import tkinter as tk
 from tkinter import Text, Toplevel, messagebox
 from ttkbootstrap import Frame, Label, Button
@@ -9,11 +10,17 @@ import webbrowser
 class TokenizerComparisonDialog:
     """Premium tokenizer comparison dialog for side-by-side analysis"""
     
+    POLL_INTERVAL_MS = 100  # How often partial results are moved onto the table
+    
     def __init__(self, parent, controller, chunks: List[str]):
         self.parent = parent
         self.controller = controller
         self.chunks = chunks
         self.window = None
+        self.job = None
+        self._updates = queue.Queue()
+        self._rows: Dict[str, Dict[str, Label]] = {}
+        self._status_label = None
         
     def show(self):
         """Display the tokenizer comparison dialog"""
@@ -25,41 +32,45 @@ class TokenizerComparisonDialog:
             PremiumUpgradeDialog(self.parent, self.controller, 'advanced_analytics').show()
             return
         
-        # Sample some text for comparison - avoid token length errors
-        sample_text = "\n\n".join(self.chunks[:3]) if len(self.chunks) >= 3 else "\n\n".join(self.chunks)
-        if len(sample_text) > 2000:  # Limit for comparison to avoid tokenization errors
+        # Excerpt shown below the table; the comparison itself covers the corpus
+        sample_text = "\n\n".join(self.chunks[:3])
+        if len(sample_text) > 2000:
             sample_text = sample_text[:2000] + "..."
         
         self.window = Toplevel(self.parent)
         self.window.title("Tokenizer Comparison")
         self.window.geometry("800x600")
+        self.window.protocol("WM_DELETE_WINDOW", self._close)
         
         main_frame = Frame(self.window, padding=20)
         main_frame.pack(fill="both", expand=True)
         
         # Build UI sections
         self._create_header(main_frame)
-        self._create_comparison_table(main_frame, sample_text)
+        self._create_comparison_table(main_frame)
         self._create_sample_display(main_frame, sample_text)
         self._create_close_button(main_frame)
+        
+        self._start_comparison()
 
     def _create_header(self, parent):
         """Create dialog header"""
-        Label(parent, text="🔍 Tokenizer Comparison", font=("Arial", 16, "bold")).pack(pady=(0, 15))
+        Label(parent, text="🔍 Tokenizer Comparison", font=("Arial", 16, "bold")).pack(pady=(0, 5))
+        self._status_label = Label(parent, text="Starting comparison...")
+        self._status_label.pack(pady=(0, 10))
 
-    def _create_comparison_table(self, parent, sample_text):
-        """Create the tokenizer comparison table"""
+    def _create_comparison_table(self, parent):
+        """Create the tokenizer comparison table (filled in as results arrive)"""
         comparison_frame = Frame(parent, relief="solid", padding=10)
         comparison_frame.pack(fill="both", expand=True)
         
         # Headers
-        headers = ["Tokenizer", "Token Count", "Accuracy", "Performance", "Access"]
+        headers = ["Tokenizer", "Tokens", "Tokens/Char", "Throughput", "Accuracy", "Access"]
         for i, header in enumerate(headers):
             Label(comparison_frame, text=header, font=("Arial", 10, "bold")).grid(
                 row=0, column=i, padx=5, pady=5, sticky="w"
             )
         
-        # Compare all tokenizers with enhanced error handling
         available_tokenizers = self.controller.get_available_tokenizers()
         for row, tokenizer in enumerate(available_tokenizers, 1):
             # Tokenizer name
@@ -68,62 +79,91 @@ class TokenizerComparisonDialog:
             )
             
             if tokenizer['has_access'] and tokenizer['available']:
-                try:
-                    # Use truncation logic to avoid tokenization errors
-                    test_text = sample_text if len(sample_text) <= 1500 else sample_text[:1500]
-                    count, metadata = self.controller.get_token_count(test_text, tokenizer['name'])
-                    
-                    # Adjust count if text was truncated
-                    if len(sample_text) > 1500:
-                        count = int(count * (len(sample_text) / 1500))
-                    
-                    Label(comparison_frame, text=str(count)).grid(
-                        row=row, column=1, padx=5, pady=2
-                    )
-                    Label(comparison_frame, text=metadata.get('accuracy', 'unknown')).grid(
-                        row=row, column=2, padx=5, pady=2
-                    )
-                    Label(comparison_frame, text=metadata.get('performance', 'unknown')).grid(
-                        row=row, column=3, padx=5, pady=2
-                    )
-                    Label(comparison_frame, text="✅", foreground="green").grid(
-                        row=row, column=4, padx=5, pady=2
-                    )
-                    
-                except Exception as e:
-                    # Fallback for tokenization errors
-                    fallback_count = int(len(sample_text.split()) * 1.3)
-                    Label(comparison_frame, text=f"~{fallback_count}", foreground="orange").grid(
-                        row=row, column=1, padx=5, pady=2
-                    )
-                    Label(comparison_frame, text="estimated").grid(
-                        row=row, column=2, padx=5, pady=2
-                    )
-                    Label(comparison_frame, text="error").grid(
-                        row=row, column=3, padx=5, pady=2
-                    )
-                    Label(comparison_frame, text="⚠️", foreground="orange").grid(
-                        row=row, column=4, padx=5, pady=2
-                    )
+                cells = {}
+                for column, key in enumerate(['tokens', 'ratio', 'throughput', 'accuracy'], 1):
+                    cells[key] = Label(comparison_frame, text="…")
+                    cells[key].grid(row=row, column=column, padx=5, pady=2)
+                cells['access'] = Label(comparison_frame, text="⏳")
+                cells['access'].grid(row=row, column=5, padx=5, pady=2)
+                self._rows[tokenizer['name']] = cells
             else:
                 Label(comparison_frame, text="N/A").grid(
                     row=row, column=1, padx=5, pady=2
                 )
-                Label(comparison_frame, text=tokenizer['accuracy']).grid(
+                Label(comparison_frame, text="-").grid(
                     row=row, column=2, padx=5, pady=2
                 )
                 Label(comparison_frame, text=tokenizer['performance']).grid(
                     row=row, column=3, padx=5, pady=2
                 )
+                Label(comparison_frame, text=tokenizer['accuracy']).grid(
+                    row=row, column=4, padx=5, pady=2
+                )
                 access_text = "🔒" if tokenizer['is_premium'] and not tokenizer['has_access'] else "❌"
                 access_color = "orange" if access_text == "🔒" else "red"
                 Label(comparison_frame, text=access_text, foreground=access_color).grid(
-                    row=row, column=4, padx=5, pady=2
+                    row=row, column=5, padx=5, pady=2
                 )
 
+    def _start_comparison(self):
+        """Run the comparison on worker threads and stream results into the table"""
+        # Worker threads only touch the queue; the Tk thread drains it
+        self.job = self.controller.compare_tokenizers(self.chunks, on_progress=self._updates.put)
+        
+        sample = self.job.sample
+        if sample.sampled:
+            scope = (f"Stratified sample: {sample.sample_chunks:,} of {sample.total_chunks:,} chunks "
+                     f"({sample.total_characters:,} characters), totals estimated")
+        else:
+            scope = f"Full corpus: {sample.total_chunks:,} chunks ({sample.total_characters:,} characters)"
+        self._status_label.config(text=scope)
+        self._poll_updates()
+
+    def _poll_updates(self):
+        """Apply queued partial results on the Tk thread"""
+        if self.window is None or not self.window.winfo_exists():
+            return
+        
+        while True:
+            try:
+                result = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            self._apply_result(result)
+        
+        if not (self.job.done and self._updates.empty()):
+            self.window.after(self.POLL_INTERVAL_MS, self._poll_updates)
+
+    def _apply_result(self, result):
+        """Update one tokenizer's row"""
+        cells = self._rows.get(result.tokenizer)
+        if not cells:
+            return
+        
+        estimated = result.sampled or not result.done
+        tokens_text = f"{'~' if estimated else ''}{result.estimated_total_tokens:,}"
+        if not result.done:
+            tokens_text += f" ({result.percent_complete:.0f}%)"
+        
+        cells['tokens'].config(text=tokens_text, foreground="orange" if result.error else "")
+        cells['ratio'].config(text=f"{result.tokens_per_character:.3f}")
+        cells['throughput'].config(text=f"{result.characters_per_second / 1000:,.0f}k chars/s")
+        cells['accuracy'].config(text=result.accuracy)
+        
+        if result.error:
+            cells['access'].config(text="⚠️", foreground="orange")
+        elif result.done:
+            cells['access'].config(text="✅", foreground="green")
+
+    def _close(self):
+        """Stop the comparison and close the dialog"""
+        if self.job is not None:
+            self.job.cancel()
+        self.window.destroy()
+
     def _create_sample_display(self, parent, sample_text):
         """Create sample text display section"""
-        Label(parent, text="Sample Text Used for Comparison:", 
+        Label(parent, text="Corpus Excerpt:", 
               font=("Arial", 10, "bold")).pack(anchor="w", pady=(15, 5))
         
         sample_display = Text(parent, height=8, wrap="word")
@@ -133,7 +173,7 @@ class TokenizerComparisonDialog:
 
     def _create_close_button(self, parent):
         """Create close button"""
-        Button(parent, text="Close", command=self.window.destroy).pack(pady=(10, 0))
+        Button(parent, text="Close", command=self._close).pack(pady=(10, 0))
 
 
 class PremiumUpgradeDialog:
@@ -171,6 +171,16 @@ Performance Metrics:
 • 400-{TOKEN_LIMIT} tokens: {dist.get('400_512', 0)} chunks
 • Over limit: {dist.get('over_limit', 0)} chunks"""
             
+            # Duplicate clusters removed before export (if available)
+            if analysis.get('duplicate_stats'):
+                dup = analysis['duplicate_stats']
+                summary += f"""
+
+🧹 Deduplication:
+• Duplicates Removed: {dup.get('duplicates_removed', 0)} chunks ({dup.get('duplicate_percentage', 0):.1f}%)
+• Exact / Near: {dup.get('exact_duplicates', 0)} / {dup.get('near_duplicates', 0)}
+• Duplicate Clusters: {dup.get('duplicate_clusters', 0)} (largest: {dup.get('largest_cluster', 0)} chunks)"""
+            
             messagebox.showinfo("📊 Advanced Analytics Dashboard", summary)
             
         except Exception as e:
@@ -5,7 +5,7 @@ Extracted from app_frame.py to reduce complexity and improve maintainability
 """
 
 import tkinter as tk
-from ttkbootstrap import Frame, Label, Button, Entry, Combobox
+from ttkbootstrap import Frame, Label, Button, Entry, Combobox, Checkbutton
 from ttkbootstrap.tooltip import ToolTip
 from ui.styles import MODERN_SLATE
 
@@ -50,6 +50,21 @@ class SectionBuilder:
                compound="left", command=self._get_select_file_callback(), 
                style="Secondary.TButton").pack(fill="x")
         
+        # Multi-file queue button
+        queue_button = Button(file_section, text="📚 Queue Files or Folder", 
+                              command=self._get_file_queue_callback(), 
+                              style="Secondary.TButton")
+        queue_button.pack(fill="x", pady=(8, 0))
+        ToolTip(queue_button, text="Process many files at once into a single dataset")
+        
+        # Code repository ingestion
+        repo_button = Button(file_section, text="🗂 Ingest Code Repository", 
+                             command=self._get_ingest_repository_callback(), 
+                             style="Secondary.TButton")
+        repo_button.pack(fill="x", pady=(8, 0))
+        ToolTip(repo_button, text="Process every source file in a repository folder,\n"
+                                  "honouring .gitignore and skipping vendored or generated files")
+        
         return file_section
     
     def build_preprocessing_section(self):
@@ -92,6 +107,42 @@ class SectionBuilder:
         if self.app:
             self.app.delimiter_entry = delimiter_entry
         
+        # JSON / JSONL extraction options
+        Label(preprocess_section, text="JSON Field Paths (optional):", 
+              style="FieldLabel.TLabel").pack(anchor="w", pady=(8, 6))
+        json_fields_entry = Entry(preprocess_section, style="Modern.TEntry")
+        json_fields_entry.pack(fill="x", pady=(0, 6))
+        ToolTip(json_fields_entry,
+                text="Comma-separated paths to extract from JSON/JSONL files,\n"
+                     "e.g. messages[*].content, title\n"
+                     "Leave empty to extract all text",
+                delay=500)
+        
+        json_streaming = tk.BooleanVar(value=False)
+        Checkbutton(preprocess_section, text="Stream JSON arrays item by item", 
+                    variable=json_streaming, 
+                    style="Modern.TCheckbutton").pack(anchor="w", pady=(0, 4))
+        
+        # Store references for app
+        if self.app:
+            self.app.json_fields_entry = json_fields_entry
+            self.app.json_streaming = json_streaming
+        
+        # Duplicate removal (changes the exported dataset, so it is opt-in)
+        deduplicate = tk.BooleanVar(value=False)
+        dedup_check = Checkbutton(preprocess_section, text="Remove duplicate chunks", 
+                                  variable=deduplicate, 
+                                  style="Modern.TCheckbutton")
+        dedup_check.pack(anchor="w", pady=(0, 4))
+        ToolTip(dedup_check,
+                text="Drop repeated and near-identical chunks (boilerplate, license\n"
+                     "headers, passages shared between editions) before export.\n"
+                     "The first occurrence of each is kept.",
+                delay=500)
+        
+        if self.app:
+            self.app.deduplicate = deduplicate
+        
         # Tokenizer Selection
         Label(preprocess_section, text="Tokenizer:", 
               style="FieldLabel.TLabel").pack(anchor="w", pady=(8, 6))
@@ -183,6 +234,14 @@ Premium Feature - Requires active license or trial"""
                command=self._get_preview_callback(), 
                style="Secondary.TButton").pack(fill="x")
         
+        # Dataset summary (updated by app as token counts land)
+        summary_label = Label(preview_section, text="", 
+                              style="Secondary.TLabel", anchor="w")
+        summary_label.pack(fill="x", pady=(8, 0))
+        
+        if self.app:
+            self.app.analysis_summary_label = summary_label
+        
         return preview_section
     
     def build_export_section(self):
@@ -250,6 +309,14 @@ Premium Feature - Requires active license or trial"""
         """Get select file callback"""
         return lambda: self.app.select_file() if self.app else None
     
+    def _get_file_queue_callback(self):
+        """Get file queue callback"""
+        return lambda: self.app.show_file_queue() if self.app else None
+    
+    def _get_ingest_repository_callback(self):
+        """Get repository ingestion callback"""
+        return lambda: self.app.ingest_repository() if self.app else None
+    
     def _get_split_method_callback(self):
         """Get split method change callback"""
         return lambda event=None: self.app.on_split_method_change(event) if self.app else None
@@ -0,0 +1,161 @@
+# ui/startup.py
+"""
+Splash-first startup for Wolfscribe
+
+main.py paints a splash screen straight away and hands the slow part of
+startup to StartupLoader: importing the controller (and through it the
+extractors, the cost calculator and the tokenizer libraries) and building
+the ProcessingController. Tk is only touched from the main thread, which
+polls the loader with after() until it is ready.
+
+`python main.py --startup-report` prints an -X importtime breakdown of the
+splash path and the deferred path. It exits non-zero when the splash path
+goes over budget or heavy modules creep back onto it.
+
+This module is imported before the window paints, so it must stay
+standard-library only.
+"""
+
+import logging
+import os
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, List, Optional, TextIO, Tuple
+
+# Configuration constants
+POLL_INTERVAL_MS = 50  # How often the Tk thread checks whether loading finished
+SPLASH_IMPORT_BUDGET_MS = 300  # Import time allowed before the window paints
+REPORT_TOP_MODULES = 15  # Slowest deferred imports listed in the report
+SPLASH_IMPORT = "import main"
+DEFERRED_IMPORT = "import main; import ui.app_frame"
+
+# Packages that must only load on the background thread
+SPLASH_FORBIDDEN_PACKAGES = (
+    'controller', 'core', 'processing', 'export',
+    'pandas', 'numpy', 'transformers', 'sentence_transformers', 'tiktoken', 'torch'
+)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_IMPORTTIME_PREFIX = "import time:"
+
+
+class StartupLoader:
+    """
+    Import the controller and build it on a background thread
+
+    The readiness signal is the `ready` event; Tk code should use
+    when_ready() rather than waiting on it, so the splash keeps painting.
+    """
+
+    def __init__(self):
+        self.ready = threading.Event()
+        self.controller = None
+        self.error: Optional[BaseException] = None
+        self.elapsed_seconds = 0.0
+        self._thread = threading.Thread(target=self._load, name="wolfscribe-startup", daemon=True)
+
+    def start(self) -> "StartupLoader":
+        self._thread.start()
+        return self
+
+    def when_ready(self, widget, callback: Callable[["StartupLoader"], None]):
+        """Call callback(loader) on the Tk thread once loading has finished"""
+        def poll():
+            if self.ready.is_set():
+                callback(self)
+            else:
+                widget.after(POLL_INTERVAL_MS, poll)
+        poll()
+
+    def _load(self):
+        started = time.perf_counter()
+        try:
+            from controller import ProcessingController
+            self.controller = ProcessingController()
+        except Exception as e:
+            logging.exception("Background startup failed")
+            self.error = e
+        finally:
+            self.elapsed_seconds = time.perf_counter() - started
+            logging.info(f"Controller ready after {self.elapsed_seconds:.2f}s")
+            self.ready.set()
+
+
+def run_startup_report(out: TextIO = sys.stdout) -> int:
+    """
+    Print import times for the splash and deferred startup paths
+
+    Returns:
+        int: Process exit code (0 when the splash path is within budget)
+    """
+    splash = _measure_imports(SPLASH_IMPORT)
+    full = _measure_imports(DEFERRED_IMPORT)
+
+    splash_ms = _total_ms(splash)
+    heavy = sorted({
+        name.split('.')[0] for name, _, _ in splash
+        if name.split('.')[0] in SPLASH_FORBIDDEN_PACKAGES
+    })
+
+    splash_names = {name for name, _, _ in splash}
+    deferred = [entry for entry in full if entry[0] not in splash_names]
+    deferred_ms = sum(self_us for _, self_us, _ in deferred) / 1000
+
+    out.write(f"Splash path ({SPLASH_IMPORT}): {splash_ms:.1f} ms "
+              f"(budget {SPLASH_IMPORT_BUDGET_MS} ms)\n")
+    out.write(f"  Heavy modules on splash path: {', '.join(heavy) if heavy else 'none'}\n")
+    out.write(f"Deferred path (background thread): {deferred_ms:.1f} ms\n")
+    out.write("Slowest deferred imports (cumulative):\n")
+    for name, _, cumulative_us in sorted(deferred, key=lambda entry: entry[2], reverse=True)[:REPORT_TOP_MODULES]:
+        out.write(f"  {cumulative_us / 1000:8.1f} ms  {name}\n")
+
+    over_budget = splash_ms > SPLASH_IMPORT_BUDGET_MS
+    if over_budget or heavy:
+        out.write("FAIL: splash path regressed\n")
+        return 1
+    out.write("OK\n")
+    return 0
+
+
+def _measure_imports(statement: str) -> List[Tuple[str, int, int]]:
+    """Run statement in a fresh interpreter under -X importtime"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=PROJECT_ROOT, capture_output=True, text=True
+    )
+
+    entries, other_lines = _parse_importtime(result.stderr)
+    if result.returncode != 0:
+        detail = "\n".join(other_lines[-5:])
+        raise RuntimeError(f"Startup import failed ({statement}):\n{detail}")
+    return entries
+
+
+def _parse_importtime(stderr: str) -> Tuple[List[Tuple[str, int, int]], List[str]]:
+    """Split -X importtime output into (module, self us, cumulative us) entries"""
+    entries = []
+    other_lines = []
+    for line in stderr.splitlines():
+        if not line.startswith(_IMPORTTIME_PREFIX):
+            other_lines.append(line)
+            continue
+        fields = line[len(_IMPORTTIME_PREFIX):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # Column header
+        entries.append((fields[2].strip(), int(fields[0]), int(fields[1])))
+    return entries, other_lines
+
+
+def _total_ms(entries: List[Tuple[str, int, int]]) -> float:
+    return sum(self_us for _, self_us, _ in entries) / 1000
+
+
+__all__ = [
+    'StartupLoader',
+    'run_startup_report',
+    'POLL_INTERVAL_MS',
+    'SPLASH_IMPORT_BUDGET_MS'
+]